@@ -0,0 +1,22 @@
+-- CreateTable
+CREATE TABLE "ProcessingJob" (
+    "id" TEXT NOT NULL PRIMARY KEY,
+    "voiceNoteId" TEXT NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'queued',
+    "payload" TEXT NOT NULL DEFAULT '{}',
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "maxAttempts" INTEGER NOT NULL DEFAULT 3,
+    "runAfter" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "lockedAt" DATETIME,
+    "lastError" TEXT,
+    "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" DATETIME NOT NULL,
+    "completedAt" DATETIME,
+    CONSTRAINT "ProcessingJob_voiceNoteId_fkey" FOREIGN KEY ("voiceNoteId") REFERENCES "VoiceNote" ("id") ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- CreateIndex
+CREATE INDEX "ProcessingJob_status_runAfter_idx" ON "ProcessingJob"("status", "runAfter");
+
+-- CreateIndex
+CREATE INDEX "ProcessingJob_voiceNoteId_idx" ON "ProcessingJob"("voiceNoteId");
@@ -0,0 +1,30 @@
+-- AlterTable
+ALTER TABLE "VoiceNote" ADD COLUMN "fileHash" TEXT;
+
+-- CreateIndex
+CREATE INDEX "VoiceNote_userId_fileHash_idx" ON "VoiceNote"("userId", "fileHash");
+
+-- CreateTable
+CREATE TABLE "TranscriptionCacheEntry" (
+    "id" TEXT NOT NULL PRIMARY KEY,
+    "cacheKey" TEXT NOT NULL,
+    "audioHash" TEXT NOT NULL,
+    "model" TEXT NOT NULL,
+    "text" TEXT NOT NULL,
+    "language" TEXT NOT NULL,
+    "duration" REAL NOT NULL,
+    "confidence" REAL NOT NULL,
+    "sizeBytes" INTEGER NOT NULL,
+    "hitCount" INTEGER NOT NULL DEFAULT 0,
+    "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "lastHitAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "TranscriptionCacheEntry_cacheKey_key" ON "TranscriptionCacheEntry"("cacheKey");
+
+-- CreateIndex
+CREATE INDEX "TranscriptionCacheEntry_audioHash_idx" ON "TranscriptionCacheEntry"("audioHash");
+
+-- CreateIndex
+CREATE INDEX "TranscriptionCacheEntry_lastHitAt_idx" ON "TranscriptionCacheEntry"("lastHitAt");
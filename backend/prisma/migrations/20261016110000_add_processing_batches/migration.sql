@@ -0,0 +1,12 @@
+-- CreateTable
+CREATE TABLE "ProcessingBatch" (
+    "id" TEXT NOT NULL PRIMARY KEY,
+    "userId" TEXT NOT NULL,
+    "voiceNoteIds" TEXT NOT NULL DEFAULT '[]',
+    "language" TEXT,
+    "projectId" TEXT,
+    "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- CreateIndex
+CREATE INDEX "ProcessingBatch_userId_createdAt_idx" ON "ProcessingBatch"("userId", "createdAt");
@@ -0,0 +1,35 @@
+-- CreateTable
+CREATE TABLE "VoiceNoteSearchDoc" (
+    "docId" INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    "voiceNoteId" TEXT NOT NULL,
+    CONSTRAINT "VoiceNoteSearchDoc_voiceNoteId_fkey" FOREIGN KEY ("voiceNoteId") REFERENCES "VoiceNote" ("id") ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "VoiceNoteSearchDoc_voiceNoteId_key" ON "VoiceNoteSearchDoc"("voiceNoteId");
+
+-- CreateVirtualTable
+-- Full-text index over titles, descriptions, transcriptions and summaries.
+-- rowid = VoiceNoteSearchDoc.docId; rows are kept in sync by VoiceNoteRepositoryImpl.
+CREATE VIRTUAL TABLE "VoiceNoteSearch" USING fts5(
+    title,
+    description,
+    transcription,
+    summary,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+-- Backfill existing notes
+INSERT INTO "VoiceNoteSearchDoc" ("voiceNoteId") SELECT "id" FROM "VoiceNote";
+
+INSERT INTO "VoiceNoteSearch" (rowid, title, description, transcription, summary)
+SELECT
+    d."docId",
+    v."title" || ' ' || COALESCE(v."aiGeneratedTitle", ''),
+    COALESCE(v."briefDescription", ''),
+    COALESCE(t."text", ''),
+    COALESCE(s."summary", '') || ' ' || COALESCE(s."keyPoints", '') || ' ' || COALESCE(s."actionItems", '')
+FROM "VoiceNoteSearchDoc" d
+JOIN "VoiceNote" v ON v."id" = d."voiceNoteId"
+LEFT JOIN "Transcription" t ON t."voiceNoteId" = v."id"
+LEFT JOIN "Summary" s ON s."voiceNoteId" = v."id";
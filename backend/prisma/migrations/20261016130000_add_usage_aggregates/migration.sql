@@ -0,0 +1,13 @@
+-- CreateTable
+-- Filled by the app on first start (rebuilt from the event log), then kept up to date incrementally
+CREATE TABLE "UsageAggregate" (
+    "userId" TEXT NOT NULL,
+    "period" TEXT NOT NULL,
+    "notesProcessed" INTEGER NOT NULL DEFAULT 0,
+    "secondsTranscribed" REAL NOT NULL DEFAULT 0,
+    "creditsUsed" INTEGER NOT NULL DEFAULT 0,
+    "updatedAt" DATETIME NOT NULL,
+
+    PRIMARY KEY ("userId", "period"),
+    CONSTRAINT "UsageAggregate_userId_fkey" FOREIGN KEY ("userId") REFERENCES "User" ("id") ON DELETE CASCADE ON UPDATE CASCADE
+);
@@ -0,0 +1,11 @@
+-- CreateTable
+CREATE TABLE "RateLimitBucket" (
+    "key" TEXT NOT NULL PRIMARY KEY,
+    "windowStart" BIGINT NOT NULL,
+    "count" INTEGER NOT NULL DEFAULT 0,
+    "previousCount" INTEGER NOT NULL DEFAULT 0,
+    "expiresAt" BIGINT NOT NULL
+);
+
+-- CreateIndex
+CREATE INDEX "RateLimitBucket_expiresAt_idx" ON "RateLimitBucket"("expiresAt");
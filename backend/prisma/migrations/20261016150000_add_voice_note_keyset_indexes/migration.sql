@@ -0,0 +1,12 @@
+-- Keyset pagination of voice note lists seeks on (owner, createdAt, id)
+-- DropIndex
+DROP INDEX "VoiceNote_userId_createdAt_idx";
+
+-- DropIndex
+DROP INDEX "VoiceNote_sessionId_idx";
+
+-- CreateIndex
+CREATE INDEX "VoiceNote_userId_createdAt_id_idx" ON "VoiceNote"("userId", "createdAt", "id");
+
+-- CreateIndex
+CREATE INDEX "VoiceNote_sessionId_createdAt_id_idx" ON "VoiceNote"("sessionId", "createdAt", "id");
@@ -0,0 +1,25 @@
+-- CreateTable
+CREATE TABLE "StoredObject" (
+    "path" TEXT NOT NULL PRIMARY KEY,
+    "hash" TEXT,
+    "size" INTEGER NOT NULL,
+    "refCount" INTEGER NOT NULL DEFAULT 0,
+    "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "touchedAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "expiredAt" DATETIME
+);
+
+-- CreateIndex
+CREATE INDEX "StoredObject_refCount_touchedAt_idx" ON "StoredObject"("refCount", "touchedAt");
+
+-- CreateIndex
+CREATE INDEX "StoredObject_expiredAt_touchedAt_idx" ON "StoredObject"("expiredAt", "touchedAt");
+
+-- CreateIndex
+CREATE INDEX "VoiceNote_originalFilePath_idx" ON "VoiceNote"("originalFilePath");
+
+-- Register files uploaded before content addressing, so they are counted and aged like new ones
+INSERT INTO "StoredObject" ("path", "hash", "size", "refCount", "createdAt", "touchedAt")
+SELECT "originalFilePath", MAX("fileHash"), MAX("fileSize"), COUNT(*), MIN("createdAt"), MAX("createdAt")
+FROM "VoiceNote"
+GROUP BY "originalFilePath";
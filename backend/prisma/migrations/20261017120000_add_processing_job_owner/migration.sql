@@ -0,0 +1,2 @@
+-- AlterTable
+ALTER TABLE "ProcessingJob" ADD COLUMN "lockedBy" TEXT;
@@ -1,4 +1,6 @@
-import { EntityContextBuilder } from './EntityContextBuilder';
+import { EntityContextBuilder, estimateTokens } from './EntityContextBuilder';
+import { EntityRelevanceRanker } from './EntityRelevanceRanker';
+import type { IEntityUsageRepository } from '../../domain/repositories/IEntityUsageRepository';
 import type { IEntityRepository } from '../../domain/repositories/IEntityRepository';
 import type { IProjectRepository } from '../../domain/repositories/IProjectRepository';
 import type { Entity } from '../../domain/entities/Entity';
@@ -72,7 +74,7 @@ describe('EntityContextBuilder', () => {
   });
 
   describe('compressForGPT4o', () => {
-    it('should compress entities to top 20 for GPT-4o', async () => {
+    it('should fit the highest-priority entities into the token budget for GPT-4o', async () => {
       const mockEntities: Entity[] = [];
       
       // Create 30 entities of different types
@@ -120,18 +122,19 @@ describe('EntityContextBuilder', () => {
 
       (mockEntityRepo.findByUserId as jest.Mock).mockResolvedValue(mockEntities);
 
-      const context = await builder.buildContext('user1', null, 'gpt4o');
+      const context = await builder.buildContext('user1', null, 'gpt4o', 60);
 
-      // Should have compressed field with exactly 20 entities
+      // Should stay within the budget
       expect(context.compressed).toBeDefined();
+      expect(estimateTokens(context.compressed)).toBeLessThanOrEqual(60);
       const compressedEntities = context.compressed.split(', ');
-      expect(compressedEntities.length).toBe(20);
+      expect(compressedEntities.length).toBeLessThan(30);
       
       // Should prioritize technical terms first
       expect(compressedEntities[0]).toBe('TechValue1');
       expect(compressedEntities[9]).toBe('TechValue10');
       expect(compressedEntities[10]).toBe('PersonValue1');
-      expect(compressedEntities[19]).toBe('PersonValue10');
+      expect(compressedEntities).not.toContain('CompanyValue1');
     });
 
     it('should handle empty entity lists gracefully', async () => {
@@ -244,4 +247,153 @@ describe('EntityContextBuilder', () => {
       expect(context.detailed).toContain('Claude: AI assistant');
     });
   });
+
+  describe('caching', () => {
+    const entity: Entity = {
+      id: '1',
+      userId: 'user1',
+      name: 'Ada',
+      type: 'person',
+      value: 'Ada',
+      createdAt: new Date(),
+      updatedAt: new Date()
+    };
+
+    beforeEach(() => {
+      (mockEntityRepo.findByProject as jest.Mock).mockResolvedValue([entity]);
+      (mockEntityRepo.findByUserId as jest.Mock).mockResolvedValue([entity]);
+    });
+
+    it('should query the repository once per user and project', async () => {
+      const first = await builder.buildContext('user1', 'project1', 'gpt4o');
+      const second = await builder.buildContext('user1', 'project1', 'gpt4o');
+      await builder.buildContext('user1', 'project1', 'gemini');
+      const entities = await builder.getEntities('user1', 'project1');
+
+      expect(second).toBe(first);
+      expect(entities).toEqual([entity]);
+      expect(mockEntityRepo.findByProject).toHaveBeenCalledTimes(1);
+    });
+
+    it('should share one query between concurrent misses', async () => {
+      await Promise.all([
+        builder.buildContext('user1', 'project1', 'gpt4o'),
+        builder.buildContext('user1', 'project1', 'gemini')
+      ]);
+
+      expect(mockEntityRepo.findByProject).toHaveBeenCalledTimes(1);
+    });
+
+    it('should reload after the user\'s entities change', async () => {
+      await builder.buildContext('user1', 'project1', 'gpt4o');
+      await builder.buildContext('user1', null, 'gpt4o');
+
+      builder.invalidateUser('user1');
+      await builder.buildContext('user1', 'project1', 'gpt4o');
+      await builder.buildContext('user1', null, 'gpt4o');
+
+      expect(mockEntityRepo.findByProject).toHaveBeenCalledTimes(2);
+      expect(mockEntityRepo.findByUserId).toHaveBeenCalledTimes(2);
+    });
+
+    it('should reload only the project whose entities changed', async () => {
+      await builder.buildContext('user1', 'project1', 'gpt4o');
+      await builder.buildContext('user1', null, 'gpt4o');
+
+      builder.invalidateProject('project1');
+      await builder.buildContext('user1', 'project1', 'gpt4o');
+      await builder.buildContext('user1', null, 'gpt4o');
+
+      expect(mockEntityRepo.findByProject).toHaveBeenCalledTimes(2);
+      expect(mockEntityRepo.findByUserId).toHaveBeenCalledTimes(1);
+    });
+
+    it('should not cache failed queries', async () => {
+      (mockEntityRepo.findByProject as jest.Mock)
+        .mockRejectedValueOnce(new Error('database is locked'))
+        .mockResolvedValue([entity]);
+
+      await expect(builder.buildContext('user1', 'project1', 'gpt4o')).rejects.toThrow('database is locked');
+      const context = await builder.buildContext('user1', 'project1', 'gpt4o');
+
+      expect(context.people).toBe('Ada');
+    });
+
+    it('should expire entries after the TTL', async () => {
+      builder = new EntityContextBuilder(mockEntityRepo, mockProjectRepo, undefined, { ttlMs: 0 });
+
+      await builder.buildContext('user1', 'project1', 'gpt4o');
+      await builder.buildContext('user1', 'project1', 'gpt4o');
+
+      expect(mockEntityRepo.findByProject).toHaveBeenCalledTimes(2);
+    });
+  });
+
+  describe('ranking', () => {
+    const DAY_MS = 24 * 60 * 60 * 1000;
+    let usageRepo: jest.Mocked<Pick<IEntityUsageRepository, 'getUsageStatsByUser'>>;
+
+    function makeEntity(id: string, type: Entity['type'], value: string, description?: string): Entity {
+      return { id, userId: 'user1', name: value, type, value, aliases: [], description, createdAt: new Date(), updatedAt: new Date() };
+    }
+
+    beforeEach(() => {
+      usageRepo = { getUsageStatsByUser: jest.fn().mockResolvedValue(new Map()) };
+      builder = new EntityContextBuilder(
+        mockEntityRepo,
+        mockProjectRepo,
+        new EntityRelevanceRanker(usageRepo as unknown as IEntityUsageRepository)
+      );
+    });
+
+    it('should put frequently and recently used entities first', async () => {
+      (mockEntityRepo.findByProject as jest.Mock).mockResolvedValue([
+        makeEntity('1', 'technical', 'Kubernetes'),
+        makeEntity('2', 'person', 'Ada'),
+        makeEntity('3', 'product', 'Zabka')
+      ]);
+      usageRepo.getUsageStatsByUser.mockResolvedValue(new Map([
+        ['3', { totalUsage: 12, correctUsage: 12, correctionRate: 0, lastUsedAt: new Date() }],
+        ['2', { totalUsage: 12, correctUsage: 12, correctionRate: 0, lastUsedAt: new Date(Date.now() - 365 * DAY_MS) }]
+      ]));
+
+      const context = await builder.buildContext('user1', 'project1', 'gpt4o');
+
+      expect(context.compressed).toBe('Zabka, Ada, Kubernetes');
+      expect(usageRepo.getUsageStatsByUser).toHaveBeenCalledWith('user1');
+    });
+
+    it('should re-rank from recorded usage without querying again', async () => {
+      (mockEntityRepo.findByProject as jest.Mock).mockResolvedValue([
+        makeEntity('1', 'technical', 'Kubernetes'),
+        makeEntity('2', 'person', 'Ada')
+      ]);
+
+      expect((await builder.buildContext('user1', 'project1', 'gpt4o')).compressed).toBe('Kubernetes, Ada');
+
+      builder.recordUsage('user1', ['2']);
+      await Promise.resolve();
+
+      expect((await builder.buildContext('user1', 'project1', 'gpt4o')).compressed).toBe('Ada, Kubernetes');
+      expect(mockEntityRepo.findByProject).toHaveBeenCalledTimes(1);
+      expect(usageRepo.getUsageStatsByUser).toHaveBeenCalledTimes(1);
+    });
+
+    it('should drop the least relevant entities from the Gemini context when over budget', async () => {
+      const entities = Array.from({ length: 50 }, (_, i) =>
+        makeEntity(`p${i}`, 'person', `Person ${i}`, 'Engineer on the platform team'));
+      (mockEntityRepo.findByProject as jest.Mock).mockResolvedValue(entities);
+      usageRepo.getUsageStatsByUser.mockResolvedValue(new Map([
+        ['p49', { totalUsage: 3, correctUsage: 3, correctionRate: 0, lastUsedAt: new Date() }]
+      ]));
+
+      const context = await builder.buildContext('user1', 'project1', 'gemini', 100);
+
+      const tokens = estimateTokens(context.people) + estimateTokens(context.detailed || '');
+      expect(tokens).toBeLessThanOrEqual(100);
+      expect(context.people.startsWith('Person 49 (')).toBe(true);
+      expect(context.detailed).toContain('- Person 49: Engineer on the platform team');
+      expect(context.people).not.toContain('Person 48');
+    });
+  });
 });
\ No newline at end of file
@@ -1,36 +1,173 @@
 import { IEntityRepository } from '../../domain/repositories/IEntityRepository';
 import { IProjectRepository } from '../../domain/repositories/IProjectRepository';
 import { Entity, EntityContext, GroupedEntities } from '../../domain/entities/Entity';
+import { EntityRelevanceRanker, TYPE_PRIORITY } from './EntityRelevanceRanker';
 
 export type ModelType = 'gpt4o' | 'gemini';
 
+export interface EntityContextCacheOptions {
+  ttlMs?: number;
+  maxEntries?: number;
+}
+
+interface CachedEntities {
+  userId: string;
+  projectId: string | null;
+  expiresAt: number;
+  entities: Promise<Entity[]>;
+  // By model type and token budget
+  contexts: Map<string, EntityContext>;
+}
+
+// Bounds how long another cluster worker can serve a context after an edit it did not see
+const DEFAULT_TTL_MS = 5 * 60 * 1000;
+const DEFAULT_MAX_ENTRIES = 1000;
+
+// Entity tokens when the caller passes no budget (entityContext.maxPromptTokens)
+const DEFAULT_MAX_TOKENS: Record<ModelType, number> = {
+  gpt4o: 150,
+  gemini: 8000
+};
+
+// Rough BPE estimate (~4 characters per token), good enough for budgeting
+export function estimateTokens(text: string): number {
+  return Math.ceil(text.length / 4);
+}
+
+/**
+ * Builds the entity context injected into transcription and summarization
+ * prompts: the most relevant entities (see EntityRelevanceRanker) that fit the
+ * model's token budget. Entity lists and the contexts derived from them are
+ * memoized per (user, project), model type and budget; the entity and project
+ * use cases invalidate them on every change, so the processing hot path does
+ * not touch the database once a project is warm.
+ */
 export class EntityContextBuilder {
+  private readonly cache = new Map<string, CachedEntities>();
+  private readonly ttlMs: number;
+  private readonly maxEntries: number;
+
   constructor(
     private entityRepo: IEntityRepository,
-    private projectRepo: IProjectRepository
-  ) {}
+    private projectRepo: IProjectRepository,
+    private ranker?: EntityRelevanceRanker,
+    options: EntityContextCacheOptions = {}
+  ) {
+    this.ttlMs = options.ttlMs ?? DEFAULT_TTL_MS;
+    this.maxEntries = options.maxEntries ?? DEFAULT_MAX_ENTRIES;
+  }
 
   async buildContext(
     userId: string,
     projectId: string | null,
-    modelType: ModelType
+    modelType: ModelType,
+    maxTokens = DEFAULT_MAX_TOKENS[modelType]
   ): Promise<EntityContext> {
-    // Get entities for project or user
-    const entities = projectId 
-      ? await this.entityRepo.findByProject(projectId)
-      : await this.entityRepo.findByUserId(userId);
+    const entry = this.lookup(userId, projectId);
+    const entities = await entry.entities;
+
+    const contextKey = `${modelType}:${maxTokens}`;
+    const cached = entry.contexts.get(contextKey);
+    if (cached) {
+      return cached;
+    }
 
-    // Group by type
-    const grouped = this.groupByType(entities);
+    // Most relevant first; without usage data, by type priority
+    const ranked = this.ranker
+      ? await this.ranker.rank(userId, entities)
+      : [...entities].sort((a, b) => TYPE_PRIORITY[a.type] - TYPE_PRIORITY[b.type]);
 
     // Optimize for model
-    if (modelType === 'gpt4o') {
-      return this.compressForGPT4o(grouped);
-    } else {
-      return this.expandForGemini(grouped);
+    const context = modelType === 'gpt4o'
+      ? this.compressForGPT4o(ranked, maxTokens)
+      : this.expandForGemini(ranked, maxTokens);
+    entry.contexts.set(contextKey, context);
+    return context;
+  }
+
+  /**
+   * Entities of the project (or all of the user's entities without one),
+   * served from the same cache as buildContext.
+   */
+  async getEntities(userId: string, projectId: string | null): Promise<Entity[]> {
+    return this.lookup(userId, projectId).entities;
+  }
+
+  /**
+   * Entities that turned up in a transcription or summary of this user; moves
+   * them up the ranking for the next context built.
+   */
+  recordUsage(userId: string, entityIds: string[]): void {
+    if (!this.ranker || entityIds.length === 0) {
+      return;
+    }
+    this.ranker.recordUsage(userId, entityIds);
+    for (const entry of this.cache.values()) {
+      if (entry.userId === userId) {
+        entry.contexts.clear();
+      }
+    }
+  }
+
+  // After an entity of this user was created, updated or deleted
+  invalidateUser(userId: string): void {
+    for (const [key, entry] of this.cache) {
+      if (entry.userId === userId) {
+        this.cache.delete(key);
+      }
+    }
+  }
+
+  // After entities were added to or removed from this project, or it was deleted
+  invalidateProject(projectId: string): void {
+    for (const [key, entry] of this.cache) {
+      if (entry.projectId === projectId) {
+        this.cache.delete(key);
+      }
     }
   }
 
+  clear(): void {
+    this.cache.clear();
+  }
+
+  private lookup(userId: string, projectId: string | null): CachedEntities {
+    const key = `${userId}|${projectId ?? ''}`;
+    const now = Date.now();
+    const existing = this.cache.get(key);
+
+    if (existing && existing.expiresAt > now) {
+      // Re-insert to keep the map in least-recently-used order
+      this.cache.delete(key);
+      this.cache.set(key, existing);
+      return existing;
+    }
+
+    const entry: CachedEntities = {
+      userId,
+      projectId,
+      expiresAt: now + this.ttlMs,
+      // Get entities for project or user; concurrent misses share this query
+      entities: projectId
+        ? this.entityRepo.findByProject(projectId)
+        : this.entityRepo.findByUserId(userId),
+      contexts: new Map()
+    };
+    entry.entities.catch(() => {
+      // Don't cache failures
+      if (this.cache.get(key) === entry) {
+        this.cache.delete(key);
+      }
+    });
+
+    this.cache.delete(key);
+    this.cache.set(key, entry);
+    while (this.cache.size > this.maxEntries) {
+      this.cache.delete(this.cache.keys().next().value as string);
+    }
+    return entry;
+  }
+
   private groupByType(entities: Entity[]): GroupedEntities {
     const grouped: GroupedEntities = {};
     
@@ -45,22 +182,23 @@ export class EntityContextBuilder {
     return grouped;
   }
 
-  private compressForGPT4o(grouped: GroupedEntities): EntityContext {
-    // For GPT-4o, we need to be token-efficient
-    // Simple compression: top 20 entities as comma-separated list
-    const allEntities: Entity[] = [];
-    
-    // Prioritize by type: technical > person > company > product
-    if (grouped.technical) allEntities.push(...grouped.technical);
-    if (grouped.person) allEntities.push(...grouped.person);
-    if (grouped.company) allEntities.push(...grouped.company);
-    if (grouped.product) allEntities.push(...grouped.product);
-    
-    // Take top 20 entities
-    const top20 = allEntities.slice(0, 20);
-    
+  private compressForGPT4o(ranked: Entity[], maxTokens: number): EntityContext {
+    // For GPT-4o, we need to be token-efficient: as many of the most
+    // relevant entities as fit the budget, as a comma-separated list
+    const values: string[] = [];
+    let tokens = 0;
+    for (const entity of ranked) {
+      const cost = estimateTokens(values.length > 0 ? `, ${entity.value}` : entity.value);
+      if (tokens + cost > maxTokens) {
+        continue;
+      }
+      values.push(entity.value);
+      tokens += cost;
+    }
+
+    const grouped = this.groupByType(ranked);
     return {
-      compressed: top20.map(e => e.value).join(', '),
+      compressed: values.join(', '),
       // Individual type lists for selective use
       people: grouped.person?.slice(0, 5).map(e => e.value).join(', ') || '',
       technical: grouped.technical?.slice(0, 5).map(e => e.value).join(', ') || '',
@@ -69,74 +207,74 @@ export class EntityContextBuilder {
     };
   }
 
-  private expandForGemini(grouped: GroupedEntities): EntityContext {
-    // For Gemini with 1M tokens, we can be more verbose
+  private expandForGemini(ranked: Entity[], maxTokens: number): EntityContext {
+    // For Gemini we can be more verbose, but a project with thousands of
+    // entities still has to fit the budget: every entity appears once in its
+    // type list and once in the detailed context
+    const selected: Entity[] = [];
+    let tokens = 0;
+    for (const entity of ranked) {
+      const cost = estimateTokens(this.describeForList(entity)) + estimateTokens(this.describeInDetail(entity));
+      if (tokens + cost > maxTokens) {
+        continue;
+      }
+      selected.push(entity);
+      tokens += cost;
+    }
+
+    const grouped = this.groupByType(selected);
     return {
       compressed: '', // Not used for Gemini
-      people: grouped.person?.map(e => 
-        e.description ? `${e.value} (${e.description})` : e.value
-      ).join(', ') || '',
-      technical: grouped.technical?.map(e => {
-        if (e.aliases && e.aliases.length > 0) {
-          return `${e.value} (aka: ${e.aliases.join(', ')})`;
-        }
-        return e.value;
-      }).join(', ') || '',
-      companies: grouped.company?.map(e => e.value).join(', ') || '',
-      products: grouped.product?.map(e => e.value).join(', ') || '',
+      people: grouped.person?.map(e => this.describeForList(e)).join(', ') || '',
+      technical: grouped.technical?.map(e => this.describeForList(e)).join(', ') || '',
+      companies: grouped.company?.map(e => this.describeForList(e)).join(', ') || '',
+      products: grouped.product?.map(e => this.describeForList(e)).join(', ') || '',
       detailed: this.buildDetailedContext(grouped)
     };
   }
 
-  private buildDetailedContext(grouped: GroupedEntities): string {
-    let context = '';
-    
-    if (grouped.person && grouped.person.length > 0) {
-      context += `Team Members and People:\n`;
-      grouped.person.forEach(e => {
-        context += `- ${e.value}`;
-        if (e.description) context += `: ${e.description}`;
-        if (e.aliases && e.aliases.length > 0) {
-          context += ` (also known as: ${e.aliases.join(', ')})`;
-        }
-        context += '\n';
-      });
-      context += '\n';
+  private describeForList(entity: Entity): string {
+    if (entity.type === 'person') {
+      return entity.description ? `${entity.value} (${entity.description})` : entity.value;
     }
-    
-    if (grouped.technical && grouped.technical.length > 0) {
-      context += `Technical Terms and Concepts:\n`;
-      grouped.technical.forEach(e => {
-        context += `- ${e.value}`;
-        if (e.description) context += `: ${e.description}`;
-        if (e.aliases && e.aliases.length > 0) {
-          context += ` (alternatives: ${e.aliases.join(', ')})`;
-        }
-        context += '\n';
-      });
-      context += '\n';
+    if (entity.type === 'technical' && entity.aliases && entity.aliases.length > 0) {
+      return `${entity.value} (aka: ${entity.aliases.join(', ')})`;
     }
-    
-    if (grouped.company && grouped.company.length > 0) {
-      context += `Companies and Organizations:\n`;
-      grouped.company.forEach(e => {
-        context += `- ${e.value}`;
-        if (e.description) context += `: ${e.description}`;
-        context += '\n';
-      });
-      context += '\n';
+    return entity.value;
+  }
+
+  private describeInDetail(entity: Entity): string {
+    let line = `- ${entity.value}`;
+    if (entity.description) line += `: ${entity.description}`;
+    if (entity.aliases && entity.aliases.length > 0) {
+      if (entity.type === 'person') {
+        line += ` (also known as: ${entity.aliases.join(', ')})`;
+      } else if (entity.type === 'technical') {
+        line += ` (alternatives: ${entity.aliases.join(', ')})`;
+      }
     }
-    
-    if (grouped.product && grouped.product.length > 0) {
-      context += `Products and Services:\n`;
-      grouped.product.forEach(e => {
-        context += `- ${e.value}`;
-        if (e.description) context += `: ${e.description}`;
+    return line;
+  }
+
+  private buildDetailedContext(grouped: GroupedEntities): string {
+    const sections: Array<[string, Entity[] | undefined]> = [
+      ['Team Members and People', grouped.person],
+      ['Technical Terms and Concepts', grouped.technical],
+      ['Companies and Organizations', grouped.company],
+      ['Products and Services', grouped.product]
+    ];
+
+    let context = '';
+    for (const [heading, entities] of sections) {
+      if (entities && entities.length > 0) {
+        context += `${heading}:\n`;
+        entities.forEach(e => {
+          context += `${this.describeInDetail(e)}\n`;
+        });
         context += '\n';
-      });
-      context += '\n';
+      }
     }
-    
+
     return context.trim();
   }
 }
\ No newline at end of file
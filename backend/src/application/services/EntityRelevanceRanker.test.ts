@@ -0,0 +1,82 @@
+import { EntityRelevanceRanker } from './EntityRelevanceRanker';
+import type { IEntityUsageRepository, EntityUsageStats } from '../../domain/repositories/IEntityUsageRepository';
+import type { Entity } from '../../domain/entities/Entity';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const NOW = Date.UTC(2026, 9, 1);
+
+function makeEntity(id: string, type: Entity['type'] = 'technical'): Entity {
+  return { id, userId: 'user1', name: id, type, value: id, createdAt: new Date(NOW), updatedAt: new Date(NOW) };
+}
+
+function used(correctUsage: number, daysAgo: number): EntityUsageStats {
+  return { totalUsage: correctUsage, correctUsage, correctionRate: 0, lastUsedAt: new Date(NOW - daysAgo * DAY_MS) };
+}
+
+describe('EntityRelevanceRanker', () => {
+  let usageRepository: { getUsageStatsByUser: jest.Mock };
+  let ranker: EntityRelevanceRanker;
+
+  beforeEach(() => {
+    usageRepository = { getUsageStatsByUser: jest.fn().mockResolvedValue(new Map()) };
+    ranker = new EntityRelevanceRanker(usageRepository as unknown as IEntityUsageRepository, {
+      recencyHalfLifeDays: 30
+    });
+  });
+
+  it('should halve the score for every half-life since the last use', () => {
+    const fresh = ranker.score(used(10, 0), NOW);
+    const month = ranker.score(used(10, 30), NOW);
+
+    expect(month).toBeCloseTo(fresh / 2);
+    expect(ranker.score(undefined, NOW)).toBe(0);
+    expect(ranker.score(used(0, 0), NOW)).toBe(0);
+  });
+
+  it('should prefer frequent use, then recent use', async () => {
+    usageRepository.getUsageStatsByUser.mockResolvedValue(new Map([
+      ['rare', used(1, 0)],
+      ['frequent', used(50, 0)],
+      ['stale', used(50, 365)]
+    ]));
+
+    const ranked = await ranker.rank('user1', [
+      makeEntity('never'), makeEntity('rare'), makeEntity('stale'), makeEntity('frequent')
+    ], NOW);
+
+    expect(ranked.map(entity => entity.id)).toEqual(['frequent', 'rare', 'stale', 'never']);
+  });
+
+  it('should order unused entities by type priority, keeping their order within a type', async () => {
+    const ranked = await ranker.rank('user1', [
+      makeEntity('acme', 'company'),
+      makeEntity('ada', 'person'),
+      makeEntity('k8s', 'technical'),
+      makeEntity('bob', 'person')
+    ], NOW);
+
+    expect(ranked.map(entity => entity.id)).toEqual(['k8s', 'ada', 'bob', 'acme']);
+  });
+
+  it('should load usage once per user and apply recorded usage in memory', async () => {
+    const entities = [makeEntity('a'), makeEntity('b')];
+    await ranker.rank('user1', entities, NOW);
+
+    ranker.recordUsage('user1', ['b'], new Date(NOW));
+    const ranked = await ranker.rank('user1', entities, NOW);
+
+    expect(ranked.map(entity => entity.id)).toEqual(['b', 'a']);
+    expect(usageRepository.getUsageStatsByUser).toHaveBeenCalledTimes(1);
+  });
+
+  it('should not cache a failed load', async () => {
+    usageRepository.getUsageStatsByUser
+      .mockRejectedValueOnce(new Error('database is locked'))
+      .mockResolvedValue(new Map([['b', used(3, 0)]]));
+
+    await expect(ranker.rank('user1', [makeEntity('a')], NOW)).rejects.toThrow('database is locked');
+    const ranked = await ranker.rank('user1', [makeEntity('a'), makeEntity('b')], NOW);
+
+    expect(ranked[0].id).toBe('b');
+  });
+});
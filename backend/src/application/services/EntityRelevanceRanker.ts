@@ -0,0 +1,120 @@
+import { IEntityUsageRepository, EntityUsageStats } from '../../domain/repositories/IEntityUsageRepository';
+import { Entity, EntityType } from '../../domain/entities/Entity';
+
+export interface EntityRelevanceOptions {
+  recencyHalfLifeDays?: number;
+  ttlMs?: number;
+}
+
+interface UserUsage {
+  expiresAt: number;
+  stats: Promise<Map<string, EntityUsageStats>>;
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const DEFAULT_HALF_LIFE_DAYS = 30;
+// Usage recorded by other cluster workers shows up after at most this long
+const DEFAULT_TTL_MS = 5 * 60 * 1000;
+
+// Tie-break for entities with the same score: technical > person > company > product
+export const TYPE_PRIORITY: Record<EntityType, number> = {
+  technical: 0,
+  person: 1,
+  company: 2,
+  product: 3
+};
+
+/**
+ * Orders entities by how often and how recently they turned up in the user's
+ * transcriptions and summaries (EntityUsage records with wasUsed and no
+ * correction). Usage stats are loaded once per user in a single aggregate
+ * query and then kept current in memory as new usage is recorded.
+ */
+export class EntityRelevanceRanker {
+  private readonly users = new Map<string, UserUsage>();
+  private readonly halfLifeMs: number;
+  private readonly ttlMs: number;
+
+  constructor(
+    private readonly usageRepository: IEntityUsageRepository,
+    options: EntityRelevanceOptions = {}
+  ) {
+    this.halfLifeMs = (options.recencyHalfLifeDays ?? DEFAULT_HALF_LIFE_DAYS) * DAY_MS;
+    this.ttlMs = options.ttlMs ?? DEFAULT_TTL_MS;
+  }
+
+  /**
+   * Most relevant first. Entities never used keep the type priority and
+   * their original order.
+   */
+  async rank(userId: string, entities: Entity[], now = Date.now()): Promise<Entity[]> {
+    const stats = await this.statsFor(userId, now);
+
+    return entities
+      .map((entity, index) => ({ entity, index, score: this.score(stats.get(entity.id), now) }))
+      .sort((a, b) =>
+        b.score - a.score ||
+        TYPE_PRIORITY[a.entity.type] - TYPE_PRIORITY[b.entity.type] ||
+        a.index - b.index
+      )
+      .map(({ entity }) => entity);
+  }
+
+  // Frequency on a log scale, halved for every half-life since the last use
+  score(stats: EntityUsageStats | undefined, now = Date.now()): number {
+    if (!stats || stats.correctUsage === 0 || !stats.lastUsedAt) {
+      return 0;
+    }
+    const age = Math.max(0, now - stats.lastUsedAt.getTime());
+    return Math.log1p(stats.correctUsage) * Math.pow(0.5, age / this.halfLifeMs);
+  }
+
+  // Apply usage that was just persisted, without going back to the database
+  recordUsage(userId: string, entityIds: string[], usedAt = new Date()): void {
+    const cached = this.users.get(userId);
+    if (!cached || entityIds.length === 0) {
+      // Not loaded yet - the next load reads it from the database
+      return;
+    }
+
+    cached.stats.then(stats => {
+      for (const entityId of entityIds) {
+        const entry = stats.get(entityId) ?? { totalUsage: 0, correctUsage: 0, correctionRate: 0 };
+        const corrected = entry.totalUsage * entry.correctionRate / 100;
+        entry.totalUsage += 1;
+        entry.correctUsage += 1;
+        entry.correctionRate = (corrected / entry.totalUsage) * 100;
+        if (!entry.lastUsedAt || usedAt > entry.lastUsedAt) {
+          entry.lastUsedAt = usedAt;
+        }
+        stats.set(entityId, entry);
+      }
+    }, () => {
+      // A failed load is dropped from the cache; the next one reads the database
+    });
+  }
+
+  invalidateUser(userId: string): void {
+    this.users.delete(userId);
+  }
+
+  private statsFor(userId: string, now: number): Promise<Map<string, EntityUsageStats>> {
+    const cached = this.users.get(userId);
+    if (cached && cached.expiresAt > now) {
+      return cached.stats;
+    }
+
+    const entry: UserUsage = {
+      expiresAt: now + this.ttlMs,
+      stats: this.usageRepository.getUsageStatsByUser(userId)
+    };
+    entry.stats.catch(() => {
+      // Don't cache failures
+      if (this.users.get(userId) === entry) {
+        this.users.delete(userId);
+      }
+    });
+    this.users.set(userId, entry);
+    return entry.stats;
+  }
+}
@@ -0,0 +1,240 @@
+import { ProcessingOrchestrator } from './ProcessingOrchestrator';
+import { VoiceNote } from '../../domain/entities/VoiceNote';
+import { Language } from '../../domain/value-objects/Language';
+
+const USER_ID = 'user-1';
+const PROJECT_ID = 'project-1';
+
+function deferred<T>(): { promise: Promise<T>; resolve: (value: T) => void } {
+  let resolve!: (value: T) => void;
+  const promise = new Promise<T>(res => {
+    resolve = res;
+  });
+  return { promise, resolve };
+}
+
+async function flush(): Promise<void> {
+  for (let i = 0; i < 10; i++) {
+    await new Promise(resolve => setImmediate(resolve));
+  }
+}
+
+function makeVoiceNote(): VoiceNote {
+  return VoiceNote.create({
+    userId: USER_ID,
+    title: 'Standup',
+    originalFilePath: '/tmp/standup.m4a',
+    fileSize: 1024,
+    mimeType: 'audio/m4a',
+    language: Language.EN
+  });
+}
+
+describe('ProcessingOrchestrator', () => {
+  let transcriptionService: any;
+  let titleGenerationService: any;
+  let voiceNoteRepository: any;
+  let eventStore: any;
+  let entityContextBuilder: any;
+  let projectRepository: any;
+  let entityUsageRepository: any;
+  let orchestrator: ProcessingOrchestrator;
+
+  beforeEach(() => {
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+
+    transcriptionService = {
+      transcribe: jest.fn().mockResolvedValue({ text: 'hello world', language: Language.EN, duration: 3, confidence: 0.9 })
+    };
+    titleGenerationService = {
+      generateMetadata: jest.fn().mockResolvedValue({ title: 'Greeting', description: 'Says hello' })
+    };
+    voiceNoteRepository = { save: jest.fn().mockResolvedValue(undefined) };
+    eventStore = { append: jest.fn().mockResolvedValue(undefined) };
+    entityContextBuilder = {
+      buildContext: jest.fn().mockResolvedValue({ compressed: 'Ada, Bob', people: '', technical: '', companies: '', products: '' }),
+      recordUsage: jest.fn(),
+      getEntities: jest.fn().mockResolvedValue([
+        { id: 'e1', name: 'Ada' },
+        { id: 'e2', name: 'Bob' },
+        { id: 'e3', name: 'Zabka' }
+      ])
+    };
+    projectRepository = {
+      findById: jest.fn().mockResolvedValue({ id: PROJECT_ID, userId: USER_ID }),
+      addVoiceNote: jest.fn().mockResolvedValue(undefined)
+    };
+    entityUsageRepository = { trackUsage: jest.fn().mockResolvedValue(undefined) };
+
+    orchestrator = new ProcessingOrchestrator(
+      transcriptionService,
+      {} as any,
+      titleGenerationService,
+      voiceNoteRepository,
+      eventStore,
+      { transcription: { provider: 'openai', model: 'whisper-1' } } as any,
+      entityContextBuilder,
+      projectRepository,
+      entityUsageRepository
+    );
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('overlaps title generation with the transcribed event and saves once after transcription', async () => {
+    const title = deferred<any>();
+    titleGenerationService.generateMetadata.mockReturnValue(title.promise);
+
+    const processing = orchestrator.processVoiceNote(makeVoiceNote());
+    await flush();
+
+    const appendedTypes = eventStore.append.mock.calls.map(([event]: any[]) => event.eventType);
+    expect(appendedTypes).toContain('VoiceNoteTranscribed');
+    expect(voiceNoteRepository.save).toHaveBeenCalledTimes(1);
+
+    title.resolve({ title: 'Greeting', description: 'Says hello' });
+    const result = await processing;
+
+    expect(voiceNoteRepository.save).toHaveBeenCalledTimes(2);
+    expect(result.getStatus().getValue()).toBe('completed');
+    expect(result.getAIGeneratedTitle()).toBe('Greeting');
+  });
+
+  it('persists nothing more once the caller has aborted the attempt', async () => {
+    const title = deferred<any>();
+    titleGenerationService.generateMetadata.mockReturnValue(title.promise);
+    const attempt = new AbortController();
+
+    const processing = orchestrator.processVoiceNote(makeVoiceNote(), undefined, undefined, {
+      willRetry: true,
+      signal: attempt.signal
+    });
+    await flush();
+    attempt.abort(new Error('timed out'));
+    title.resolve({ title: 'Greeting', description: 'Says hello' });
+
+    await expect(processing).rejects.toThrow('timed out');
+    expect(voiceNoteRepository.save).toHaveBeenCalledTimes(1);
+    const appendedTypes = eventStore.append.mock.calls.map(([event]: any[]) => event.eventType);
+    expect(appendedTypes).not.toContain('VoiceNoteProcessingCompleted');
+    expect(appendedTypes).not.toContain('VoiceNoteProcessingFailed');
+  });
+
+  it('reports per-stage timings on the completed event', async () => {
+    await orchestrator.processVoiceNote(makeVoiceNote(), undefined, PROJECT_ID);
+
+    const completed = eventStore.append.mock.calls
+      .map(([event]: any[]) => event)
+      .find((event: any) => event.eventType === 'VoiceNoteProcessingCompleted');
+
+    expect(Object.keys(completed.payload.stageTimingsMs).sort()).toEqual([
+      'entityUsage',
+      'persist',
+      'projectAssociation',
+      'start',
+      'startedEvent',
+      'titleGeneration',
+      'transcribedEvent',
+      'transcription'
+    ]);
+    expect(completed.payload.pipelineTimeMs).toBeGreaterThanOrEqual(0);
+  });
+
+  it('records entity usage for all project entities in one call', async () => {
+    await orchestrator.processVoiceNote(makeVoiceNote(), undefined, PROJECT_ID);
+
+    expect(entityUsageRepository.trackUsage).toHaveBeenCalledTimes(1);
+    expect(entityUsageRepository.trackUsage.mock.calls[0][0].map((usage: any) => usage.entityId))
+      .toEqual(['e1', 'e2', 'e3']);
+    expect(projectRepository.addVoiceNote).toHaveBeenCalledWith(PROJECT_ID, expect.any(String));
+  });
+
+  it('counts an entity as used only when mentioned as a whole word', async () => {
+    transcriptionService.transcribe.mockResolvedValue({
+      text: 'Ada went over every detail with the Google team', language: Language.EN, duration: 3, confidence: 0.9
+    });
+    entityContextBuilder.getEntities.mockResolvedValue([
+      { id: 'e1', name: 'Ada' },
+      { id: 'e2', name: 'AI' },
+      { id: 'e3', name: 'Golang', aliases: ['Go'] }
+    ]);
+
+    await orchestrator.processVoiceNote(makeVoiceNote(), undefined, PROJECT_ID);
+
+    const usages = entityUsageRepository.trackUsage.mock.calls[0][0];
+    expect(usages.map((usage: any) => [usage.entityId, usage.wasUsed]))
+      .toEqual([['e1', true], ['e2', false], ['e3', false]]);
+  });
+
+  it('completes without AI metadata when title generation fails', async () => {
+    titleGenerationService.generateMetadata.mockRejectedValue(new Error('LLM down'));
+
+    const result = await orchestrator.processVoiceNote(makeVoiceNote());
+
+    expect(result.getStatus().getValue()).toBe('completed');
+    expect(result.getAIGeneratedTitle()).toBeUndefined();
+  });
+
+  it('streams summary text on reprocess and saves only the finished summary', async () => {
+    const voiceNote = await orchestrator.processVoiceNote(makeVoiceNote());
+    voiceNoteRepository.save.mockClear();
+    const savesWhileStreaming: number[] = [];
+    const summarizationService = {
+      summarize: jest.fn(async (_text: string, _language: Language, options: any) => {
+        options.onSummaryDelta('Hel');
+        options.onSummaryDelta('lo');
+        savesWhileStreaming.push(voiceNoteRepository.save.mock.calls.length);
+        return { summary: 'Hello', keyPoints: ['Greeting'], actionItems: [] };
+      })
+    };
+    const streaming = new ProcessingOrchestrator(
+      transcriptionService,
+      summarizationService,
+      titleGenerationService,
+      voiceNoteRepository,
+      eventStore,
+      { transcription: { provider: 'openai', model: 'whisper-1' } } as any,
+      entityContextBuilder,
+      projectRepository,
+      entityUsageRepository
+    );
+
+    const deltas: string[] = [];
+    const result = await streaming.reprocessVoiceNote(
+      voiceNote, undefined, undefined, undefined, undefined, undefined,
+      { onSummaryDelta: text => deltas.push(text) }
+    );
+
+    expect(deltas).toEqual(['Hel', 'lo']);
+    expect(savesWhileStreaming).toEqual([0]);
+    expect(voiceNoteRepository.save).toHaveBeenCalledTimes(1);
+    expect(result.getSummary()?.getSummary()).toBe('Hello');
+  });
+
+  it('regenerates the summary of a completed note without reprocessing it', async () => {
+    const voiceNote = await orchestrator.processVoiceNote(makeVoiceNote());
+    const version = voiceNote.getVersion();
+    voiceNoteRepository.save.mockClear();
+    const summarizing = new ProcessingOrchestrator(
+      transcriptionService,
+      { summarize: jest.fn().mockResolvedValue({ summary: 'Hello', keyPoints: [], actionItems: [] }) } as any,
+      titleGenerationService,
+      voiceNoteRepository,
+      eventStore,
+      { transcription: { provider: 'openai', model: 'whisper-1' } } as any,
+      entityContextBuilder,
+      projectRepository,
+      entityUsageRepository
+    );
+
+    const result = await summarizing.reprocessVoiceNote(voiceNote);
+
+    expect(result.getStatus().getValue()).toBe('completed');
+    expect(result.getVersion()).toBe(version);
+    // One save for the summary, no pending/processing round trip
+    expect(voiceNoteRepository.save).toHaveBeenCalledTimes(1);
+  });
+});
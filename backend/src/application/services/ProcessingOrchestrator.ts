@@ -5,15 +5,16 @@ import { Language } from '../../domain/value-objects/Language';
 import { ProcessingStatusValue } from '../../domain/value-objects/ProcessingStatus';
 import { VoiceNoteRepository } from '../../domain/repositories/VoiceNoteRepository';
 import { EventStore } from '../../domain/repositories/EventStore';
-import { TranscriptionService } from '../../domain/services/TranscriptionService';
+import { TranscriptionService, TranscriptionResult } from '../../domain/services/TranscriptionService';
 import { SummarizationService } from '../../domain/services/SummarizationService';
-import { TitleGenerationService } from '../../domain/services/TitleGenerationService';
+import { TitleGenerationService, TitleGenerationResult } from '../../domain/services/TitleGenerationService';
 import { Config } from '../../config/schema';
 import { EntityContextBuilder, ModelType } from './EntityContextBuilder';
+import { TranscriptionCache } from './TranscriptionCache';
+import { StageMetrics } from '../../infrastructure/observability/StageMetrics';
 import { IProjectRepository } from '../../domain/repositories/IProjectRepository';
 import { IEntityUsageRepository, EntityUsageRecord } from '../../domain/repositories/IEntityUsageRepository';
 import { EntityContext } from '../../domain/entities/Entity';
-import { IEntityRepository } from '../../domain/repositories/IEntityRepository';
 import {
   VoiceNoteProcessingStartedEvent,
   VoiceNoteTranscribedEvent,
@@ -23,6 +24,18 @@ import {
   VoiceNoteReprocessedEvent
 } from '../../domain/events/VoiceNoteEvents';
 
+// Wall-clock milliseconds per pipeline stage, reported on VoiceNoteProcessingCompleted
+export type PipelineStageTimings = Record<string, number>;
+
+// Project entity offered to the model, with the terms that count as a mention
+type ProjectEntityRef = { id: string; name: string; value?: string; aliases?: string[] };
+
+// Whole-word, case-insensitive match, so "AI" is not found in "detail"
+function mentions(text: string, term: string): boolean {
+  const escaped = term.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+  return new RegExp(`(?<![\\p{L}\\p{N}])${escaped}(?![\\p{L}\\p{N}])`, 'iu').test(text);
+}
+
 export class ProcessingOrchestrator {
   private static readonly CANONICAL_FAILURE_MESSAGE = 
     'Processing failed due to an unexpected error. Please try again later or contact support if the issue persists.';
@@ -37,7 +50,7 @@ export class ProcessingOrchestrator {
     private entityContextBuilder: EntityContextBuilder,
     private projectRepository: IProjectRepository,
     private entityUsageRepository: IEntityUsageRepository,
-    private entityRepository: IEntityRepository
+    private transcriptionCache?: TranscriptionCache
   ) {}
 
   // Helper function to convert model names to simplified types for EntityContextBuilder
@@ -48,6 +61,16 @@ export class ProcessingOrchestrator {
     return 'gpt4o'; // Default to gpt4o for all OpenAI models
   }
 
+  // Entity tokens for the model family, capped by the transcription model's own prompt limit
+  private entityTokenBudget(modelType: ModelType, model?: string): number | undefined {
+    const budget = this.config.entityContext?.maxPromptTokens[modelType];
+    const modelLimit = model ? this.config.transcription.models?.[model]?.maxPromptTokens : undefined;
+    if (budget === undefined || modelLimit === undefined) {
+      return budget ?? modelLimit;
+    }
+    return Math.min(budget, modelLimit);
+  }
+
   // Helper function to format EntityContext to string
   private formatEntityContext(context: EntityContext): string {
     // For GPT-4o, use compressed format
@@ -76,73 +99,82 @@ export class ProcessingOrchestrator {
     return parts.join('\n');
   }
 
+  /**
+   * Run the upload pipeline for a voice note. Once options.signal is aborted
+   * (the caller gave up on this attempt) nothing more is persisted: the next
+   * write throws the abort reason instead, and failures are not recorded.
+   */
   async processVoiceNote(
     voiceNote: VoiceNote,
     language?: Language,
-    projectId?: string
+    projectId?: string,
+    options: { willRetry?: boolean; signal?: AbortSignal } = {}
   ): Promise<VoiceNote> {
+    const willRetry = options.willRetry ?? false;
+    const signal = options.signal;
+    const stageTimings: PipelineStageTimings = {};
+    const pipelineStartedAt = Date.now();
+    // Upload (or re-queue) to pipeline start: queue wait for background jobs
+    StageMetrics.getInstance().observe('queue_wait', pipelineStartedAt - voiceNote.getUpdatedAt().getTime());
     try {
       // Start processing
       voiceNote.startProcessing();
-      await this.voiceNoteRepository.save(voiceNote);
-      
+      signal?.throwIfAborted();
+      await this.timeStage(stageTimings, 'start', () => this.voiceNoteRepository.save(voiceNote));
+
       const startedEvent = new VoiceNoteProcessingStartedEvent(
         voiceNote.getId().toString()
       );
-      await this.eventStore.append(startedEvent);
-
-      // Associate voice note with project if projectId provided
-      if (projectId) {
-        const project = await this.projectRepository.findById(projectId);
-        if (project && project.userId === voiceNote.getUserId()) {
-          await this.projectRepository.addVoiceNote(projectId, voiceNote.getId().toString());
-        }
-      }
 
-      // Transcription with entity context
-      const transcriptionResult = await this.performTranscription(voiceNote, language, projectId);
+      // The started event and project association don't feed transcription, so they overlap with it
+      const [transcriptionResult] = await Promise.all([
+        this.timeStage(stageTimings, 'transcription', () => this.performTranscription(voiceNote, language, projectId)),
+        this.timeStage(stageTimings, 'startedEvent', () => this.eventStore.append(startedEvent)),
+        this.timeStage(stageTimings, 'projectAssociation', () => this.associateProject(voiceNote, projectId))
+      ]);
       if (!transcriptionResult.success) {
+        signal?.throwIfAborted();
         return await this.handleProcessingFailure(
           voiceNote,
-          transcriptionResult.error || new Error('Transcription failed')
+          transcriptionResult.error || new Error('Transcription failed'),
+          willRetry
         );
       }
 
-      voiceNote.addTranscription(transcriptionResult.transcription!);
-      await this.voiceNoteRepository.save(voiceNote);
-      
+      const transcription = transcriptionResult.transcription!;
+      voiceNote.addTranscription(transcription);
+
       const transcribedEvent = new VoiceNoteTranscribedEvent(
         voiceNote.getId().toString(),
         {
           transcriptionId: voiceNote.getId().toString(), // Use voice note ID as transcription reference
           model: 'whisper-1',
           provider: 'openai',
-          wordCount: transcriptionResult.transcription!.getText().split(' ').length
+          wordCount: transcription.getText().split(' ').length
         }
       );
-      await this.eventStore.append(transcribedEvent);
 
-      // Generate AI title and metadata after transcription
-      try {
-        const titleResult = await this.titleGenerationService.generateMetadata(
-          transcriptionResult.transcription!.getText(),
-          voiceNote.getLanguage().toString()
-        );
-        
+      // Independent post-transcription work: the title LLM call, the transcribed
+      // event and entity usage recording run side by side. The voice note itself
+      // is written once afterwards.
+      const [titleResult] = await Promise.all([
+        this.timeStage(stageTimings, 'titleGeneration', () => this.generateTitle(voiceNote, transcription)),
+        this.timeStage(stageTimings, 'transcribedEvent', () => this.eventStore.append(transcribedEvent)),
+        this.timeStage(stageTimings, 'entityUsage', () => this.recordEntityUsage(
+          voiceNote,
+          projectId,
+          transcriptionResult.projectEntities || [],
+          transcription.getText(),
+          'transcription'
+        ))
+      ]);
+
+      if (titleResult) {
         voiceNote.setAIGeneratedTitle(titleResult.title);
         voiceNote.setBriefDescription(titleResult.description);
         if (titleResult.date) {
           voiceNote.setDerivedDate(titleResult.date);
         }
-        
-        console.log('[ProcessingOrchestrator] Generated AI metadata:', {
-          title: titleResult.title,
-          description: titleResult.description,
-          date: titleResult.date
-        });
-      } catch (error) {
-        // Title generation is non-critical, log error but continue
-        console.error('[ProcessingOrchestrator] Title generation failed:', error);
       }
 
       // Skip summarization on initial upload - will be done via PostTranscriptionDialog
@@ -164,7 +196,10 @@ export class ProcessingOrchestrator {
       voiceNote.addSummary(summaryResult.summary!);
       */
       voiceNote.markAsCompleted();
-      await this.voiceNoteRepository.save(voiceNote);
+
+      // Transcription, AI metadata and the completed status go out in one transaction
+      signal?.throwIfAborted();
+      await this.timeStage(stageTimings, 'persist', () => this.voiceNoteRepository.save(voiceNote));
       
       // Skip summarization event since we're not auto-summarizing
       /*
@@ -183,15 +218,126 @@ export class ProcessingOrchestrator {
       const completedEvent = new VoiceNoteProcessingCompletedEvent(
         voiceNote.getId().toString(),
         {
-          processingTimeMs: Date.now() - voiceNote.getCreatedAt().getTime()
+          processingTimeMs: Date.now() - voiceNote.getCreatedAt().getTime(),
+          pipelineTimeMs: Date.now() - pipelineStartedAt,
+          stageTimingsMs: stageTimings
         }
       );
       await this.eventStore.append(completedEvent);
 
+      console.log(`[ProcessingOrchestrator] Processed ${voiceNote.getId()} in ${Date.now() - pipelineStartedAt}ms:`, stageTimings);
+
       return voiceNote;
     } catch (error) {
-      return await this.handleProcessingFailure(voiceNote, error as Error);
+      if (signal?.aborted) {
+        throw error;
+      }
+      return await this.handleProcessingFailure(voiceNote, error as Error, willRetry);
+    }
+  }
+
+  /**
+   * Run one pipeline stage and record its wall-clock duration, both for the
+   * completed event and the pipeline_<stage> histogram on /metrics. Stages
+   * that overlap each record their own duration, so the sum can exceed the total.
+   */
+  private async timeStage<T>(
+    timings: PipelineStageTimings,
+    stage: string,
+    run: () => Promise<T>
+  ): Promise<T> {
+    const startedAt = Date.now();
+    try {
+      return await run();
+    } finally {
+      timings[stage] = Date.now() - startedAt;
+      StageMetrics.getInstance().observe(`pipeline_${stage}`, timings[stage]);
+    }
+  }
+
+  // Associate voice note with project if projectId provided
+  private async associateProject(voiceNote: VoiceNote, projectId?: string): Promise<void> {
+    if (!projectId) {
+      return;
+    }
+    const project = await this.projectRepository.findById(projectId);
+    if (project && project.userId === voiceNote.getUserId()) {
+      await this.projectRepository.addVoiceNote(projectId, voiceNote.getId().toString());
+    }
+  }
+
+  // Title generation is non-critical: failures are logged and the note completes without AI metadata
+  private async generateTitle(
+    voiceNote: VoiceNote,
+    transcription: Transcription
+  ): Promise<TitleGenerationResult | null> {
+    try {
+      const titleResult = await this.titleGenerationService.generateMetadata(
+        transcription.getText(),
+        voiceNote.getLanguage().toString()
+      );
+
+      console.log('[ProcessingOrchestrator] Generated AI metadata:', {
+        title: titleResult.title,
+        description: titleResult.description,
+        date: titleResult.date
+      });
+      return titleResult;
+    } catch (error) {
+      console.error('[ProcessingOrchestrator] Title generation failed:', error);
+      return null;
+    }
+  }
+
+  /**
+   * One batched insert for all entities offered to the model, marking those
+   * that actually appear in its output; the used ones feed the relevance
+   * ranking. Usage tracking never fails the pipeline.
+   */
+  private async recordEntityUsage(
+    voiceNote: VoiceNote,
+    projectId: string | undefined,
+    projectEntities: ProjectEntityRef[],
+    outputText: string,
+    usageType: 'transcription' | 'summarization'
+  ): Promise<void> {
+    if (!projectId || projectEntities.length === 0) {
+      return;
     }
+
+    try {
+      const usedIds = new Set(projectEntities
+        .filter(entity => [entity.value, entity.name, ...(entity.aliases || [])]
+          .some(term => term && mentions(outputText, term)))
+        .map(entity => entity.id));
+
+      await this.entityUsageRepository.trackUsage(projectEntities.map(entity => ({
+        entityId: entity.id,
+        projectId,
+        voiceNoteId: voiceNote.getId().toString(),
+        usageType,
+        userId: voiceNote.getUserId()!,
+        wasUsed: usedIds.has(entity.id),
+        wasCorrected: false
+      })));
+      this.entityContextBuilder.recordUsage(voiceNote.getUserId()!, [...usedIds]);
+      console.log(`[ProcessingOrchestrator] Tracked entity usage for ${usageType}:`, {
+        projectId,
+        entityCount: projectEntities.length,
+        usedCount: usedIds.size,
+        voiceNoteId: voiceNote.getId().toString()
+      });
+    } catch (error) {
+      console.error('[ProcessingOrchestrator] Failed to track entity usage:', error);
+    }
+  }
+
+  /**
+   * Record a failure raised outside the pipeline itself (e.g. a job timeout).
+   * With willRetry the note goes back to pending instead of failed.
+   */
+  async abandonProcessing(voiceNote: VoiceNote, error: Error, willRetry = false): Promise<VoiceNote> {
+    return this.handleProcessingFailure(voiceNote, error, willRetry);
   }
 
   async reprocessVoiceNote(
@@ -200,7 +346,8 @@ export class ProcessingOrchestrator {
     userPrompt?: string,
     _model?: string,
     _language?: Language,
-    projectId?: string
+    projectId?: string,
+    options: { onSummaryDelta?: (text: string) => void } = {}
   ): Promise<VoiceNote> {
     try {
       // Must have transcription to generate/regenerate summary
@@ -211,7 +358,7 @@ export class ProcessingOrchestrator {
 
       // Check current status to determine if this is initial generation or regeneration
       const currentStatus = voiceNote.getStatus();
-      const isInitialGeneration = currentStatus !== ProcessingStatusValue.COMPLETED;
+      const isInitialGeneration = currentStatus.getValue() !== ProcessingStatusValue.COMPLETED;
       
       // Only update status if not already completed (for initial generation after skip)
       if (isInitialGeneration) {
@@ -228,13 +375,15 @@ export class ProcessingOrchestrator {
         }
       }
 
-      // Generate or regenerate summarization with prompts
+      // Generate or regenerate summarization with prompts. Streamed text is
+      // only forwarded; the note is saved once, after the summary is complete
       const summaryResult = await this.performSummarization(
         voiceNote,
         transcription,
         systemPrompt,
         userPrompt,
-        projectId
+        projectId,
+        options.onSummaryDelta
       );
 
       if (!summaryResult.success) {
@@ -302,14 +451,19 @@ export class ProcessingOrchestrator {
     voiceNote: VoiceNote,
     language?: Language,
     projectId?: string
-  ): Promise<{ success: boolean; transcription?: Transcription; error?: Error }> {
+  ): Promise<{
+    success: boolean;
+    transcription?: Transcription;
+    projectEntities?: ProjectEntityRef[];
+    error?: Error;
+  }> {
     try {
       const model = voiceNote.getTranscriptionModel() || 'gpt-4o-transcribe';
       let transcriptionResult;
       
       // Generate entity context if projectId is provided
       let entityContext: string | undefined;
-      let projectEntities: Array<{ id: string; name: string }> = [];
+      let projectEntities: ProjectEntityRef[] = [];
       if (projectId) {
         try {
           // Fix: Use correct parameter order and getModelType helper
@@ -323,16 +477,17 @@ export class ProcessingOrchestrator {
             const contextData = await this.entityContextBuilder.buildContext(
               userId,
               projectId,
-              modelType
+              modelType,
+              this.entityTokenBudget(modelType, model)
             );
             
             // Fix: EntityContextBuilder returns EntityContext directly, not wrapped
             if (contextData) {
               entityContext = this.formatEntityContext(contextData);
               
-              // Get entities from repository for usage tracking
-              const entities = await this.entityRepository.findByProject(projectId);
-              projectEntities = entities.map(e => ({ id: e.id, name: e.name }));
+              // Entities for usage tracking, from the builder's cache
+              const entities = await this.entityContextBuilder.getEntities(userId, projectId);
+              projectEntities = entities.map(e => ({ id: e.id, name: e.name, value: e.value, aliases: e.aliases }));
               
               console.log('[ProcessingOrchestrator] Generated entity context for transcription:', {
                 projectId,
@@ -356,8 +511,8 @@ export class ProcessingOrchestrator {
           ? `${entityContext}\n\n${whisperPrompt || ''}`
           : whisperPrompt;
           
-        transcriptionResult = await this.transcriptionService.transcribe(
-          voiceNote.getOriginalFilePath(),
+        transcriptionResult = await this.transcribeWithCache(
+          voiceNote,
           language || voiceNote.getLanguage(),
           combinedPrompt ? { prompt: combinedPrompt } : undefined
         );
@@ -376,8 +531,8 @@ export class ProcessingOrchestrator {
         console.log('[ProcessingOrchestrator] Enhanced system prompt with entities:', enhancedSystemPrompt);
         console.log('[ProcessingOrchestrator] User prompt:', userPrompt);
         
-        transcriptionResult = await this.transcriptionService.transcribe(
-          voiceNote.getOriginalFilePath(),
+        transcriptionResult = await this.transcribeWithCache(
+          voiceNote,
           language || voiceNote.getLanguage(),
           {
             model: 'google/gemini-2.0-flash-001',
@@ -392,8 +547,8 @@ export class ProcessingOrchestrator {
           ? `${entityContext}\n\n${whisperPrompt || ''}`
           : whisperPrompt;
           
-        transcriptionResult = await this.transcriptionService.transcribe(
-          voiceNote.getOriginalFilePath(),
+        transcriptionResult = await this.transcribeWithCache(
+          voiceNote,
           language || voiceNote.getLanguage(),
           combinedPrompt ? { prompt: combinedPrompt } : undefined
         );
@@ -406,50 +561,64 @@ export class ProcessingOrchestrator {
         transcriptionResult.confidence || 1.0
       );
 
-      // Track entity usage if entities were used
-      if (projectId && projectEntities.length > 0) {
-        try {
-          for (const entity of projectEntities) {
-            await this.entityUsageRepository.trackUsage([{
-              entityId: entity.id,
-              projectId: projectId,
-              voiceNoteId: voiceNote.getId().toString(),
-              usageType: 'transcription',
-              userId: voiceNote.getUserId()!,
-              wasUsed: true,
-              wasCorrected: false
-            }]);
-          }
-          console.log('[ProcessingOrchestrator] Tracked entity usage for transcription:', {
-            projectId,
-            entityCount: projectEntities.length,
-            voiceNoteId: voiceNote.getId().toString()
-          });
-        } catch (error) {
-          // Don't fail transcription if usage tracking fails
-          console.error('[ProcessingOrchestrator] Failed to track entity usage:', error);
-        }
-      }
-
-      return { success: true, transcription };
+      return { success: true, transcription, projectEntities };
     } catch (error) {
       return { success: false, error: error as Error };
     }
   }
 
+  /**
+   * Transcribe through the content-hash cache: identical audio with the same
+   * model, language and prompts reuses the stored result instead of calling the provider.
+   */
+  private async transcribeWithCache(
+    voiceNote: VoiceNote,
+    language: Language,
+    options?: { prompt?: string; model?: string; systemPrompt?: string }
+  ): Promise<TranscriptionResult> {
+    const transcribe = () => this.transcriptionService.transcribe(
+      voiceNote.getOriginalFilePath(),
+      language,
+      options
+    );
+
+    if (!this.transcriptionCache || !this.transcriptionCache.isEnabled()) {
+      return transcribe();
+    }
+
+    const audioHash = voiceNote.getFileHash()
+      || await TranscriptionCache.hashFile(voiceNote.getOriginalFilePath());
+    const { result, cached } = await this.transcriptionCache.getOrTranscribe(
+      {
+        audioHash,
+        model: options?.model || `${this.config.transcription.provider}:${this.config.transcription.model}`,
+        language: language.getValue(),
+        prompt: options?.prompt,
+        systemPrompt: options?.systemPrompt
+      },
+      transcribe
+    );
+
+    if (cached) {
+      console.log(`[ProcessingOrchestrator] Reused cached transcription for ${voiceNote.getId()}`);
+    }
+    return result;
+  }
+
   private async performSummarization(
     voiceNote: VoiceNote,
     transcription: Transcription,
     systemPrompt?: string,
     userPrompt?: string,
-    projectId?: string
+    projectId?: string,
+    onSummaryDelta?: (text: string) => void
   ): Promise<{ success: boolean; summary?: Summary; error?: Error }> {
     try {
       const language = transcription.getLanguage();
       
       // Generate entity context if projectId is provided
       let entityContext: string | undefined;
-      let projectEntities: Array<{ id: string; name: string }> = [];
+      let projectEntities: ProjectEntityRef[] = [];
       if (projectId) {
         try {
           // For summarization, we use GPT-4o model context
@@ -463,16 +632,17 @@ export class ProcessingOrchestrator {
             const contextData = await this.entityContextBuilder.buildContext(
               userId,
               projectId,
-              modelType
+              modelType,
+              this.entityTokenBudget(modelType)
             );
             
             // Fix: EntityContextBuilder returns EntityContext directly, not wrapped
             if (contextData) {
               entityContext = this.formatEntityContext(contextData);
               
-              // Get entities from repository for usage tracking
-              const entities = await this.entityRepository.findByProject(projectId);
-              projectEntities = entities.map(e => ({ id: e.id, name: e.name }));
+              // Entities for usage tracking, from the builder's cache
+              const entities = await this.entityContextBuilder.getEntities(userId, projectId);
+              projectEntities = entities.map(e => ({ id: e.id, name: e.name, value: e.value, aliases: e.aliases }));
               
               console.log('[ProcessingOrchestrator] Generated entity context for summarization:', {
                 projectId,
@@ -504,7 +674,8 @@ export class ProcessingOrchestrator {
         {
           prompt: enhancedUserPrompt || systemPrompt || undefined,
           maxTokens: 2000,
-          temperature: 0.7
+          temperature: 0.7,
+          onSummaryDelta
         }
       );
 
@@ -516,29 +687,13 @@ export class ProcessingOrchestrator {
       );
 
       // Track entity usage if entities were used for summarization
-      if (projectId && projectEntities.length > 0) {
-        try {
-          for (const entity of projectEntities) {
-            await this.entityUsageRepository.trackUsage([{
-              entityId: entity.id,
-              projectId: projectId,
-              voiceNoteId: voiceNote.getId().toString(),
-              usageType: 'summarization',
-              userId: voiceNote.getUserId()!,
-              wasUsed: true,
-              wasCorrected: false
-            }]);
-          }
-          console.log('[ProcessingOrchestrator] Tracked entity usage for summarization:', {
-            projectId,
-            entityCount: projectEntities.length,
-            voiceNoteId: voiceNote.getId().toString()
-          });
-        } catch (error) {
-          // Don't fail summarization if usage tracking fails
-          console.error('[ProcessingOrchestrator] Failed to track entity usage:', error);
-        }
-      }
+      await this.recordEntityUsage(
+        voiceNote,
+        projectId,
+        projectEntities,
+        [result.summary, ...result.keyPoints, ...result.actionItems].join('\n'),
+        'summarization'
+      );
 
       return { success: true, summary };
     } catch (error) {
@@ -548,8 +703,17 @@ export class ProcessingOrchestrator {
 
   private async handleProcessingFailure(
     voiceNote: VoiceNote,
-    error: Error
+    error: Error,
+    willRetry = false
   ): Promise<VoiceNote> {
+    if (willRetry && voiceNote.getStatus().getValue() === ProcessingStatusValue.PROCESSING) {
+      // Another attempt is queued - keep the note pending and don't publish a failure yet
+      voiceNote.scheduleRetry(error.message);
+      await this.voiceNoteRepository.save(voiceNote);
+      console.warn(`[ProcessingOrchestrator] Attempt failed for ${voiceNote.getId()}, retry scheduled:`, error.message);
+      return voiceNote;
+    }
+
     voiceNote.markAsFailed(ProcessingOrchestrator.CANONICAL_FAILURE_MESSAGE);
     await this.voiceNoteRepository.save(voiceNote);
     
@@ -0,0 +1,308 @@
+import { ProcessingQueue } from './ProcessingQueue';
+import type { ProcessingOrchestrator } from './ProcessingOrchestrator';
+import type { VoiceNoteRepository } from '../../domain/repositories/VoiceNoteRepository';
+import type { ProcessingJob, ProcessingJobRepository } from '../../domain/repositories/ProcessingJobRepository';
+import { ProcessingStatusValue } from '../../domain/value-objects/ProcessingStatus';
+
+const VOICE_NOTE_ID = '123e4567-e89b-12d3-a456-426614174000';
+
+function makeJob(overrides: Partial<ProcessingJob> = {}): ProcessingJob {
+  return {
+    id: 'job-1',
+    voiceNoteId: VOICE_NOTE_ID,
+    status: 'running',
+    payload: {},
+    attempts: 1,
+    maxAttempts: 3,
+    runAfter: new Date(),
+    lockedBy: 'host:1:claim-1',
+    createdAt: new Date(),
+    updatedAt: new Date(),
+    ...overrides
+  };
+}
+
+function noteWithStatus(status: ProcessingStatusValue, errorMessage?: string, updatedAt = new Date()): any {
+  return {
+    getId: () => ({ getValue: () => VOICE_NOTE_ID }),
+    getStatus: () => ({ getValue: () => status }),
+    getErrorMessage: () => errorMessage,
+    getUpdatedAt: () => updatedAt
+  };
+}
+
+async function flush(): Promise<void> {
+  for (let i = 0; i < 10; i++) {
+    await new Promise(resolve => setImmediate(resolve));
+  }
+}
+
+describe('ProcessingQueue', () => {
+  let jobRepository: jest.Mocked<ProcessingJobRepository>;
+  let voiceNoteRepository: jest.Mocked<VoiceNoteRepository>;
+  let orchestrator: { processVoiceNote: jest.Mock; abandonProcessing: jest.Mock };
+  let config: any;
+  let queue: ProcessingQueue;
+
+  beforeEach(() => {
+    jobRepository = {
+      enqueue: jest.fn(),
+      findActiveByVoiceNoteId: jest.fn().mockResolvedValue(null),
+      claimNext: jest.fn().mockResolvedValue(null),
+      markCompleted: jest.fn().mockResolvedValue(true),
+      scheduleRetry: jest.fn().mockResolvedValue(true),
+      markFailed: jest.fn().mockResolvedValue(true),
+      renewLeases: jest.fn().mockResolvedValue([]),
+      requeueInterrupted: jest.fn().mockResolvedValue([]),
+      countByStatus: jest.fn().mockResolvedValue({ queued: 0, running: 0, completed: 0, failed: 0 })
+    };
+
+    voiceNoteRepository = {
+      save: jest.fn(),
+      findById: jest.fn().mockResolvedValue(noteWithStatus(ProcessingStatusValue.PENDING)),
+      findByFileHash: jest.fn(),
+      findByUserId: jest.fn(),
+      findPendingForProcessing: jest.fn(),
+      findByStatus: jest.fn().mockResolvedValue([]),
+      delete: jest.fn(),
+      exists: jest.fn()
+    } as any;
+
+    orchestrator = {
+      processVoiceNote: jest.fn(),
+      abandonProcessing: jest.fn()
+    };
+
+    config = {
+      processing: {
+        maxConcurrentJobs: 2,
+        jobTimeoutMinutes: 30,
+        retryAttempts: 3,
+        queueType: 'sqlite',
+        pollIntervalMs: 60000,
+        retryBackoffMs: 1000,
+        jobLeaseMs: 60000
+      }
+    };
+
+    queue = new ProcessingQueue(
+      jobRepository,
+      voiceNoteRepository,
+      orchestrator as unknown as ProcessingOrchestrator,
+      config
+    );
+  });
+
+  afterEach(async () => {
+    await queue.stop();
+  });
+
+  it('should return the active job instead of enqueuing a duplicate', async () => {
+    const existing = makeJob({ status: 'queued', attempts: 0 });
+    jobRepository.findActiveByVoiceNoteId.mockResolvedValue(existing);
+
+    const job = await queue.enqueue(VOICE_NOTE_ID, { language: 'en' });
+
+    expect(job).toBe(existing);
+    expect(jobRepository.enqueue).not.toHaveBeenCalled();
+  });
+
+  it('should not run more jobs than maxConcurrentJobs', async () => {
+    const releases: Array<() => void> = [];
+    orchestrator.processVoiceNote.mockImplementation(() => new Promise(resolve => {
+      releases.push(() => resolve(noteWithStatus(ProcessingStatusValue.COMPLETED)));
+    }));
+    let next = 0;
+    jobRepository.claimNext.mockImplementation(async () => makeJob({ id: `job-${++next}` }));
+
+    await queue.start();
+    await flush();
+
+    expect(orchestrator.processVoiceNote).toHaveBeenCalledTimes(2);
+    expect((await queue.getStats()).inFlight).toBe(2);
+
+    jobRepository.claimNext.mockResolvedValue(null);
+    releases.forEach(release => release());
+    await flush();
+
+    expect(jobRepository.markCompleted).toHaveBeenCalledTimes(2);
+    expect((await queue.getStats()).completedSinceStart).toBe(2);
+  });
+
+  it('should schedule a retry with backoff when an attempt fails and retries remain', async () => {
+    orchestrator.processVoiceNote.mockResolvedValue(
+      noteWithStatus(ProcessingStatusValue.PENDING, 'provider unavailable')
+    );
+    jobRepository.claimNext
+      .mockResolvedValueOnce(makeJob({ attempts: 2 }))
+      .mockResolvedValue(null);
+
+    const before = Date.now();
+    await queue.start();
+    await flush();
+
+    expect(orchestrator.processVoiceNote.mock.calls[0][3]).toEqual({ willRetry: true, signal: expect.any(AbortSignal) });
+    expect(jobRepository.scheduleRetry).toHaveBeenCalledWith(
+      'job-1', 'host:1:claim-1', 'provider unavailable', expect.any(Date)
+    );
+    const runAfter = jobRepository.scheduleRetry.mock.calls[0][3] as Date;
+    expect(runAfter.getTime()).toBeGreaterThanOrEqual(before + 2000);
+  });
+
+  it('should mark the job failed on the last attempt', async () => {
+    orchestrator.processVoiceNote.mockResolvedValue(
+      noteWithStatus(ProcessingStatusValue.FAILED, 'Processing failed')
+    );
+    jobRepository.claimNext
+      .mockResolvedValueOnce(makeJob({ attempts: 3 }))
+      .mockResolvedValue(null);
+
+    await queue.start();
+    await flush();
+
+    expect(orchestrator.processVoiceNote.mock.calls[0][3]).toEqual({ willRetry: false, signal: expect.any(AbortSignal) });
+    expect(jobRepository.markFailed).toHaveBeenCalledWith('job-1', 'host:1:claim-1', 'Processing failed');
+    expect(jobRepository.scheduleRetry).not.toHaveBeenCalled();
+  });
+
+  it('should retry a timed out job only after the abandoned attempt has settled', async () => {
+    config.processing.jobTimeoutMinutes = 0.0001;
+    let settle: () => void = () => {};
+    let signal: AbortSignal | undefined;
+    orchestrator.processVoiceNote.mockImplementation((_note, _language, _projectId, options) => {
+      signal = options.signal;
+      return new Promise((_, reject) => {
+        settle = () => reject(signal!.reason);
+      });
+    });
+    jobRepository.claimNext
+      .mockResolvedValueOnce(makeJob())
+      .mockResolvedValue(null);
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+
+    await queue.start();
+    await new Promise(resolve => setTimeout(resolve, 50));
+    await flush();
+
+    expect(signal!.aborted).toBe(true);
+    expect(jobRepository.scheduleRetry).not.toHaveBeenCalled();
+
+    settle();
+    await flush();
+
+    expect(orchestrator.abandonProcessing).not.toHaveBeenCalled();
+    expect(jobRepository.scheduleRetry).toHaveBeenCalledWith(
+      'job-1', 'host:1:claim-1', expect.stringContaining('timed out'), expect.any(Date)
+    );
+    expect((await queue.getStats()).timeoutsSinceStart).toBe(1);
+  });
+
+  it('should not count a completion the lease holder no longer owns', async () => {
+    orchestrator.processVoiceNote.mockResolvedValue(noteWithStatus(ProcessingStatusValue.COMPLETED));
+    jobRepository.markCompleted.mockResolvedValue(false);
+    jobRepository.claimNext
+      .mockResolvedValueOnce(makeJob())
+      .mockResolvedValue(null);
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+
+    await queue.start();
+    await flush();
+
+    expect(jobRepository.markCompleted).toHaveBeenCalledWith('job-1', 'host:1:claim-1');
+    expect((await queue.getStats()).completedSinceStart).toBe(0);
+  });
+
+  it('should release voice notes left processing by a previous run', async () => {
+    const stuck = {
+      ...noteWithStatus(ProcessingStatusValue.PROCESSING),
+      scheduleRetry: jest.fn()
+    };
+    voiceNoteRepository.findByStatus.mockResolvedValue([stuck]);
+
+    await queue.start();
+
+    expect(stuck.scheduleRetry).toHaveBeenCalled();
+    expect(voiceNoteRepository.save).toHaveBeenCalledWith(stuck);
+    expect(jobRepository.enqueue).toHaveBeenCalledWith(VOICE_NOTE_ID, {}, 3);
+    expect((await queue.getStats()).recoveredOnStart).toBe(1);
+  });
+
+  describe('in cluster mode', () => {
+    beforeEach(() => {
+      queue = new ProcessingQueue(
+        jobRepository,
+        voiceNoteRepository,
+        orchestrator as unknown as ProcessingOrchestrator,
+        config,
+        true
+      );
+    });
+
+    it('should only take over jobs whose lease expired', async () => {
+      const before = Date.now();
+      await queue.start();
+
+      const staleBefore = jobRepository.requeueInterrupted.mock.calls[0][0] as Date;
+      expect(staleBefore.getTime()).toBeLessThanOrEqual(before - 60000 + 1000);
+    });
+
+    it('should leave processing notes alone while another worker may hold them', async () => {
+      const active = {
+        ...noteWithStatus(ProcessingStatusValue.PROCESSING),
+        scheduleRetry: jest.fn()
+      };
+      const orphaned = {
+        ...noteWithStatus(ProcessingStatusValue.PROCESSING, undefined, new Date(Date.now() - 31 * 60 * 1000)),
+        scheduleRetry: jest.fn()
+      };
+      voiceNoteRepository.findByStatus.mockResolvedValue([active, orphaned]);
+
+      await queue.start();
+
+      expect(active.scheduleRetry).not.toHaveBeenCalled();
+      expect(orphaned.scheduleRetry).toHaveBeenCalled();
+      expect(jobRepository.enqueue).toHaveBeenCalledTimes(1);
+    });
+
+    it('should renew the leases of in-flight jobs', async () => {
+      let release: () => void = () => {};
+      orchestrator.processVoiceNote.mockImplementation(() => new Promise(resolve => {
+        release = () => resolve(noteWithStatus(ProcessingStatusValue.COMPLETED));
+      }));
+      jobRepository.claimNext
+        .mockResolvedValueOnce(makeJob({ id: 'job-7' }))
+        .mockResolvedValue(null);
+
+      await queue.start();
+      await flush();
+      await (queue as any).maintainLeases(false);
+
+      expect(jobRepository.renewLeases).toHaveBeenCalledWith(
+        [{ id: 'job-7', lockedBy: 'host:1:claim-1' }], expect.any(Date)
+      );
+      release();
+    });
+
+    it('should drop the outcome of a job whose lease was taken over', async () => {
+      let release: () => void = () => {};
+      orchestrator.processVoiceNote.mockImplementation(() => new Promise(resolve => {
+        release = () => resolve(noteWithStatus(ProcessingStatusValue.COMPLETED));
+      }));
+      jobRepository.claimNext
+        .mockResolvedValueOnce(makeJob({ id: 'job-7' }))
+        .mockResolvedValue(null);
+      jobRepository.renewLeases.mockResolvedValue(['job-7']);
+      jest.spyOn(console, 'warn').mockImplementation(() => {});
+
+      await queue.start();
+      await flush();
+      await (queue as any).maintainLeases(false);
+      release();
+      await flush();
+
+      expect(jobRepository.markCompleted).not.toHaveBeenCalled();
+      expect(jobRepository.markFailed).not.toHaveBeenCalled();
+      expect(jobRepository.scheduleRetry).not.toHaveBeenCalled();
+    });
+  });
+});
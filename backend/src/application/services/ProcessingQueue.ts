@@ -0,0 +1,393 @@
+import os from 'os';
+import { VoiceNoteRepository } from '../../domain/repositories/VoiceNoteRepository';
+import {
+  ProcessingJob,
+  ProcessingJobPayload,
+  ProcessingJobRepository
+} from '../../domain/repositories/ProcessingJobRepository';
+import { VoiceNoteId } from '../../domain/value-objects/VoiceNoteId';
+import { Language } from '../../domain/value-objects/Language';
+import { ProcessingStatus, ProcessingStatusValue } from '../../domain/value-objects/ProcessingStatus';
+import { Config } from '../../config/schema';
+import { ProcessingOrchestrator } from './ProcessingOrchestrator';
+
+const MAX_RETRY_BACKOFF_MS = 5 * 60 * 1000;
+const DRAIN_RATE_WINDOW_MS = 60 * 1000;
+const RECOVERY_BATCH_SIZE = 500;
+
+export interface ProcessingQueueStats {
+  queued: number;
+  running: number;
+  completed: number;
+  failed: number;
+  oldestQueuedAgeMs: number;
+  inFlight: number;
+  concurrency: number;
+  completedSinceStart: number;
+  failedSinceStart: number;
+  retriesSinceStart: number;
+  timeoutsSinceStart: number;
+  recoveredOnStart: number;
+  drainRatePerMinute: number;
+}
+
+// A claimed job running in this process; `lease` is aborted once the lease is lost
+interface InFlightJob {
+  job: ProcessingJob;
+  lease: AbortController;
+  run: Promise<void>;
+}
+
+class JobTimeoutError extends Error {
+  constructor(timeoutMs: number) {
+    super(`Processing job timed out after ${Math.round(timeoutMs / 1000)}s`);
+    this.name = 'JobTimeoutError';
+  }
+}
+
+/**
+ * Persistent processing queue backed by the ProcessingJob table.
+ *
+ * Jobs are claimed from the database by a bounded pool of workers
+ * (processing.maxConcurrentJobs), each attempt is capped by
+ * processing.jobTimeoutMinutes, failed attempts are retried with exponential
+ * backoff up to processing.retryAttempts, and jobs left running by a crashed
+ * or restarted process are put back in the queue on start().
+ *
+ * In cluster mode (shared: the process is a cluster worker) every worker runs
+ * a queue against the same table. Claims are compare-and-set, so a job runs in one worker only;
+ * running jobs hold a lease (processing.jobLeaseMs) that their worker renews,
+ * and any worker requeues jobs whose lease ran out because their worker died.
+ * Every write by the lease holder is fenced by its claim token, so a stalled
+ * worker whose job was taken over stops renewing and never overwrites the
+ * new owner's outcome.
+ */
+export class ProcessingQueue {
+  private readonly inFlight = new Map<string, InFlightJob>();
+  private readonly owner = `${os.hostname()}:${process.pid}`;
+  private readonly completedAt: number[] = [];
+  private pollTimer: NodeJS.Timeout | null = null;
+  private leaseTimer: NodeJS.Timeout | null = null;
+  private draining = false;
+  private started = false;
+
+  private completedSinceStart = 0;
+  private failedSinceStart = 0;
+  private retriesSinceStart = 0;
+  private timeoutsSinceStart = 0;
+  private recoveredOnStart = 0;
+
+  constructor(
+    private readonly jobRepository: ProcessingJobRepository,
+    private readonly voiceNoteRepository: VoiceNoteRepository,
+    private readonly processingOrchestrator: ProcessingOrchestrator,
+    private readonly config: Config,
+    // Other processes claim from the same table (cluster mode)
+    private readonly shared = false
+  ) {}
+
+  async start(): Promise<void> {
+    if (this.started) return;
+    this.started = true;
+
+    this.recoveredOnStart = await this.recover(!this.shared);
+
+    this.pollTimer = setInterval(() => {
+      this.drain().catch(error => console.error('[ProcessingQueue] Drain failed:', error));
+    }, this.config.processing.pollIntervalMs);
+
+    if (this.shared) {
+      let sinceRecovery = 0;
+      this.leaseTimer = setInterval(() => {
+        sinceRecovery += this.leaseRenewalMs;
+        const recoverNow = sinceRecovery >= this.config.processing.jobLeaseMs;
+        if (recoverNow) sinceRecovery = 0;
+        this.maintainLeases(recoverNow)
+          .catch(error => console.error('[ProcessingQueue] Lease maintenance failed:', error));
+      }, this.leaseRenewalMs);
+    }
+
+    console.log(`[ProcessingQueue] Started with ${this.concurrency} workers`);
+    await this.drain();
+  }
+
+  /**
+   * Stop claiming new jobs and wait for in-flight ones to settle.
+   * Anything still running when the process exits is recovered on next start.
+   */
+  async stop(): Promise<void> {
+    this.started = false;
+    if (this.pollTimer) {
+      clearInterval(this.pollTimer);
+      this.pollTimer = null;
+    }
+    if (this.leaseTimer) {
+      clearInterval(this.leaseTimer);
+      this.leaseTimer = null;
+    }
+    await Promise.allSettled(Array.from(this.inFlight.values(), flight => flight.run));
+  }
+
+  /**
+   * Queue a voice note for processing. Returns the existing job if the note
+   * is already queued or running, so double submits don't double-bill providers.
+   */
+  async enqueue(voiceNoteId: string, payload: ProcessingJobPayload = {}): Promise<ProcessingJob> {
+    const existing = await this.jobRepository.findActiveByVoiceNoteId(voiceNoteId);
+    if (existing) {
+      return existing;
+    }
+
+    const job = await this.jobRepository.enqueue(
+      voiceNoteId,
+      payload,
+      Math.max(1, this.config.processing.retryAttempts)
+    );
+
+    // Pick it up right away instead of waiting for the next poll
+    setImmediate(() => {
+      this.drain().catch(error => console.error('[ProcessingQueue] Drain failed:', error));
+    });
+
+    return job;
+  }
+
+  async getStats(): Promise<ProcessingQueueStats> {
+    const counts = await this.jobRepository.countByStatus();
+    this.pruneCompletedWindow();
+
+    return {
+      queued: counts.queued,
+      running: counts.running,
+      completed: counts.completed,
+      failed: counts.failed,
+      oldestQueuedAgeMs: counts.oldestQueuedAt ? Date.now() - counts.oldestQueuedAt.getTime() : 0,
+      inFlight: this.inFlight.size,
+      concurrency: this.concurrency,
+      completedSinceStart: this.completedSinceStart,
+      failedSinceStart: this.failedSinceStart,
+      retriesSinceStart: this.retriesSinceStart,
+      timeoutsSinceStart: this.timeoutsSinceStart,
+      recoveredOnStart: this.recoveredOnStart,
+      drainRatePerMinute: this.completedAt.length * (60 * 1000 / DRAIN_RATE_WINDOW_MS)
+    };
+  }
+
+  private get concurrency(): number {
+    return Math.max(1, this.config.processing.maxConcurrentJobs);
+  }
+
+  private get jobTimeoutMs(): number {
+    return this.config.processing.jobTimeoutMinutes * 60 * 1000;
+  }
+
+  private get leaseRenewalMs(): number {
+    return Math.max(1000, Math.floor(this.config.processing.jobLeaseMs / 3));
+  }
+
+  private async maintainLeases(recoverStale: boolean): Promise<void> {
+    const lost = await this.jobRepository.renewLeases(
+      Array.from(this.inFlight.values(), ({ job }) => ({ id: job.id, lockedBy: job.lockedBy! })),
+      new Date()
+    );
+    for (const id of lost) {
+      const flight = this.inFlight.get(id);
+      if (flight && !flight.lease.signal.aborted) {
+        console.warn(`[ProcessingQueue] Lost the lease on job ${id}, another worker has taken it over`);
+        flight.lease.abort();
+      }
+    }
+    if (recoverStale && this.started) {
+      const recovered = await this.recover(false);
+      if (recovered > 0) {
+        await this.drain();
+      }
+    }
+  }
+
+  /**
+   * Claim due jobs until every worker slot is busy or the queue is empty.
+   */
+  private async drain(): Promise<void> {
+    if (!this.started || this.draining) return;
+    this.draining = true;
+
+    try {
+      while (this.started && this.inFlight.size < this.concurrency) {
+        const job = await this.jobRepository.claimNext(this.owner, new Date());
+        if (!job) break;
+
+        const lease = new AbortController();
+        const run = this.runJob(job, lease.signal)
+          .catch(error => console.error(`[ProcessingQueue] Job ${job.id} crashed:`, error))
+          .finally(() => {
+            // After a takeover this process may have claimed the job again under a new token
+            if (this.inFlight.get(job.id)?.job === job) {
+              this.inFlight.delete(job.id);
+            }
+            // A slot just freed up - refill it without waiting for the poll
+            this.drain().catch(error => console.error('[ProcessingQueue] Drain failed:', error));
+          });
+        this.inFlight.set(job.id, { job, lease, run });
+      }
+    } finally {
+      this.draining = false;
+    }
+  }
+
+  private async runJob(job: ProcessingJob, lease: AbortSignal): Promise<void> {
+    const voiceNote = await this.voiceNoteRepository.findById(VoiceNoteId.fromString(job.voiceNoteId));
+    if (!voiceNote) {
+      await this.fail(job, 'Voice note not found');
+      return;
+    }
+
+    const willRetry = job.attempts < job.maxAttempts;
+    let timer: NodeJS.Timeout | undefined;
+    const timeout = new Promise<never>((_, reject) => {
+      timer = setTimeout(() => reject(new JobTimeoutError(this.jobTimeoutMs)), this.jobTimeoutMs);
+    });
+
+    // Aborted on timeout or when the lease is lost, so the attempt stops persisting
+    const attempt = new AbortController();
+    const abortAttempt = () => attempt.abort(lease.reason);
+    lease.addEventListener('abort', abortAttempt);
+
+    const processing = this.processingOrchestrator.processVoiceNote(
+      voiceNote,
+      job.payload.language ? Language.fromString(job.payload.language) : undefined,
+      job.payload.projectId,
+      { willRetry, signal: attempt.signal }
+    );
+
+    try {
+      const processed = await Promise.race([processing, timeout]);
+
+      // The job belongs to whoever took over the lease now
+      if (lease.aborted) return;
+
+      const status = processed.getStatus().getValue();
+      if (status === ProcessingStatusValue.COMPLETED) {
+        if (await this.jobRepository.markCompleted(job.id, job.lockedBy!)) {
+          this.recordCompletion();
+        } else {
+          this.leaseLost(job);
+        }
+      } else if (status === ProcessingStatusValue.PENDING && willRetry) {
+        await this.retryLater(job, processed.getErrorMessage() || 'Processing failed');
+      } else {
+        await this.fail(job, processed.getErrorMessage() || 'Processing failed');
+      }
+    } catch (error) {
+      if (lease.aborted) return;
+
+      // Timeout (or an error the orchestrator didn't catch). The provider call
+      // can't be cancelled, so the attempt is told to stop persisting and the
+      // retry waits until it has settled; the job stays in flight meanwhile,
+      // so its lease keeps being renewed.
+      if (error instanceof JobTimeoutError) {
+        this.timeoutsSinceStart++;
+        attempt.abort(error);
+        await Promise.allSettled([processing]);
+        if (lease.aborted) return;
+      }
+      const message = error instanceof Error ? error.message : String(error);
+      console.error(`[ProcessingQueue] Job ${job.id} attempt ${job.attempts}/${job.maxAttempts} failed:`, message);
+
+      const current = await this.voiceNoteRepository.findById(VoiceNoteId.fromString(job.voiceNoteId));
+      if (current && current.getStatus().getValue() === ProcessingStatusValue.PROCESSING) {
+        await this.processingOrchestrator.abandonProcessing(current, error as Error, willRetry);
+      }
+
+      if (willRetry) {
+        await this.retryLater(job, message);
+      } else {
+        await this.fail(job, message);
+      }
+    } finally {
+      clearTimeout(timer);
+      lease.removeEventListener('abort', abortAttempt);
+    }
+  }
+
+  private async fail(job: ProcessingJob, error: string): Promise<void> {
+    if (await this.jobRepository.markFailed(job.id, job.lockedBy!, error)) {
+      this.failedSinceStart++;
+    } else {
+      this.leaseLost(job);
+    }
+  }
+
+  private leaseLost(job: ProcessingJob): void {
+    console.warn(`[ProcessingQueue] Job ${job.id} was taken over by another worker, dropping this attempt's outcome`);
+  }
+
+  private async retryLater(job: ProcessingJob, error: string): Promise<void> {
+    // Exponential backoff: base, 2x base, 4x base ... capped
+    const backoffMs = Math.min(
+      this.config.processing.retryBackoffMs * Math.pow(2, job.attempts - 1),
+      MAX_RETRY_BACKOFF_MS
+    );
+    if (!(await this.jobRepository.scheduleRetry(job.id, job.lockedBy!, error, new Date(Date.now() + backoffMs)))) {
+      this.leaseLost(job);
+      return;
+    }
+    this.retriesSinceStart++;
+    console.log(`[ProcessingQueue] Job ${job.id} retry ${job.attempts}/${job.maxAttempts - 1} in ${backoffMs}ms`);
+  }
+
+  /**
+   * Restart recovery: requeue jobs that were running when their process died
+   * and release their voice notes from 'processing'. Notes stuck in
+   * 'processing' without any job (inline processing interrupted) get a new job.
+   *
+   * A process that owns the queue alone (`exclusive`, on start) knows every
+   * running job is left over. Otherwise only jobs with an expired lease are
+   * taken over, and orphaned notes only once they have been untouched for
+   * longer than a job may run, since another worker may still be on them.
+   */
+  private async recover(exclusive: boolean): Promise<number> {
+    const now = Date.now();
+    const interruptedNoteIds = new Set(await this.jobRepository.requeueInterrupted(
+      exclusive ? undefined : new Date(now - this.config.processing.jobLeaseMs)
+    ));
+    const released = new Set<string>();
+
+    const stuck = await this.voiceNoteRepository.findByStatus(ProcessingStatus.PROCESSING, RECOVERY_BATCH_SIZE);
+    for (const voiceNote of stuck) {
+      const voiceNoteId = voiceNote.getId().getValue();
+
+      if (!interruptedNoteIds.has(voiceNoteId)) {
+        const existing = await this.jobRepository.findActiveByVoiceNoteId(voiceNoteId);
+        if (existing && !exclusive) continue;
+        if (!exclusive && voiceNote.getUpdatedAt().getTime() > now - this.jobTimeoutMs) continue;
+        if (!existing) {
+          await this.jobRepository.enqueue(voiceNoteId, {}, Math.max(1, this.config.processing.retryAttempts));
+        }
+      }
+
+      voiceNote.scheduleRetry('Processing interrupted by server restart');
+      await this.voiceNoteRepository.save(voiceNote);
+      released.add(voiceNoteId);
+    }
+
+    const recovered = new Set([...interruptedNoteIds, ...released]).size;
+    if (recovered > 0) {
+      console.log(`[ProcessingQueue] Recovered ${recovered} interrupted job(s)`);
+    }
+    return recovered;
+  }
+
+  private recordCompletion(): void {
+    this.completedSinceStart++;
+    this.completedAt.push(Date.now());
+    this.pruneCompletedWindow();
+  }
+
+  private pruneCompletedWindow(): void {
+    const cutoff = Date.now() - DRAIN_RATE_WINDOW_MS;
+    while (this.completedAt.length > 0 && this.completedAt[0] < cutoff) {
+      this.completedAt.shift();
+    }
+  }
+}
@@ -0,0 +1,109 @@
+import { StorageReaper } from './StorageReaper';
+
+const NOW = new Date('2026-10-17T12:00:00Z');
+const MINUTE_MS = 60 * 1000;
+
+function object(path: string, size: number, refCount = 0): any {
+  return { path, size, refCount, createdAt: NOW, touchedAt: NOW };
+}
+
+describe('StorageReaper', () => {
+  let objects: any;
+  let storage: any;
+  let config: any;
+  let reaper: StorageReaper;
+
+  beforeEach(() => {
+    objects = {
+      findReclaimable: jest.fn().mockResolvedValue([]),
+      claimReclaimable: jest.fn().mockResolvedValue(true),
+      findAged: jest.fn().mockResolvedValue([]),
+      markExpired: jest.fn().mockResolvedValue(true),
+      isLive: jest.fn().mockResolvedValue(false),
+      reconcile: jest.fn().mockResolvedValue({ checked: 0, corrected: 0 }),
+      totals: jest.fn().mockResolvedValue({ objects: 2, bytes: 1000, referencedBytes: 3000, unreferenced: 0, expired: 0 })
+    };
+    storage = {
+      remove: jest.fn().mockImplementation(async (_path: string, isStillNeeded: () => Promise<boolean>) => !(await isStillNeeded())),
+      sweepTemporary: jest.fn().mockResolvedValue(0)
+    };
+    config = {
+      storage: {
+        maxFileAgeDays: 30,
+        gc: { enabled: true, intervalMs: 60000, batchSize: 2, maxDeletesPerSecond: 0, orphanGraceMinutes: 60 }
+      }
+    };
+    reaper = new StorageReaper(objects, storage, config);
+  });
+
+  it('reclaims unreferenced files past the grace period, batch after batch', async () => {
+    objects.findReclaimable
+      .mockResolvedValueOnce([object('a', 100), object('b', 200)])
+      .mockResolvedValueOnce([object('c', 300)]);
+    // An upload of the same content claimed b back before the reaper got to it
+    objects.claimReclaimable.mockImplementation(async (path: string) => path !== 'b');
+
+    await reaper.runOnce(NOW);
+
+    expect(objects.findReclaimable).toHaveBeenCalledTimes(2);
+    expect(objects.findReclaimable.mock.calls[0][0]).toEqual(new Date(NOW.getTime() - 60 * MINUTE_MS));
+    expect(storage.remove.mock.calls.map((call: any[]) => call[0])).toEqual(['a', 'c']);
+    const stats = await reaper.getStats();
+    expect(stats).toMatchObject({ reclaimedObjects: 2, reclaimedBytes: 400, passes: 1, dedupRatio: 3 });
+  });
+
+  it('keeps a file that was uploaded again while it was being removed', async () => {
+    objects.findReclaimable.mockResolvedValueOnce([object('a', 100)]);
+    objects.isLive.mockResolvedValue(true);
+
+    await reaper.runOnce(NOW);
+
+    expect(storage.remove).toHaveBeenCalledTimes(1);
+    expect((await reaper.getStats()).reclaimedObjects).toBe(0);
+  });
+
+  it('expires aged audio only when maxFileAgeDays is set', async () => {
+    objects.findAged.mockResolvedValueOnce([object('old', 500, 2)]);
+
+    await reaper.runOnce(NOW);
+
+    expect(objects.findAged.mock.calls[0][0]).toEqual(new Date(NOW.getTime() - 30 * 24 * 60 * MINUTE_MS));
+    expect(objects.markExpired).toHaveBeenCalledWith('old', expect.any(Date));
+    expect(await reaper.getStats()).toMatchObject({ expiredObjects: 1, expiredBytes: 500 });
+
+    config.storage.maxFileAgeDays = 0;
+    objects.findAged.mockClear();
+    await reaper.runOnce(NOW);
+
+    expect(objects.findAged).not.toHaveBeenCalled();
+  });
+
+  it('recounts references a batch per pass and wraps around at the end of the table', async () => {
+    objects.reconcile
+      .mockResolvedValueOnce({ checked: 2, corrected: 1, lastPath: 'b' })
+      .mockResolvedValueOnce({ checked: 1, corrected: 0, lastPath: 'c' })
+      .mockResolvedValueOnce({ checked: 2, corrected: 0, lastPath: 'b' });
+
+    await reaper.runOnce(NOW);
+    await reaper.runOnce(NOW);
+    await reaper.runOnce(NOW);
+
+    expect(objects.reconcile.mock.calls.map((call: any[]) => call[0])).toEqual([undefined, 'b', undefined]);
+    expect((await reaper.getStats()).correctedRefCounts).toBe(1);
+  });
+
+  it('does not overlap passes', async () => {
+    let release!: () => void;
+    objects.findReclaimable.mockReturnValueOnce(new Promise(resolve => {
+      release = () => resolve([]);
+    }));
+
+    const first = reaper.runOnce(NOW);
+    const second = reaper.runOnce(NOW);
+    release();
+    await Promise.all([first, second]);
+
+    expect(objects.findReclaimable).toHaveBeenCalledTimes(1);
+    expect((await reaper.getStats()).passes).toBe(1);
+  });
+});
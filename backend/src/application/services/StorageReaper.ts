@@ -0,0 +1,207 @@
+import { StoredObject, StoredObjectRepository, StoredObjectTotals } from '../../domain/repositories/StoredObjectRepository';
+import { StorageService } from '../../domain/services/StorageService';
+import { Config } from '../../config/schema';
+
+const MINUTE_MS = 60 * 1000;
+const DAY_MS = 24 * 60 * MINUTE_MS;
+
+export interface StorageReaperStats extends StoredObjectTotals {
+  enabled: boolean;
+  dedupRatio: number;  // referencedBytes / bytes
+  passes: number;
+  reclaimedObjects: number;
+  reclaimedBytes: number;
+  expiredObjects: number;
+  expiredBytes: number;
+  correctedRefCounts: number;
+  temporaryFilesRemoved: number;
+  deletesPerSecond: number;  // Over the deleting part of the last pass that deleted anything
+  lastPassAt?: string;
+  lastPassMs: number;
+  orphanGraceMinutes: number;
+}
+
+/**
+ * Background lifecycle for content-addressed uploads. Each pass:
+ *
+ * 1. reclaims files no note has referenced for storage.gc.orphanGraceMinutes
+ *    (deleted notes, rejected or abandoned uploads),
+ * 2. expires the audio of completed notes untouched for storage.maxFileAgeDays
+ *    (the notes keep their transcription and summary),
+ * 3. recounts references for the next batch of files, so counts left wrong by
+ *    cascading deletes are corrected within one sweep of the table,
+ * 4. clears partial files left in tmp/ by crashes.
+ *
+ * Deletes are paced to storage.gc.maxDeletesPerSecond and a pass drains the
+ * whole backlog before the next one starts. Run it in one process only.
+ */
+export class StorageReaper {
+  private timer: NodeJS.Timeout | null = null;
+  private pass: Promise<void> | null = null;
+  private stopping = false;
+  private reconcileCursor?: string;
+  private nextDeleteAt = 0;
+
+  private passes = 0;
+  private reclaimedObjects = 0;
+  private reclaimedBytes = 0;
+  private expiredObjects = 0;
+  private expiredBytes = 0;
+  private correctedRefCounts = 0;
+  private temporaryFilesRemoved = 0;
+  private deletesPerSecond = 0;
+  private lastPassAt?: Date;
+  private lastPassMs = 0;
+
+  constructor(
+    private readonly objects: StoredObjectRepository,
+    private readonly storage: StorageService,
+    private readonly config: Config
+  ) {}
+
+  isEnabled(): boolean {
+    return this.config.storage.gc.enabled;
+  }
+
+  start(): void {
+    if (!this.isEnabled() || this.timer) return;
+    this.stopping = false;
+
+    this.timer = setInterval(() => {
+      this.runOnce().catch(error => console.error('[StorageReaper] Pass failed:', error));
+    }, this.config.storage.gc.intervalMs);
+    this.timer.unref();
+    console.log('[StorageReaper] Started');
+  }
+
+  // Stop after the file being deleted; the rest is picked up by the next process to start
+  async stop(): Promise<void> {
+    this.stopping = true;
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+    await this.pass?.catch(() => undefined);
+  }
+
+  // Passes never overlap: a call during a pass waits for that pass
+  runOnce(now: Date = new Date()): Promise<void> {
+    if (!this.pass) {
+      this.pass = this.runPass(now).finally(() => {
+        this.pass = null;
+      });
+    }
+    return this.pass;
+  }
+
+  async getStats(): Promise<StorageReaperStats> {
+    const totals = await this.objects.totals();
+    return {
+      enabled: this.isEnabled(),
+      ...totals,
+      dedupRatio: totals.bytes > 0 ? totals.referencedBytes / totals.bytes : 1,
+      passes: this.passes,
+      reclaimedObjects: this.reclaimedObjects,
+      reclaimedBytes: this.reclaimedBytes,
+      expiredObjects: this.expiredObjects,
+      expiredBytes: this.expiredBytes,
+      correctedRefCounts: this.correctedRefCounts,
+      temporaryFilesRemoved: this.temporaryFilesRemoved,
+      deletesPerSecond: this.deletesPerSecond,
+      lastPassAt: this.lastPassAt?.toISOString(),
+      lastPassMs: this.lastPassMs,
+      orphanGraceMinutes: this.config.storage.gc.orphanGraceMinutes
+    };
+  }
+
+  private async runPass(now: Date): Promise<void> {
+    const startedAt = Date.now();
+    const { gc, maxFileAgeDays } = this.config.storage;
+
+    const reclaimed = await this.drain(
+      new Date(now.getTime() - gc.orphanGraceMinutes * MINUTE_MS),
+      (before, limit) => this.objects.findReclaimable(before, limit),
+      (object, before) => this.objects.claimReclaimable(object.path, before),
+      object => {
+        this.reclaimedObjects++;
+        this.reclaimedBytes += object.size;
+      }
+    );
+
+    let expired = 0;
+    if (maxFileAgeDays > 0) {
+      expired = await this.drain(
+        new Date(now.getTime() - maxFileAgeDays * DAY_MS),
+        (before, limit) => this.objects.findAged(before, limit),
+        (object, before) => this.objects.markExpired(object.path, before),
+        object => {
+          this.expiredObjects++;
+          this.expiredBytes += object.size;
+        }
+      );
+    }
+
+    const recount = await this.objects.reconcile(this.reconcileCursor, gc.batchSize);
+    this.reconcileCursor = recount.checked < gc.batchSize ? undefined : recount.lastPath;
+    this.correctedRefCounts += recount.corrected;
+
+    this.temporaryFilesRemoved += await this.storage.sweepTemporary(now);
+
+    this.passes++;
+    this.lastPassAt = now;
+    this.lastPassMs = Date.now() - startedAt;
+    if (reclaimed + expired > 0 || recount.corrected > 0) {
+      console.log(`[StorageReaper] Reclaimed ${reclaimed} and expired ${expired} files, ` +
+        `corrected ${recount.corrected} reference counts in ${this.lastPassMs}ms`);
+    }
+  }
+
+  /**
+   * Delete candidates batch by batch until none are left. A candidate is
+   * claimed in the database first (compare-and-set on its touchedAt), so an
+   * upload or reference that lands meanwhile keeps the file.
+   */
+  private async drain(
+    before: Date,
+    find: (before: Date, limit: number) => Promise<StoredObject[]>,
+    claim: (object: StoredObject, before: Date) => Promise<boolean>,
+    onDeleted: (object: StoredObject) => void
+  ): Promise<number> {
+    const batchSize = this.config.storage.gc.batchSize;
+    const startedAt = Date.now();
+    let deleted = 0;
+
+    while (!this.stopping) {
+      const batch = await find(before, batchSize);
+      for (const object of batch) {
+        if (this.stopping) break;
+        await this.throttle();
+        if (!(await claim(object, before))) continue;
+
+        const removed = await this.storage.remove(object.path, () => this.objects.isLive(object.path));
+        if (removed) {
+          deleted++;
+          onDeleted(object);
+        }
+      }
+      if (batch.length < batchSize) break;
+    }
+
+    if (deleted > 0) {
+      this.deletesPerSecond = deleted / Math.max((Date.now() - startedAt) / 1000, 0.001);
+    }
+    return deleted;
+  }
+
+  private async throttle(): Promise<void> {
+    const rate = this.config.storage.gc.maxDeletesPerSecond;
+    if (!rate) return;
+
+    const now = Date.now();
+    const wait = this.nextDeleteAt - now;
+    this.nextDeleteAt = Math.max(now, this.nextDeleteAt) + 1000 / rate;
+    if (wait > 0) {
+      await new Promise(resolve => setTimeout(resolve, wait));
+    }
+  }
+}
@@ -0,0 +1,112 @@
+import { TranscriptionCache } from './TranscriptionCache';
+import type { TranscriptionCacheRepository } from '../../domain/repositories/TranscriptionCacheRepository';
+import { Language } from '../../domain/value-objects/Language';
+
+const PARTS = {
+  audioHash: 'a'.repeat(64),
+  model: 'openai:gpt-4o-transcribe',
+  language: 'en',
+  prompt: 'Known entities: Żabka'
+};
+
+describe('TranscriptionCache', () => {
+  let repository: jest.Mocked<TranscriptionCacheRepository>;
+  let config: any;
+  let cache: TranscriptionCache;
+
+  beforeEach(() => {
+    repository = {
+      findByKey: jest.fn().mockResolvedValue(null),
+      save: jest.fn(),
+      recordHit: jest.fn(),
+      evict: jest.fn().mockResolvedValue(0),
+      totals: jest.fn().mockResolvedValue({ entries: 0, totalBytes: 0 })
+    };
+    config = {
+      transcription: {
+        cache: { enabled: true, maxEntries: 100, maxAgeDays: 30 }
+      }
+    };
+    cache = new TranscriptionCache(repository, config);
+  });
+
+  it('should key on audio, model, language and prompts', () => {
+    const key = TranscriptionCache.buildKey(PARTS);
+
+    expect(TranscriptionCache.buildKey({ ...PARTS })).toBe(key);
+    expect(TranscriptionCache.buildKey({ ...PARTS, model: 'google/gemini-2.0-flash-001' })).not.toBe(key);
+    expect(TranscriptionCache.buildKey({ ...PARTS, prompt: 'Known entities: Microsoft' })).not.toBe(key);
+    expect(TranscriptionCache.buildKey({ ...PARTS, systemPrompt: 'Transcribe verbatim' })).not.toBe(key);
+  });
+
+  it('should transcribe and store on a miss', async () => {
+    const transcribe = jest.fn().mockResolvedValue({
+      text: 'spotkanie z klientem',
+      language: Language.PL,
+      duration: 12,
+      confidence: 0.9
+    });
+
+    const { result, cached } = await cache.getOrTranscribe(PARTS, transcribe);
+
+    expect(cached).toBe(false);
+    expect(result.text).toBe('spotkanie z klientem');
+    expect(transcribe).toHaveBeenCalledTimes(1);
+    expect(repository.save).toHaveBeenCalledWith(expect.objectContaining({
+      cacheKey: TranscriptionCache.buildKey(PARTS),
+      audioHash: PARTS.audioHash,
+      language: 'pl'
+    }));
+  });
+
+  it('should serve a hit without calling the provider', async () => {
+    repository.findByKey.mockResolvedValue({
+      cacheKey: TranscriptionCache.buildKey(PARTS),
+      audioHash: PARTS.audioHash,
+      model: PARTS.model,
+      text: 'cached text',
+      language: 'en',
+      duration: 5,
+      confidence: 1,
+      sizeBytes: 11,
+      hitCount: 3,
+      createdAt: new Date(),
+      lastHitAt: new Date()
+    });
+    const transcribe = jest.fn();
+
+    const { result, cached } = await cache.getOrTranscribe(PARTS, transcribe);
+
+    expect(cached).toBe(true);
+    expect(result.text).toBe('cached text');
+    expect(transcribe).not.toHaveBeenCalled();
+    expect(repository.recordHit).toHaveBeenCalled();
+    expect((await cache.getStats()).hitRate).toBe(1);
+  });
+
+  it('should share one provider call between concurrent identical misses', async () => {
+    let release: (value: any) => void = () => undefined;
+    const transcribe = jest.fn(() => new Promise<any>(resolve => { release = resolve; }));
+
+    const first = cache.getOrTranscribe(PARTS, transcribe);
+    const second = cache.getOrTranscribe(PARTS, transcribe);
+    await new Promise(resolve => setImmediate(resolve));
+    release({ text: 'once', language: Language.EN, duration: 1, confidence: 1 });
+
+    const results = await Promise.all([first, second]);
+
+    expect(transcribe).toHaveBeenCalledTimes(1);
+    expect(results.map(r => r.result.text)).toEqual(['once', 'once']);
+    expect((await cache.getStats()).coalesced).toBe(1);
+  });
+
+  it('should bypass the cache when disabled', async () => {
+    config.transcription.cache.enabled = false;
+    const transcribe = jest.fn().mockResolvedValue({ text: 'x', language: Language.EN, duration: 1, confidence: 1 });
+
+    await cache.getOrTranscribe(PARTS, transcribe);
+
+    expect(repository.findByKey).not.toHaveBeenCalled();
+    expect(repository.save).not.toHaveBeenCalled();
+  });
+});
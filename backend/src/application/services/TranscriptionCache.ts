@@ -0,0 +1,194 @@
+import { createHash } from 'crypto';
+import { createReadStream } from 'fs';
+import { TranscriptionCacheRepository } from '../../domain/repositories/TranscriptionCacheRepository';
+import { TranscriptionResult } from '../../domain/services/TranscriptionService';
+import { Language } from '../../domain/value-objects/Language';
+import { Config } from '../../config/schema';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const EVICTION_INTERVAL_MS = 60 * 1000;
+
+export interface TranscriptionCacheKeyParts {
+  audioHash: string;
+  model: string;
+  language: string;
+  prompt?: string;
+  systemPrompt?: string;
+}
+
+export interface TranscriptionCacheStats {
+  enabled: boolean;
+  entries: number;
+  totalBytes: number;
+  hits: number;
+  misses: number;
+  coalesced: number;
+  evictions: number;
+  hitRate: number;
+}
+
+/**
+ * Cross-note cache of transcription results keyed by audio content hash,
+ * model, language and the full prompt (including entity context), so the same
+ * recording uploaded again skips the provider call entirely.
+ *
+ * Concurrent misses for the same key share one provider call. Entries not hit
+ * for transcription.cache.maxAgeDays are evicted, and the table is trimmed to
+ * transcription.cache.maxEntries by least recent hit.
+ */
+export class TranscriptionCache {
+  private readonly pending = new Map<string, Promise<TranscriptionResult>>();
+  private lastEvictionAt = 0;
+
+  private hits = 0;
+  private misses = 0;
+  private coalesced = 0;
+  private evictions = 0;
+
+  constructor(
+    private readonly repository: TranscriptionCacheRepository,
+    private readonly config: Config
+  ) {}
+
+  isEnabled(): boolean {
+    return this.config.transcription.cache.enabled;
+  }
+
+  static buildKey(parts: TranscriptionCacheKeyParts): string {
+    return createHash('sha256')
+      .update(JSON.stringify([
+        parts.audioHash,
+        parts.model,
+        parts.language,
+        parts.prompt || '',
+        parts.systemPrompt || ''
+      ]))
+      .digest('hex');
+  }
+
+  // Fallback for notes uploaded before the hash was recorded at upload time
+  static hashFile(filePath: string): Promise<string> {
+    return new Promise((resolve, reject) => {
+      const hash = createHash('sha256');
+      createReadStream(filePath)
+        .on('data', chunk => hash.update(chunk))
+        .on('end', () => resolve(hash.digest('hex')))
+        .on('error', reject);
+    });
+  }
+
+  async getOrTranscribe(
+    parts: TranscriptionCacheKeyParts,
+    transcribe: () => Promise<TranscriptionResult>
+  ): Promise<{ result: TranscriptionResult; cached: boolean }> {
+    if (!this.isEnabled()) {
+      return { result: await transcribe(), cached: false };
+    }
+
+    const cacheKey = TranscriptionCache.buildKey(parts);
+
+    let inFlight = this.pending.get(cacheKey);
+    if (!inFlight) {
+      const cached = await this.lookup(cacheKey);
+      if (cached) {
+        this.hits++;
+        return { result: cached, cached: true };
+      }
+      // Another caller may have started the same transcription while we were looking
+      inFlight = this.pending.get(cacheKey);
+    }
+
+    if (inFlight) {
+      this.coalesced++;
+      return { result: await inFlight, cached: true };
+    }
+
+    this.misses++;
+    const request = transcribe();
+    this.pending.set(cacheKey, request);
+    try {
+      const result = await request;
+      await this.store(cacheKey, parts, result);
+      return { result, cached: false };
+    } finally {
+      this.pending.delete(cacheKey);
+    }
+  }
+
+  async getStats(): Promise<TranscriptionCacheStats> {
+    const totals = this.isEnabled()
+      ? await this.repository.totals()
+      : { entries: 0, totalBytes: 0 };
+    const lookups = this.hits + this.coalesced + this.misses;
+    return {
+      enabled: this.isEnabled(),
+      ...totals,
+      hits: this.hits,
+      misses: this.misses,
+      coalesced: this.coalesced,
+      evictions: this.evictions,
+      hitRate: lookups > 0 ? (this.hits + this.coalesced) / lookups : 0
+    };
+  }
+
+  private async lookup(cacheKey: string): Promise<TranscriptionResult | null> {
+    try {
+      const entry = await this.repository.findByKey(cacheKey);
+      if (!entry) {
+        return null;
+      }
+      if (entry.lastHitAt.getTime() < Date.now() - this.maxAgeMs()) {
+        return null;
+      }
+
+      await this.repository.recordHit(cacheKey);
+      return {
+        text: entry.text,
+        language: Language.fromString(entry.language),
+        duration: entry.duration,
+        confidence: entry.confidence
+      };
+    } catch (error) {
+      // A broken cache must never fail a transcription
+      console.error('[TranscriptionCache] Lookup failed:', error);
+      return null;
+    }
+  }
+
+  private async store(
+    cacheKey: string,
+    parts: TranscriptionCacheKeyParts,
+    result: TranscriptionResult
+  ): Promise<void> {
+    try {
+      await this.repository.save({
+        cacheKey,
+        audioHash: parts.audioHash,
+        model: parts.model,
+        text: result.text,
+        language: (result.language || Language.fromString(parts.language)).getValue(),
+        duration: result.duration || 0,
+        confidence: result.confidence || 0,
+        sizeBytes: Buffer.byteLength(result.text, 'utf8')
+      });
+
+      if (Date.now() - this.lastEvictionAt >= EVICTION_INTERVAL_MS) {
+        this.lastEvictionAt = Date.now();
+        const removed = await this.repository.evict(
+          new Date(Date.now() - this.maxAgeMs()),
+          this.config.transcription.cache.maxEntries
+        );
+        if (removed > 0) {
+          this.evictions += removed;
+          console.log(`[TranscriptionCache] Evicted ${removed} entries`);
+        }
+      }
+    } catch (error) {
+      console.error('[TranscriptionCache] Store failed:', error);
+    }
+  }
+
+  private maxAgeMs(): number {
+    return this.config.transcription.cache.maxAgeDays * DAY_MS;
+  }
+}
@@ -0,0 +1,121 @@
+import { VoiceNote } from '../../domain/entities/VoiceNote';
+
+export interface VoiceNoteExportOptions {
+  includeTranscription?: boolean;
+  includeMetadata?: boolean;
+}
+
+// Remove or replace invalid filename characters
+export function sanitizeFilename(title: string): string {
+  return title
+    .replace(/[^a-zA-Z0-9\s-_]/g, '')
+    .replace(/\s+/g, '_')
+    .substring(0, 100); // Limit length
+}
+
+/**
+ * One note as a Markdown document: title, optional metadata, summary with
+ * key points and action items, optional transcription. Shared by the single
+ * note export and bulk zip exports.
+ */
+export function renderMarkdown(voiceNote: VoiceNote, options: VoiceNoteExportOptions, exportedAt = new Date()): string {
+  const summary = voiceNote.getSummary();
+  const transcription = voiceNote.getTranscription();
+  const parts: string[] = [`# ${voiceNote.getTitle()}\n\n`];
+
+  // Add metadata if requested
+  if (options.includeMetadata) {
+    parts.push(`## Metadata\n\n`);
+    parts.push(`- **Date**: ${voiceNote.getCreatedAt().toISOString()}\n`);
+    parts.push(`- **Language**: ${voiceNote.getLanguage().getValue()}\n`);
+    parts.push(`- **Status**: ${voiceNote.getStatus().getValue()}\n`);
+    if (voiceNote.getTags().length > 0) {
+      parts.push(`- **Tags**: ${voiceNote.getTags().join(', ')}\n`);
+    }
+    parts.push(`\n`);
+  }
+
+  if (summary) {
+    parts.push(`## Summary\n\n${summary.getSummary()}\n\n`);
+
+    if (summary.getKeyPoints().length > 0) {
+      parts.push(`## Key Points\n\n`);
+      summary.getKeyPoints().forEach((point: string) => {
+        parts.push(`- ${point}\n`);
+      });
+      parts.push(`\n`);
+    }
+
+    if (summary.getActionItems().length > 0) {
+      parts.push(`## Action Items\n\n`);
+      summary.getActionItems().forEach((item: any) => {
+        let itemText = `- [ ] ${item.title ?? item}`;
+        const metadata = [];
+        if (item.owner) metadata.push(`Owner: ${item.owner}`);
+        if (item.dueDate) metadata.push(`Due: ${item.dueDate}`);
+        if (item.priority) metadata.push(`Priority: ${item.priority}`);
+        if (item.project) metadata.push(`Project: ${item.project}`);
+
+        if (metadata.length > 0) {
+          itemText += ` (${metadata.join(', ')})`;
+        }
+        parts.push(`${itemText}\n`);
+      });
+      parts.push(`\n`);
+    }
+  }
+
+  // Add transcription if requested
+  if (options.includeTranscription && transcription) {
+    parts.push(`## Transcription\n\n`);
+    parts.push(`${transcription.getText()}\n\n`);
+  }
+
+  // Add footer
+  parts.push(`---\n\n`);
+  parts.push(`*Generated by nano-Grazynka on ${exportedAt.toISOString()}*\n`);
+
+  return parts.join('');
+}
+
+/** One note as a plain object for JSON and NDJSON exports */
+export function toExportRecord(voiceNote: VoiceNote, options: VoiceNoteExportOptions, exportedAt = new Date()): Record<string, any> {
+  const summary = voiceNote.getSummary();
+  const transcription = voiceNote.getTranscription();
+
+  const data: Record<string, any> = {
+    title: voiceNote.getTitle(),
+    summary: summary
+      ? {
+          text: summary.getSummary(),
+          keyPoints: summary.getKeyPoints(),
+          actionItems: summary.getActionItems()
+        }
+      : null
+  };
+
+  // Add metadata if requested
+  if (options.includeMetadata) {
+    data.metadata = {
+      id: voiceNote.getId().getValue(),
+      createdAt: voiceNote.getCreatedAt().toISOString(),
+      updatedAt: voiceNote.getUpdatedAt().toISOString(),
+      language: voiceNote.getLanguage().getValue(),
+      status: voiceNote.getStatus().getValue(),
+      tags: voiceNote.getTags(),
+      version: voiceNote.getVersion()
+    };
+  }
+
+  // Add transcription if requested
+  if (options.includeTranscription && transcription) {
+    data.transcription = {
+      text: transcription.getText(),
+      timestamp: transcription.getTimestamp().toISOString()
+    };
+  }
+
+  data.exportedAt = exportedAt.toISOString();
+
+  return data;
+}
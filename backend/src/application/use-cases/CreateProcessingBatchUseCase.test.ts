@@ -0,0 +1,118 @@
+import { CreateProcessingBatchUseCase } from './CreateProcessingBatchUseCase';
+import { ProcessingStatusValue } from '../../domain/value-objects/ProcessingStatus';
+
+const USER_ID = 'user-1';
+const IDS = [
+  '123e4567-e89b-12d3-a456-426614174001',
+  '123e4567-e89b-12d3-a456-426614174002',
+  '123e4567-e89b-12d3-a456-426614174003',
+  '123e4567-e89b-12d3-a456-426614174004'
+];
+
+function note(id: string, status: ProcessingStatusValue, userId: string = USER_ID): any {
+  return {
+    getId: () => ({ getValue: () => id, toString: () => id }),
+    getUserId: () => userId,
+    getStatus: () => ({ getValue: () => status })
+  };
+}
+
+async function flush(): Promise<void> {
+  for (let i = 0; i < 10; i++) {
+    await new Promise(resolve => setImmediate(resolve));
+  }
+}
+
+describe('CreateProcessingBatchUseCase', () => {
+  let voiceNoteRepository: any;
+  let batchRepository: any;
+  let orchestrator: any;
+  let queue: any;
+  let config: any;
+
+  beforeEach(() => {
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+
+    voiceNoteRepository = {
+      findByIds: jest.fn().mockResolvedValue([
+        note(IDS[0], ProcessingStatusValue.PENDING),
+        note(IDS[1], ProcessingStatusValue.COMPLETED),
+        note(IDS[2], ProcessingStatusValue.FAILED),
+        note(IDS[3], ProcessingStatusValue.PENDING, 'someone-else')
+      ])
+    };
+    batchRepository = {
+      create: jest.fn().mockImplementation(async batch => ({ ...batch, id: 'batch-1', createdAt: new Date() }))
+    };
+    orchestrator = { processVoiceNote: jest.fn().mockResolvedValue(undefined) };
+    queue = { enqueue: jest.fn().mockResolvedValue({ id: 'job' }) };
+    config = { processing: { maxConcurrentJobs: 2, batchMaxItems: 10 } };
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('enqueues pending and failed notes the user owns and skips the rest', async () => {
+    const useCase = new CreateProcessingBatchUseCase(voiceNoteRepository, batchRepository, orchestrator, queue, config);
+
+    const result = await useCase.execute({ userId: USER_ID, voiceNoteIds: [...IDS, IDS[0], ''], language: 'PL' });
+
+    expect(result.success).toBe(true);
+    if (!result.success) return;
+    expect(result.data).toEqual({
+      batchId: 'batch-1',
+      total: 3,
+      scheduled: 2,
+      skipped: [
+        { voiceNoteId: '', reason: 'Invalid voice note ID' },
+        { voiceNoteId: IDS[3], reason: 'Voice note not found' }
+      ]
+    });
+    expect(batchRepository.create.mock.calls[0][0].voiceNoteIds).toEqual([IDS[0], IDS[1], IDS[2]]);
+    expect(queue.enqueue.mock.calls.map((call: any[]) => call[0])).toEqual([IDS[0], IDS[2]]);
+    expect(queue.enqueue).toHaveBeenCalledWith(IDS[0], { language: 'PL', projectId: undefined });
+  });
+
+  it('runs inline batches with at most maxConcurrentJobs notes in flight', async () => {
+    const ids = IDS.slice(0, 3);
+    voiceNoteRepository.findByIds.mockResolvedValue(ids.map(id => note(id, ProcessingStatusValue.PENDING)));
+
+    let inFlight = 0;
+    let peak = 0;
+    const releases: Array<() => void> = [];
+    orchestrator.processVoiceNote.mockImplementation(() => {
+      inFlight++;
+      peak = Math.max(peak, inFlight);
+      return new Promise<void>(resolve => releases.push(() => {
+        inFlight--;
+        resolve();
+      }));
+    });
+
+    const useCase = new CreateProcessingBatchUseCase(voiceNoteRepository, batchRepository, orchestrator, null, config);
+    const result = await useCase.execute({ userId: USER_ID, voiceNoteIds: ids });
+    expect(result.success).toBe(true);
+
+    await flush();
+    expect(orchestrator.processVoiceNote).toHaveBeenCalledTimes(2);
+
+    releases.shift()!();
+    await flush();
+    expect(orchestrator.processVoiceNote).toHaveBeenCalledTimes(3);
+    releases.splice(0).forEach(release => release());
+    await flush();
+
+    expect(peak).toBe(2);
+  });
+
+  it('rejects batches over batchMaxItems', async () => {
+    config.processing.batchMaxItems = 2;
+    const useCase = new CreateProcessingBatchUseCase(voiceNoteRepository, batchRepository, orchestrator, queue, config);
+
+    const result = await useCase.execute({ userId: USER_ID, voiceNoteIds: IDS });
+
+    expect(result.success).toBe(false);
+    expect(batchRepository.create).not.toHaveBeenCalled();
+  });
+});
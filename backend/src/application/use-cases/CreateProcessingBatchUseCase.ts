@@ -0,0 +1,153 @@
+import { UseCase } from '../base/UseCase';
+import { Result, ValidationError } from '../base/Result';
+import { VoiceNote } from '../../domain/entities/VoiceNote';
+import { VoiceNoteRepository } from '../../domain/repositories/VoiceNoteRepository';
+import { ProcessingBatchRepository } from '../../domain/repositories/ProcessingBatchRepository';
+import { VoiceNoteId } from '../../domain/value-objects/VoiceNoteId';
+import { Language } from '../../domain/value-objects/Language';
+import { ProcessingStatusValue } from '../../domain/value-objects/ProcessingStatus';
+import { Config } from '../../config/schema';
+import { ProcessingOrchestrator } from '../services/ProcessingOrchestrator';
+import { ProcessingQueue } from '../services/ProcessingQueue';
+
+export interface CreateProcessingBatchInput {
+  userId: string;
+  voiceNoteIds: string[];
+  language?: string;
+  projectId?: string;
+}
+
+export interface CreateProcessingBatchOutput {
+  batchId: string;
+  total: number;
+  scheduled: number;
+  skipped: Array<{ voiceNoteId: string; reason: string }>;
+}
+
+/**
+ * Group many voice notes under one batch handle and schedule them for
+ * processing. In queued mode every note becomes a job and the worker pool
+ * bounds concurrency; in inline mode the batch runs in the background with at
+ * most processing.maxConcurrentJobs notes in flight. Notes already processing
+ * or completed join the batch (so progress covers them) but are not rerun.
+ */
+export class CreateProcessingBatchUseCase extends UseCase<
+  CreateProcessingBatchInput,
+  Result<CreateProcessingBatchOutput>
+> {
+  constructor(
+    private readonly voiceNoteRepository: VoiceNoteRepository,
+    private readonly batchRepository: ProcessingBatchRepository,
+    private readonly processingOrchestrator: ProcessingOrchestrator,
+    private readonly processingQueue: ProcessingQueue | null,
+    private readonly config: Config
+  ) {
+    super();
+  }
+
+  async execute(input: CreateProcessingBatchInput): Promise<Result<CreateProcessingBatchOutput>> {
+    try {
+      const requestedIds = [...new Set(input.voiceNoteIds)];
+      if (requestedIds.length === 0) {
+        return { success: false, error: new ValidationError('At least one voice note is required') };
+      }
+      if (requestedIds.length > this.config.processing.batchMaxItems) {
+        return {
+          success: false,
+          error: new ValidationError(`A batch can hold at most ${this.config.processing.batchMaxItems} voice notes`)
+        };
+      }
+
+      const skipped: CreateProcessingBatchOutput['skipped'] = [];
+      const validIds: VoiceNoteId[] = [];
+      for (const id of requestedIds) {
+        try {
+          validIds.push(VoiceNoteId.fromString(id));
+        } catch {
+          skipped.push({ voiceNoteId: id, reason: 'Invalid voice note ID' });
+        }
+      }
+
+      const found = new Map(
+        (await this.voiceNoteRepository.findByIds(validIds)).map(note => [note.getId().getValue(), note])
+      );
+
+      const included: string[] = [];
+      const toProcess: VoiceNote[] = [];
+      for (const id of validIds.map(voiceNoteId => voiceNoteId.getValue())) {
+        const voiceNote = found.get(id);
+        // Someone else's note is reported exactly like a missing one
+        if (!voiceNote || voiceNote.getUserId() !== input.userId) {
+          skipped.push({ voiceNoteId: id, reason: 'Voice note not found' });
+          continue;
+        }
+
+        included.push(id);
+        const status = voiceNote.getStatus().getValue();
+        if (status === ProcessingStatusValue.PENDING || status === ProcessingStatusValue.FAILED) {
+          toProcess.push(voiceNote);
+        }
+      }
+
+      if (included.length === 0) {
+        return { success: false, error: new ValidationError('None of the voice notes can be processed') };
+      }
+
+      const batch = await this.batchRepository.create({
+        userId: input.userId,
+        voiceNoteIds: included,
+        language: input.language,
+        projectId: input.projectId
+      });
+
+      if (this.processingQueue) {
+        for (const voiceNote of toProcess) {
+          await this.processingQueue.enqueue(voiceNote.getId().getValue(), {
+            language: input.language,
+            projectId: input.projectId
+          });
+        }
+      } else {
+        this.runInline(batch.id, toProcess, input.language, input.projectId);
+      }
+
+      console.log(`[CreateProcessingBatch] Batch ${batch.id}: ${included.length} notes, ${toProcess.length} scheduled, ${skipped.length} skipped`);
+
+      return {
+        success: true,
+        data: {
+          batchId: batch.id,
+          total: included.length,
+          scheduled: toProcess.length,
+          skipped
+        }
+      };
+    } catch (error) {
+      return {
+        success: false,
+        error: error instanceof Error ? error : new Error('Unknown error occurred')
+      };
+    }
+  }
+
+  // Inline mode has no worker pool, so run a bounded one for this batch without holding the request
+  private runInline(batchId: string, voiceNotes: VoiceNote[], language?: string, projectId?: string): void {
+    const processingLanguage = language ? Language.fromString(language) : undefined;
+    let next = 0;
+
+    const worker = async () => {
+      while (next < voiceNotes.length) {
+        const voiceNote = voiceNotes[next++];
+        try {
+          await this.processingOrchestrator.processVoiceNote(voiceNote, processingLanguage, projectId);
+        } catch (error) {
+          console.error(`[CreateProcessingBatch] Batch ${batchId} note ${voiceNote.getId()} failed:`, error);
+        }
+      }
+    };
+
+    const workers = Math.max(1, Math.min(this.config.processing.maxConcurrentJobs, voiceNotes.length));
+    Promise.all(Array.from({ length: workers }, worker))
+      .then(() => console.log(`[CreateProcessingBatch] Batch ${batchId} finished`));
+  }
+}
@@ -1,29 +1,27 @@
 import { UseCase } from '../base/UseCase';
 import { Result, NotFoundError } from '../base/Result';
 import { VoiceNoteRepository } from '../../domain/repositories/VoiceNoteRepository';
-import { StorageService } from '../../domain/services/StorageService';
 import { VoiceNoteId } from '../../domain/value-objects/VoiceNoteId';
-import { Config } from '../../config/schema';
 
 export interface DeleteVoiceNoteInput {
   voiceNoteId: string;
-  deleteAudioFile?: boolean;
 }
 
 export interface DeleteVoiceNoteOutput {
   voiceNoteId: string;
   deleted: boolean;
-  audioFileDeleted: boolean;
 }
 
+/**
+ * Deleting a note releases its reference to the audio file; the storage
+ * reaper deletes the file once no other note uses the same recording.
+ */
 export class DeleteVoiceNoteUseCase extends UseCase<
   DeleteVoiceNoteInput,
   Result<DeleteVoiceNoteOutput>
 > {
   constructor(
-    private readonly voiceNoteRepository: VoiceNoteRepository,
-    private readonly storageService: StorageService,
-    private readonly config: Config
+    private readonly voiceNoteRepository: VoiceNoteRepository
   ) {
     super();
   }
@@ -41,18 +39,6 @@ export class DeleteVoiceNoteUseCase extends UseCase<
         };
       }
 
-      // Delete audio file if requested
-      let audioFileDeleted = false;
-      if (input.deleteAudioFile !== false && voiceNote.getOriginalFilePath()) {
-        try {
-          await this.storageService.deleteFile(voiceNote.getOriginalFilePath()!);
-          audioFileDeleted = true;
-        } catch (error) {
-          // Log error but continue with deletion
-          console.error('Failed to delete audio file:', error);
-        }
-      }
-
       // Delete voice note from repository (cascade deletes transcription and summary)
       await this.voiceNoteRepository.delete(voiceNoteId);
 
@@ -60,8 +46,7 @@ export class DeleteVoiceNoteUseCase extends UseCase<
         success: true,
         data: {
           voiceNoteId: input.voiceNoteId,
-          deleted: true,
-          audioFileDeleted
+          deleted: true
         }
       };
     } catch (error) {
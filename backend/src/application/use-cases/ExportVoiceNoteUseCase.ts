@@ -2,6 +2,7 @@ import { UseCase } from '../base/UseCase';
 import { Result, NotFoundError, ValidationError } from '../base/Result';
 import { VoiceNoteRepository } from '../../domain/repositories/VoiceNoteRepository';
 import { VoiceNoteId } from '../../domain/value-objects/VoiceNoteId';
+import { renderMarkdown, sanitizeFilename, toExportRecord } from '../services/VoiceNoteExport';
 
 export interface ExportVoiceNoteInput {
   voiceNoteId: string;
@@ -56,12 +57,12 @@ export class ExportVoiceNoteUseCase extends UseCase<
       let mimeType: string;
 
       if (format === 'markdown') {
-        content = this.generateMarkdown(voiceNote, input);
-        filename = `${this.sanitizeFilename(voiceNote.getTitle())}.md`;
+        content = renderMarkdown(voiceNote, input);
+        filename = `${sanitizeFilename(voiceNote.getTitle())}.md`;
         mimeType = 'text/markdown';
       } else {
-        content = this.generateJSON(voiceNote, input);
-        filename = `${this.sanitizeFilename(voiceNote.getTitle())}.json`;
+        content = JSON.stringify(toExportRecord(voiceNote, input), null, 2);
+        filename = `${sanitizeFilename(voiceNote.getTitle())}.json`;
         mimeType = 'application/json';
       }
 
@@ -80,113 +81,4 @@ export class ExportVoiceNoteUseCase extends UseCase<
       };
     }
   }
-
-  private generateMarkdown(voiceNote: any, input: ExportVoiceNoteInput): string {
-    const summary = voiceNote.getSummary();
-    const transcription = voiceNote.getTranscription();
-    
-    let markdown = `# ${voiceNote.getTitle()}\n\n`;
-
-    // Add metadata if requested
-    if (input.includeMetadata) {
-      markdown += `## Metadata\n\n`;
-      markdown += `- **Date**: ${voiceNote.getCreatedAt().toISOString()}\n`;
-      markdown += `- **Language**: ${voiceNote.getLanguage().getValue()}\n`;
-      markdown += `- **Status**: ${voiceNote.getStatus().getValue()}\n`;
-      if (voiceNote.getTags().length > 0) {
-        markdown += `- **Tags**: ${voiceNote.getTags().join(', ')}\n`;
-      }
-      markdown += `\n`;
-    }
-
-    // Add summary
-    markdown += `## Summary\n\n${summary.getSummary()}\n\n`;
-
-    // Add key points
-    if (summary.getKeyPoints().length > 0) {
-      markdown += `## Key Points\n\n`;
-      summary.getKeyPoints().forEach((point: string) => {
-        markdown += `- ${point}\n`;
-      });
-      markdown += `\n`;
-    }
-
-    // Add action items
-    if (summary.getActionItems().length > 0) {
-      markdown += `## Action Items\n\n`;
-      summary.getActionItems().forEach((item: any) => {
-        let itemText = `- [ ] ${item.title}`;
-        const metadata = [];
-        if (item.owner) metadata.push(`Owner: ${item.owner}`);
-        if (item.dueDate) metadata.push(`Due: ${item.dueDate}`);
-        if (item.priority) metadata.push(`Priority: ${item.priority}`);
-        if (item.project) metadata.push(`Project: ${item.project}`);
-        
-        if (metadata.length > 0) {
-          itemText += ` (${metadata.join(', ')})`;
-        }
-        markdown += `${itemText}\n`;
-      });
-      markdown += `\n`;
-    }
-
-    // Add transcription if requested
-    if (input.includeTranscription && transcription) {
-      markdown += `## Transcription\n\n`;
-      markdown += `${transcription.getText()}\n\n`;
-    }
-
-    // Add footer
-    markdown += `---\n\n`;
-    markdown += `*Generated by nano-Grazynka on ${new Date().toISOString()}*\n`;
-
-    return markdown;
-  }
-
-  private generateJSON(voiceNote: any, input: ExportVoiceNoteInput): string {
-    const summary = voiceNote.getSummary();
-    const transcription = voiceNote.getTranscription();
-
-    const data: any = {
-      title: voiceNote.getTitle(),
-      summary: {
-        text: summary.getSummary(),
-        keyPoints: summary.getKeyPoints(),
-        actionItems: summary.getActionItems()
-      }
-    };
-
-    // Add metadata if requested
-    if (input.includeMetadata) {
-      data.metadata = {
-        id: voiceNote.getId().getValue(),
-        createdAt: voiceNote.getCreatedAt().toISOString(),
-        updatedAt: voiceNote.getUpdatedAt().toISOString(),
-        language: voiceNote.getLanguage().getValue(),
-        status: voiceNote.getStatus().getValue(),
-        tags: voiceNote.getTags(),
-        version: voiceNote.getVersion()
-      };
-    }
-
-    // Add transcription if requested
-    if (input.includeTranscription && transcription) {
-      data.transcription = {
-        text: transcription.getText(),
-        timestamps: transcription.getTimestamps()
-      };
-    }
-
-    data.exportedAt = new Date().toISOString();
-
-    return JSON.stringify(data, null, 2);
-  }
-
-  private sanitizeFilename(title: string): string {
-    // Remove or replace invalid filename characters
-    return title
-      .replace(/[^a-zA-Z0-9\s-_]/g, '')
-      .replace(/\s+/g, '_')
-      .substring(0, 100); // Limit length
-  }
 }
\ No newline at end of file
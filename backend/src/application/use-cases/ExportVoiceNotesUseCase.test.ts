@@ -0,0 +1,94 @@
+import { ExportVoiceNotesUseCase } from './ExportVoiceNotesUseCase';
+import { NotFoundError, ValidationError } from '../base/Result';
+import { VoiceNote } from '../../domain/entities/VoiceNote';
+import { Transcription } from '../../domain/entities/Transcription';
+import { Language } from '../../domain/value-objects/Language';
+
+function note(title: string, text: string): VoiceNote {
+  const voiceNote = VoiceNote.create({
+    userId: 'user-1',
+    title,
+    originalFilePath: `/uploads/${title}`,
+    fileSize: 1024,
+    mimeType: 'audio/m4a',
+    language: Language.EN
+  });
+  voiceNote.addTranscription(Transcription.create(text, Language.EN, 3));
+  return voiceNote;
+}
+
+async function readAll(stream: NodeJS.ReadableStream): Promise<Buffer> {
+  const chunks: Buffer[] = [];
+  for await (const chunk of stream) {
+    chunks.push(Buffer.from(chunk));
+  }
+  return Buffer.concat(chunks);
+}
+
+describe('ExportVoiceNotesUseCase', () => {
+  let voiceNoteRepository: any;
+  let projectRepository: any;
+  let useCase: ExportVoiceNotesUseCase;
+  let notes: VoiceNote[];
+
+  beforeEach(() => {
+    notes = [note('standup.m4a', 'Spotkanie o budżecie'), note('retro.m4a', 'Retro')];
+    voiceNoteRepository = {
+      list: jest.fn().mockImplementation(async () => ({ items: [], hasNext: false, total: notes.length })),
+      iterate: jest.fn().mockImplementation(async function* () {
+        yield* notes;
+      })
+    };
+    projectRepository = { findById: jest.fn() };
+    useCase = new ExportVoiceNotesUseCase(voiceNoteRepository, projectRepository, 50);
+  });
+
+  it('streams one JSON record per note', async () => {
+    const result = await useCase.execute({ userId: 'user-1', includeMetadata: false });
+
+    expect(result.success).toBe(true);
+    const data = (result as any).data;
+    expect(data).toMatchObject({ mimeType: 'application/x-ndjson', count: 2 });
+    expect(data.filename).toMatch(/^voice-notes-\d{4}-\d{2}-\d{2}\.ndjson$/);
+    expect(voiceNoteRepository.iterate).toHaveBeenCalledWith('user-1', { batchSize: 50 }, { projectId: undefined });
+
+    const lines = (await readAll(data.stream)).toString('utf8').trim().split('\n').map(line => JSON.parse(line));
+    expect(lines.map(line => line.title)).toEqual(['standup.m4a', 'retro.m4a']);
+    expect(lines[0].transcription.text).toBe('Spotkanie o budżecie');
+    expect(lines[0].metadata).toBeUndefined();
+  });
+
+  it('names the archive after the project and writes one Markdown file per note', async () => {
+    projectRepository.findById.mockResolvedValue({ id: 'project-1', userId: 'user-1', name: 'Q3 Planning' });
+
+    const result = await useCase.execute({ userId: 'user-1', projectId: 'project-1', format: 'zip' });
+
+    const data = (result as any).data;
+    expect(data.filename).toMatch(/^Q3_Planning-voice-notes-.*\.zip$/);
+    expect(voiceNoteRepository.list.mock.calls[0][2]).toEqual({ projectId: 'project-1' });
+
+    const archive = await readAll(data.stream);
+    expect(archive.readUInt32LE(0)).toBe(0x04034b50);
+    expect(archive.readUInt16LE(archive.length - 12)).toBe(2);
+    expect(archive.includes(Buffer.from(`_standupm4a_${notes[0].getId().getValue()}.md`))).toBe(true);
+  });
+
+  it("does not export another user's project", async () => {
+    projectRepository.findById.mockResolvedValue({ id: 'project-1', userId: 'user-2', name: 'Other' });
+
+    const result = await useCase.execute({ userId: 'user-1', projectId: 'project-1' });
+
+    expect(result.success).toBe(false);
+    expect((result as any).error).toBeInstanceOf(NotFoundError);
+    expect(voiceNoteRepository.iterate).not.toHaveBeenCalled();
+  });
+
+  it('rejects zip exports beyond the entry limit', async () => {
+    voiceNoteRepository.list.mockResolvedValue({ items: [], hasNext: false, total: 70000 });
+
+    const result = await useCase.execute({ userId: 'user-1', format: 'zip' });
+
+    expect(result.success).toBe(false);
+    expect((result as any).error).toBeInstanceOf(ValidationError);
+  });
+});
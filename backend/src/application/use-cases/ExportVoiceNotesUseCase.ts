@@ -0,0 +1,141 @@
+import { Readable } from 'stream';
+import { UseCase } from '../base/UseCase';
+import { Result, NotFoundError, ValidationError } from '../base/Result';
+import { VoiceNoteRepository, VoiceNoteFilter } from '../../domain/repositories/VoiceNoteRepository';
+import { IProjectRepository } from '../../domain/repositories/IProjectRepository';
+import { VoiceNote } from '../../domain/entities/VoiceNote';
+import { renderMarkdown, sanitizeFilename, toExportRecord, VoiceNoteExportOptions } from '../services/VoiceNoteExport';
+import { zipStream, ZipEntry, ZIP_MAX_ENTRIES } from '../../infrastructure/export/zip';
+
+export interface ExportVoiceNotesInput {
+  userId: string;
+  projectId?: string;  // Only notes in this project; all of the user's notes otherwise
+  format?: 'ndjson' | 'zip';
+  includeTranscription?: boolean;
+  includeMetadata?: boolean;
+}
+
+export interface ExportVoiceNotesOutput {
+  stream: Readable;
+  filename: string;
+  mimeType: string;
+  count: number;
+}
+
+// Notes read from the database per round trip
+const EXPORT_BATCH_SIZE = 200;
+
+/**
+ * Bulk export of a user's (or one project's) notes as NDJSON, one JSON
+ * record per line, or as a zip of Markdown files. The returned stream pulls
+ * notes from a keyset cursor only as fast as the client reads, so memory
+ * does not grow with the number of notes.
+ */
+export class ExportVoiceNotesUseCase extends UseCase<
+  ExportVoiceNotesInput,
+  Result<ExportVoiceNotesOutput>
+> {
+  constructor(
+    private readonly voiceNoteRepository: VoiceNoteRepository,
+    private readonly projectRepository: IProjectRepository,
+    private readonly batchSize: number = EXPORT_BATCH_SIZE
+  ) {
+    super();
+  }
+
+  async execute(input: ExportVoiceNotesInput): Promise<Result<ExportVoiceNotesOutput>> {
+    try {
+      let baseName = 'voice-notes';
+      if (input.projectId) {
+        const project = await this.projectRepository.findById(input.projectId);
+        if (!project || project.userId !== input.userId) {
+          return {
+            success: false,
+            error: new NotFoundError(`Project with ID ${input.projectId} not found`)
+          };
+        }
+        baseName = `${sanitizeFilename(project.name) || 'project'}-voice-notes`;
+      }
+
+      const filter: VoiceNoteFilter = { projectId: input.projectId };
+      const { total } = await this.voiceNoteRepository.list(
+        input.userId,
+        { limit: 1, keyset: true, count: 'exact' },
+        filter
+      );
+      const count = total || 0;
+
+      const format = input.format || 'ndjson';
+      if (format === 'zip' && count > ZIP_MAX_ENTRIES) {
+        return {
+          success: false,
+          error: new ValidationError(
+            `Zip exports are limited to ${ZIP_MAX_ENTRIES} notes (${count} selected). Use format=ndjson instead.`
+          )
+        };
+      }
+
+      const options: VoiceNoteExportOptions = {
+        includeTranscription: input.includeTranscription ?? true,
+        includeMetadata: input.includeMetadata ?? true
+      };
+      const notes = this.voiceNoteRepository.iterate(input.userId, { batchSize: this.batchSize }, filter);
+      const exportedAt = new Date();
+      const date = exportedAt.toISOString().slice(0, 10);
+
+      if (format === 'zip') {
+        return {
+          success: true,
+          data: {
+            stream: zipStream(markdownEntries(notes, options, exportedAt)),
+            filename: `${baseName}-${date}.zip`,
+            mimeType: 'application/zip',
+            count
+          }
+        };
+      }
+
+      return {
+        success: true,
+        data: {
+          stream: Readable.from(ndjsonLines(notes, options, exportedAt), { objectMode: false }),
+          filename: `${baseName}-${date}.ndjson`,
+          mimeType: 'application/x-ndjson',
+          count
+        }
+      };
+    } catch (error) {
+      return {
+        success: false,
+        error: error instanceof Error ? error : new Error('Unknown error occurred')
+      };
+    }
+  }
+}
+
+async function* ndjsonLines(
+  notes: AsyncIterable<VoiceNote>,
+  options: VoiceNoteExportOptions,
+  exportedAt: Date
+): AsyncGenerator<string> {
+  for await (const voiceNote of notes) {
+    yield JSON.stringify(toExportRecord(voiceNote, options, exportedAt)) + '\n';
+  }
+}
+
+// One Markdown file per note; the date prefix sorts them, the id keeps names unique
+async function* markdownEntries(
+  notes: AsyncIterable<VoiceNote>,
+  options: VoiceNoteExportOptions,
+  exportedAt: Date
+): AsyncGenerator<ZipEntry> {
+  for await (const voiceNote of notes) {
+    const createdAt = voiceNote.getCreatedAt();
+    const title = sanitizeFilename(voiceNote.getDisplayTitle()) || 'voice-note';
+    yield {
+      name: `${createdAt.toISOString().slice(0, 10)}_${title}_${voiceNote.getId().getValue()}.md`,
+      data: renderMarkdown(voiceNote, options, exportedAt),
+      modifiedAt: voiceNote.getUpdatedAt()
+    };
+  }
+}
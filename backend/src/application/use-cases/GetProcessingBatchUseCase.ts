@@ -0,0 +1,88 @@
+import { UseCase } from '../base/UseCase';
+import { Result, NotFoundError } from '../base/Result';
+import {
+  ProcessingBatchItemStatus,
+  ProcessingBatchRepository
+} from '../../domain/repositories/ProcessingBatchRepository';
+import { ProcessingStatusValue } from '../../domain/value-objects/ProcessingStatus';
+
+export interface GetProcessingBatchInput {
+  batchId: string;
+  userId: string;
+  includeItems?: boolean;
+}
+
+export interface GetProcessingBatchOutput {
+  batchId: string;
+  createdAt: Date;
+  total: number;
+  pending: number;
+  processing: number;
+  completed: number;
+  failed: number;
+  missing: number;  // Deleted since the batch was created
+  done: boolean;
+  percentComplete: number;
+  items?: ProcessingBatchItemStatus[];
+}
+
+export class GetProcessingBatchUseCase extends UseCase<
+  GetProcessingBatchInput,
+  Result<GetProcessingBatchOutput>
+> {
+  constructor(private readonly batchRepository: ProcessingBatchRepository) {
+    super();
+  }
+
+  async execute(input: GetProcessingBatchInput): Promise<Result<GetProcessingBatchOutput>> {
+    try {
+      const batch = await this.batchRepository.findById(input.batchId);
+      if (!batch || batch.userId !== input.userId) {
+        return { success: false, error: new NotFoundError(`Batch with ID ${input.batchId} not found`) };
+      }
+
+      const statuses = await this.batchRepository.findItemStatuses(batch.voiceNoteIds);
+      const counts: Record<string, number> = {};
+      for (const item of statuses) {
+        counts[item.status] = (counts[item.status] || 0) + 1;
+      }
+
+      const pending = counts[ProcessingStatusValue.PENDING] || 0;
+      const processing = counts[ProcessingStatusValue.PROCESSING] || 0;
+      const completed = counts[ProcessingStatusValue.COMPLETED] || 0;
+      const failed = counts[ProcessingStatusValue.FAILED] || 0;
+      const total = batch.voiceNoteIds.length;
+      const finished = total - pending - processing;
+
+      let items: ProcessingBatchItemStatus[] | undefined;
+      if (input.includeItems) {
+        const byId = new Map(statuses.map(item => [item.voiceNoteId, item]));
+        items = batch.voiceNoteIds
+          .map(id => byId.get(id))
+          .filter((item): item is ProcessingBatchItemStatus => !!item);
+      }
+
+      return {
+        success: true,
+        data: {
+          batchId: batch.id,
+          createdAt: batch.createdAt,
+          total,
+          pending,
+          processing,
+          completed,
+          failed,
+          missing: total - statuses.length,
+          done: pending + processing === 0,
+          percentComplete: total > 0 ? Math.round((finished / total) * 100) : 100,
+          items
+        }
+      };
+    } catch (error) {
+      return {
+        success: false,
+        error: error instanceof Error ? error : new Error('Unknown error occurred')
+      };
+    }
+  }
+}
@@ -0,0 +1,75 @@
+import { ListVoiceNotesUseCase } from './ListVoiceNotesUseCase';
+import { ValidationError } from '../base/Result';
+
+function item(id: string, createdAt: string): any {
+  return {
+    id,
+    userId: 'user-1',
+    title: `${id}.m4a`,
+    fileSize: 1024,
+    mimeType: 'audio/m4a',
+    language: 'EN',
+    status: 'completed',
+    tags: [],
+    aiGeneratedTitle: `Note ${id}`,
+    createdAt: new Date(createdAt),
+    updatedAt: new Date(createdAt),
+    hasTranscription: true,
+    hasSummary: false
+  };
+}
+
+describe('ListVoiceNotesUseCase', () => {
+  let repository: any;
+  let useCase: ListVoiceNotesUseCase;
+
+  beforeEach(() => {
+    repository = {
+      list: jest.fn(),
+      search: jest.fn()
+    };
+    useCase = new ListVoiceNotesUseCase(repository);
+  });
+
+  it('round-trips the keyset cursor and skips counting by default', async () => {
+    repository.list.mockResolvedValueOnce({
+      items: [item('b', '2026-10-02T00:00:00Z'), item('a', '2026-10-01T00:00:00Z')],
+      hasNext: true,
+      next: { createdAt: new Date('2026-10-01T00:00:00Z'), id: 'a' }
+    });
+
+    const first = await useCase.execute({ userId: 'user-1', limit: 2, cursor: '' });
+
+    expect(first.success).toBe(true);
+    const data = (first as any).data;
+    expect(repository.list.mock.calls[0][1]).toMatchObject({ keyset: true, after: undefined, count: 'none', limit: 2 });
+    expect(data.items.map((i: any) => i.displayTitle)).toEqual(['Note b', 'Note a']);
+    expect(data.pagination).toMatchObject({ hasNext: true, limit: 2 });
+    expect(data.pagination.total).toBeUndefined();
+
+    repository.list.mockResolvedValueOnce({ items: [], hasNext: false });
+    const second = await useCase.execute({ userId: 'user-1', limit: 2, cursor: data.pagination.nextCursor });
+
+    expect(repository.list.mock.calls[1][1].after).toEqual({ createdAt: new Date('2026-10-01T00:00:00Z'), id: 'a' });
+    expect((second as any).data.pagination.nextCursor).toBeNull();
+  });
+
+  it('rejects a malformed cursor', async () => {
+    const result = await useCase.execute({ userId: 'user-1', cursor: 'not-a-cursor' });
+
+    expect(result.success).toBe(false);
+    expect((result as any).error).toBeInstanceOf(ValidationError);
+    expect(repository.list).not.toHaveBeenCalled();
+  });
+
+  it('keeps offset pagination with an exact total when no cursor is given', async () => {
+    repository.list.mockResolvedValue({ items: [item('a', '2026-10-01T00:00:00Z')], hasNext: true, total: 41 });
+
+    const result = await useCase.execute({ userId: 'user-1', page: 2, limit: 20, sortBy: 'updatedAt' });
+
+    expect(repository.list.mock.calls[0][1]).toMatchObject({ page: 2, count: 'exact', sortBy: 'processedAt' });
+    expect((result as any).data.pagination).toMatchObject({
+      page: 2, total: 41, totalPages: 3, hasNext: true, hasPrevious: true
+    });
+  });
+});
@@ -1,6 +1,13 @@
 import { UseCase } from '../base/UseCase';
-import { Result } from '../base/Result';
-import { VoiceNoteRepository, VoiceNoteFilter } from '../../domain/repositories/VoiceNoteRepository';
+import { Result, ValidationError } from '../base/Result';
+import {
+  VoiceNoteRepository,
+  VoiceNoteFilter,
+  VoiceNoteListCursor,
+  VoiceNoteListItem,
+  PaginationOptions
+} from '../../domain/repositories/VoiceNoteRepository';
+import { VoiceNote } from '../../domain/entities/VoiceNote';
 
 export interface ListVoiceNotesInput {
   userId?: string;
@@ -17,8 +24,19 @@ export interface ListVoiceNotesInput {
   };
   sortBy?: 'createdAt' | 'updatedAt' | 'title';
   sortOrder?: 'asc' | 'desc';
+  // Keyset pagination: '' for the first page, then pagination.nextCursor
+  cursor?: string;
+  count?: 'exact' | 'estimate' | 'none';
 }
 
+type ListItem = ListVoiceNotesOutput['items'][number];
+
+const SORT_FIELDS: Record<string, PaginationOptions['sortBy']> = {
+  createdAt: 'uploadedAt',
+  updatedAt: 'processedAt',
+  title: 'fileName'
+};
+
 export interface ListVoiceNotesOutput {
   items: Array<{
     id: string;
@@ -38,17 +56,39 @@ export interface ListVoiceNotesOutput {
     updatedAt: Date;
     hasSummary: boolean;
     hasTranscription: boolean;
+    snippet?: string;  // Matched text when searching
   }>;
   pagination: {
-    page: number;
+    page?: number;            // offset pagination only
     limit: number;
-    total: number;
-    totalPages: number;
+    total?: number;           // omitted when count is 'none'
+    totalIsEstimate?: boolean;  // total was capped (count: 'estimate')
+    totalPages?: number;
     hasNext: boolean;
-    hasPrevious: boolean;
+    hasPrevious?: boolean;
+    nextCursor?: string | null;  // keyset pagination only; null on the last page
   };
 }
 
+function encodeCursor(cursor: VoiceNoteListCursor): string {
+  return Buffer.from(JSON.stringify([cursor.createdAt.getTime(), cursor.id])).toString('base64url');
+}
+
+function decodeCursor(value: string): VoiceNoteListCursor | undefined {
+  if (!value) {
+    return undefined;
+  }
+  try {
+    const [createdAt, id] = JSON.parse(Buffer.from(value, 'base64url').toString('utf8'));
+    if (typeof createdAt === 'number' && typeof id === 'string') {
+      return { createdAt: new Date(createdAt), id };
+    }
+  } catch {
+    // fall through
+  }
+  throw new ValidationError('Invalid pagination cursor');
+}
+
 export class ListVoiceNotesUseCase extends UseCase<
   ListVoiceNotesInput,
   Result<ListVoiceNotesOutput>
@@ -64,54 +104,81 @@ export class ListVoiceNotesUseCase extends UseCase<
       const page = input.page || 1;
       const limit = input.limit || 20;
 
+      const search = input.filter?.search?.trim();
+
       // Build filter
       const filter: VoiceNoteFilter = {
         userId: input.userId,
         status: input.filter?.status,
         language: input.filter?.language,
         tags: input.filter?.tags,
-        search: input.filter?.search,
-        startDate: input.filter?.startDate,
-        endDate: input.filter?.endDate,
+        searchQuery: search || undefined,
+        fromDate: input.filter?.startDate,
+        toDate: input.filter?.endDate,
         sessionId: (input.filter as any)?.sessionId
+      } as any;
+
+      const pagination = {
+        page,
+        pageSize: limit,
+        sortBy: SORT_FIELDS[input.sortBy || 'createdAt'] || 'uploadedAt',
+        sortOrder: (input.sortOrder as 'asc' | 'desc') || 'desc'
       };
 
-      // Get paginated results
-      const result = await this.voiceNoteRepository.findByUserId(
-        input.userId || '',
-        {
+      // Keyset pages skip counting unless asked; offset pages keep the exact total
+      if (input.cursor !== undefined && !search) {
+        if (input.sortBy && input.sortBy !== 'createdAt') {
+          throw new ValidationError('Cursor pagination is only available sorted by createdAt');
+        }
+        const listed = await this.voiceNoteRepository.list(input.userId || '', {
+          limit,
+          keyset: true,
+          after: decodeCursor(input.cursor),
+          sortOrder: pagination.sortOrder,
+          count: input.count || 'none'
+        }, filter);
+
+        return {
+          success: true,
+          data: {
+            items: listed.items.map(item => this.fromListItem(item)),
+            pagination: {
+              limit,
+              total: listed.total,
+              totalIsEstimate: listed.totalIsEstimate,
+              hasNext: listed.hasNext,
+              nextCursor: listed.next ? encodeCursor(listed.next) : null
+            }
+          }
+        };
+      }
+
+      // Searches go through the full-text index and come back ranked with snippets
+      let items: ListItem[];
+      let total: number | undefined;
+      let totalIsEstimate: boolean | undefined;
+      let hasNext: boolean;
+      if (search) {
+        const result = await this.voiceNoteRepository.search(input.userId || '', search, pagination, filter);
+        items = result.items.map(({ voiceNote, snippet }) => ({ ...this.fromVoiceNote(voiceNote), snippet }));
+        total = result.total;
+        hasNext = page < Math.ceil(result.total / limit);
+      } else {
+        const listed = await this.voiceNoteRepository.list(input.userId || '', {
+          limit,
           page,
-          pageSize: limit,
-          sortBy: (input.sortBy as any) || 'uploadedAt',
-          sortOrder: (input.sortOrder as 'asc' | 'desc') || 'desc'
-        },
-        filter
-      );
-
-      // Map voice notes to output format
-      const items = result.items.map(voiceNote => ({
-        id: voiceNote.getId().toString(),
-        userId: voiceNote.getUserId() || '',  // Handle optional userId
-        title: voiceNote.getTitle(),
-        originalFilename: voiceNote.getTitle(),  // Add original filename explicitly
-        fileSize: voiceNote.getFileSize(),
-        mimeType: voiceNote.getMimeType(),
-        language: voiceNote.getLanguage().getValue(),
-        status: voiceNote.getStatus().getValue() as string,  // Cast to string
-        tags: voiceNote.getTags(),
-        duration: voiceNote.getDuration(),  // Include audio duration
-        aiGeneratedTitle: voiceNote.getAIGeneratedTitle(),  // Include AI title
-        briefDescription: voiceNote.getBriefDescription(),  // Include description
-        derivedDate: voiceNote.getDerivedDate(),  // Include derived date
-        displayTitle: voiceNote.getDisplayTitle(),  // Include display title
-        createdAt: voiceNote.getCreatedAt(),
-        updatedAt: voiceNote.getUpdatedAt(),
-        hasSummary: !!voiceNote.getSummary(),
-        hasTranscription: !!voiceNote.getTranscription()
-      }));
+          sortBy: pagination.sortBy,
+          sortOrder: pagination.sortOrder,
+          count: input.count || 'exact'
+        }, filter);
+        items = listed.items.map(item => this.fromListItem(item));
+        total = listed.total;
+        totalIsEstimate = listed.totalIsEstimate;
+        hasNext = listed.hasNext;
+      }
 
       // Calculate pagination metadata
-      const totalPages = Math.ceil(result.total / limit);
+      const totalPages = total !== undefined ? Math.ceil(total / limit) : undefined;
 
       return {
         success: true,
@@ -120,9 +187,10 @@ export class ListVoiceNotesUseCase extends UseCase<
           pagination: {
             page,
             limit,
-            total: result.total,
+            total,
+            ...(totalIsEstimate !== undefined ? { totalIsEstimate } : {}),
             totalPages,
-            hasNext: page < totalPages,
+            hasNext,
             hasPrevious: page > 1
           }
         }
@@ -134,4 +202,50 @@ export class ListVoiceNotesUseCase extends UseCase<
       };
     }
   }
-}
\ No newline at end of file
+
+  private fromListItem(item: VoiceNoteListItem): ListItem {
+    return {
+      id: item.id,
+      userId: item.userId || '',  // Handle optional userId
+      title: item.title,
+      originalFilename: item.title,  // Add original filename explicitly
+      fileSize: item.fileSize,
+      mimeType: item.mimeType,
+      language: item.language,
+      status: item.status,
+      tags: item.tags,
+      duration: item.duration,
+      aiGeneratedTitle: item.aiGeneratedTitle,
+      briefDescription: item.briefDescription,
+      derivedDate: item.derivedDate,
+      displayTitle: item.aiGeneratedTitle || item.title,
+      createdAt: item.createdAt,
+      updatedAt: item.updatedAt,
+      hasSummary: item.hasSummary,
+      hasTranscription: item.hasTranscription
+    } as ListItem;
+  }
+
+  private fromVoiceNote(voiceNote: VoiceNote): ListItem {
+    return {
+      id: voiceNote.getId().toString(),
+      userId: voiceNote.getUserId() || '',  // Handle optional userId
+      title: voiceNote.getTitle(),
+      originalFilename: voiceNote.getTitle(),  // Add original filename explicitly
+      fileSize: voiceNote.getFileSize(),
+      mimeType: voiceNote.getMimeType(),
+      language: voiceNote.getLanguage().getValue(),
+      status: voiceNote.getStatus().getValue() as string,  // Cast to string
+      tags: voiceNote.getTags(),
+      duration: voiceNote.getDuration(),  // Include audio duration
+      aiGeneratedTitle: voiceNote.getAIGeneratedTitle(),  // Include AI title
+      briefDescription: voiceNote.getBriefDescription(),  // Include description
+      derivedDate: voiceNote.getDerivedDate(),  // Include derived date
+      displayTitle: voiceNote.getDisplayTitle(),  // Include display title
+      createdAt: voiceNote.getCreatedAt(),
+      updatedAt: voiceNote.getUpdatedAt(),
+      hasSummary: !!voiceNote.getSummary(),
+      hasTranscription: !!voiceNote.getTranscription()
+    } as ListItem;
+  }
+}
@@ -1,4 +1,5 @@
 import { PrismaClient } from '@prisma/client';
+import { UserCacheInvalidator } from '../../domain/services/UserCacheInvalidator';
 
 export interface MigrateAnonymousToUserRequest {
   sessionId: string;
@@ -12,7 +13,8 @@ export interface MigrateAnonymousToUserResponse {
 
 export class MigrateAnonymousToUserUseCase {
   constructor(
-    private readonly prisma: PrismaClient
+    private readonly prisma: PrismaClient,
+    private readonly userCache?: UserCacheInvalidator
   ) {}
 
   async execute(request: MigrateAnonymousToUserRequest): Promise<MigrateAnonymousToUserResponse> {
@@ -103,6 +105,9 @@ export class MigrateAnonymousToUserUseCase {
         };
       });
 
+      // creditsUsed changed outside the repository
+      this.userCache?.invalidateCachedUser(userId);
+
       console.log('Migration completed successfully', { 
         migrated: result.migrated,
         sessionId,
@@ -4,6 +4,7 @@ import { VoiceNoteRepository } from '../../domain/repositories/VoiceNoteReposito
 import { VoiceNoteId } from '../../domain/value-objects/VoiceNoteId';
 import { Language } from '../../domain/value-objects/Language';
 import { ProcessingOrchestrator } from '../services/ProcessingOrchestrator';
+import { ProcessingQueue } from '../services/ProcessingQueue';
 
 export interface ProcessVoiceNoteInput {
   voiceNoteId: string;
@@ -17,6 +18,7 @@ export interface ProcessVoiceNoteOutput {
   status: string;
   transcriptionId?: string;
   summaryId?: string;
+  jobId?: string;
 }
 
 export class ProcessVoiceNoteUseCase extends UseCase<
@@ -25,7 +27,8 @@ export class ProcessVoiceNoteUseCase extends UseCase<
 > {
   constructor(
     private readonly voiceNoteRepository: VoiceNoteRepository,
-    private readonly processingOrchestrator: ProcessingOrchestrator
+    private readonly processingOrchestrator: ProcessingOrchestrator,
+    private readonly processingQueue?: ProcessingQueue | null
   ) {
     super();
   }
@@ -51,6 +54,23 @@ export class ProcessVoiceNoteUseCase extends UseCase<
         };
       }
 
+      // Queued mode: hand off to the worker pool and return immediately
+      if (this.processingQueue) {
+        const job = await this.processingQueue.enqueue(input.voiceNoteId, {
+          language: input.language,
+          projectId: input.projectId
+        });
+
+        return {
+          success: true,
+          data: {
+            voiceNoteId: input.voiceNoteId,
+            status: voiceNote.getStatus().getValue(),
+            jobId: job.id
+          }
+        };
+      }
+
       // Process the voice note
       const processedVoiceNote = await this.processingOrchestrator.processVoiceNote(
         voiceNote,
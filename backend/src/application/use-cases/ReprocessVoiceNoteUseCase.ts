@@ -9,6 +9,7 @@ export interface ReprocessVoiceNoteInput {
   userPrompt?: string;  // Changed from newUserPrompt to match what's sent from API
   systemPromptVariables?: Record<string, string>;
   projectId?: string;  // Optional project ID for entity context
+  onSummaryDelta?: (text: string) => void;  // Streams the summary text as it is generated
 }
 
 export interface ReprocessVoiceNoteOutput {
@@ -70,7 +71,8 @@ export class ReprocessVoiceNoteUseCase extends UseCase<
         input.userPrompt,  // userPrompt (optional)
         undefined,  // model
         undefined,  // language
-        input.projectId  // projectId (optional)
+        input.projectId,  // projectId (optional)
+        { onSummaryDelta: input.onSummaryDelta }
       );
 
       // The reprocessVoiceNote returns a VoiceNote, not a result object
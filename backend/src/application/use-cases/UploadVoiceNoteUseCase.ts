@@ -14,7 +14,9 @@ export interface UploadVoiceNoteInput {
   sessionId?: string;  // For anonymous users
   projectId?: string;  // Optional project ID for entity context
   file: {
-    buffer: Buffer;
+    buffer?: Buffer;
+    path?: string;  // Already streamed to storage (see StorageService.saveStream)
+    sha256?: string;  // Content hash computed while streaming
     originalName: string;
     mimeType: string;
     size: number;
@@ -80,9 +82,9 @@ export class UploadVoiceNoteUseCase extends UseCase<
         return validationResult;
       }
 
-      // Save file to storage
-      const storagePath = await this.storageService.save(
-        input.file.buffer,
+      // Save file to storage (streamed uploads are already on disk)
+      const storagePath = input.file.path || await this.storageService.save(
+        input.file.buffer!,
         input.file.originalName,
         input.userId || input.sessionId || 'anonymous'
       );
@@ -91,10 +93,9 @@ export class UploadVoiceNoteUseCase extends UseCase<
       const title = this.extractTitleFromFilename(input.file.originalName);
 
       // Extract audio duration
-      const duration = await this.audioMetadataExtractor.extractDuration(
-        input.file.buffer,
-        input.file.mimeType
-      );
+      const duration = input.file.path
+        ? await this.audioMetadataExtractor.extractDurationFromFile(input.file.path, input.file.mimeType)
+        : await this.audioMetadataExtractor.extractDuration(input.file.buffer!, input.file.mimeType);
 
       // Create voice note entity
       const voiceNote = VoiceNote.create({
@@ -112,7 +113,8 @@ export class UploadVoiceNoteUseCase extends UseCase<
         transcriptionModel: input.transcriptionModel,
         geminiSystemPrompt: input.geminiSystemPrompt,
         geminiUserPrompt: input.geminiUserPrompt,
-        projectId: input.projectId
+        projectId: input.projectId,
+        fileHash: input.file.sha256
       });
 
       // Save to repository
@@ -145,7 +147,8 @@ export class UploadVoiceNoteUseCase extends UseCase<
   }
 
   private validateFile(file: {
-    buffer: Buffer;
+    buffer?: Buffer;
+    path?: string;
     originalName: string;
     mimeType: string;
     size: number;
@@ -183,8 +186,8 @@ export class UploadVoiceNoteUseCase extends UseCase<
       };
     }
 
-    // Check if buffer is not empty
-    if (!file.buffer || file.buffer.length === 0) {
+    // Check if file is not empty
+    if (file.size === 0 || (!file.path && (!file.buffer || file.buffer.length === 0))) {
       return {
         success: false,
         error: new ValidationError('File is empty')
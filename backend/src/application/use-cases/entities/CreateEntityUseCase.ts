@@ -1,5 +1,6 @@
 import { IEntityRepository } from '../../../domain/repositories/IEntityRepository';
 import { Entity } from '../../../domain/entities/Entity';
+import { EntityContextBuilder } from '../../services/EntityContextBuilder';
 
 interface CreateEntityInput {
   userId: string;
@@ -20,7 +21,8 @@ interface CreateEntityOutput {
 
 export class CreateEntityUseCase {
   constructor(
-    private entityRepository: IEntityRepository
+    private entityRepository: IEntityRepository,
+    private entityContextBuilder?: EntityContextBuilder
   ) {}
 
   async execute(input: CreateEntityInput): Promise<CreateEntityOutput> {
@@ -45,6 +47,7 @@ export class CreateEntityUseCase {
         aliases: input.aliases,
         description: input.description
       });
+      this.entityContextBuilder?.invalidateUser(input.userId);
 
       return {
         success: true,
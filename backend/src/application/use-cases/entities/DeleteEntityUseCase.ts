@@ -1,4 +1,5 @@
 import { IEntityRepository } from '../../../domain/repositories/IEntityRepository';
+import { EntityContextBuilder } from '../../services/EntityContextBuilder';
 
 interface DeleteEntityInput {
   entityId: string;
@@ -12,7 +13,8 @@ interface DeleteEntityOutput {
 
 export class DeleteEntityUseCase {
   constructor(
-    private entityRepository: IEntityRepository
+    private entityRepository: IEntityRepository,
+    private entityContextBuilder?: EntityContextBuilder
   ) {}
 
   async execute(input: DeleteEntityInput): Promise<DeleteEntityOutput> {
@@ -35,6 +37,7 @@ export class DeleteEntityUseCase {
 
       // Delete entity (cascade will handle ProjectEntity and EntityUsage relations)
       await this.entityRepository.delete(input.entityId);
+      this.entityContextBuilder?.invalidateUser(input.userId);
 
       return {
         success: true
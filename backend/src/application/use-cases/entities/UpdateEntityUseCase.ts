@@ -1,5 +1,6 @@
 import { IEntityRepository } from '../../../domain/repositories/IEntityRepository';
 import { Entity } from '../../../domain/entities/Entity';
+import { EntityContextBuilder } from '../../services/EntityContextBuilder';
 
 interface UpdateEntityInput {
   entityId: string;
@@ -21,7 +22,8 @@ interface UpdateEntityOutput {
 
 export class UpdateEntityUseCase {
   constructor(
-    private entityRepository: IEntityRepository
+    private entityRepository: IEntityRepository,
+    private entityContextBuilder?: EntityContextBuilder
   ) {}
 
   async execute(input: UpdateEntityInput): Promise<UpdateEntityOutput> {
@@ -60,6 +62,7 @@ export class UpdateEntityUseCase {
 
       // Update entity
       const updatedEntity = await this.entityRepository.update(input.entityId, updates);
+      this.entityContextBuilder?.invalidateUser(input.userId);
 
       return {
         success: true,
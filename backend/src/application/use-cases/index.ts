@@ -5,7 +5,10 @@ export { ListVoiceNotesUseCase } from './ListVoiceNotesUseCase';
 export { DeleteVoiceNoteUseCase } from './DeleteVoiceNoteUseCase';
 export { ReprocessVoiceNoteUseCase } from './ReprocessVoiceNoteUseCase';
 export { ExportVoiceNoteUseCase } from './ExportVoiceNoteUseCase';
+export { ExportVoiceNotesUseCase } from './ExportVoiceNotesUseCase';
 export { MigrateAnonymousToUserUseCase } from './MigrateAnonymousToUserUseCase';
+export { CreateProcessingBatchUseCase } from './CreateProcessingBatchUseCase';
+export { GetProcessingBatchUseCase } from './GetProcessingBatchUseCase';
 
 export type { UploadVoiceNoteInput, UploadVoiceNoteOutput } from './UploadVoiceNoteUseCase';
 export type { ProcessVoiceNoteInput, ProcessVoiceNoteOutput } from './ProcessVoiceNoteUseCase';
@@ -13,4 +16,7 @@ export type { GetVoiceNoteInput, GetVoiceNoteOutput } from './GetVoiceNoteUseCas
 export type { ListVoiceNotesInput, ListVoiceNotesOutput } from './ListVoiceNotesUseCase';
 export type { DeleteVoiceNoteInput, DeleteVoiceNoteOutput } from './DeleteVoiceNoteUseCase';
 export type { ReprocessVoiceNoteInput, ReprocessVoiceNoteOutput } from './ReprocessVoiceNoteUseCase';
-export type { ExportVoiceNoteInput, ExportVoiceNoteOutput } from './ExportVoiceNoteUseCase';
\ No newline at end of file
+export type { ExportVoiceNoteInput, ExportVoiceNoteOutput } from './ExportVoiceNoteUseCase';
+export type { ExportVoiceNotesInput, ExportVoiceNotesOutput } from './ExportVoiceNotesUseCase';
+export type { CreateProcessingBatchInput, CreateProcessingBatchOutput } from './CreateProcessingBatchUseCase';
+export type { GetProcessingBatchInput, GetProcessingBatchOutput } from './GetProcessingBatchUseCase';
\ No newline at end of file
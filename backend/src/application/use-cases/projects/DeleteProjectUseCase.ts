@@ -1,4 +1,5 @@
 import { IProjectRepository } from '../../../domain/repositories/IProjectRepository';
+import { EntityContextBuilder } from '../../services/EntityContextBuilder';
 
 interface DeleteProjectInput {
   projectId: string;
@@ -12,7 +13,8 @@ interface DeleteProjectOutput {
 
 export class DeleteProjectUseCase {
   constructor(
-    private projectRepository: IProjectRepository
+    private projectRepository: IProjectRepository,
+    private entityContextBuilder?: EntityContextBuilder
   ) {}
 
   async execute(input: DeleteProjectInput): Promise<DeleteProjectOutput> {
@@ -35,6 +37,7 @@ export class DeleteProjectUseCase {
 
       // Delete project (cascade will handle ProjectEntity and ProjectNote relations)
       await this.projectRepository.delete(input.projectId);
+      this.entityContextBuilder?.invalidateProject(input.projectId);
 
       return {
         success: true
@@ -1,5 +1,6 @@
 import { IProjectRepository } from '../../../domain/repositories/IProjectRepository';
 import { IEntityRepository } from '../../../domain/repositories/IEntityRepository';
+import { EntityContextBuilder } from '../../services/EntityContextBuilder';
 
 interface ManageProjectEntitiesInput {
   projectId: string;
@@ -20,7 +21,8 @@ interface ManageProjectEntitiesOutput {
 export class ManageProjectEntitiesUseCase {
   constructor(
     private projectRepository: IProjectRepository,
-    private entityRepository: IEntityRepository
+    private entityRepository: IEntityRepository,
+    private entityContextBuilder?: EntityContextBuilder
   ) {}
 
   async execute(input: ManageProjectEntitiesInput): Promise<ManageProjectEntitiesOutput> {
@@ -70,6 +72,10 @@ export class ManageProjectEntitiesUseCase {
         }
       }
 
+      if (affectedCount > 0) {
+        this.entityContextBuilder?.invalidateProject(input.projectId);
+      }
+
       const actionVerb = input.action === 'add' ? 'added to' : 'removed from';
       return {
         success: true,
@@ -55,6 +55,7 @@ export class ConfigLoader {
         ...config.server,
         port: process.env.PORT ? parseInt(process.env.PORT) : config.server?.port,
         host: process.env.HOST || config.server?.host,
+        workers: process.env.WORKERS ? parseInt(process.env.WORKERS) : config.server?.workers,
       },
       database: {
         ...config.database,
@@ -62,12 +63,14 @@ export class ConfigLoader {
       },
       transcription: {
         ...config.transcription,
+        apiUrl: process.env.TRANSCRIPTION_API_URL || config.transcription?.apiUrl,
         apiKey: config.transcription?.provider === 'openrouter'
           ? (process.env.OPENROUTER_API_KEY || config.transcription?.apiKey)
           : (process.env.OPENAI_API_KEY || config.transcription?.apiKey),
       },
       summarization: {
         ...config.summarization,
+        apiUrl: process.env.SUMMARIZATION_API_URL || config.summarization?.apiUrl,
         apiKey: config.summarization?.provider === 'openrouter' 
           ? (process.env.OPENROUTER_API_KEY || config.summarization?.apiKey)
           : (process.env.OPENAI_API_KEY || config.summarization?.apiKey),
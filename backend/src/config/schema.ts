@@ -4,9 +4,16 @@ export const configSchema = z.object({
   server: z.object({
     port: z.number().min(1).max(65535).default(3001),
     host: z.string().default('0.0.0.0'),
+    workers: z.number().min(0).default(1),  // >1 = cluster mode, 0 = one worker per CPU core
   }),
   database: z.object({
     url: z.string().default('file:/data/nano-grazynka.db'),
+    busyTimeoutMs: z.number().default(5000),  // How long a writer waits for the SQLite lock held by another process
+    eventBuffer: z.object({
+      enabled: z.boolean().default(true),
+      maxBatchSize: z.number().default(100),
+      flushIntervalMs: z.number().default(10),  // Longest an append waits for its group commit
+    }).default({ enabled: true, maxBatchSize: 100, flushIntervalMs: 10 }),
   }),
   transcription: z.object({
     provider: z.enum(['openai', 'openrouter']).default('openai'),
@@ -16,6 +23,56 @@ export const configSchema = z.object({
     apiUrl: z.string().optional(),
     maxFileSizeMB: z.number().default(25),
     supportedFormats: z.array(z.string()).default(['mp3', 'mp4', 'mpeg', 'mpga', 'm4a', 'wav', 'webm']),
+    cache: z.object({
+      enabled: z.boolean().default(true),
+      maxEntries: z.number().default(5000),
+      maxAgeDays: z.number().default(90),
+    }).default({ enabled: true, maxEntries: 5000, maxAgeDays: 90 }),
+    chunking: z.object({
+      enabled: z.boolean().default(true),
+      minDurationSec: z.number().default(600),  // Shorter recordings go out in one request
+      targetChunkSec: z.number().default(300),
+      maxChunkSec: z.number().default(420),
+      overlapSec: z.number().default(2),
+      maxParallel: z.number().default(4),
+      silenceNoiseDb: z.number().default(-35),
+      minSilenceSec: z.number().default(0.5),
+    }).refine(
+      // Every chunk must move the plan forward, see AudioSegmenter.planSegments
+      chunking => chunking.overlapSec >= 0 &&
+        chunking.overlapSec < chunking.targetChunkSec &&
+        chunking.targetChunkSec <= chunking.maxChunkSec,
+      { message: 'chunking needs 0 <= overlapSec < targetChunkSec <= maxChunkSec' }
+    ).default({
+      enabled: true,
+      minDurationSec: 600,
+      targetChunkSec: 300,
+      maxChunkSec: 420,
+      overlapSec: 2,
+      maxParallel: 4,
+      silenceNoiseDb: -35,
+      minSilenceSec: 0.5,
+    }),
+    preprocessing: z.object({
+      enabled: z.boolean().default(true),
+      format: z.enum(['opus', 'mp3', 'flac']).default('opus'),
+      sampleRate: z.number().default(16000),
+      bitrateKbps: z.number().default(24),  // Ignored for flac
+      trimSilence: z.boolean().default(true),
+      silenceNoiseDb: z.number().default(-45),
+      minSilenceSec: z.number().default(0.5),
+    }).default({
+      enabled: true,
+      format: 'opus',
+      sampleRate: 16000,
+      bitrateKbps: 24,
+      trimSilence: true,
+      silenceNoiseDb: -45,
+      minSilenceSec: 0.5,
+    }),
+    models: z.record(z.string(), z.object({
+      maxPromptTokens: z.number().optional(),  // Provider limit for the transcription prompt
+    }).passthrough()).default({}),
   }),
   summarization: z.object({
     provider: z.enum(['openai', 'openrouter']).default('openai'),
@@ -38,12 +95,76 @@ export const configSchema = z.object({
   }),
   storage: z.object({
     uploadDir: z.string().default('/data/uploads'),
-    maxFileAgeDays: z.number().default(30),
+    maxFileAgeDays: z.number().default(30),  // Audio of completed notes untouched this long is deleted; 0 = keep
+    gc: z.object({
+      enabled: z.boolean().default(true),
+      intervalMs: z.number().default(60000),
+      batchSize: z.number().default(500),  // Files looked at per query
+      maxDeletesPerSecond: z.number().default(100),  // 0 = unlimited
+      orphanGraceMinutes: z.number().default(60),  // Unreferenced files are kept this long before they are reclaimed
+    }).default({ enabled: true, intervalMs: 60000, batchSize: 500, maxDeletesPerSecond: 100, orphanGraceMinutes: 60 }),
   }),
   processing: z.object({
     maxConcurrentJobs: z.number().default(3),
     jobTimeoutMinutes: z.number().default(30),
     retryAttempts: z.number().default(3),
+    queueType: z.enum(['sqlite', 'inline']).default('sqlite'),  // inline = process within the request
+    pollIntervalMs: z.number().default(1000),
+    retryBackoffMs: z.number().default(5000),
+    batchMaxItems: z.number().default(500),  // Voice notes per POST /api/voice-notes/batches
+    jobLeaseMs: z.number().default(60000),  // Cluster mode: running jobs not renewed within this are taken over
+  }),
+  rateLimit: z.object({
+    store: z.enum(['memory', 'sqlite']).default('memory'),  // sqlite = shared by all processes on the database
+    maxKeys: z.number().default(100000),  // Memory store: least recently seen keys are evicted beyond this
+  }).default({ store: 'memory', maxKeys: 100000 }),
+  entityContext: z.object({
+    maxPromptTokens: z.object({
+      gpt4o: z.number().default(150),  // Also capped by transcription.models.<model>.maxPromptTokens
+      gemini: z.number().default(8000),
+    }).default({ gpt4o: 150, gemini: 8000 }),
+    recencyHalfLifeDays: z.number().default(30),  // A usage this old counts half as much as one today
+  }).default({ maxPromptTokens: { gpt4o: 150, gemini: 8000 }, recencyHalfLifeDays: 30 }),
+  auth: z.object({
+    userCache: z.object({
+      enabled: z.boolean().default(true),
+      ttlMs: z.number().default(30000),  // Longest another process's tier/credit change goes unseen
+      maxEntries: z.number().default(10000),  // Users and sessions each; least recently used evicted beyond this
+    }).default({ enabled: true, ttlMs: 30000, maxEntries: 10000 }),
+  }).default({ userCache: { enabled: true, ttlMs: 30000, maxEntries: 10000 } }),
+  providers: z.object({
+    keepAliveMs: z.number().default(30000),  // Idle pooled connections are closed after this
+    maxSockets: z.number().default(32),  // Connections per base URL
+    timeoutMs: z.number().default(120000),  // Abandon a request with no bytes moving for this long
+    slowRequestMs: z.number().default(60000),  // Slower answers count as congestion; 0 = latency is ignored
+    maxRetries: z.number().default(3),  // 429s retried after Retry-After
+    initialConcurrency: z.number().default(4),
+    minConcurrency: z.number().default(1),
+    maxConcurrency: z.number().default(16),
+    backoffRatio: z.number().min(0.1).max(0.9).default(0.5),  // Limit multiplier on 429/503/timeout
+    circuitBreaker: z.object({
+      failureThreshold: z.number().default(5),  // Consecutive 5xx/network failures
+      openMs: z.number().default(30000),
+    }).default({ failureThreshold: 5, openMs: 30000 }),
+    endpoints: z.record(z.string(), z.object({  // Overrides by base URL prefix
+      timeoutMs: z.number().optional(),
+      slowRequestMs: z.number().optional(),
+      initialConcurrency: z.number().optional(),
+      minConcurrency: z.number().optional(),
+      maxConcurrency: z.number().optional(),
+    })).default({}),
+  }).default({
+    keepAliveMs: 30000,
+    maxSockets: 32,
+    timeoutMs: 120000,
+    slowRequestMs: 60000,
+    maxRetries: 3,
+    initialConcurrency: 4,
+    minConcurrency: 1,
+    maxConcurrency: 16,
+    backoffRatio: 0.5,
+    circuitBreaker: { failureThreshold: 5, openMs: 30000 },
+    endpoints: {},
   }),
 });
 
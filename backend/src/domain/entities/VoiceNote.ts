@@ -13,6 +13,23 @@ import {
   VoiceNoteReprocessedEvent
 } from '../events/VoiceNoteEvents';
 
+// Columns that can change after upload; the repository writes only the dirty ones
+export type VoiceNoteMutableField =
+  | 'status'
+  | 'errorMessage'
+  | 'tags'
+  | 'duration'
+  | 'aiGeneratedTitle'
+  | 'briefDescription'
+  | 'derivedDate'
+  | 'version';
+
+export interface VoiceNoteChanges {
+  fields: VoiceNoteMutableField[];
+  transcription: boolean;
+  summary: boolean;
+}
+
 export class VoiceNote {
   private id: VoiceNoteId;
   private userId?: string;  // Made optional for anonymous users
@@ -43,7 +60,13 @@ export class VoiceNote {
   private aiGeneratedTitle?: string;
   private briefDescription?: string;
   private derivedDate?: Date;
+  private fileHash?: string;  // sha256 of the audio, keys the transcription cache
   private domainEvents: any[] = [];
+  // Change tracking since the last load/save; a note that was never saved is written in full
+  private persisted = false;
+  private dirtyFields = new Set<VoiceNoteMutableField>();
+  private transcriptionDirty = false;
+  private summaryDirty = false;
 
   private constructor(
     id: VoiceNoteId,
@@ -71,7 +94,8 @@ export class VoiceNote {
     derivedDate?: Date,  // Date extracted from content
     createdAt?: Date,
     updatedAt?: Date,
-    version?: number
+    version?: number,
+    fileHash?: string  // sha256 of the uploaded audio
   ) {
 
     
@@ -101,6 +125,7 @@ export class VoiceNote {
     this.createdAt = createdAt || new Date();
     this.updatedAt = updatedAt || new Date();
     this.version = version || 1;
+    this.fileHash = fileHash;
   }
 
   static create(params: {
@@ -120,6 +145,7 @@ export class VoiceNote {
     geminiUserPrompt?: string;
     refinementPrompt?: string;
     projectId?: string;  // Entity Project System
+    fileHash?: string;  // sha256 of the uploaded audio
   }): VoiceNote {
     const voiceNote = new VoiceNote(
       VoiceNoteId.generate(),
@@ -147,14 +173,15 @@ export class VoiceNote {
       undefined,  // derivedDate - will use default
       undefined,  // createdAt - will use default
       undefined,  // updatedAt - will use default
-      undefined   // version - will use default
+      undefined,  // version - will use default
+      params.fileHash
     );
 
     voiceNote.addDomainEvent(new VoiceNoteUploadedEvent(voiceNote.id.getValue(), {
       userId: params.userId || 'anonymous',
       sessionId: params.sessionId,
       fileName: params.originalFilePath,
-      fileHash: '',
+      fileHash: params.fileHash || '',
       fileSizeBytes: params.fileSize,
       durationSeconds: 0,
       language: params.language.getValue()
@@ -188,7 +215,8 @@ export class VoiceNote {
     derivedDate?: Date,  // Date extracted from content
     createdAt?: Date,
     updatedAt?: Date,
-    version?: number
+    version?: number,
+    fileHash?: string
   ): VoiceNote {
     return new VoiceNote(
       id,
@@ -216,7 +244,8 @@ export class VoiceNote {
       derivedDate,
       createdAt,
       updatedAt,
-      version
+      version,
+      fileHash
     );
   }
 
@@ -233,6 +262,10 @@ export class VoiceNote {
     return this.sessionId;
   }
 
+  getFileHash(): string | undefined {
+    return this.fileHash;
+  }
+
   getUserPrompt(): string | undefined {
     return this.userPrompt;
   }
@@ -283,17 +316,17 @@ export class VoiceNote {
 
   setAIGeneratedTitle(title: string): void {
     this.aiGeneratedTitle = title;
-    this.updatedAt = new Date();
+    this.touch('aiGeneratedTitle');
   }
 
   setBriefDescription(description: string): void {
     this.briefDescription = description;
-    this.updatedAt = new Date();
+    this.touch('briefDescription');
   }
 
   setDerivedDate(date: Date): void {
     this.derivedDate = date;
-    this.updatedAt = new Date();
+    this.touch('derivedDate');
   }
 
   getTitle(): string {
@@ -314,7 +347,7 @@ export class VoiceNote {
 
   setDuration(duration: number): void {
     this.duration = duration;
-    this.updatedAt = new Date();
+    this.touch('duration');
   }
 
   getMimeType(): string {
@@ -365,6 +398,30 @@ export class VoiceNote {
     this.domainEvents = [];
   }
 
+  isPersisted(): boolean {
+    return this.persisted;
+  }
+
+  getChanges(): VoiceNoteChanges {
+    return {
+      fields: [...this.dirtyFields],
+      transcription: this.transcriptionDirty,
+      summary: this.summaryDirty
+    };
+  }
+
+  hasChanges(): boolean {
+    return this.dirtyFields.size > 0 || this.transcriptionDirty || this.summaryDirty;
+  }
+
+  // Called by the repository once the current state is in storage
+  markPersisted(): void {
+    this.persisted = true;
+    this.dirtyFields.clear();
+    this.transcriptionDirty = false;
+    this.summaryDirty = false;
+  }
+
   // Business methods
   startProcessing(): void {
     const currentStatus = this.status.getValue();
@@ -372,12 +429,13 @@ export class VoiceNote {
       throw new Error('Can only start processing for pending or failed voice notes');
     }
     this.status = new ProcessingStatus(ProcessingStatusValue.PROCESSING);
-    this.updatedAt = new Date();
+    this.touch('status');
     this.addDomainEvent(new VoiceNoteProcessingStartedEvent(this.id.getValue()));
   }
 
   addTranscription(transcription: Transcription): void {
     this.transcription = transcription;
+    this.transcriptionDirty = true;
     this.updatedAt = new Date();
     this.addDomainEvent(new VoiceNoteTranscribedEvent(
       this.id.getValue(),
@@ -392,6 +450,7 @@ export class VoiceNote {
 
   addSummary(summary: Summary): void {
     this.summary = summary;
+    this.summaryDirty = true;
     this.updatedAt = new Date();
     this.addDomainEvent(new VoiceNoteSummarizedEvent(
       this.id.getValue(),
@@ -410,7 +469,7 @@ export class VoiceNote {
     }
     this.status = new ProcessingStatus(ProcessingStatusValue.COMPLETED);
     this.errorMessage = undefined;
-    this.updatedAt = new Date();
+    this.touch('status', 'errorMessage');
     this.addDomainEvent(new VoiceNoteProcessingCompletedEvent(this.id.getValue(), {
       processingTimeMs: 0
     }));
@@ -419,16 +478,26 @@ export class VoiceNote {
   markAsFailed(error: string): void {
     this.status = new ProcessingStatus(ProcessingStatusValue.FAILED);
     this.errorMessage = error;
-    this.updatedAt = new Date();
+    this.touch('status', 'errorMessage');
     this.addDomainEvent(new VoiceNoteProcessingFailedEvent(this.id.getValue(), {
       error,
       failedAt: new Date().toISOString()
     }));
   }
 
+  // Return to pending after a failed or interrupted attempt that will be retried
+  scheduleRetry(error: string): void {
+    if (this.status.getValue() !== ProcessingStatusValue.PROCESSING) {
+      throw new Error('Can only schedule a retry from processing status');
+    }
+    this.status = new ProcessingStatus(ProcessingStatusValue.PENDING);
+    this.errorMessage = error;
+    this.touch('status', 'errorMessage');
+  }
+
   updateTags(tags: string[]): void {
     this.tags = tags;
-    this.updatedAt = new Date();
+    this.touch('tags');
   }
 
   reprocess(): void {
@@ -437,13 +506,18 @@ export class VoiceNote {
     }
     this.status = new ProcessingStatus(ProcessingStatusValue.PENDING);
     this.errorMessage = undefined;
-    this.updatedAt = new Date();
     this.version += 1;
+    this.touch('status', 'errorMessage', 'version');
     this.addDomainEvent(new VoiceNoteReprocessedEvent(this.id.getValue(), {
       reason: 'User requested reprocessing'
     }));
   }
 
+  private touch(...fields: VoiceNoteMutableField[]): void {
+    fields.forEach(field => this.dirtyFields.add(field));
+    this.updatedAt = new Date();
+  }
+
   private addDomainEvent(event: any): void {
     this.domainEvents.push(event);
   }
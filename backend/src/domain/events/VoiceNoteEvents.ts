@@ -54,7 +54,9 @@ export class VoiceNoteProcessingCompletedEvent extends BaseDomainEvent {
   constructor(
     voiceNoteId: string,
     payload: {
-      processingTimeMs: number;
+      processingTimeMs: number;  // Since upload, including time spent queued
+      pipelineTimeMs?: number;
+      stageTimingsMs?: Record<string, number>;
     }
   ) {
     super(voiceNoteId, 'VoiceNoteProcessingCompleted', payload);
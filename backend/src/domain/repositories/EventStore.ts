@@ -4,4 +4,5 @@ export interface EventStore {
   append(event: DomainEvent): Promise<void>;
   getEvents(aggregateId: string): Promise<DomainEvent[]>;
   getAllEvents(fromDate?: Date): Promise<DomainEvent[]>;
+  streamEvents(fromDate?: Date, batchSize?: number): AsyncIterable<DomainEvent>;
 }
\ No newline at end of file
@@ -10,6 +10,13 @@ export interface EntityUsageRecord {
   createdAt?: Date;
 }
 
+export interface EntityUsageStats {
+  totalUsage: number;
+  correctUsage: number;
+  correctionRate: number;
+  lastUsedAt?: Date;
+}
+
 export interface IEntityUsageRepository {
   trackUsage(records: EntityUsageRecord[]): Promise<void>;
   findByVoiceNote(voiceNoteId: string): Promise<EntityUsageRecord[]>;
@@ -20,9 +27,7 @@ export interface IEntityUsageRepository {
     originalText?: string,
     correctedText?: string
   ): Promise<void>;
-  getUsageStats(entityId: string): Promise<{
-    totalUsage: number;
-    correctUsage: number;
-    correctionRate: number;
-  }>;
+  getUsageStats(entityId: string): Promise<EntityUsageStats>;
+  // Stats of every entity of the user that has usage records, in one query
+  getUsageStatsByUser(userId: string): Promise<Map<string, EntityUsageStats>>;
 }
\ No newline at end of file
@@ -0,0 +1,22 @@
+export interface ProcessingBatch {
+  id: string;
+  userId: string;
+  voiceNoteIds: string[];  // Submission order
+  language?: string;
+  projectId?: string;
+  createdAt: Date;
+}
+
+export interface ProcessingBatchItemStatus {
+  voiceNoteId: string;
+  title: string;
+  status: string;
+  errorMessage?: string;
+}
+
+export interface ProcessingBatchRepository {
+  create(batch: Omit<ProcessingBatch, 'id' | 'createdAt'>): Promise<ProcessingBatch>;
+  findById(id: string): Promise<ProcessingBatch | null>;
+  // Current status of every note in a batch with a single query, whatever the batch size
+  findItemStatuses(voiceNoteIds: string[]): Promise<ProcessingBatchItemStatus[]>;
+}
@@ -0,0 +1,49 @@
+export type ProcessingJobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export interface ProcessingJobPayload {
+  language?: string;
+  projectId?: string;
+}
+
+export interface ProcessingJob {
+  id: string;
+  voiceNoteId: string;
+  status: ProcessingJobStatus;
+  payload: ProcessingJobPayload;
+  attempts: number;
+  maxAttempts: number;
+  runAfter: Date;
+  lockedAt?: Date;
+  lockedBy?: string;  // Claim token: owner plus a per-claim nonce
+  lastError?: string;
+  createdAt: Date;
+  updatedAt: Date;
+  completedAt?: Date;
+}
+
+export interface ProcessingJobCounts {
+  queued: number;
+  running: number;
+  completed: number;
+  failed: number;
+  oldestQueuedAt?: Date;
+}
+
+export interface ProcessingJobRepository {
+  enqueue(voiceNoteId: string, payload: ProcessingJobPayload, maxAttempts: number): Promise<ProcessingJob>;
+  findActiveByVoiceNoteId(voiceNoteId: string): Promise<ProcessingJob | null>;
+  // Atomically move the next due job from queued to running, leased to `owner`
+  // under a fresh claim token (job.lockedBy); null when nothing is due
+  claimNext(owner: string, now?: Date): Promise<ProcessingJob | null>;
+  // Writes by the lease holder only apply while its claim still holds the job;
+  // false means the lease was lost and another worker may have the job
+  markCompleted(id: string, lockedBy: string): Promise<boolean>;
+  scheduleRetry(id: string, lockedBy: string, error: string, runAfter: Date): Promise<boolean>;
+  markFailed(id: string, lockedBy: string, error: string): Promise<boolean>;
+  // Extend the leases this process still holds; returns the IDs of jobs whose lease was lost
+  renewLeases(leases: Array<{ id: string; lockedBy: string }>, now?: Date): Promise<string[]>;
+  // Put running jobs whose lease was last renewed before staleBefore (all running jobs
+  // when omitted) back in the queue; returns their voice note IDs
+  requeueInterrupted(staleBefore?: Date): Promise<string[]>;
+  countByStatus(): Promise<ProcessingJobCounts>;
+}
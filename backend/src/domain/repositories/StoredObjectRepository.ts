@@ -0,0 +1,41 @@
+export interface StoredObject {
+  path: string;
+  hash?: string;
+  size: number;
+  refCount: number;
+  createdAt: Date;
+  touchedAt: Date;
+  expiredAt?: Date;
+}
+
+export interface StoredObjectTotals {
+  objects: number;  // Files on disk (not expired)
+  bytes: number;  // Their size on disk
+  referencedBytes: number;  // size x refCount: what the notes would take without deduplication
+  unreferenced: number;  // Waiting to be reclaimed
+  expired: number;  // Removed for age, still referenced by notes
+}
+
+/**
+ * Registry of the files in content-addressed storage. Reference counts are
+ * kept by VoiceNoteRepository (the VoiceNote rows pointing at a path);
+ * the storage reaper reads this to decide what to delete.
+ */
+export interface StoredObjectRepository {
+  // Called before a file is placed: creates the row or revives an expired one, and restarts its grace period
+  register(object: { path: string; hash: string; size: number }): Promise<void>;
+  // Whether a file at this path should exist: registered and not expired
+  isLive(path: string): Promise<boolean>;
+  // Unreferenced since before touchedBefore, oldest first
+  findReclaimable(touchedBefore: Date, limit: number): Promise<StoredObject[]>;
+  // Drop the row if it is still unreclaimed and untouched; false when an upload revived it meanwhile
+  claimReclaimable(path: string, touchedBefore: Date): Promise<boolean>;
+  // Referenced only by completed notes and untouched since touchedBefore, oldest first. Old files that an
+  // unfinished note still needs are touched instead, so they are looked at again a full period later
+  findAged(touchedBefore: Date, limit: number): Promise<StoredObject[]>;
+  // Mark the file expired if it is still untouched; false when it was uploaded or referenced again meanwhile
+  markExpired(path: string, touchedBefore: Date): Promise<boolean>;
+  // Recount references for the next `limit` paths after `afterPath`; returns the last path checked
+  reconcile(afterPath: string | undefined, limit: number): Promise<{ checked: number; corrected: number; lastPath?: string }>;
+  totals(): Promise<StoredObjectTotals>;
+}
@@ -0,0 +1,27 @@
+export interface TranscriptionCacheEntry {
+  cacheKey: string;
+  audioHash: string;
+  model: string;
+  text: string;
+  language: string;
+  duration: number;
+  confidence: number;
+  sizeBytes: number;
+  hitCount: number;
+  createdAt: Date;
+  lastHitAt: Date;
+}
+
+export interface TranscriptionCacheTotals {
+  entries: number;
+  totalBytes: number;
+}
+
+export interface TranscriptionCacheRepository {
+  findByKey(cacheKey: string): Promise<TranscriptionCacheEntry | null>;
+  save(entry: Omit<TranscriptionCacheEntry, 'hitCount' | 'createdAt' | 'lastHitAt'>): Promise<void>;
+  recordHit(cacheKey: string): Promise<void>;
+  // Drop entries not hit since olderThan, then the least recently hit beyond maxEntries; returns how many were removed
+  evict(olderThan: Date, maxEntries: number): Promise<number>;
+  totals(): Promise<TranscriptionCacheTotals>;
+}
@@ -0,0 +1,25 @@
+export interface UsageTotals {
+  notesProcessed: number;
+  secondsTranscribed: number;
+  creditsUsed: number;
+}
+
+export const ALL_TIME_PERIOD = 'all';
+
+// Aggregates are bucketed by UTC calendar month, e.g. "2026-10"
+export function usagePeriod(at: Date): string {
+  return at.toISOString().slice(0, 7);
+}
+
+export function emptyUsageTotals(): UsageTotals {
+  return { notesProcessed: 0, secondsTranscribed: 0, creditsUsed: 0 };
+}
+
+export interface UsageAggregateRepository {
+  // Adds to the month of `at` and to the all-time row
+  increment(userId: string, at: Date, delta: Partial<UsageTotals>): Promise<void>;
+  findTotals(userId: string, periods: string[]): Promise<Map<string, UsageTotals>>;
+  isEmpty(): Promise<boolean>;
+  // Replaces every row (of one user, or of everyone) with freshly computed totals
+  replaceAll(totals: Map<string, Map<string, UsageTotals>>, userId?: string): Promise<void>;
+}
@@ -11,6 +11,8 @@ export interface VoiceNoteFilter {
   searchQuery?: string;
   fromDate?: Date;
   toDate?: Date;
+  sessionId?: string;
+  projectId?: string;
 }
 
 export interface PaginationOptions {
@@ -28,12 +30,74 @@ export interface PaginatedResult<T> {
   totalPages: number;
 }
 
+export interface VoiceNoteSearchHit {
+  voiceNote: VoiceNote;
+  rank: number;     // bm25 score, lower is a better match
+  snippet: string;  // matched text with terms wrapped in **
+}
+
+// List-card projection: no transcript or summary text
+export interface VoiceNoteListItem {
+  id: string;
+  userId?: string;
+  sessionId?: string;
+  title: string;
+  fileSize: number;
+  mimeType: string;
+  language: string;
+  status: string;
+  tags: string[];
+  duration?: number;
+  aiGeneratedTitle?: string;
+  briefDescription?: string;
+  derivedDate?: Date;
+  createdAt: Date;
+  updatedAt: Date;
+  hasTranscription: boolean;
+  hasSummary: boolean;
+}
+
+// Keyset position: the last row of the previous page in (createdAt, id) order
+export interface VoiceNoteListCursor {
+  createdAt: Date;
+  id: string;
+}
+
+export interface VoiceNoteListOptions {
+  limit: number;
+  // Keyset pagination ordered by (createdAt, id); `after` is absent on the first page
+  keyset?: boolean;
+  after?: VoiceNoteListCursor;
+  // Offset pagination (keyset: false)
+  page?: number;
+  sortBy?: PaginationOptions['sortBy'];
+  sortOrder?: 'asc' | 'desc';
+  // estimate counts at most LIST_COUNT_ESTIMATE_CAP rows
+  count?: 'exact' | 'estimate' | 'none';
+}
+
+export interface VoiceNoteListPage {
+  items: VoiceNoteListItem[];
+  hasNext: boolean;
+  next?: VoiceNoteListCursor;
+  total?: number;
+  totalIsEstimate?: boolean;
+}
+
+export const LIST_COUNT_ESTIMATE_CAP = 1000;
+
 export interface VoiceNoteRepository {
   save(voiceNote: VoiceNote): Promise<void>;
   findById(id: VoiceNoteId): Promise<VoiceNote | null>;
+  findByIds(ids: VoiceNoteId[]): Promise<VoiceNote[]>;
   findByFileHash(userId: string, fileHash: string): Promise<VoiceNote | null>;
   findByUserId(userId: string, pagination: PaginationOptions, filter?: VoiceNoteFilter): Promise<PaginatedResult<VoiceNote>>;
+  list(userId: string, options: VoiceNoteListOptions, filter?: VoiceNoteFilter): Promise<VoiceNoteListPage>;
+  // Every matching note, oldest first, read batchSize rows at a time as the consumer pulls
+  iterate(userId: string, options: { batchSize: number }, filter?: VoiceNoteFilter): AsyncIterable<VoiceNote>;
+  search(userId: string, query: string, pagination: PaginationOptions, filter?: VoiceNoteFilter): Promise<PaginatedResult<VoiceNoteSearchHit>>;
   findPendingForProcessing(limit: number): Promise<VoiceNote[]>;
+  findByStatus(status: ProcessingStatus, limit: number): Promise<VoiceNote[]>;
   delete(id: VoiceNoteId): Promise<void>;
   exists(id: VoiceNoteId): Promise<boolean>;
 }
\ No newline at end of file
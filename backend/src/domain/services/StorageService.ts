@@ -1,7 +1,26 @@
+import { Readable } from 'stream';
+
+export interface StoredFile {
+  path: string;
+  size: number;
+  sha256: string;
+}
+
 export interface StorageService {
   save(buffer: Buffer, originalName: string, userId?: string): Promise<string>;
+  // Single pass: stream -> hash -> disk, without holding the file in memory
+  saveStream(
+    stream: Readable,
+    originalName: string,
+    userId?: string,
+    options?: { maxBytes?: number }
+  ): Promise<StoredFile>;
   read(filePath: string): Promise<Buffer>;
   delete(filePath: string): Promise<void>;
+  // Delete unless isStillNeeded() says the file was uploaded again meanwhile; true when a file was deleted
+  remove(filePath: string, isStillNeeded: () => Promise<boolean>): Promise<boolean>;
+  // Remove partial files left behind by crashed uploads; returns how many
+  sweepTemporary(now?: Date): Promise<number>;
   exists(filePath: string): Promise<boolean>;
   getUrl(filePath: string): string;
-}
\ No newline at end of file
+}
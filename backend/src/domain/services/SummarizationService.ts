@@ -14,6 +14,8 @@ export interface SummarizationService {
       prompt?: string;
       maxTokens?: number;
       temperature?: number;
+      // Streams the summary text as the model writes it
+      onSummaryDelta?: (text: string) => void;
     }
   ): Promise<SummarizationResult>;
 }
\ No newline at end of file
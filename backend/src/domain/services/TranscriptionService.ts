@@ -14,6 +14,8 @@ export interface TranscriptionService {
     options?: {
       prompt?: string;
       temperature?: number;
+      model?: string;
+      systemPrompt?: string;
     }
   ): Promise<TranscriptionResult>;
 
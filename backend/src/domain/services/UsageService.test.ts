@@ -0,0 +1,73 @@
+import { UsageService } from './UsageService';
+
+function eventLog(events: Array<[string, string, string]>) {
+  return {
+    async *streamEvents() {
+      for (const [aggregateId, eventType, occurredAt] of events) {
+        yield { aggregateId, eventType, occurredAt: new Date(occurredAt), payload: {} };
+      }
+    }
+  };
+}
+
+describe('UsageService', () => {
+  let userRepository: any;
+  let prisma: any;
+  let usageAggregates: any;
+
+  beforeEach(() => {
+    userRepository = {
+      findById: jest.fn().mockResolvedValue({ id: 'user-1', creditsUsed: 4, creditLimit: 10 })
+    };
+    prisma = {
+      voiceNote: {
+        findMany: jest.fn().mockResolvedValue([
+          { id: 'note-1', userId: 'user-1', duration: null, transcriptions: { duration: 120 } },
+          { id: 'note-2', userId: 'user-1', duration: 60, transcriptions: null }
+        ])
+      }
+    };
+    usageAggregates = {
+      findTotals: jest.fn(),
+      replaceAll: jest.fn().mockResolvedValue(undefined)
+    };
+  });
+
+  it('reads stats from the month and all-time aggregates only', async () => {
+    const month = new Date().toISOString().slice(0, 7);
+    usageAggregates.findTotals.mockResolvedValue(new Map([
+      [month, { notesProcessed: 2, secondsTranscribed: 150, creditsUsed: 2 }],
+      ['all', { notesProcessed: 40, secondsTranscribed: 6000, creditsUsed: 41 }]
+    ]));
+    const service = new UsageService(userRepository, prisma, usageAggregates, eventLog([]) as any);
+
+    const stats = await service.getUserUsageStats('user-1');
+
+    expect(usageAggregates.findTotals).toHaveBeenCalledWith('user-1', [month, 'all']);
+    expect(prisma.voiceNote.findMany).not.toHaveBeenCalled();
+    expect(stats).toEqual({
+      currentMonth: { creditsUsed: 4, creditsLimit: 10, notesProcessed: 2, minutesTranscribed: 3 },
+      allTime: { totalNotes: 40, totalMinutesTranscribed: 100 }
+    });
+  });
+
+  it('rebuilds monthly and all-time totals from the event log, counting a note\'s first completion only', async () => {
+    const service = new UsageService(userRepository, prisma, usageAggregates, eventLog([
+      ['note-1', 'VoiceNoteUploaded', '2026-09-30T23:00:00Z'],
+      ['note-1', 'VoiceNoteProcessingCompleted', '2026-10-01T00:10:00Z'],
+      ['note-2', 'VoiceNoteUploaded', '2026-10-02T10:00:00Z'],
+      ['note-2', 'VoiceNoteProcessingStarted', '2026-10-02T10:00:01Z'],
+      ['note-2', 'VoiceNoteProcessingCompleted', '2026-10-02T10:01:00Z'],
+      ['note-2', 'VoiceNoteProcessingCompleted', '2026-10-05T08:00:00Z']
+    ]) as any);
+
+    await service.rebuildUsageAggregates();
+
+    const totals = usageAggregates.replaceAll.mock.calls[0][0].get('user-1');
+    expect(Object.fromEntries(totals)).toEqual({
+      '2026-09': { notesProcessed: 0, secondsTranscribed: 0, creditsUsed: 1 },
+      '2026-10': { notesProcessed: 2, secondsTranscribed: 180, creditsUsed: 1 },
+      all: { notesProcessed: 2, secondsTranscribed: 180, creditsUsed: 2 }
+    });
+  });
+});
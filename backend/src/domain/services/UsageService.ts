@@ -1,11 +1,23 @@
 import { PrismaClient } from '@prisma/client';
 import { UserEntity } from '../entities/User';
 import { UserRepository } from '../../infrastructure/persistence/UserRepositoryImpl';
+import { EventStore } from '../repositories/EventStore';
+import {
+  ALL_TIME_PERIOD,
+  UsageAggregateRepository,
+  UsageTotals,
+  emptyUsageTotals,
+  usagePeriod
+} from '../repositories/UsageAggregateRepository';
+
+const REBUILD_LOOKUP_BATCH = 500;
 
 export class UsageService {
   constructor(
     private readonly userRepository: UserRepository,
-    private readonly prisma: PrismaClient
+    private readonly prisma: PrismaClient,
+    private readonly usageAggregates: UsageAggregateRepository,
+    private readonly eventStore: EventStore
   ) {}
 
   async checkAndIncrementUsage(userId: string): Promise<{ allowed: boolean; user: UserEntity }> {
@@ -50,11 +62,16 @@ export class UsageService {
     });
   }
 
+  /**
+   * Reads the maintained aggregates (two primary-key rows), so the cost does
+   * not grow with the user's history.
+   */
   async getUserUsageStats(userId: string): Promise<{
     currentMonth: {
       creditsUsed: number;
       creditsLimit: number;
       notesProcessed: number;
+      minutesTranscribed: number;
     };
     allTime: {
       totalNotes: number;
@@ -66,43 +83,95 @@ export class UsageService {
       throw new Error('User not found');
     }
 
-    // Get current month stats
-    const startOfMonth = new Date();
-    startOfMonth.setDate(1);
-    startOfMonth.setHours(0, 0, 0, 0);
-
-    const monthlyLogs = await this.prisma.usageLog.count({
-      where: {
-        userId,
-        action: 'upload',
-        timestamp: { gte: startOfMonth },
-      },
-    });
-
-    // Get all-time stats
-    const allNotes = await this.prisma.voiceNote.count({
-      where: { userId },
-    });
-
-    const transcriptions = await this.prisma.transcription.findMany({
-      where: {
-        voiceNote: { userId },
-      },
-      select: { duration: true },
-    });
-
-    const totalMinutes = transcriptions.reduce((sum, t) => sum + (t.duration || 0), 0) / 60;
+    const month = usagePeriod(new Date());
+    const totals = await this.usageAggregates.findTotals(userId, [month, ALL_TIME_PERIOD]);
+    const monthly = totals.get(month)!;
+    const allTime = totals.get(ALL_TIME_PERIOD)!;
 
     return {
       currentMonth: {
         creditsUsed: user.creditsUsed,
         creditsLimit: user.creditLimit,
-        notesProcessed: monthlyLogs,
+        notesProcessed: monthly.notesProcessed,
+        minutesTranscribed: Math.round(monthly.secondsTranscribed / 60),
       },
       allTime: {
-        totalNotes: allNotes,
-        totalMinutesTranscribed: Math.round(totalMinutes),
+        totalNotes: allTime.notesProcessed,
+        totalMinutesTranscribed: Math.round(allTime.secondsTranscribed / 60),
       },
     };
   }
-}
\ No newline at end of file
+
+  /**
+   * Recomputes the aggregates from the event log: a VoiceNoteUploaded event is
+   * one credit, a note's first VoiceNoteProcessingCompleted event one processed
+   * note plus its transcribed duration (later completions are not counted, as
+   * in VoiceNoteRepositoryImpl.save). Events are streamed, so memory grows with
+   * the number of notes, not events.
+   */
+  async rebuildUsageAggregates(userId?: string): Promise<number> {
+    const uploads = new Map<string, Date[]>();
+    const completions = new Map<string, Date>();
+
+    for await (const event of this.eventStore.streamEvents()) {
+      if (event.eventType === 'VoiceNoteUploaded') {
+        const dates = uploads.get(event.aggregateId) || [];
+        dates.push(event.occurredAt);
+        uploads.set(event.aggregateId, dates);
+      } else if (event.eventType === 'VoiceNoteProcessingCompleted') {
+        const first = completions.get(event.aggregateId);
+        if (!first || event.occurredAt < first) {
+          completions.set(event.aggregateId, event.occurredAt);
+        }
+      }
+    }
+
+    const noteIds = [...new Set([...uploads.keys(), ...completions.keys()])];
+    const totals = new Map<string, Map<string, UsageTotals>>();
+    const add = (owner: string, at: Date, delta: Partial<UsageTotals>) => {
+      const periods = totals.get(owner) || new Map<string, UsageTotals>();
+      totals.set(owner, periods);
+      for (const period of [usagePeriod(at), ALL_TIME_PERIOD]) {
+        const row = periods.get(period) || emptyUsageTotals();
+        row.notesProcessed += delta.notesProcessed ?? 0;
+        row.secondsTranscribed += delta.secondsTranscribed ?? 0;
+        row.creditsUsed += delta.creditsUsed ?? 0;
+        periods.set(period, row);
+      }
+    };
+
+    for (let i = 0; i < noteIds.length; i += REBUILD_LOOKUP_BATCH) {
+      const notes = await this.prisma.voiceNote.findMany({
+        where: {
+          id: { in: noteIds.slice(i, i + REBUILD_LOOKUP_BATCH) },
+          ...(userId ? { userId } : { userId: { not: null } }),
+        },
+        select: { id: true, userId: true, duration: true, transcriptions: { select: { duration: true } } },
+      });
+
+      for (const note of notes) {
+        const seconds = note.transcriptions?.duration || note.duration || 0;
+        for (const at of uploads.get(note.id) || []) {
+          add(note.userId!, at, { creditsUsed: 1 });
+        }
+        const completedAt = completions.get(note.id);
+        if (completedAt) {
+          add(note.userId!, completedAt, { notesProcessed: 1, secondsTranscribed: seconds });
+        }
+      }
+    }
+
+    await this.usageAggregates.replaceAll(totals, userId);
+    return totals.size;
+  }
+
+  // First start after the aggregates were introduced: backfill them once
+  async rebuildUsageAggregatesIfEmpty(): Promise<void> {
+    if (!(await this.usageAggregates.isEmpty())) {
+      return;
+    }
+    const startedAt = Date.now();
+    const users = await this.rebuildUsageAggregates();
+    console.log(`[UsageService] Rebuilt usage aggregates for ${users} users in ${Date.now() - startedAt}ms`);
+  }
+}
@@ -0,0 +1,4 @@
+// Drops a cached user after its row was changed outside the user repository
+export interface UserCacheInvalidator {
+  invalidateCachedUser(userId: string): void;
+}
@@ -34,4 +34,27 @@ export class AudioMetadataExtractor {
       return null;
     }
   }
+
+  /**
+   * Extract duration from an audio file on disk. Reads only the container
+   * headers it needs instead of loading the whole file into memory.
+   * @param filePath - Path to the audio file
+   * @param mimeType - MIME type of the audio file
+   * @returns Duration in seconds or null if extraction fails
+   */
+  async extractDurationFromFile(filePath: string, mimeType?: string): Promise<number | null> {
+    try {
+      const musicMetadata = await import('music-metadata');
+      const { parseFile } = musicMetadata;
+
+      const metadata = await parseFile(filePath, { duration: false, skipCovers: true });
+      const duration = metadata.format.duration || null;
+      console.log('Extracted duration:', duration, 'seconds from file with mimeType:', mimeType);
+
+      return duration;
+    } catch (error) {
+      console.error('Failed to extract audio duration from file:', error);
+      return null;
+    }
+  }
 }
\ No newline at end of file
@@ -0,0 +1,154 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { DEFAULT_FFMPEG_PATH, runFfmpeg } from './ffmpeg';
+
+export interface SilenceInterval {
+  start: number;
+  end: number;
+}
+
+export interface AudioSegment {
+  index: number;
+  start: number;  // Seconds from the beginning of the recording
+  end: number;
+}
+
+export interface SegmentPlanOptions {
+  targetChunkSec: number;
+  maxChunkSec: number;
+  overlapSec: number;
+}
+
+/**
+ * Splits recordings into chunks at pauses using ffmpeg (silencedetect to find
+ * the pauses, stream copy to cut). ffmpeg is optional: when the binary is
+ * missing isAvailable() resolves false and callers transcribe the whole file.
+ */
+export class AudioSegmenter {
+  private available: Promise<boolean> | null = null;
+
+  constructor(private readonly ffmpegPath: string = DEFAULT_FFMPEG_PATH) {}
+
+  isAvailable(): Promise<boolean> {
+    if (!this.available) {
+      this.available = this.run(['-hide_banner', '-version']).then(
+        () => true,
+        error => {
+          console.warn('[AudioSegmenter] ffmpeg not available, long recordings will not be chunked:', error.message);
+          return false;
+        }
+      );
+    }
+    return this.available;
+  }
+
+  async detectSilences(filePath: string, noiseDb: number, minSilenceSec: number): Promise<SilenceInterval[]> {
+    const output = await this.run([
+      '-hide_banner', '-nostats',
+      '-i', filePath,
+      '-af', `silencedetect=noise=${noiseDb}dB:d=${minSilenceSec}`,
+      '-f', 'null', '-'
+    ]);
+    return AudioSegmenter.parseSilences(output);
+  }
+
+  static parseSilences(output: string): SilenceInterval[] {
+    const silences: SilenceInterval[] = [];
+    let start: number | null = null;
+
+    for (const line of output.split('\n')) {
+      const startMatch = line.match(/silence_start:\s*(-?[\d.]+)/);
+      if (startMatch) {
+        start = Math.max(0, parseFloat(startMatch[1]));
+        continue;
+      }
+      const endMatch = line.match(/silence_end:\s*([\d.]+)/);
+      if (endMatch && start !== null) {
+        silences.push({ start, end: parseFloat(endMatch[1]) });
+        start = null;
+      }
+    }
+
+    return silences;
+  }
+
+  /**
+   * Cut at the middle of the pause closest to targetChunkSec, never producing
+   * a chunk longer than maxChunkSec. Without a usable pause the chunk is cut
+   * hard at maxChunkSec and the next one starts overlapSec earlier so words on
+   * the boundary are heard by both (the overlap is removed when stitching).
+   * Each chunk moves the start forward by more than targetChunkSec / 2 (pause)
+   * or by maxChunkSec - overlapSec (hard cut), so options that allow neither
+   * are rejected instead of looping forever.
+   */
+  static planSegments(duration: number, silences: SilenceInterval[], options: SegmentPlanOptions): AudioSegment[] {
+    const hardCutStep = options.maxChunkSec - options.overlapSec;
+    if (!(options.targetChunkSec > 0) || !(hardCutStep > 0)) {
+      throw new Error(
+        `Invalid chunking options: targetChunkSec ${options.targetChunkSec}, ` +
+        `maxChunkSec ${options.maxChunkSec}, overlapSec ${options.overlapSec}`
+      );
+    }
+
+    const segments: AudioSegment[] = [];
+    let start = 0;
+
+    while (duration - start > options.maxChunkSec) {
+      const earliest = start + options.targetChunkSec / 2;
+      const latest = start + options.maxChunkSec;
+      const target = start + options.targetChunkSec;
+
+      let cut: number | null = null;
+      for (const silence of silences) {
+        const middle = (silence.start + silence.end) / 2;
+        if (middle <= earliest || middle >= latest) continue;
+        if (cut === null || Math.abs(middle - target) < Math.abs(cut - target)) {
+          cut = middle;
+        }
+      }
+
+      if (cut !== null) {
+        segments.push({ index: segments.length, start, end: cut });
+        start = cut;
+      } else {
+        segments.push({ index: segments.length, start, end: latest });
+        start += hardCutStep;
+      }
+    }
+
+    segments.push({ index: segments.length, start, end: duration });
+    return segments;
+  }
+
+  createWorkDir(): Promise<string> {
+    return fs.promises.mkdtemp(path.join(os.tmpdir(), 'nano-grazynka-chunks-'));
+  }
+
+  async removeWorkDir(dir: string): Promise<void> {
+    try {
+      await fs.promises.rm(dir, { recursive: true, force: true });
+    } catch (error) {
+      console.error('[AudioSegmenter] Failed to remove work dir:', error);
+    }
+  }
+
+  // Stream copy (no re-encode), so a chunk is written in milliseconds
+  async extractSegment(filePath: string, segment: AudioSegment, outDir: string): Promise<string> {
+    const extension = path.extname(filePath) || '.m4a';
+    const outPath = path.join(outDir, `chunk-${String(segment.index).padStart(3, '0')}${extension}`);
+    await this.run([
+      '-hide_banner', '-loglevel', 'error',
+      '-ss', segment.start.toFixed(3),
+      '-i', filePath,
+      '-t', (segment.end - segment.start).toFixed(3),
+      '-c', 'copy',
+      '-y', outPath
+    ]);
+    return outPath;
+  }
+
+  private run(args: string[]): Promise<string> {
+    return runFfmpeg(this.ffmpegPath, args);
+  }
+}
@@ -0,0 +1,190 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { AudioSegmenter } from './AudioSegmenter';
+import { DEFAULT_FFMPEG_PATH, runFfmpeg } from './ffmpeg';
+
+export type TranscodeFormat = 'opus' | 'mp3' | 'flac';
+
+export interface TranscodeOptions {
+  format: TranscodeFormat;
+  sampleRate: number;
+  bitrateKbps: number;
+  trimSilence: boolean;
+  silenceNoiseDb: number;
+  minSilenceSec: number;
+}
+
+export interface SpeechBounds {
+  start: number;  // Seconds of leading silence to skip
+  end: number | null;  // Where trailing silence begins, null when there is none
+  duration: number | null;  // Of the whole recording, when ffmpeg reports it
+}
+
+export interface TranscodeResult {
+  path: string;
+  bytes: number;
+  originalBytes: number;
+  trimmedSec: number;
+}
+
+// Every codec here is accepted by the OpenAI, OpenRouter and Gemini audio inputs
+const FORMATS: Record<TranscodeFormat, { extension: string; codecArgs: (bitrateKbps: number) => string[] }> = {
+  opus: {
+    extension: '.ogg',
+    codecArgs: bitrateKbps => ['-c:a', 'libopus', '-b:a', `${bitrateKbps}k`, '-application', 'voip']
+  },
+  mp3: {
+    extension: '.mp3',
+    codecArgs: bitrateKbps => ['-c:a', 'libmp3lame', '-b:a', `${bitrateKbps}k`]
+  },
+  flac: {
+    extension: '.flac',
+    codecArgs: () => ['-c:a', 'flac']
+  }
+};
+
+// Silence kept around the speech so the first and last words are not clipped
+const EDGE_PAD_SEC = 0.25;
+// A silence this close to either end of the recording is leading/trailing silence
+const END_TOLERANCE_SEC = 0.05;
+
+/**
+ * Re-encodes recordings before they go to the transcription provider: mono,
+ * resampled (16 kHz by default) and in a compact speech codec, with leading
+ * and trailing silence cut off. Like AudioSegmenter it needs ffmpeg; when the
+ * binary is missing isAvailable() resolves false and the original file is sent.
+ */
+export class AudioTranscoder {
+  private available: Promise<boolean> | null = null;
+
+  constructor(private readonly ffmpegPath: string = DEFAULT_FFMPEG_PATH) {}
+
+  isAvailable(): Promise<boolean> {
+    if (!this.available) {
+      this.available = runFfmpeg(this.ffmpegPath, ['-hide_banner', '-version']).then(
+        () => true,
+        error => {
+          console.warn('[AudioTranscoder] ffmpeg not available, audio will be sent as uploaded:', error.message);
+          return false;
+        }
+      );
+    }
+    return this.available;
+  }
+
+  static parseDuration(output: string): number | null {
+    const match = output.match(/Duration:\s*(\d+):(\d+):([\d.]+)/);
+    if (!match) {
+      return null;
+    }
+    return parseInt(match[1], 10) * 3600 + parseInt(match[2], 10) * 60 + parseFloat(match[3]);
+  }
+
+  /**
+   * Speech boundaries from ffmpeg silencedetect output. A silence_start with
+   * no matching silence_end runs to the end of the file. Returns null when
+   * there is nothing to trim or the whole recording is silent.
+   */
+  static speechBounds(output: string, padSec: number = EDGE_PAD_SEC): SpeechBounds | null {
+    const duration = AudioTranscoder.parseDuration(output);
+    const silences = AudioSegmenter.parseSilences(output);
+    const starts = [...output.matchAll(/silence_start:\s*(-?[\d.]+)/g)];
+    const ends = [...output.matchAll(/silence_end:\s*([\d.]+)/g)];
+
+    let trailingStart: number | null = null;
+    if (starts.length > ends.length) {
+      trailingStart = Math.max(0, parseFloat(starts[starts.length - 1][1]));
+    } else if (duration !== null && silences.length > 0) {
+      const last = silences[silences.length - 1];
+      if (last.end >= duration - END_TOLERANCE_SEC) {
+        trailingStart = last.start;
+      }
+    }
+
+    const leading = silences.length > 0 && silences[0].start <= END_TOLERANCE_SEC ? silences[0].end : 0;
+    if (trailingStart !== null && trailingStart <= leading) {
+      // Silent throughout; nothing worth cutting down to
+      return null;
+    }
+    const start = Math.max(0, leading - padSec);
+    let end = trailingStart === null ? null : trailingStart + padSec;
+    if (end !== null && duration !== null && end >= duration) {
+      end = null;
+    }
+
+    if (start === 0 && end === null) {
+      return null;
+    }
+    return { start, end, duration };
+  }
+
+  async detectSpeech(filePath: string, noiseDb: number, minSilenceSec: number): Promise<SpeechBounds | null> {
+    const output = await runFfmpeg(this.ffmpegPath, [
+      '-hide_banner', '-nostats',
+      '-i', filePath,
+      '-af', `silencedetect=noise=${noiseDb}dB:d=${minSilenceSec}`,
+      '-f', 'null', '-'
+    ]);
+    return AudioTranscoder.speechBounds(output);
+  }
+
+  async transcode(filePath: string, outDir: string, options: TranscodeOptions): Promise<TranscodeResult> {
+    let bounds: SpeechBounds | null = null;
+    if (options.trimSilence) {
+      try {
+        bounds = await this.detectSpeech(filePath, options.silenceNoiseDb, options.minSilenceSec);
+      } catch (error) {
+        console.warn('[AudioTranscoder] Silence detection failed, keeping the full recording:', error);
+      }
+    }
+
+    const format = FORMATS[options.format];
+    const outPath = path.join(outDir, `${path.basename(filePath, path.extname(filePath))}${format.extension}`);
+    const args = ['-hide_banner', '-loglevel', 'error'];
+    if (bounds && bounds.start > 0) {
+      args.push('-ss', bounds.start.toFixed(3));
+    }
+    args.push('-i', filePath);
+    if (bounds && bounds.end !== null) {
+      args.push('-t', (bounds.end - bounds.start).toFixed(3));
+    }
+    args.push(
+      '-vn', '-ac', '1', '-ar', String(options.sampleRate),
+      ...format.codecArgs(options.bitrateKbps),
+      '-y', outPath
+    );
+    await runFfmpeg(this.ffmpegPath, args);
+
+    const [original, transcoded] = await Promise.all([
+      fs.promises.stat(filePath),
+      fs.promises.stat(outPath)
+    ]);
+    return {
+      path: outPath,
+      bytes: transcoded.size,
+      originalBytes: original.size,
+      trimmedSec: AudioTranscoder.trimmedSeconds(bounds)
+    };
+  }
+
+  static trimmedSeconds(bounds: SpeechBounds | null): number {
+    if (!bounds) {
+      return 0;
+    }
+    const trailing = bounds.end !== null && bounds.duration !== null ? bounds.duration - bounds.end : 0;
+    return bounds.start + trailing;
+  }
+
+  createWorkDir(): Promise<string> {
+    return fs.promises.mkdtemp(path.join(os.tmpdir(), 'nano-grazynka-transcode-'));
+  }
+
+  async removeWorkDir(dir: string): Promise<void> {
+    try {
+      await fs.promises.rm(dir, { recursive: true, force: true });
+    } catch (error) {
+      console.error('[AudioTranscoder] Failed to remove work dir:', error);
+    }
+  }
+}
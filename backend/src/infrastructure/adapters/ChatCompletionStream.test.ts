@@ -0,0 +1,61 @@
+import { JsonStringFieldReader, readChatCompletionStream } from './ChatCompletionStream';
+
+function streamedResponse(pieces: string[]): Response {
+  const encoder = new TextEncoder();
+  return new Response(new ReadableStream({
+    start(controller) {
+      pieces.forEach(piece => controller.enqueue(encoder.encode(piece)));
+      controller.close();
+    }
+  }));
+}
+
+function sse(content: string): string {
+  return `data: ${JSON.stringify({ choices: [{ index: 0, delta: { content } }] })}\n\n`;
+}
+
+describe('JsonStringFieldReader', () => {
+  it('should stream only the requested top-level field, decoding escapes across pieces', () => {
+    const json = JSON.stringify({
+      title: 'ignored',
+      summary: '**Spotkanie** w Żabce\n- budżet "Q3" 🎉',
+      key_points: ['summary', { summary: 'nested' }]
+    });
+    const reader = new JsonStringFieldReader('summary');
+
+    let text = '';
+    for (let i = 0; i < json.length; i += 3) {
+      text += reader.push(json.slice(i, i + 3));
+    }
+
+    expect(text).toBe('**Spotkanie** w Żabce\n- budżet "Q3" 🎉');
+  });
+
+  it('should decode \\u escapes and ignore a field that is not a string', () => {
+    const reader = new JsonStringFieldReader('summary');
+
+    expect(reader.push('{"count": 3, "summary": null, ')).toBe('');
+    expect(reader.push('"summary": "Za\\u01')).toBe('Za');
+    expect(reader.push('7c\\u00f3\\u0142\\u0107"}')).toBe('żółć');
+  });
+});
+
+describe('readChatCompletionStream', () => {
+  it('should join content deltas split across network reads', async () => {
+    const body = [sse('{"summary": "Hel'), sse('lo"}'), ': OPENROUTER PROCESSING\n\n', 'data: [DONE]\n\n'].join('');
+    const pieces = body.match(/[\s\S]{1,7}/g)!;
+    const deltas: string[] = [];
+
+    const content = await readChatCompletionStream(streamedResponse(pieces), delta => deltas.push(delta));
+
+    expect(content).toBe('{"summary": "Hello"}');
+    expect(deltas).toEqual(['{"summary": "Hel', 'lo"}']);
+  });
+
+  it('should throw on an error chunk mid-stream', async () => {
+    const body = sse('{"summ') + `data: ${JSON.stringify({ error: { message: 'overloaded' } })}\n\n`;
+
+    await expect(readChatCompletionStream(streamedResponse([body]), () => {}))
+      .rejects.toThrow('overloaded');
+  });
+});
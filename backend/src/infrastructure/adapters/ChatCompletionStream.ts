@@ -0,0 +1,141 @@
+const ESCAPES: Record<string, string> = { b: '\b', f: '\f', n: '\n', r: '\r', t: '\t' };
+
+/**
+ * Follows a JSON object arriving in pieces and returns, per piece, the newly
+ * decoded text of one top-level string field (e.g. "summary"), so it can be
+ * shown while the model is still writing the rest of the object.
+ */
+export class JsonStringFieldReader {
+  private depth = 0;
+  private inString = false;
+  private escaped = false;
+  private unicode: string | null = null;
+  private expectingKey = false;
+  private valuePending = false;
+  private stringIsKey = false;
+  private capturing = false;
+  private key = '';
+  private lastKey = '';
+
+  constructor(private readonly field: string) {}
+
+  push(chunk: string): string {
+    let out = '';
+    const emit = (text: string) => {
+      if (this.stringIsKey) {
+        this.key += text;
+      } else if (this.capturing) {
+        out += text;
+      }
+    };
+
+    for (const c of chunk) {
+      if (this.inString) {
+        if (this.unicode !== null) {
+          this.unicode += c;
+          if (this.unicode.length === 4) {
+            emit(String.fromCharCode(parseInt(this.unicode, 16)));
+            this.unicode = null;
+          }
+        } else if (this.escaped) {
+          this.escaped = false;
+          if (c === 'u') {
+            this.unicode = '';
+          } else {
+            emit(ESCAPES[c] ?? c);
+          }
+        } else if (c === '\\') {
+          this.escaped = true;
+        } else if (c === '"') {
+          this.inString = false;
+          if (this.stringIsKey) {
+            this.lastKey = this.key;
+          }
+          this.stringIsKey = false;
+          this.capturing = false;
+        } else {
+          emit(c);
+        }
+        continue;
+      }
+
+      if (c === '"') {
+        this.inString = true;
+        this.stringIsKey = this.depth === 1 && this.expectingKey;
+        this.capturing = !this.stringIsKey && this.depth === 1 && this.valuePending && this.lastKey === this.field;
+        this.key = '';
+        this.valuePending = false;
+      } else if (c === '{' || c === '[') {
+        this.depth++;
+        this.expectingKey = this.depth === 1 && c === '{';
+        this.valuePending = false;
+      } else if (c === '}' || c === ']') {
+        this.depth--;
+      } else if (this.depth === 1 && c === ':') {
+        this.expectingKey = false;
+        this.valuePending = true;
+      } else if (this.depth === 1 && c === ',') {
+        this.expectingKey = true;
+        this.valuePending = false;
+      } else if (this.depth === 1 && c.trim()) {
+        this.valuePending = false;  // A number, boolean or null
+      }
+    }
+    return out;
+  }
+}
+
+/**
+ * Reads an OpenAI-compatible streamed chat completion (server-sent events,
+ * one `data:` chunk per batch of tokens, ending with `data: [DONE]`) and
+ * returns the whole message content. onContent gets each content delta.
+ */
+export async function readChatCompletionStream(
+  response: Response,
+  onContent: (delta: string) => void
+): Promise<string> {
+  if (!response.body) {
+    throw new Error('Streamed chat completion has no body');
+  }
+
+  const decoder = new TextDecoder();
+  let content = '';
+  let buffer = '';
+  let done = false;
+
+  const handleLine = (line: string) => {
+    // Blank lines separate events; ':' lines are keep-alive comments (OpenRouter sends them)
+    if (!line.startsWith('data:')) {
+      return;
+    }
+    const data = line.slice(5).trim();
+    if (data === '[DONE]') {
+      done = true;
+      return;
+    }
+    const chunk = JSON.parse(data);
+    if (chunk.error) {
+      throw new Error(`Chat completion stream failed: ${chunk.error.message || JSON.stringify(chunk.error)}`);
+    }
+    const delta = chunk.choices?.[0]?.delta?.content;
+    if (delta) {
+      content += delta;
+      onContent(delta);
+    }
+  };
+
+  for await (const bytes of response.body as unknown as AsyncIterable<Uint8Array>) {
+    buffer += decoder.decode(bytes, { stream: true });
+    const lines = buffer.split(/\r?\n/);
+    buffer = lines.pop()!;
+    lines.forEach(handleLine);
+    if (done) {
+      break;
+    }
+  }
+  if (!done) {
+    handleLine(buffer + decoder.decode());
+  }
+
+  return content;
+}
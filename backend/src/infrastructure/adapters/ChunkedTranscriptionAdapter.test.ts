@@ -0,0 +1,131 @@
+import { ChunkedTranscriptionAdapter, stitchTranscripts } from './ChunkedTranscriptionAdapter';
+import { AudioSegmenter } from './AudioSegmenter';
+import { Language } from '../../domain/value-objects/Language';
+
+const CHUNKING = {
+  enabled: true,
+  minDurationSec: 600,
+  targetChunkSec: 300,
+  maxChunkSec: 420,
+  overlapSec: 2,
+  maxParallel: 2,
+  silenceNoiseDb: -35,
+  minSilenceSec: 0.5
+};
+
+describe('AudioSegmenter.planSegments', () => {
+  it('should cut at the pause closest to the target chunk length', () => {
+    const silences = [
+      { start: 100, end: 101 },
+      { start: 295, end: 297 },
+      { start: 410, end: 411 },
+      { start: 598, end: 600 }
+    ];
+
+    const segments = AudioSegmenter.planSegments(900, silences, CHUNKING);
+
+    expect(segments.map(s => [s.start, s.end])).toEqual([[0, 296], [296, 599], [599, 900]]);
+  });
+
+  it('should hard cut with overlap when there is no pause', () => {
+    const segments = AudioSegmenter.planSegments(1000, [], CHUNKING);
+
+    expect(segments[0]).toEqual({ index: 0, start: 0, end: 420 });
+    expect(segments[1].start).toBe(418);
+    expect(segments[segments.length - 1].end).toBe(1000);
+    segments.forEach(s => expect(s.end - s.start).toBeLessThanOrEqual(420));
+  });
+
+  it('should reject options that would never move past the first chunk', () => {
+    expect(() => AudioSegmenter.planSegments(1000, [], { ...CHUNKING, overlapSec: 420 })).toThrow('Invalid chunking options');
+    expect(() => AudioSegmenter.planSegments(1000, [], { ...CHUNKING, targetChunkSec: 0 })).toThrow('Invalid chunking options');
+  });
+
+  it('should parse ffmpeg silencedetect output', () => {
+    const output = [
+      '[silencedetect @ 0x1] silence_start: -0.01',
+      '[silencedetect @ 0x1] silence_end: 1.5 | silence_duration: 1.51',
+      '[silencedetect @ 0x1] silence_start: 42.25',
+      '[silencedetect @ 0x1] silence_end: 43 | silence_duration: 0.75'
+    ].join('\n');
+
+    expect(AudioSegmenter.parseSilences(output)).toEqual([
+      { start: 0, end: 1.5 },
+      { start: 42.25, end: 43 }
+    ]);
+  });
+});
+
+describe('stitchTranscripts', () => {
+  it('should drop words repeated across a chunk boundary', () => {
+    expect(stitchTranscripts([
+      'Spotkanie z klientem. Budżet na',
+      'budżet na projekt Żabka.'
+    ])).toBe('Spotkanie z klientem. Budżet na projekt Żabka.');
+  });
+
+  it('should not treat a single repeated word as overlap', () => {
+    expect(stitchTranscripts(['We ship it', 'it works'])).toBe('We ship it it works');
+  });
+});
+
+describe('ChunkedTranscriptionAdapter', () => {
+  let inner: any;
+  let segmenter: jest.Mocked<AudioSegmenter>;
+  let metadataExtractor: any;
+  let adapter: ChunkedTranscriptionAdapter;
+
+  beforeEach(() => {
+    inner = {
+      transcribe: jest.fn(async (chunkPath: string) => ({
+        text: `text of ${chunkPath}`,
+        language: Language.PL,
+        duration: 0,
+        confidence: 0.9
+      })),
+      transcribeWithGemini: jest.fn()
+    };
+    segmenter = {
+      isAvailable: jest.fn().mockResolvedValue(true),
+      detectSilences: jest.fn().mockResolvedValue([]),
+      createWorkDir: jest.fn().mockResolvedValue('/tmp/chunks'),
+      removeWorkDir: jest.fn(),
+      extractSegment: jest.fn(async (_path: string, segment: any) => `chunk-${segment.index}`)
+    } as any;
+    metadataExtractor = { extractDurationFromFile: jest.fn().mockResolvedValue(1000) };
+    adapter = new ChunkedTranscriptionAdapter(
+      inner,
+      segmenter,
+      metadataExtractor,
+      { transcription: { chunking: CHUNKING } } as any
+    );
+  });
+
+  it('should transcribe chunks in order and clean up', async () => {
+    const result = await adapter.transcribe('/data/long.m4a', Language.PL, { prompt: 'Żabka' });
+
+    expect(inner.transcribe).toHaveBeenCalledTimes(3);
+    expect(inner.transcribe).toHaveBeenCalledWith('chunk-0', Language.PL, { prompt: 'Żabka' });
+    expect(result.text).toBe('text of chunk-0 text of chunk-1 text of chunk-2');
+    expect(result.duration).toBe(1000);
+    expect(segmenter.removeWorkDir).toHaveBeenCalledWith('/tmp/chunks');
+  });
+
+  it('should send short recordings in one request', async () => {
+    metadataExtractor.extractDurationFromFile.mockResolvedValue(120);
+
+    await adapter.transcribe('/data/short.m4a', Language.EN);
+
+    expect(inner.transcribe).toHaveBeenCalledWith('/data/short.m4a', Language.EN, undefined);
+    expect(segmenter.detectSilences).not.toHaveBeenCalled();
+  });
+
+  it('should fall back to one request when ffmpeg is missing', async () => {
+    segmenter.isAvailable.mockResolvedValue(false);
+
+    await adapter.transcribe('/data/long.m4a', Language.PL);
+
+    expect(inner.transcribe).toHaveBeenCalledTimes(1);
+    expect(inner.transcribe).toHaveBeenCalledWith('/data/long.m4a', Language.PL, undefined);
+  });
+});
@@ -0,0 +1,185 @@
+import { TranscriptionService, TranscriptionResult } from '../../domain/services/TranscriptionService';
+import { Language } from '../../domain/value-objects/Language';
+import { Config } from '../../config/schema';
+import { AudioSegmenter, AudioSegment } from './AudioSegmenter';
+import { AudioMetadataExtractor } from './AudioMetadataExtractor';
+
+// A single repeated word at a boundary is more likely coincidence than overlap
+const MIN_OVERLAP_WORDS = 2;
+const MAX_OVERLAP_WORDS = 30;
+
+type TranscriptionOptions = {
+  prompt?: string;
+  temperature?: number;
+  model?: string;
+  systemPrompt?: string;
+};
+
+function normalizeWord(word: string): string {
+  return word.toLowerCase().replace(/[^\p{L}\p{N}]/gu, '');
+}
+
+/**
+ * Join chunk transcripts in order, dropping the words a chunk repeats from the
+ * end of the previous one (chunks cut mid-speech overlap by a couple of seconds).
+ */
+export function stitchTranscripts(texts: string[], maxOverlapWords: number = MAX_OVERLAP_WORDS): string {
+  let stitched = '';
+
+  for (const text of texts) {
+    const trimmed = text.trim();
+    if (!trimmed) continue;
+    if (!stitched) {
+      stitched = trimmed;
+      continue;
+    }
+
+    const tail = stitched.split(/\s+/).slice(-maxOverlapWords).map(normalizeWord);
+    const tokens = [...trimmed.matchAll(/\S+/g)];
+    const head = tokens.slice(0, maxOverlapWords).map(token => normalizeWord(token[0]));
+
+    let overlap = 0;
+    for (let size = Math.min(tail.length, head.length); size >= MIN_OVERLAP_WORDS; size--) {
+      if (tail.slice(tail.length - size).every((word, i) => word === head[i])) {
+        overlap = size;
+        break;
+      }
+    }
+
+    if (overlap < tokens.length) {
+      stitched = `${stitched} ${trimmed.slice(tokens[overlap].index ?? 0)}`;
+    }
+  }
+
+  return stitched;
+}
+
+async function mapWithConcurrency<T, R>(
+  items: T[],
+  concurrency: number,
+  fn: (item: T) => Promise<R>
+): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+
+  const worker = async () => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index]);
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.max(1, Math.min(concurrency, items.length)) }, worker));
+  return results;
+}
+
+/**
+ * TranscriptionService decorator for long recordings. Audio longer than
+ * transcription.chunking.minDurationSec is split at pauses, the chunks are
+ * transcribed concurrently (at most chunking.maxParallel at a time) by the
+ * wrapped service and the texts are stitched back together in order, so
+ * wall-clock time tracks the longest chunk instead of the whole recording.
+ * Shorter audio, or any segmenting problem, falls through to a single request.
+ */
+export class ChunkedTranscriptionAdapter implements TranscriptionService {
+  constructor(
+    private readonly inner: TranscriptionService,
+    private readonly segmenter: AudioSegmenter,
+    private readonly metadataExtractor: AudioMetadataExtractor,
+    private readonly config: Config
+  ) {}
+
+  async transcribe(
+    audioFilePath: string,
+    language: Language,
+    options?: TranscriptionOptions
+  ): Promise<TranscriptionResult> {
+    const segments = await this.planSegments(audioFilePath);
+    if (!segments) {
+      return this.inner.transcribe(audioFilePath, language, options);
+    }
+    return this.transcribeSegments(audioFilePath, segments, language,
+      chunkPath => this.inner.transcribe(chunkPath, language, options));
+  }
+
+  async transcribeWithGemini(
+    audioFilePath: string,
+    language: Language,
+    options?: TranscriptionOptions
+  ): Promise<TranscriptionResult> {
+    const segments = await this.planSegments(audioFilePath);
+    if (!segments) {
+      return this.inner.transcribeWithGemini(audioFilePath, language, options);
+    }
+    return this.transcribeSegments(audioFilePath, segments, language,
+      chunkPath => this.inner.transcribeWithGemini(chunkPath, language, options));
+  }
+
+  private async planSegments(audioFilePath: string): Promise<AudioSegment[] | null> {
+    const chunking = this.config.transcription.chunking;
+    if (!chunking.enabled) {
+      return null;
+    }
+
+    const duration = await this.metadataExtractor.extractDurationFromFile(audioFilePath);
+    if (!duration || duration <= chunking.minDurationSec) {
+      return null;
+    }
+    if (!(await this.segmenter.isAvailable())) {
+      return null;
+    }
+
+    try {
+      const silences = await this.segmenter.detectSilences(
+        audioFilePath,
+        chunking.silenceNoiseDb,
+        chunking.minSilenceSec
+      );
+      const segments = AudioSegmenter.planSegments(duration, silences, chunking);
+      console.log(`[ChunkedTranscriptionAdapter] ${Math.round(duration)}s recording split into ${segments.length} chunks (${silences.length} pauses found)`);
+      return segments.length > 1 ? segments : null;
+    } catch (error) {
+      console.error('[ChunkedTranscriptionAdapter] Segmenting failed, transcribing the whole file:', error);
+      return null;
+    }
+  }
+
+  private async transcribeSegments(
+    audioFilePath: string,
+    segments: AudioSegment[],
+    language: Language,
+    transcribeChunk: (chunkPath: string) => Promise<TranscriptionResult>
+  ): Promise<TranscriptionResult> {
+    const workDir = await this.segmenter.createWorkDir();
+    const startedAt = Date.now();
+
+    try {
+      const results = await mapWithConcurrency(
+        segments,
+        this.config.transcription.chunking.maxParallel,
+        async segment => {
+          const chunkPath = await this.segmenter.extractSegment(audioFilePath, segment, workDir);
+          return transcribeChunk(chunkPath);
+        }
+      );
+
+      console.log(`[ChunkedTranscriptionAdapter] Transcribed ${segments.length} chunks in ${Date.now() - startedAt}ms`);
+
+      const totalDuration = segments[segments.length - 1].end;
+      const weightedConfidence = results.reduce(
+        (sum, result, i) => sum + (result.confidence || 0) * (segments[i].end - segments[i].start),
+        0
+      );
+      const coveredDuration = segments.reduce((sum, segment) => sum + (segment.end - segment.start), 0);
+
+      return {
+        text: stitchTranscripts(results.map(result => result.text)),
+        language: results[0].language || language,
+        duration: totalDuration,
+        confidence: coveredDuration > 0 ? weightedConfidence / coveredDuration : 0
+      };
+    } finally {
+      await this.segmenter.removeWorkDir(workDir);
+    }
+  }
+}
@@ -2,6 +2,9 @@ import { SummarizationService, SummarizationResult } from '../../domain/services
 import { Language } from '../../domain/value-objects/Language';
 import { ConfigLoader } from '../../config/loader';
 import { PromptLoader } from '../config/PromptLoader';
+import { StageMetrics } from '../observability/StageMetrics';
+import { ProviderClients } from '../http/ProviderClients';
+import { JsonStringFieldReader, readChatCompletionStream } from './ChatCompletionStream';
 
 export class LLMAdapter implements SummarizationService {
   private promptLoader: PromptLoader;
@@ -17,14 +20,17 @@ export class LLMAdapter implements SummarizationService {
       prompt?: string;
       maxTokens?: number;
       temperature?: number;
+      onSummaryDelta?: (text: string) => void;
     }
   ): Promise<SummarizationResult> {
     const provider = ConfigLoader.get('summarization.provider');
     
     if (provider === 'openai') {
-      return this.summarizeWithOpenAI(text, language, options);
+      return StageMetrics.getInstance().time('llm_summarization', () =>
+        this.summarizeWithOpenAI(text, language, options));
     } else if (provider === 'openrouter') {
-      return this.summarizeWithOpenRouter(text, language, options);
+      return StageMetrics.getInstance().time('llm_summarization', () =>
+        this.summarizeWithOpenRouter(text, language, options));
     } else {
       throw new Error(`Unsupported summarization provider: ${provider}`);
     }
@@ -37,6 +43,7 @@ export class LLMAdapter implements SummarizationService {
       prompt?: string;
       maxTokens?: number;
       temperature?: number;
+      onSummaryDelta?: (text: string) => void;
     }
   ): Promise<SummarizationResult> {
     const apiKey = ConfigLoader.get('summarization.apiKey');
@@ -47,7 +54,8 @@ export class LLMAdapter implements SummarizationService {
     const maxTokens = options?.maxTokens || ConfigLoader.get('summarization.maxTokens');
     const temperature = options?.temperature ?? ConfigLoader.get('summarization.temperature');
 
-    const response = await fetch(`${baseUrl}/chat/completions`, {
+    const requestedAt = Date.now();
+    const response = await ProviderClients.getInstance().get(baseUrl).request('/chat/completions', {
       method: 'POST',
       headers: {
         'Authorization': `Bearer ${apiKey}`,
@@ -66,6 +74,7 @@ export class LLMAdapter implements SummarizationService {
         temperature,
         // Always enforce JSON format
         response_format: { type: 'json_object' },
+        ...(options?.onSummaryDelta ? { stream: true } : {}),
       }),
     });
 
@@ -74,8 +83,7 @@ export class LLMAdapter implements SummarizationService {
       throw new Error(`OpenAI summarization failed: ${error}`);
     }
 
-    const result = await response.json();
-    const messageContent = result.choices[0].message.content;
+    const messageContent = await this.readContent(response, requestedAt, options?.onSummaryDelta);
     
     // Parse the JSON response
     const content = JSON.parse(messageContent);
@@ -90,6 +98,7 @@ export class LLMAdapter implements SummarizationService {
       prompt?: string;
       maxTokens?: number;
       temperature?: number;
+      onSummaryDelta?: (text: string) => void;
     }
   ): Promise<SummarizationResult> {
     const apiKey = ConfigLoader.get('summarization.apiKey') || process.env.OPENROUTER_API_KEY;
@@ -104,7 +113,8 @@ export class LLMAdapter implements SummarizationService {
     const maxTokens = options?.maxTokens || ConfigLoader.get('summarization.maxTokens');
     const temperature = options?.temperature ?? ConfigLoader.get('summarization.temperature');
 
-    const response = await fetch(`${baseUrl}/chat/completions`, {
+    const requestedAt = Date.now();
+    const response = await ProviderClients.getInstance().get(baseUrl).request('/chat/completions', {
       method: 'POST',
       headers: {
         'Authorization': `Bearer ${apiKey}`,
@@ -125,6 +135,7 @@ export class LLMAdapter implements SummarizationService {
         temperature,
         // Always enforce JSON format
         response_format: { type: 'json_object' },
+        ...(options?.onSummaryDelta ? { stream: true } : {}),
       }),
     });
 
@@ -133,8 +144,7 @@ export class LLMAdapter implements SummarizationService {
       throw new Error(`OpenRouter summarization failed: ${error}`);
     }
 
-    const result = await response.json();
-    const messageContent = result.choices[0].message.content;
+    const messageContent = await this.readContent(response, requestedAt, options?.onSummaryDelta);
     
     // Parse the JSON response
     const content = JSON.parse(messageContent);
@@ -142,6 +152,32 @@ export class LLMAdapter implements SummarizationService {
     return parsedResult;
   }
 
+  // A streamed answer forwards the summary text as it arrives; the result is
+  // still parsed from the complete message
+  private async readContent(
+    response: Response,
+    requestedAt: number,
+    onSummaryDelta?: (text: string) => void
+  ): Promise<string> {
+    if (!onSummaryDelta) {
+      const result = await response.json();
+      return result.choices[0].message.content;
+    }
+
+    const summary = new JsonStringFieldReader('summary');
+    let firstToken = true;
+    return readChatCompletionStream(response, delta => {
+      if (firstToken) {
+        StageMetrics.getInstance().observe('llm_first_token', Date.now() - requestedAt);
+        firstToken = false;
+      }
+      const text = summary.push(delta);
+      if (text) {
+        onSummaryDelta(text);
+      }
+    });
+  }
+
   private getSystemPrompt(language: Language, isCustomPrompt: boolean = false): string {
     // For custom prompts, use the with_custom template
     if (isCustomPrompt) {
@@ -0,0 +1,74 @@
+import fs from 'fs/promises';
+import os from 'os';
+import path from 'path';
+import { Readable } from 'stream';
+import { LocalStorageAdapter, FileTooLargeError } from './LocalStorageAdapter';
+import { ConfigLoader } from '../../config/loader';
+
+const SHA256_HELLO = '2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824';
+
+describe('LocalStorageAdapter', () => {
+  let uploadDir: string;
+  let objects: any;
+  let storage: LocalStorageAdapter;
+
+  beforeEach(async () => {
+    uploadDir = await fs.mkdtemp(path.join(os.tmpdir(), 'uploads-'));
+    jest.spyOn(ConfigLoader, 'get').mockReturnValue(uploadDir);
+    objects = { register: jest.fn().mockResolvedValue(undefined) };
+    storage = new LocalStorageAdapter(objects);
+  });
+
+  afterEach(async () => {
+    jest.restoreAllMocks();
+    await fs.rm(uploadDir, { recursive: true, force: true });
+  });
+
+  it('stores identical uploads once, under their hash in fan-out directories', async () => {
+    const streamed = await storage.saveStream(Readable.from([Buffer.from('hel'), Buffer.from('lo')]), 'Modrzewiowa 4.M4A');
+    const saved = await storage.save(Buffer.from('hello'), 'Modrzewiowa_4 (1).m4a');
+
+    const expected = path.join(uploadDir, 'objects', '2c', 'f2', `${SHA256_HELLO}.m4a`);
+    expect(streamed).toEqual({ path: expected, size: 5, sha256: SHA256_HELLO });
+    expect(saved).toBe(expected);
+    expect(await fs.readFile(expected, 'utf8')).toBe('hello');
+    expect(await fs.readdir(path.join(uploadDir, 'objects', '2c', 'f2'))).toHaveLength(1);
+    expect(await fs.readdir(path.join(uploadDir, 'tmp'))).toEqual([]);
+    expect(objects.register).toHaveBeenCalledTimes(2);
+    expect(objects.register).toHaveBeenCalledWith({ path: expected, hash: SHA256_HELLO, size: 5 });
+  });
+
+  it('leaves nothing behind when an upload is too large', async () => {
+    await expect(storage.saveStream(Readable.from([Buffer.alloc(10)]), 'big.m4a', undefined, { maxBytes: 4 }))
+      .rejects.toBeInstanceOf(FileTooLargeError);
+
+    expect(await fs.readdir(path.join(uploadDir, 'tmp'))).toEqual([]);
+    expect(objects.register).not.toHaveBeenCalled();
+  });
+
+  it('removes a file unless it is still needed once out of the way', async () => {
+    const filePath = await storage.save(Buffer.from('hello'), 'note.m4a');
+
+    expect(await storage.remove(filePath, async () => true)).toBe(false);
+    expect(await storage.exists(filePath)).toBe(true);
+
+    expect(await storage.remove(filePath, async () => false)).toBe(true);
+    expect(await storage.exists(filePath)).toBe(false);
+    expect(await fs.readdir(path.join(uploadDir, 'tmp'))).toEqual([]);
+
+    // Already gone
+    expect(await storage.remove(filePath, async () => false)).toBe(false);
+  });
+
+  it('sweeps only stale temporary files', async () => {
+    const tmp = path.join(uploadDir, 'tmp');
+    await fs.mkdir(tmp, { recursive: true });
+    await fs.writeFile(path.join(tmp, 'stale.part'), 'x');
+    await fs.writeFile(path.join(tmp, 'fresh.part'), 'x');
+    const twoHoursAgo = new Date(Date.now() - 2 * 60 * 60 * 1000);
+    await fs.utimes(path.join(tmp, 'stale.part'), twoHoursAgo, twoHoursAgo);
+
+    expect(await storage.sweepTemporary()).toBe(1);
+    expect(await fs.readdir(tmp)).toEqual(['fresh.part']);
+  });
+});
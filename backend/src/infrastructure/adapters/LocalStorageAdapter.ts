@@ -1,30 +1,108 @@
 import fs from 'fs/promises';
+import { createWriteStream } from 'fs';
+import { createHash, randomBytes } from 'crypto';
 import path from 'path';
-import { StorageService } from '../../domain/services/StorageService';
+import { Readable, Transform } from 'stream';
+import { pipeline } from 'stream/promises';
+import { StorageService, StoredFile } from '../../domain/services/StorageService';
+import { StoredObjectRepository } from '../../domain/repositories/StoredObjectRepository';
 import { ConfigLoader } from '../../config/loader';
+import { StageMetrics } from '../observability/StageMetrics';
 
+// Partial uploads and interrupted removals this old were left behind by a crash
+const TEMPORARY_MAX_AGE_MS = 60 * 60 * 1000;
+
+export class FileTooLargeError extends Error {
+  constructor(public readonly maxBytes: number) {
+    super(`File size exceeds maximum allowed size of ${Math.round(maxBytes / 1024 / 1024)}MB`);
+    this.name = 'FileTooLargeError';
+  }
+}
+
+/**
+ * Content-addressed upload storage: a file is stored once under its SHA-256,
+ * at objects/ab/cd/<sha256><ext>, however many notes upload it. The two
+ * levels of fan-out (65536 leaf directories) keep directories small at
+ * millions of files.
+ *
+ * Uploads are written to tmp/ while they are hashed, registered in the
+ * StoredObjectRepository and then renamed into place, so a file the reaper
+ * is removing is always either re-registered first or written again after.
+ * Files are deleted only by the storage reaper (see remove).
+ */
 export class LocalStorageAdapter implements StorageService {
   private readonly basePath: string;
+  private readonly knownDirectories = new Set<string>();
 
-  constructor() {
+  constructor(private readonly objects?: StoredObjectRepository) {
     this.basePath = ConfigLoader.get('storage.uploadDir');
     this.ensureDirectoryExists();
   }
 
   async save(buffer: Buffer, originalName: string, userId?: string): Promise<string> {
-    // Generate unique filename
-    const timestamp = Date.now();
-    const sanitizedName = originalName.replace(/[^a-zA-Z0-9._-]/g, '_');
-    const fileName = `${timestamp}-${sanitizedName}`;
-    
-    const fullPath = this.getFullPath(fileName);
-    const directory = path.dirname(fullPath);
-    
-    await fs.mkdir(directory, { recursive: true });
-    await fs.writeFile(fullPath, buffer);
-    
-    // Return the full path so WhisperAdapter can find the file
-    return fullPath;
+    const sha256 = createHash('sha256').update(buffer).digest('hex');
+    const partialPath = await this.temporaryPath('part');
+
+    try {
+      await StageMetrics.getInstance().time('disk_write', () => fs.writeFile(partialPath, buffer));
+      const fullPath = this.objectPath(sha256, originalName);
+      await this.place(partialPath, fullPath, sha256, buffer.length);
+      // Return the full path so WhisperAdapter can find the file
+      return fullPath;
+    } catch (error) {
+      await fs.unlink(partialPath).catch(() => undefined);
+      throw error;
+    }
+  }
+
+  async saveStream(
+    stream: Readable,
+    originalName: string,
+    userId?: string,
+    options?: { maxBytes?: number }
+  ): Promise<StoredFile> {
+    const partialPath = await this.temporaryPath('part');
+
+    // Hash and count bytes as they pass through on their way to disk
+    const hash = createHash('sha256');
+    const maxBytes = options?.maxBytes;
+    let size = 0;
+    const meter = new Transform({
+      transform(chunk: Buffer, _encoding, callback) {
+        size += chunk.length;
+        if (maxBytes && size > maxBytes) {
+          callback(new FileTooLargeError(maxBytes));
+          return;
+        }
+        hash.update(chunk);
+        callback(null, chunk);
+      }
+    });
+
+    try {
+      await StageMetrics.getInstance().time('disk_write', () =>
+        pipeline(stream, meter, createWriteStream(partialPath)));
+    } catch (error) {
+      await fs.unlink(partialPath).catch(() => undefined);
+      // Drain the rest of the source so the multipart parser can move on
+      stream.resume();
+      throw error;
+    }
+
+    const sha256 = hash.digest('hex');
+    const fullPath = this.objectPath(sha256, originalName);
+    try {
+      await this.place(partialPath, fullPath, sha256, size);
+    } catch (error) {
+      await fs.unlink(partialPath).catch(() => undefined);
+      throw error;
+    }
+
+    return {
+      path: fullPath,
+      size,
+      sha256
+    };
   }
 
   async read(filePath: string): Promise<Buffer> {
@@ -34,7 +112,7 @@ export class LocalStorageAdapter implements StorageService {
 
   async delete(filePath: string): Promise<void> {
     const fullPath = this.getFullPath(filePath);
-    
+
     try {
       await fs.unlink(fullPath);
     } catch (error: any) {
@@ -44,9 +122,76 @@ export class LocalStorageAdapter implements StorageService {
     }
   }
 
+  /**
+   * Delete a file unless it is wanted again by the time it is out of the way:
+   * the file is first moved into tmp/, then isStillNeeded() is asked, and it
+   * is moved back if an upload registered the same content meanwhile. An
+   * upload that finds the path empty writes its own identical copy, so the
+   * file is never lost. Returns whether a file was deleted.
+   */
+  async remove(filePath: string, isStillNeeded: () => Promise<boolean>): Promise<boolean> {
+    const fullPath = this.getFullPath(filePath);
+    const removingPath = await this.temporaryPath('reap');
+
+    try {
+      await fs.rename(fullPath, removingPath);
+    } catch (error: any) {
+      if (error.code === 'ENOENT') {
+        return false;
+      }
+      throw error;
+    }
+
+    let needed = true;
+    try {
+      needed = await isStillNeeded();
+    } finally {
+      if (needed) {
+        await fs.rename(removingPath, fullPath);
+      }
+    }
+    if (needed) {
+      return false;
+    }
+
+    await fs.unlink(removingPath);
+    return true;
+  }
+
+  async sweepTemporary(now: Date = new Date()): Promise<number> {
+    const directory = path.join(this.basePath, 'tmp');
+    let names: string[];
+    try {
+      names = await fs.readdir(directory);
+    } catch (error: any) {
+      if (error.code === 'ENOENT') {
+        return 0;
+      }
+      throw error;
+    }
+
+    let removed = 0;
+    for (const name of names) {
+      const filePath = path.join(directory, name);
+      try {
+        const stats = await fs.stat(filePath);
+        if (now.getTime() - stats.mtimeMs > TEMPORARY_MAX_AGE_MS) {
+          await fs.unlink(filePath);
+          removed++;
+        }
+      } catch (error: any) {
+        // Finished or cleaned up since the listing
+        if (error.code !== 'ENOENT') {
+          throw error;
+        }
+      }
+    }
+    return removed;
+  }
+
   async exists(filePath: string): Promise<boolean> {
     const fullPath = this.getFullPath(filePath);
-    
+
     try {
       await fs.access(fullPath);
       return true;
@@ -59,7 +204,40 @@ export class LocalStorageAdapter implements StorageService {
     return `/files/${filePath}`;
   }
 
+  // Register first, then publish: see remove() for why the order matters
+  private async place(partialPath: string, fullPath: string, sha256: string, size: number): Promise<void> {
+    await this.objects?.register({ path: fullPath, hash: sha256, size });
+    await this.ensureDirectory(path.dirname(fullPath));
+    // Replaces an existing copy with identical bytes; readers holding it open are unaffected
+    await fs.rename(partialPath, fullPath);
+  }
+
+  private objectPath(sha256: string, originalName: string): string {
+    // The extension stays on the file: ffmpeg and the providers go by it
+    const extension = path.extname(originalName).toLowerCase().replace(/[^a-z0-9.]/g, '').slice(0, 10);
+    return path.join(this.basePath, 'objects', sha256.slice(0, 2), sha256.slice(2, 4), `${sha256}${extension}`);
+  }
+
+  private async temporaryPath(kind: 'part' | 'reap'): Promise<string> {
+    const directory = path.join(this.basePath, 'tmp');
+    await this.ensureDirectory(directory);
+    return path.join(directory, `${Date.now()}-${randomBytes(8).toString('hex')}.${kind}`);
+  }
+
+  private async ensureDirectory(directory: string): Promise<void> {
+    // Directories are never removed, so each is created at most once per process
+    if (this.knownDirectories.has(directory)) {
+      return;
+    }
+    await fs.mkdir(directory, { recursive: true });
+    this.knownDirectories.add(directory);
+  }
+
   private getFullPath(filePath: string): string {
+    // save() hands out paths that already include the upload dir - accept them as-is
+    if (path.resolve(filePath).startsWith(path.resolve(this.basePath) + path.sep)) {
+      return filePath;
+    }
     const sanitized = filePath.replace(/^\/+/, '');
     return path.join(this.basePath, sanitized);
   }
@@ -67,4 +245,4 @@ export class LocalStorageAdapter implements StorageService {
   private async ensureDirectoryExists(): Promise<void> {
     await fs.mkdir(this.basePath, { recursive: true });
   }
-}
\ No newline at end of file
+}
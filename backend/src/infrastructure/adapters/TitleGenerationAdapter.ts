@@ -1,6 +1,8 @@
 import { TitleGenerationService, TitleGenerationResult, TitleGenerationError } from '../../domain/services/TitleGenerationService';
 import OpenAI from 'openai';
 import { PromptLoader } from '../config/PromptLoader';
+import { StageMetrics } from '../observability/StageMetrics';
+import { ProviderClients } from '../http/ProviderClients';
 
 export class TitleGenerationAdapter implements TitleGenerationService {
   private openai?: OpenAI;
@@ -27,9 +29,11 @@ export class TitleGenerationAdapter implements TitleGenerationService {
     
     try {
       if (provider === 'openai') {
-        return await this.generateWithOpenAI(transcription, language);
+        return await StageMetrics.getInstance().time('llm_title', () =>
+          this.generateWithOpenAI(transcription, language));
       } else {
-        return await this.generateWithOpenRouter(transcription, language);
+        return await StageMetrics.getInstance().time('llm_title', () =>
+          this.generateWithOpenRouter(transcription, language));
       }
     } catch (error) {
       console.error('Title generation failed:', error);
@@ -89,7 +93,8 @@ export class TitleGenerationAdapter implements TitleGenerationService {
     const maxTokens = this.config.titleGeneration?.maxTokens || 150;
     const temperature = this.config.titleGeneration?.temperature || 0.3;
 
-    const response = await fetch('https://openrouter.ai/api/v1/chat/completions', {
+    const baseUrl = process.env.OPENROUTER_API_URL || 'https://openrouter.ai/api/v1';
+    const response = await ProviderClients.getInstance().get(baseUrl).request('/chat/completions', {
       method: 'POST',
       headers: {
         'Authorization': `Bearer ${apiKey}`,
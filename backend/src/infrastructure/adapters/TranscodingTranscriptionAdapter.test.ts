@@ -0,0 +1,142 @@
+import { TranscodingTranscriptionAdapter } from './TranscodingTranscriptionAdapter';
+import { AudioTranscoder } from './AudioTranscoder';
+import { Language } from '../../domain/value-objects/Language';
+
+const PREPROCESSING = {
+  enabled: true,
+  format: 'opus',
+  sampleRate: 16000,
+  bitrateKbps: 24,
+  trimSilence: true,
+  silenceNoiseDb: -45,
+  minSilenceSec: 0.5
+};
+
+describe('AudioTranscoder.speechBounds', () => {
+  const header = '  Duration: 00:01:00.00, start: 0.000000, bitrate: 1411 kb/s';
+
+  it('should cut leading and trailing silence, keeping a little padding', () => {
+    const output = [
+      header,
+      '[silencedetect @ 0x1] silence_start: 0',
+      '[silencedetect @ 0x1] silence_end: 4.5 | silence_duration: 4.5',
+      '[silencedetect @ 0x1] silence_start: 20',
+      '[silencedetect @ 0x1] silence_end: 21 | silence_duration: 1',
+      '[silencedetect @ 0x1] silence_start: 52'
+    ].join('\n');
+
+    const bounds = AudioTranscoder.speechBounds(output);
+
+    expect(bounds).toEqual({ start: 4.25, end: 52.25, duration: 60 });
+    expect(AudioTranscoder.trimmedSeconds(bounds)).toBeCloseTo(4.25 + 7.75);
+  });
+
+  it('should treat a silence closed at the end of the file as trailing', () => {
+    const output = [
+      header,
+      '[silencedetect @ 0x1] silence_start: 55',
+      '[silencedetect @ 0x1] silence_end: 60 | silence_duration: 5'
+    ].join('\n');
+
+    expect(AudioTranscoder.speechBounds(output)).toEqual({ start: 0, end: 55.25, duration: 60 });
+  });
+
+  it('should leave recordings without edge silence or without speech alone', () => {
+    const pauseOnly = [
+      header,
+      '[silencedetect @ 0x1] silence_start: 20',
+      '[silencedetect @ 0x1] silence_end: 21 | silence_duration: 1'
+    ].join('\n');
+    const silent = [header, '[silencedetect @ 0x1] silence_start: 0'].join('\n');
+
+    expect(AudioTranscoder.speechBounds(pauseOnly)).toBeNull();
+    expect(AudioTranscoder.speechBounds(silent)).toBeNull();
+  });
+
+  it('should parse the input duration', () => {
+    expect(AudioTranscoder.parseDuration('  Duration: 01:02:03.50, start: 0')).toBe(3723.5);
+    expect(AudioTranscoder.parseDuration('  Duration: N/A, start: 0')).toBeNull();
+  });
+});
+
+describe('TranscodingTranscriptionAdapter', () => {
+  let inner: any;
+  let transcoder: jest.Mocked<AudioTranscoder>;
+  let config: any;
+  let adapter: TranscodingTranscriptionAdapter;
+
+  beforeEach(() => {
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+
+    inner = {
+      transcribe: jest.fn(async () => ({ text: 'hello', language: Language.PL, duration: 10, confidence: 0.9 })),
+      transcribeWithGemini: jest.fn(async () => ({ text: 'hello', language: Language.PL, duration: 10, confidence: 0.9 }))
+    };
+    transcoder = {
+      isAvailable: jest.fn().mockResolvedValue(true),
+      createWorkDir: jest.fn().mockResolvedValue('/tmp/transcode'),
+      removeWorkDir: jest.fn(),
+      transcode: jest.fn().mockResolvedValue({
+        path: '/tmp/transcode/note.ogg',
+        bytes: 40000,
+        originalBytes: 5000000,
+        trimmedSec: 3
+      })
+    } as any;
+    config = { transcription: { preprocessing: { ...PREPROCESSING } } };
+    adapter = new TranscodingTranscriptionAdapter(inner, transcoder, config);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should send the transcoded copy and clean up', async () => {
+    await adapter.transcribe('/data/note.wav', Language.PL, { prompt: 'Żabka' });
+
+    expect(transcoder.transcode).toHaveBeenCalledWith('/data/note.wav', '/tmp/transcode', config.transcription.preprocessing);
+    expect(inner.transcribe).toHaveBeenCalledWith('/tmp/transcode/note.ogg', Language.PL, { prompt: 'Żabka' });
+    expect(transcoder.removeWorkDir).toHaveBeenCalledWith('/tmp/transcode');
+  });
+
+  it('should transcode for Gemini too', async () => {
+    await adapter.transcribeWithGemini('/data/note.wav', Language.PL);
+
+    expect(inner.transcribeWithGemini).toHaveBeenCalledWith('/tmp/transcode/note.ogg', Language.PL, undefined);
+  });
+
+  it('should keep the original when the copy is not smaller', async () => {
+    transcoder.transcode.mockResolvedValue({
+      path: '/tmp/transcode/note.ogg',
+      bytes: 60000,
+      originalBytes: 50000,
+      trimmedSec: 0
+    });
+
+    await adapter.transcribe('/data/note.m4a', Language.PL);
+
+    expect(inner.transcribe).toHaveBeenCalledWith('/data/note.m4a', Language.PL, undefined);
+  });
+
+  it('should send the original when transcoding fails', async () => {
+    transcoder.transcode.mockRejectedValue(new Error('ffmpeg exited with code 1'));
+
+    await adapter.transcribe('/data/note.webm', Language.PL);
+
+    expect(inner.transcribe).toHaveBeenCalledWith('/data/note.webm', Language.PL, undefined);
+    expect(transcoder.removeWorkDir).toHaveBeenCalledWith('/tmp/transcode');
+  });
+
+  it('should pass through when disabled or ffmpeg is missing', async () => {
+    config.transcription.preprocessing.enabled = false;
+    await adapter.transcribe('/data/a.wav', Language.PL);
+
+    config.transcription.preprocessing.enabled = true;
+    transcoder.isAvailable.mockResolvedValue(false);
+    await adapter.transcribe('/data/b.wav', Language.PL);
+
+    expect(transcoder.transcode).not.toHaveBeenCalled();
+    expect(inner.transcribe.mock.calls.map((call: any[]) => call[0])).toEqual(['/data/a.wav', '/data/b.wav']);
+  });
+});
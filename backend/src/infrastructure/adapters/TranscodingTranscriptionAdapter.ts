@@ -0,0 +1,75 @@
+import { TranscriptionService, TranscriptionResult } from '../../domain/services/TranscriptionService';
+import { Language } from '../../domain/value-objects/Language';
+import { Config } from '../../config/schema';
+import { StageMetrics } from '../observability/StageMetrics';
+import { AudioTranscoder } from './AudioTranscoder';
+
+type TranscriptionOptions = {
+  prompt?: string;
+  temperature?: number;
+  model?: string;
+  systemPrompt?: string;
+};
+
+/**
+ * TranscriptionService decorator that uploads a compact copy of the audio
+ * (transcription.preprocessing: mono, resampled, speech codec, edge silence
+ * trimmed) instead of the file as stored. Wrapped by ChunkedTranscriptionAdapter,
+ * so long recordings are transcoded chunk by chunk in parallel. When ffmpeg
+ * is missing, transcoding fails or the copy is not smaller, the original goes out.
+ */
+export class TranscodingTranscriptionAdapter implements TranscriptionService {
+  constructor(
+    private readonly inner: TranscriptionService,
+    private readonly transcoder: AudioTranscoder,
+    private readonly config: Config
+  ) {}
+
+  transcribe(
+    audioFilePath: string,
+    language: Language,
+    options?: TranscriptionOptions
+  ): Promise<TranscriptionResult> {
+    return this.withCompactAudio(audioFilePath,
+      filePath => this.inner.transcribe(filePath, language, options));
+  }
+
+  transcribeWithGemini(
+    audioFilePath: string,
+    language: Language,
+    options?: TranscriptionOptions
+  ): Promise<TranscriptionResult> {
+    return this.withCompactAudio(audioFilePath,
+      filePath => this.inner.transcribeWithGemini(filePath, language, options));
+  }
+
+  private async withCompactAudio(
+    audioFilePath: string,
+    transcribe: (filePath: string) => Promise<TranscriptionResult>
+  ): Promise<TranscriptionResult> {
+    const preprocessing = this.config.transcription.preprocessing;
+    if (!preprocessing.enabled || !(await this.transcoder.isAvailable())) {
+      return transcribe(audioFilePath);
+    }
+
+    const workDir = await this.transcoder.createWorkDir();
+    try {
+      let filePath = audioFilePath;
+      try {
+        const result = await StageMetrics.getInstance().time(
+          'audio_transcode',
+          () => this.transcoder.transcode(audioFilePath, workDir, preprocessing)
+        );
+        if (result.bytes < result.originalBytes) {
+          filePath = result.path;
+        }
+        console.log(`[TranscodingTranscriptionAdapter] ${result.originalBytes} -> ${result.bytes} bytes (${preprocessing.format}, ${result.trimmedSec.toFixed(1)}s silence trimmed), sending ${filePath === audioFilePath ? 'original' : 'transcoded'}`);
+      } catch (error) {
+        console.error('[TranscodingTranscriptionAdapter] Transcoding failed, sending the original file:', error);
+      }
+      return await transcribe(filePath);
+    } finally {
+      await this.transcoder.removeWorkDir(workDir);
+    }
+  }
+}
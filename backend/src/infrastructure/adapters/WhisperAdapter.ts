@@ -1,10 +1,15 @@
 import fs from 'fs';
+import { Readable } from 'stream';
 import { TranscriptionService, TranscriptionResult } from '../../domain/services/TranscriptionService';
 import { Language } from '../../domain/value-objects/Language';
 import { ConfigLoader } from '../../config/loader';
 import { PromptLoader } from '../config/PromptLoader';
+import { StageMetrics } from '../observability/StageMetrics';
+import { ProviderClients } from '../http/ProviderClients';
+import { ProviderNetworkError } from '../http/ProviderHttpClient';
 
 export class WhisperAdapter implements TranscriptionService {
+  private static readonly AUDIO_PLACEHOLDER = '__AUDIO_BASE64__';
   private promptLoader: PromptLoader;
 
   constructor(promptLoader?: PromptLoader) {
@@ -77,15 +82,16 @@ export class WhisperAdapter implements TranscriptionService {
       throw new Error(`Audio file not found: ${fullPath}`);
     }
     
-    // Read file as buffer
-    const fileBuffer = fs.readFileSync(fullPath);
     const fileName = audioFilePath.split('/').pop() || 'audio.m4a';
     
-    // Create a Blob from the buffer with proper MIME type
+    // File-backed Blob: the multipart body streams from disk instead of a heap copy
     const mimeType = fileName.endsWith('.m4a') ? 'audio/m4a' : 
                      fileName.endsWith('.mp3') ? 'audio/mpeg' :
-                     fileName.endsWith('.wav') ? 'audio/wav' : 'audio/mpeg';
-    const fileBlob = new Blob([fileBuffer], { type: mimeType });
+                     fileName.endsWith('.wav') ? 'audio/wav' :
+                     fileName.endsWith('.ogg') ? 'audio/ogg' :
+                     fileName.endsWith('.flac') ? 'audio/flac' :
+                     fileName.endsWith('.webm') ? 'audio/webm' : 'audio/mpeg';
+    const fileBlob = await fs.openAsBlob(fullPath, { type: mimeType });
     
     // Retry logic with exponential backoff
     const maxRetries = 3;
@@ -117,14 +123,16 @@ export class WhisperAdapter implements TranscriptionService {
         
         console.log(`[WhisperAdapter] Attempt ${attempt}/${maxRetries} - Transcribing with OpenAI...`);
         
-        const response = await fetch(`${baseUrl}/audio/transcriptions`, {
-          method: 'POST',
-          headers: {
-            'Authorization': `Bearer ${apiKey}`,
-            // DO NOT set Content-Type - let fetch handle it automatically
-          },
-          body: formData,
-        });
+        const response = await StageMetrics.getInstance().time('transcription_provider', () =>
+          ProviderClients.getInstance().get(baseUrl).request('/audio/transcriptions', {
+            method: 'POST',
+            headers: {
+              'Authorization': `Bearer ${apiKey}`,
+              // DO NOT set Content-Type - the client sets the multipart boundary
+            },
+            body: formData,
+          })
+        );
 
         if (!response.ok) {
           const error = await response.text();
@@ -137,14 +145,7 @@ export class WhisperAdapter implements TranscriptionService {
             continue; // Retry with new model
           }
           
-          // Check for rate limit errors
-          if (response.status === 429) {
-            const retryAfter = response.headers.get('retry-after');
-            const waitTime = retryAfter ? parseInt(retryAfter) * 1000 : Math.pow(2, attempt) * 1000;
-            console.log(`[WhisperAdapter] Rate limited, waiting ${waitTime}ms before retry...`);
-            await new Promise(resolve => setTimeout(resolve, waitTime));
-            continue;
-          }
+          // 429s were already retried by the provider client (Retry-After); still throttled = give up
           
           // For server errors, retry with exponential backoff
           if (response.status >= 500) {
@@ -175,7 +176,7 @@ export class WhisperAdapter implements TranscriptionService {
         
         // If this is a network error and not the last attempt, retry
         if (attempt < maxRetries && 
-            (error instanceof TypeError || // Network errors
+            (error instanceof ProviderNetworkError || // Network errors and timeouts
              (error as any).code === 'ECONNRESET' ||
              (error as any).code === 'ETIMEDOUT')) {
           const waitTime = Math.pow(2, attempt) * 1000;
@@ -215,15 +216,16 @@ export class WhisperAdapter implements TranscriptionService {
       throw new Error(`Audio file not found: ${fullPath}`);
     }
     
-    // Read file as buffer
-    const fileBuffer = fs.readFileSync(fullPath);
     const fileName = audioFilePath.split('/').pop() || 'audio.m4a';
     
-    // Create a Blob from the buffer
+    // File-backed Blob streamed from disk
     const mimeType = fileName.endsWith('.m4a') ? 'audio/m4a' : 
                      fileName.endsWith('.mp3') ? 'audio/mpeg' :
-                     fileName.endsWith('.wav') ? 'audio/wav' : 'audio/mpeg';
-    const fileBlob = new Blob([fileBuffer], { type: mimeType });
+                     fileName.endsWith('.wav') ? 'audio/wav' :
+                     fileName.endsWith('.ogg') ? 'audio/ogg' :
+                     fileName.endsWith('.flac') ? 'audio/flac' :
+                     fileName.endsWith('.webm') ? 'audio/webm' : 'audio/mpeg';
+    const fileBlob = await fs.openAsBlob(fullPath, { type: mimeType });
     
     // Use native FormData
     const formData = new FormData();
@@ -246,16 +248,18 @@ export class WhisperAdapter implements TranscriptionService {
       formData.append('temperature', options.temperature.toString());
     }
 
-    const response = await fetch(`${baseUrl}/audio/transcriptions`, {
-      method: 'POST',
-      headers: {
-        'Authorization': `Bearer ${apiKey}`,
-        'HTTP-Referer': 'https://nano-grazynka.app',
-        'X-Title': 'nano-Grazynka',
-        // DO NOT set Content-Type
-      },
-      body: formData,
-    });
+    const response = await StageMetrics.getInstance().time('transcription_provider', () =>
+      ProviderClients.getInstance().get(baseUrl).request('/audio/transcriptions', {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${apiKey}`,
+          'HTTP-Referer': 'https://nano-grazynka.app',
+          'X-Title': 'nano-Grazynka',
+          // DO NOT set Content-Type
+        },
+        body: formData,
+      })
+    );
 
     if (!response.ok) {
       const error = await response.text();
@@ -288,7 +292,7 @@ export class WhisperAdapter implements TranscriptionService {
     if (!apiKey) {
       throw new Error('GEMINI_API_KEY not configured in environment variables');
     }
-    const baseUrl = 'https://generativelanguage.googleapis.com/v1beta';
+    const baseUrl = process.env.GEMINI_API_URL || 'https://generativelanguage.googleapis.com/v1beta';
     
     // Use the path as-is since LocalStorageAdapter now returns full path
     const fullPath = audioFilePath;
@@ -297,9 +301,9 @@ export class WhisperAdapter implements TranscriptionService {
       throw new Error(`Audio file not found: ${fullPath}`);
     }
     
-    // Read file as buffer and encode as base64
-    const fileBuffer = fs.readFileSync(fullPath);
-    const base64Audio = fileBuffer.toString('base64');
+    // Audio is base64-encoded on the fly while the request body streams (see streamGeminiBody)
+    const { size: fileSize } = await fs.promises.stat(fullPath);
+    const base64Length = Math.ceil(fileSize / 3) * 4;
     
     // Determine MIME type for direct Gemini API
     const fileName = audioFilePath.split('/').pop() || 'audio.m4a';
@@ -327,7 +331,7 @@ export class WhisperAdapter implements TranscriptionService {
     );
     
     // Debug: Log audio file size
-    console.log(`[Gemini] Processing audio file: ${fileName}, size: ${fileBuffer.length} bytes, mime: ${mimeType}`);
+    console.log(`[Gemini] Processing audio file: ${fileName}, size: ${fileSize} bytes, mime: ${mimeType}`);
     
     // Construct request for direct Gemini API
     // Combine system prompt and user prompt into single instruction
@@ -346,7 +350,7 @@ ${options?.prompt || "Please transcribe this audio accurately."}`;
             {
               inline_data: {
                 mime_type: mimeType,
-                data: base64Audio
+                data: WhisperAdapter.AUDIO_PLACEHOLDER
               }
             }
           ]
@@ -367,7 +371,7 @@ ${options?.prompt || "Please transcribe this audio accurately."}`;
         {
           parts: [
             { text: fullPrompt },
-            { inline_data: { mime_type: mimeType, data: `[BASE64_DATA_${base64Audio.length}_CHARS]` } }
+            { inline_data: { mime_type: mimeType, data: `[BASE64_DATA_${base64Length}_CHARS]` } }
           ]
         }
       ],
@@ -376,6 +380,8 @@ ${options?.prompt || "Please transcribe this audio accurately."}`;
     
     // Use the correct Gemini API endpoint
     const modelName = 'models/gemini-2.0-flash-exp';
+    const [bodyHead, bodyTail] = JSON.stringify(requestBody).split(`"${WhisperAdapter.AUDIO_PLACEHOLDER}"`);
+    const contentLength = Buffer.byteLength(bodyHead) + base64Length + 2 + Buffer.byteLength(bodyTail);
     
     // Retry logic with exponential backoff for 503 errors
     let lastError;
@@ -384,13 +390,17 @@ ${options?.prompt || "Please transcribe this audio accurately."}`;
     
     for (let attempt = 0; attempt < maxRetries; attempt++) {
       try {
-        const response = await fetch(`${baseUrl}/${modelName}:generateContent?key=${apiKey}`, {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json'
-          },
-          body: JSON.stringify(requestBody)
-        });
+        // A fresh stream per send (including 429 retries) - a consumed body can't be replayed
+        const response = await StageMetrics.getInstance().time('transcription_provider', () =>
+          ProviderClients.getInstance().get(baseUrl).request(`/${modelName}:generateContent?key=${apiKey}`, {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/json',
+              'Content-Length': String(contentLength)
+            },
+            body: () => Readable.from(this.streamGeminiBody(fullPath, bodyHead, bodyTail))
+          })
+        );
 
         if (!response.ok) {
           const error = await response.text();
@@ -452,6 +462,26 @@ ${options?.prompt || "Please transcribe this audio accurately."}`;
     throw lastError || new Error('Gemini transcription failed after all retries');
   }
 
+  /**
+   * Yields the Gemini JSON request with the audio file base64-encoded chunk by
+   * chunk, so neither the raw file nor its base64 form is held in memory.
+   * Chunks are cut on 3-byte boundaries so the pieces concatenate into valid base64.
+   */
+  private async *streamGeminiBody(filePath: string, head: string, tail: string): AsyncGenerator<Buffer> {
+    yield Buffer.from(`${head}"`);
+    let carry = Buffer.alloc(0);
+    for await (const chunk of fs.createReadStream(filePath, { highWaterMark: 3 * 64 * 1024 })) {
+      const data = carry.length > 0 ? Buffer.concat([carry, chunk as Buffer]) : (chunk as Buffer);
+      const usable = data.length - (data.length % 3);
+      yield Buffer.from(data.subarray(0, usable).toString('base64'));
+      carry = data.subarray(usable);
+    }
+    if (carry.length > 0) {
+      yield Buffer.from(carry.toString('base64'));
+    }
+    yield Buffer.from(`"${tail}`);
+  }
+
   private calculateConfidence(segments?: any[]): number {
     if (!segments || segments.length === 0) {
       return 0.95;
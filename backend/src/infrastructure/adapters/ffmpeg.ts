@@ -0,0 +1,30 @@
+import { spawn } from 'child_process';
+
+// Keep only the tail of ffmpeg's stderr for error messages
+const MAX_ERROR_OUTPUT = 2000;
+
+export const DEFAULT_FFMPEG_PATH = process.env.FFMPEG_PATH || 'ffmpeg';
+
+/**
+ * Run ffmpeg to completion and resolve with its stderr (where it reports
+ * stream info and filter output such as silencedetect).
+ */
+export function runFfmpeg(ffmpegPath: string, args: string[]): Promise<string> {
+  return new Promise((resolve, reject) => {
+    const child = spawn(ffmpegPath, args, { stdio: ['ignore', 'ignore', 'pipe'] });
+    let output = '';
+
+    child.stderr.setEncoding('utf8');
+    child.stderr.on('data', chunk => {
+      output += chunk;
+    });
+    child.on('error', reject);
+    child.on('close', code => {
+      if (code === 0) {
+        resolve(output);
+      } else {
+        reject(new Error(`ffmpeg exited with code ${code}: ${output.slice(-MAX_ERROR_OUTPUT)}`));
+      }
+    });
+  });
+}
@@ -0,0 +1,159 @@
+import { AuthenticatedUserCache } from './AuthenticatedUserCache';
+import { UserEntity } from '../../domain/entities/User';
+import { UserRepositoryImpl } from '../persistence/UserRepositoryImpl';
+
+const NOW = Date.UTC(2026, 9, 1);
+const OPTIONS = { enabled: true, ttlMs: 30000, maxEntries: 100 };
+
+function makeUser(id: string, overrides: Partial<{ tier: 'free' | 'pro' | 'business'; creditsUsed: number }> = {}) {
+  return UserEntity.fromPersistence({
+    id,
+    email: `${id}@example.com`,
+    tier: overrides.tier ?? 'free',
+    creditsUsed: overrides.creditsUsed ?? 0,
+    creditsResetDate: new Date(NOW),
+    createdAt: new Date(NOW)
+  });
+}
+
+function toRow(user: UserEntity) {
+  return { ...user.toJSON(), passwordHash: 'hash', lastLoginAt: null };
+}
+
+describe('AuthenticatedUserCache', () => {
+  let cache: AuthenticatedUserCache;
+
+  beforeEach(() => {
+    cache = new AuthenticatedUserCache({ ...OPTIONS });
+  });
+
+  it('should load a user once within the TTL and share concurrent loads', async () => {
+    const load = jest.fn().mockResolvedValue(makeUser('u1'));
+
+    await Promise.all([cache.getUser('u1', load, NOW), cache.getUser('u1', load, NOW)]);
+    await cache.getUser('u1', load, NOW + 29000);
+    expect(load).toHaveBeenCalledTimes(1);
+
+    await cache.getUser('u1', load, NOW + 31000);
+    expect(load).toHaveBeenCalledTimes(2);
+  });
+
+  it('should not cache a failed load or a missing user', async () => {
+    const load = jest.fn()
+      .mockRejectedValueOnce(new Error('database is locked'))
+      .mockResolvedValueOnce(null)
+      .mockResolvedValue(makeUser('u1'));
+
+    await expect(cache.getUser('u1', load, NOW)).rejects.toThrow('database is locked');
+    await expect(cache.getUser('u1', load, NOW)).resolves.toBeNull();
+    await expect(cache.getUser('u1', load, NOW)).resolves.toMatchObject({ id: 'u1' });
+    expect(load).toHaveBeenCalledTimes(3);
+  });
+
+  it('should serve a written user without loading and reload after invalidation', async () => {
+    const load = jest.fn().mockResolvedValue(makeUser('u1'));
+
+    cache.setUser(makeUser('u1', { tier: 'pro' }), NOW);
+    expect((await cache.getUser('u1', load, NOW))!.tier).toBe('pro');
+    expect(load).not.toHaveBeenCalled();
+
+    cache.invalidateUser('u1');
+    expect((await cache.getUser('u1', load, NOW))!.tier).toBe('free');
+  });
+
+  it('should keep a write even if an older load finishes after it', async () => {
+    let finishLoad: (user: UserEntity) => void = () => {};
+    const stale = cache.getUser('u1', () => new Promise(resolve => { finishLoad = resolve; }), NOW);
+
+    cache.setUser(makeUser('u1', { creditsUsed: 3 }), NOW);
+    finishLoad(makeUser('u1', { creditsUsed: 2 }));
+    await stale;
+
+    expect((await cache.getUser('u1', jest.fn(), NOW))!.creditsUsed).toBe(3);
+  });
+
+  it('should evict the least recently used users past maxEntries', async () => {
+    cache = new AuthenticatedUserCache({ ...OPTIONS, maxEntries: 2 });
+    cache.setUser(makeUser('a'), NOW);
+    cache.setUser(makeUser('b'), NOW);
+    await cache.getUser('a', jest.fn(), NOW);
+    cache.setUser(makeUser('c'), NOW);
+
+    const load = jest.fn().mockResolvedValue(makeUser('b'));
+    await cache.getUser('b', load, NOW);
+    expect(load).toHaveBeenCalledTimes(1);
+    expect(cache.size().users).toBe(2);
+  });
+
+  it('should verify a token once and never past its expiry', () => {
+    const verify = jest.fn().mockReturnValue({ userId: 'u1', email: 'u1@example.com', tier: 'free', exp: NOW / 1000 + 10 });
+
+    cache.verifySession('token', verify, NOW);
+    cache.verifySession('token', verify, NOW + 5000);
+    expect(verify).toHaveBeenCalledTimes(1);
+
+    cache.verifySession('token', verify, NOW + 11000);
+    expect(verify).toHaveBeenCalledTimes(2);
+
+    cache.invalidateSession('token');
+    cache.verifySession('token', verify, NOW + 11000);
+    expect(verify).toHaveBeenCalledTimes(3);
+  });
+
+  it('should not cache a token that fails verification', () => {
+    const verify = jest.fn(() => { throw new Error('Invalid token'); });
+
+    expect(() => cache.verifySession('bad', verify, NOW)).toThrow('Invalid token');
+    expect(() => cache.verifySession('bad', verify, NOW)).toThrow('Invalid token');
+    expect(cache.size().sessions).toBe(0);
+  });
+
+  it('should pass straight through when disabled', async () => {
+    cache.configure({ ...OPTIONS, enabled: false });
+    const load = jest.fn().mockResolvedValue(makeUser('u1'));
+
+    cache.setUser(makeUser('u1', { tier: 'pro' }), NOW);
+    await cache.getUser('u1', load, NOW);
+    await cache.getUser('u1', load, NOW);
+
+    expect(load).toHaveBeenCalledTimes(2);
+  });
+});
+
+describe('UserRepositoryImpl with AuthenticatedUserCache', () => {
+  let prisma: any;
+  let repository: UserRepositoryImpl;
+
+  beforeEach(() => {
+    prisma = {
+      user: {
+        findUnique: jest.fn().mockResolvedValue(toRow(makeUser('u1'))),
+        update: jest.fn().mockResolvedValue(toRow(makeUser('u1', { tier: 'pro' })))
+      }
+    };
+    repository = new UserRepositoryImpl(prisma, new AuthenticatedUserCache({ ...OPTIONS }));
+  });
+
+  it('should query a user once across requests', async () => {
+    await repository.findById('u1');
+    await repository.findById('u1');
+
+    expect(prisma.user.findUnique).toHaveBeenCalledTimes(1);
+  });
+
+  it('should serve the updated user after a tier change without another query', async () => {
+    await repository.findById('u1');
+    await repository.updateTier('u1', 'pro');
+
+    expect((await repository.findById('u1'))!.tier).toBe('pro');
+    expect(prisma.user.findUnique).toHaveBeenCalledTimes(1);
+  });
+
+  it('should query again after an explicit invalidation', async () => {
+    await repository.findById('u1');
+    repository.invalidateCachedUser('u1');
+    await repository.findById('u1');
+
+    expect(prisma.user.findUnique).toHaveBeenCalledTimes(2);
+  });
+});
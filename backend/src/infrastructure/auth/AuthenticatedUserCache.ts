@@ -0,0 +1,143 @@
+import { UserEntity } from '../../domain/entities/User';
+import type { JwtPayload } from './JwtService';
+
+export interface AuthenticatedUserCacheOptions {
+  enabled: boolean;
+  ttlMs: number;
+  maxEntries: number;
+}
+
+interface UserEntry {
+  user: Promise<UserEntity | null>;
+  expiresAt: number;
+}
+
+interface SessionEntry {
+  payload: JwtPayload;
+  expiresAt: number;
+}
+
+const DEFAULT_OPTIONS: AuthenticatedUserCacheOptions = { enabled: true, ttlMs: 30000, maxEntries: 10000 };
+
+/**
+ * Process-wide cache of users by id and of verified session tokens, so an
+ * authenticated request needs neither a users query nor a signature check.
+ * Shared by every UserRepositoryImpl: its writes (tier, credits, login)
+ * replace the cached user and logout drops the session, so this process
+ * never serves a stale user. Other cluster workers see such a change once
+ * their entry expires (ttlMs). Both Maps double as LRU lists.
+ */
+export class AuthenticatedUserCache {
+  private static instance: AuthenticatedUserCache;
+  private users = new Map<string, UserEntry>();
+  private sessions = new Map<string, SessionEntry>();
+
+  constructor(private options: AuthenticatedUserCacheOptions = DEFAULT_OPTIONS) {}
+
+  static getInstance(): AuthenticatedUserCache {
+    if (!AuthenticatedUserCache.instance) {
+      AuthenticatedUserCache.instance = new AuthenticatedUserCache();
+    }
+    return AuthenticatedUserCache.instance;
+  }
+
+  configure(options: AuthenticatedUserCacheOptions): void {
+    this.options = options;
+    this.clear();
+  }
+
+  /**
+   * The cached user, or the result of load(). Concurrent misses share one
+   * load; a failed load and a missing user are not cached.
+   */
+  getUser(id: string, load: () => Promise<UserEntity | null>, now: number = Date.now()): Promise<UserEntity | null> {
+    if (!this.options.enabled) {
+      return load();
+    }
+
+    const cached = this.users.get(id);
+    if (cached) {
+      this.users.delete(id);
+      if (cached.expiresAt > now) {
+        this.users.set(id, cached);
+        return cached.user;
+      }
+    }
+
+    const entry: UserEntry = { user: load(), expiresAt: now + this.options.ttlMs };
+    this.users.set(id, entry);
+    this.evict(this.users, now);
+    entry.user.then(
+      user => {
+        if (!user) this.forget(id, entry);
+      },
+      () => this.forget(id, entry)
+    );
+    return entry.user;
+  }
+
+  /** Replaces the cached copy after a write, so the next request sees it without a query */
+  setUser(user: UserEntity, now: number = Date.now()): void {
+    if (!this.options.enabled || !user.id) {
+      return;
+    }
+    this.users.delete(user.id);
+    this.users.set(user.id, { user: Promise.resolve(user), expiresAt: now + this.options.ttlMs });
+    this.evict(this.users, now);
+  }
+
+  invalidateUser(id: string): void {
+    this.users.delete(id);
+  }
+
+  /** Verified token payload, calling verify() (which throws on a bad token) on a miss */
+  verifySession(token: string, verify: (token: string) => JwtPayload, now: number = Date.now()): JwtPayload {
+    if (!this.options.enabled) {
+      return verify(token);
+    }
+
+    const cached = this.sessions.get(token);
+    if (cached) {
+      this.sessions.delete(token);
+      if (cached.expiresAt > now) {
+        this.sessions.set(token, cached);
+        return cached.payload;
+      }
+    }
+
+    const payload = verify(token);
+    // Never outlive the token itself
+    const tokenExpiresAt = payload.exp ? payload.exp * 1000 : Infinity;
+    this.sessions.set(token, { payload, expiresAt: Math.min(now + this.options.ttlMs, tokenExpiresAt) });
+    this.evict(this.sessions, now);
+    return payload;
+  }
+
+  invalidateSession(token: string): void {
+    this.sessions.delete(token);
+  }
+
+  clear(): void {
+    this.users.clear();
+    this.sessions.clear();
+  }
+
+  size(): { users: number; sessions: number } {
+    return { users: this.users.size, sessions: this.sessions.size };
+  }
+
+  private forget(id: string, entry: UserEntry): void {
+    if (this.users.get(id) === entry) {
+      this.users.delete(id);
+    }
+  }
+
+  private evict(entries: Map<string, { expiresAt: number }>, now: number): void {
+    for (const [key, entry] of entries) {
+      if (entries.size <= this.options.maxEntries && entry.expiresAt > now) {
+        break;
+      }
+      entries.delete(key);
+    }
+  }
+}
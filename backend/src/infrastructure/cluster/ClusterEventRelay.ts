@@ -0,0 +1,41 @@
+import cluster from 'cluster';
+import { DomainEvent } from '../../domain/events/DomainEvent';
+
+export const CLUSTER_EVENT_MESSAGE = 'nano-grazynka:domain-event';
+
+export interface ClusterEventMessage {
+  type: typeof CLUSTER_EVENT_MESSAGE;
+  event: Omit<DomainEvent, 'occurredAt'> & { occurredAt: string };
+}
+
+export function isClusterEventMessage(message: unknown): message is ClusterEventMessage {
+  return typeof message === 'object' && message !== null
+    && (message as ClusterEventMessage).type === CLUSTER_EVENT_MESSAGE;
+}
+
+/**
+ * Carries persisted domain events between cluster workers over the IPC
+ * channel (worker -> primary -> every other worker), so an SSE client
+ * connected to one worker hears about a note processed by another.
+ */
+export class ClusterEventRelay {
+  static isAvailable(): boolean {
+    return cluster.isWorker && typeof process.send === 'function';
+  }
+
+  publish(event: DomainEvent): void {
+    const message: ClusterEventMessage = {
+      type: CLUSTER_EVENT_MESSAGE,
+      event: { ...event, occurredAt: event.occurredAt.toISOString() }
+    };
+    process.send?.(message);
+  }
+
+  onEvent(listener: (event: DomainEvent) => void): void {
+    process.on('message', (message: unknown) => {
+      if (isClusterEventMessage(message)) {
+        listener({ ...message.event, occurredAt: new Date(message.event.occurredAt) });
+      }
+    });
+  }
+}
@@ -0,0 +1,65 @@
+import cluster from 'cluster';
+import { ClusterSupervisor } from './ClusterSupervisor';
+
+describe('ClusterSupervisor', () => {
+  let nextId: number;
+  let forkedEnvs: Record<number, any>;
+  let listeners: Record<string, (...args: any[]) => void>;
+
+  beforeEach(() => {
+    jest.useFakeTimers();
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+    jest.spyOn(process, 'on').mockImplementation(() => process);
+    nextId = 1;
+    forkedEnvs = {};
+    listeners = {};
+    jest.spyOn(cluster, 'fork').mockImplementation(((env: any) => {
+      const id = nextId++;
+      forkedEnvs[id] = env;
+      return { id, process: { pid: 1000 + id } };
+    }) as any);
+    jest.spyOn(cluster, 'on').mockImplementation(((event: string, listener: any) => {
+      listeners[event] = listener;
+      return cluster;
+    }) as any);
+  });
+
+  afterEach(() => {
+    jest.useRealTimers();
+    jest.restoreAllMocks();
+    delete process.env.CLUSTER_WORKER_SLOT;
+  });
+
+  it('restarts a crashed worker into the slot it held', () => {
+    new ClusterSupervisor(2).start();
+
+    expect(forkedEnvs).toEqual({
+      1: { CLUSTER_WORKER_SLOT: '0' },
+      2: { CLUSTER_WORKER_SLOT: '1' }
+    });
+
+    // The leader crashes; its replacement gets a new id but keeps slot 0
+    listeners.exit({ id: 1, process: { pid: 1001 } }, 1, null);
+    jest.advanceTimersByTime(1000);
+
+    expect(forkedEnvs[3]).toEqual({ CLUSTER_WORKER_SLOT: '0' });
+  });
+
+  it('leads in slot 0 only', () => {
+    const isWorker = cluster.isWorker;
+    try {
+      (cluster as any).isWorker = true;
+      process.env.CLUSTER_WORKER_SLOT = '1';
+      expect(ClusterSupervisor.isLeader()).toBe(false);
+      process.env.CLUSTER_WORKER_SLOT = '0';
+      expect(ClusterSupervisor.isLeader()).toBe(true);
+
+      (cluster as any).isWorker = false;
+      delete process.env.CLUSTER_WORKER_SLOT;
+      expect(ClusterSupervisor.isLeader()).toBe(true);
+    } finally {
+      (cluster as any).isWorker = isWorker;
+    }
+  });
+});
@@ -0,0 +1,89 @@
+import cluster, { Worker } from 'cluster';
+import os from 'os';
+import { isClusterEventMessage } from './ClusterEventRelay';
+
+const RESTART_DELAY_MS = 1000;
+const SHUTDOWN_TIMEOUT_MS = 60 * 1000;
+// Slot index of a worker, kept when a crashed worker is replaced (worker ids are not)
+const WORKER_SLOT_ENV = 'CLUSTER_WORKER_SLOT';
+
+/**
+ * Cluster primary: forks the HTTP workers, restarts any that crash, relays
+ * domain events between them and forwards SIGTERM/SIGINT so each worker
+ * shuts down gracefully. The primary itself does not use the database once
+ * the workers run.
+ *
+ * Each worker is forked into a numbered slot, and a restarted worker takes
+ * over the slot of the one that crashed. The worker in slot 0 is the leader
+ * that runs once-per-database work.
+ */
+export class ClusterSupervisor {
+  private stopping = false;
+  private readonly slots = new Map<number, number>();
+
+  constructor(private readonly workers: number) {}
+
+  static resolveWorkerCount(configured: number): number {
+    return configured > 0 ? configured : os.availableParallelism();
+  }
+
+  // True in the slot 0 worker, and in a process that is not clustered at all
+  static isLeader(): boolean {
+    return !cluster.isWorker || process.env[WORKER_SLOT_ENV] === '0';
+  }
+
+  start(): void {
+    console.log(`[ClusterSupervisor] Primary ${process.pid} starting ${this.workers} workers`);
+
+    cluster.on('message', (worker: Worker, message: unknown) => {
+      if (!isClusterEventMessage(message)) return;
+      for (const other of Object.values(cluster.workers ?? {})) {
+        if (other && other.id !== worker.id && other.isConnected()) {
+          other.send(message);
+        }
+      }
+    });
+
+    cluster.on('exit', (worker: Worker, code: number, signal: string) => {
+      const slot = this.slots.get(worker.id);
+      this.slots.delete(worker.id);
+      if (this.stopping || slot === undefined) return;
+      console.error(`[ClusterSupervisor] Worker ${worker.process.pid} exited (${signal || code}), restarting`);
+      setTimeout(() => this.fork(slot), RESTART_DELAY_MS);
+    });
+
+    for (let slot = 0; slot < this.workers; slot++) {
+      this.fork(slot);
+    }
+
+    process.on('SIGTERM', () => this.stop('SIGTERM'));
+    process.on('SIGINT', () => this.stop('SIGINT'));
+  }
+
+  private fork(slot: number): void {
+    const worker = cluster.fork({ [WORKER_SLOT_ENV]: String(slot) });
+    this.slots.set(worker.id, slot);
+  }
+
+  private stop(signal: NodeJS.Signals): void {
+    if (this.stopping) return;
+    this.stopping = true;
+    console.log(`[ClusterSupervisor] ${signal} received, stopping workers...`);
+
+    const running = Object.values(cluster.workers ?? {}).filter((worker): worker is Worker => !!worker);
+    if (running.length === 0) {
+      process.exit(0);
+    }
+
+    let remaining = running.length;
+    cluster.on('exit', () => {
+      if (--remaining === 0) process.exit(0);
+    });
+    for (const worker of running) {
+      worker.process.kill('SIGTERM');
+    }
+
+    // Don't hang forever on a worker stuck in shutdown
+    setTimeout(() => process.exit(1), SHUTDOWN_TIMEOUT_MS).unref();
+  }
+}
@@ -1,6 +1,6 @@
 import { readFileSync, existsSync, watchFile, unwatchFile } from 'fs';
 import { load } from 'js-yaml';
-import { get, template } from 'lodash';
+import { get, template, TemplateExecutor } from 'lodash';
 import path from 'path';
 
 interface PromptConfig {
@@ -44,6 +44,9 @@ interface InterpolationContext {
 export class PromptLoader {
   private static instance: PromptLoader | null = null;
   private prompts: PromptConfig = {};
+  // Compiled templates by prompt path, for the currently loaded prompts version
+  private compiled = new Map<string, TemplateExecutor>();
+  private version = 0;
   private yamlPath: string;
   private watcherSetup: boolean = false;
   private isProduction: boolean = process.env.NODE_ENV === 'production';
@@ -74,6 +77,8 @@ export class PromptLoader {
   }
 
   private loadPrompts(): void {
+    this.version++;
+    this.compiled.clear();
     try {
       if (existsSync(this.yamlPath)) {
         const yamlContent = readFileSync(this.yamlPath, 'utf8');
@@ -108,23 +113,19 @@ export class PromptLoader {
 
   public getPrompt(path: string, context?: InterpolationContext): string {
     try {
-      // Get the prompt template using lodash get
-      let promptTemplate = get(this.prompts, path);
-      
-      if (!promptTemplate) {
-        console.warn(`[PromptLoader] Prompt not found at path: ${path}, using fallback`);
-        promptTemplate = this.getFallbackPrompt(path);
-      }
-
       // If no interpolation context provided, return as-is
       if (!context) {
-        return promptTemplate;
+        return this.getTemplate(path);
       }
 
-      // Interpolate variables using lodash template
-      const compiled = template(promptTemplate, {
-        interpolate: /{{([\s\S]+?)}}/g
-      });
+      // Compile once per prompts version; reloads start from an empty cache
+      let compiled = this.compiled.get(path);
+      if (!compiled) {
+        compiled = template(this.getTemplate(path), {
+          interpolate: /{{([\s\S]+?)}}/g
+        });
+        this.compiled.set(path, compiled);
+      }
 
       // Create a flat context object for interpolation
       const flatContext = this.flattenContext(context);
@@ -136,6 +137,16 @@ export class PromptLoader {
     }
   }
 
+  private getTemplate(path: string): string {
+    // Get the prompt template using lodash get
+    const promptTemplate = get(this.prompts, path);
+    if (promptTemplate) {
+      return promptTemplate;
+    }
+    console.warn(`[PromptLoader] Prompt not found at path: ${path}, using fallback`);
+    return this.getFallbackPrompt(path);
+  }
+
   private flattenContext(context: InterpolationContext): Record<string, any> {
     const flat: Record<string, any> = {};
     
@@ -239,6 +250,11 @@ Return as JSON with keys: title, summary, date`,
     return this.prompts;
   }
 
+  // Bumped on every (re)load of prompts.yaml
+  public getVersion(): number {
+    return this.version;
+  }
+
   public reloadPrompts(): void {
     this.loadPrompts();
   }
@@ -1,36 +1,75 @@
 import { PrismaClient } from '@prisma/client';
+import { StageMetrics } from '../observability/StageMetrics';
 
+const STATEMENT_VERBS = ['select', 'insert', 'update', 'delete', 'begin', 'commit', 'rollback'];
+
+// db_statement_<verb>: per-verb statement count and latency on /metrics
+function statementStage(sql: string): string {
+  const verb = sql.trimStart().split(/\s/, 1)[0].toLowerCase();
+  return `db_statement_${STATEMENT_VERBS.includes(verb) ? verb : 'other'}`;
+}
+
+export interface DatabaseOptions {
+  busyTimeoutMs: number;
+}
+
+const DEFAULT_OPTIONS: DatabaseOptions = { busyTimeoutMs: 5000 };
+
+// socket_timeout is SQLite's busy timeout (seconds) for every pooled connection
+function withBusyTimeout(url: string, busyTimeoutMs: number): string {
+  if (!url.startsWith('file:') || /[?&]socket_timeout=/.test(url)) {
+    return url;
+  }
+  const seconds = Math.max(1, Math.ceil(busyTimeoutMs / 1000));
+  return `${url}${url.includes('?') ? '&' : '?'}socket_timeout=${seconds}`;
+}
+
+/**
+ * Process-wide PrismaClient. SQLite allows one writer at a time across all
+ * processes sharing the file; with WAL readers never block, and writers from
+ * other cluster workers wait up to busyTimeoutMs for the lock instead of
+ * failing with SQLITE_BUSY.
+ */
 export class DatabaseClient {
   private static instance: PrismaClient;
+  private static options: DatabaseOptions = DEFAULT_OPTIONS;
 
   private constructor() {}
 
-  static getInstance(): PrismaClient {
+  static getInstance(options?: DatabaseOptions): PrismaClient {
     if (!DatabaseClient.instance) {
       try {
-        const dbUrl = process.env.DATABASE_URL || 'file:./data/nano-grazynka.db';
+        if (options) {
+          DatabaseClient.options = options;
+        }
+        const dbUrl = withBusyTimeout(
+          process.env.DATABASE_URL || 'file:./data/nano-grazynka.db',
+          DatabaseClient.options.busyTimeoutMs
+        );
         console.log('Initializing PrismaClient with URL:', dbUrl);
         
-        DatabaseClient.instance = new PrismaClient({
-          log: process.env.NODE_ENV === 'development' 
-            ? ['query', 'info', 'warn', 'error'] 
-            : ['error'],
+        const development = process.env.NODE_ENV === 'development';
+        const client = new PrismaClient({
+          log: [
+            { emit: 'event', level: 'query' },
+            ...(development ? ['info' as const, 'warn' as const] : []),
+            'error'
+          ],
           datasources: {
             db: {
               url: dbUrl
             }
           }
         });
-        
-        // Configure SQLite for better WAL handling
-        DatabaseClient.instance.$queryRawUnsafe('PRAGMA journal_mode = WAL;')
-          .then((result) => console.log('SQLite WAL mode enabled:', result))
-          .catch((error) => console.warn('Failed to set WAL mode:', error));
-        
-        // Ensure proper synchronization
-        DatabaseClient.instance.$queryRawUnsafe('PRAGMA synchronous = NORMAL;')
-          .then((result) => console.log('SQLite synchronous mode set:', result))
-          .catch((error) => console.warn('Failed to set synchronous mode:', error));
+
+        // Query events count every statement, so write amplification shows up on /metrics
+        client.$on('query', (event) => {
+          StageMetrics.getInstance().observe(statementStage(event.query), event.duration);
+          if (development) {
+            console.log('prisma:query', event.query);
+          }
+        });
+        DatabaseClient.instance = client;
         
         console.log('PrismaClient initialized successfully');
       } catch (error) {
@@ -40,4 +79,18 @@ export class DatabaseClient {
     }
     return DatabaseClient.instance;
   }
-}
\ No newline at end of file
+
+  /**
+   * Apply connection pragmas before serving. WAL is persistent in the database
+   * file; synchronous and busy_timeout are per connection, so this runs on
+   * startup and is awaited rather than fired and forgotten.
+   */
+  static async initialize(): Promise<void> {
+    const client = DatabaseClient.getInstance();
+    await client.$connect();
+    await client.$queryRawUnsafe('PRAGMA journal_mode = WAL;');
+    await client.$queryRawUnsafe('PRAGMA synchronous = NORMAL;');
+    await client.$queryRawUnsafe(`PRAGMA busy_timeout = ${Math.floor(DatabaseClient.options.busyTimeoutMs)};`);
+    console.log(`SQLite configured: WAL, synchronous=NORMAL, busy_timeout=${DatabaseClient.options.busyTimeoutMs}ms`);
+  }
+}
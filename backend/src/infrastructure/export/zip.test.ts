@@ -0,0 +1,81 @@
+import zlib from 'zlib';
+import { zipStream, ZipEntry } from './zip';
+
+async function collect(entries: AsyncIterable<ZipEntry>): Promise<Buffer> {
+  const chunks: Buffer[] = [];
+  for await (const chunk of zipStream(entries)) {
+    chunks.push(chunk);
+  }
+  return Buffer.concat(chunks);
+}
+
+// Reads the archive back through its central directory
+function unzip(archive: Buffer): Record<string, string> {
+  const end = archive.length - 22;
+  expect(archive.readUInt32LE(end)).toBe(0x06054b50);
+  const count = archive.readUInt16LE(end + 10);
+  let position = archive.readUInt32LE(end + 16);
+
+  const files: Record<string, string> = {};
+  for (let i = 0; i < count; i++) {
+    expect(archive.readUInt32LE(position)).toBe(0x02014b50);
+    const method = archive.readUInt16LE(position + 10);
+    const crc = archive.readUInt32LE(position + 16);
+    const compressedSize = archive.readUInt32LE(position + 20);
+    const nameLength = archive.readUInt16LE(position + 28);
+    const offset = archive.readUInt32LE(position + 42);
+    const name = archive.toString('utf8', position + 46, position + 46 + nameLength);
+
+    const dataStart = offset + 30 + archive.readUInt16LE(offset + 26);
+    const body = archive.subarray(dataStart, dataStart + compressedSize);
+    const data = method === 8 ? zlib.inflateRawSync(body) : body;
+    expect(zlib.crc32(data)).toBe(crc);
+
+    files[name] = data.toString('utf8');
+    position += 46 + nameLength;
+  }
+  return files;
+}
+
+describe('zipStream', () => {
+  it('should write entries that read back intact, deflating only when it helps', async () => {
+    async function* entries(): AsyncGenerator<ZipEntry> {
+      yield { name: 'notes/spotkanie.md', data: '# Spotkanie\n' + 'budżet Żabka '.repeat(200) };
+      yield { name: 'zażółć.md', data: 'x' };
+    }
+
+    const archive = await collect(entries());
+    const files = unzip(archive);
+
+    expect(Object.keys(files)).toEqual(['notes/spotkanie.md', 'zażółć.md']);
+    expect(files['notes/spotkanie.md']).toBe('# Spotkanie\n' + 'budżet Żabka '.repeat(200));
+    expect(files['zażółć.md']).toBe('x');
+    expect(archive.length).toBeLessThan(1000);
+  });
+
+  it('should write an empty archive when there are no entries', async () => {
+    async function* entries(): AsyncGenerator<ZipEntry> {}
+
+    const archive = await collect(entries());
+
+    expect(archive.length).toBe(22);
+    expect(unzip(archive)).toEqual({});
+  });
+
+  it('should only pull entries as the archive is read', async () => {
+    let pulled = 0;
+    async function* entries(): AsyncGenerator<ZipEntry> {
+      for (let i = 0; ; i++) {
+        pulled++;
+        yield { name: `${i}.md`, data: 'spotkanie '.repeat(100) };
+      }
+    }
+
+    const stream = zipStream(entries());
+    for await (const _chunk of stream) {
+      break;
+    }
+
+    expect(pulled).toBeLessThan(20);
+  });
+});
@@ -0,0 +1,105 @@
+import zlib from 'zlib';
+import { promisify } from 'util';
+import { Readable } from 'stream';
+
+const deflateRaw = promisify(zlib.deflateRaw);
+
+export interface ZipEntry {
+  name: string;
+  data: string | Buffer;
+  modifiedAt?: Date;
+}
+
+// Without ZIP64 records the archive is limited to 65535 entries and 4 GiB offsets
+export const ZIP_MAX_ENTRIES = 0xffff;
+const ZIP_MAX_OFFSET = 0xffffffff;
+
+const LOCAL_HEADER = 0x04034b50;
+const CENTRAL_HEADER = 0x02014b50;
+const END_OF_CENTRAL_DIRECTORY = 0x06054b50;
+const VERSION = 20;
+const UTF8_NAMES = 0x0800;
+const STORED = 0;
+const DEFLATED = 8;
+
+function dosDateTime(date: Date): { time: number; date: number } {
+  return {
+    time: (date.getHours() << 11) | (date.getMinutes() << 5) | Math.floor(date.getSeconds() / 2),
+    date: (Math.max(0, date.getFullYear() - 1980) << 9) | ((date.getMonth() + 1) << 5) | date.getDate()
+  };
+}
+
+/**
+ * Writes a zip archive from entries pulled one at a time, so an export of any
+ * size holds a single entry in memory plus its central directory record
+ * (~50 bytes + name per entry). Each entry is deflated whole before its
+ * header is written, so sizes and CRC go in the local header and no data
+ * descriptors are needed.
+ */
+export function zipStream(entries: AsyncIterable<ZipEntry>): Readable {
+  async function* generate(): AsyncGenerator<Buffer> {
+    const central: Buffer[] = [];
+    let offset = 0;
+
+    for await (const entry of entries) {
+      if (central.length >= ZIP_MAX_ENTRIES) {
+        throw new Error(`Zip archives are limited to ${ZIP_MAX_ENTRIES} entries`);
+      }
+
+      const data = Buffer.isBuffer(entry.data) ? entry.data : Buffer.from(entry.data);
+      const deflated = await deflateRaw(data);
+      const method = deflated.length < data.length ? DEFLATED : STORED;
+      const body = method === DEFLATED ? deflated : data;
+      const name = Buffer.from(entry.name);
+      const crc = zlib.crc32(data);
+      const stamp = dosDateTime(entry.modifiedAt || new Date());
+
+      if (offset + 30 + name.length + body.length > ZIP_MAX_OFFSET) {
+        throw new Error('Zip archive exceeds 4 GiB');
+      }
+
+      const local = Buffer.alloc(30);
+      local.writeUInt32LE(LOCAL_HEADER, 0);
+      local.writeUInt16LE(VERSION, 4);
+      local.writeUInt16LE(UTF8_NAMES, 6);
+      local.writeUInt16LE(method, 8);
+      local.writeUInt16LE(stamp.time, 10);
+      local.writeUInt16LE(stamp.date, 12);
+      local.writeUInt32LE(crc, 14);
+      local.writeUInt32LE(body.length, 18);
+      local.writeUInt32LE(data.length, 22);
+      local.writeUInt16LE(name.length, 26);
+      local.writeUInt16LE(0, 28);
+
+      const record = Buffer.alloc(46 + name.length);
+      record.writeUInt32LE(CENTRAL_HEADER, 0);
+      record.writeUInt16LE(VERSION, 4);
+      record.writeUInt16LE(VERSION, 6);
+      record.writeUInt16LE(UTF8_NAMES, 8);
+      record.writeUInt16LE(method, 10);
+      record.writeUInt16LE(stamp.time, 12);
+      record.writeUInt16LE(stamp.date, 14);
+      record.writeUInt32LE(crc, 16);
+      record.writeUInt32LE(body.length, 20);
+      record.writeUInt32LE(data.length, 24);
+      record.writeUInt16LE(name.length, 28);
+      record.writeUInt32LE(offset, 42);
+      name.copy(record, 46);
+      central.push(record);
+
+      yield Buffer.concat([local, name, body]);
+      offset += local.length + name.length + body.length;
+    }
+
+    const end = Buffer.alloc(22);
+    const directorySize = central.reduce((size, record) => size + record.length, 0);
+    end.writeUInt32LE(END_OF_CENTRAL_DIRECTORY, 0);
+    end.writeUInt16LE(central.length, 8);
+    end.writeUInt16LE(central.length, 10);
+    end.writeUInt32LE(directorySize, 12);
+    end.writeUInt32LE(offset, 16);
+    yield Buffer.concat([...central, end]);
+  }
+
+  return Readable.from(generate(), { objectMode: false });
+}
@@ -0,0 +1,93 @@
+import { AdaptiveConcurrencyLimiter, LimiterPermit } from './AdaptiveConcurrencyLimiter';
+
+const OPTIONS = { initialConcurrency: 4, minConcurrency: 1, maxConcurrency: 8, backoffRatio: 0.5 };
+
+async function acquireAll(limiter: AdaptiveConcurrencyLimiter, count: number): Promise<LimiterPermit[]> {
+  const permits: LimiterPermit[] = [];
+  for (let i = 0; i < count; i++) {
+    permits.push(await limiter.acquire());
+  }
+  return permits;
+}
+
+const flush = () => new Promise(resolve => setImmediate(resolve));
+
+describe('AdaptiveConcurrencyLimiter', () => {
+  let limiter: AdaptiveConcurrencyLimiter;
+
+  beforeEach(() => {
+    limiter = new AdaptiveConcurrencyLimiter(OPTIONS);
+  });
+
+  afterEach(() => {
+    jest.useRealTimers();
+  });
+
+  it('should queue requests beyond the limit and serve them in order', async () => {
+    const permits = await acquireAll(limiter, 4);
+    const served: number[] = [];
+    limiter.acquire().then(() => served.push(1));
+    limiter.acquire().then(() => served.push(2));
+    await flush();
+
+    expect(served).toEqual([]);
+    expect(limiter.stats()).toMatchObject({ inFlight: 4, queued: 2 });
+
+    permits[0].release('ignored');
+    await flush();
+    expect(served).toEqual([1]);
+
+    permits[1].release('ignored');
+    await flush();
+    expect(served).toEqual([1, 2]);
+  });
+
+  it('should grow by about one per round of successes, up to the maximum', async () => {
+    for (let i = 0; i < 4; i++) {
+      (await limiter.acquire()).release('success');
+    }
+    expect(limiter.getLimit()).toBeGreaterThan(4.9);
+    expect(limiter.getLimit()).toBeLessThan(5);
+
+    for (let i = 0; i < 200; i++) {
+      (await limiter.acquire()).release('success');
+    }
+    expect(limiter.getLimit()).toBe(8);
+  });
+
+  it('should halve once per congested burst, not once per throttled request', async () => {
+    const burst = await acquireAll(limiter, 4);
+    burst.forEach(permit => permit.release('congested'));
+    expect(limiter.getLimit()).toBe(2);
+
+    (await limiter.acquire()).release('congested');
+    expect(limiter.getLimit()).toBe(1);
+
+    (await limiter.acquire()).release('congested');
+    expect(limiter.getLimit()).toBe(1);
+  });
+
+  it('should ignore a second release of the same permit', async () => {
+    const permit = await limiter.acquire();
+    permit.release('congested');
+    permit.release('congested');
+
+    expect(limiter.stats().inFlight).toBe(0);
+    expect(limiter.getLimit()).toBe(2);
+  });
+
+  it('should hold back new requests while paused', async () => {
+    jest.useFakeTimers();
+    limiter.pause(1000);
+    let served = false;
+    limiter.acquire().then(() => { served = true; });
+
+    jest.advanceTimersByTime(999);
+    await Promise.resolve();
+    expect(served).toBe(false);
+
+    jest.advanceTimersByTime(1);
+    await Promise.resolve();
+    expect(served).toBe(true);
+  });
+});
@@ -0,0 +1,107 @@
+export interface AdaptiveConcurrencyOptions {
+  initialConcurrency: number;
+  minConcurrency: number;
+  maxConcurrency: number;
+  backoffRatio: number;  // Limit multiplier on congestion, e.g. 0.5
+}
+
+// success grows the limit, congested (429/503, timeout, slow answer) shrinks it, ignored leaves it
+export type RequestOutcome = 'success' | 'congested' | 'ignored';
+
+export interface LimiterPermit {
+  release(outcome: RequestOutcome): void;
+}
+
+export interface LimiterStats {
+  limit: number;
+  inFlight: number;
+  queued: number;
+  pausedForMs: number;
+}
+
+/**
+ * AIMD in-flight limit for one provider: every successful request adds
+ * 1/limit (about +1 per round of requests), a congestion signal multiplies
+ * the limit by backoffRatio. Requests already in flight when the limit
+ * dropped can't drop it again, so one throttled burst costs one decrease.
+ * A Retry-After pauses dispatch altogether. Waiters are served FIFO.
+ */
+export class AdaptiveConcurrencyLimiter {
+  private limit: number;
+  private inFlight = 0;
+  private waiters: Array<() => void> = [];
+  private generation = 0;
+  private pausedUntil = 0;
+  private pauseTimer: NodeJS.Timeout | null = null;
+
+  constructor(private readonly options: AdaptiveConcurrencyOptions) {
+    this.limit = Math.min(options.maxConcurrency, Math.max(options.minConcurrency, options.initialConcurrency));
+  }
+
+  acquire(): Promise<LimiterPermit> {
+    return new Promise(resolve => {
+      this.waiters.push(() => resolve(this.permit()));
+      this.drain();
+    });
+  }
+
+  /** Holds back new requests for ms (a provider's Retry-After) */
+  pause(ms: number): void {
+    this.pausedUntil = Math.max(this.pausedUntil, Date.now() + ms);
+  }
+
+  getLimit(): number {
+    return this.limit;
+  }
+
+  stats(): LimiterStats {
+    return {
+      limit: this.limit,
+      inFlight: this.inFlight,
+      queued: this.waiters.length,
+      pausedForMs: Math.max(0, this.pausedUntil - Date.now())
+    };
+  }
+
+  private permit(): LimiterPermit {
+    const generation = this.generation;
+    let released = false;
+    return {
+      release: (outcome: RequestOutcome) => {
+        if (released) return;
+        released = true;
+        this.inFlight--;
+        this.adjust(outcome, generation);
+        this.drain();
+      }
+    };
+  }
+
+  private adjust(outcome: RequestOutcome, generation: number): void {
+    if (outcome === 'success') {
+      this.limit = Math.min(this.options.maxConcurrency, this.limit + 1 / this.limit);
+    } else if (outcome === 'congested' && generation === this.generation) {
+      this.limit = Math.max(this.options.minConcurrency, this.limit * this.options.backoffRatio);
+      this.generation++;
+    }
+  }
+
+  private drain(): void {
+    const waitMs = this.pausedUntil - Date.now();
+    if (waitMs > 0) {
+      if (!this.pauseTimer && this.waiters.length > 0) {
+        this.pauseTimer = setTimeout(() => {
+          this.pauseTimer = null;
+          this.drain();
+        }, waitMs);
+        this.pauseTimer.unref();
+      }
+      return;
+    }
+
+    while (this.waiters.length > 0 && this.inFlight < Math.max(1, Math.floor(this.limit))) {
+      this.inFlight++;
+      this.waiters.shift()!();
+    }
+  }
+}
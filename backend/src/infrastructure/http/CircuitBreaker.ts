@@ -0,0 +1,74 @@
+export interface CircuitBreakerOptions {
+  failureThreshold: number;  // Consecutive failures that open the circuit
+  openMs: number;  // How long it stays open before a single trial request
+}
+
+export type CircuitState = 'closed' | 'open' | 'half-open';
+
+/**
+ * Stops sending to a provider that keeps failing (5xx, network errors,
+ * timeouts): after failureThreshold failures in a row requests fail fast
+ * for openMs, then one trial request decides between closing the circuit
+ * and another openMs. Throttling (429) is neither a failure nor a success.
+ */
+export class CircuitBreaker {
+  private state: CircuitState = 'closed';
+  private failures = 0;
+  private openedAt = 0;
+  private trialInFlight = false;
+
+  constructor(private readonly options: CircuitBreakerOptions) {}
+
+  /** Open and not yet due for a trial */
+  isOpen(now: number = Date.now()): boolean {
+    return this.state === 'open' && now - this.openedAt < this.options.openMs;
+  }
+
+  /** Whether a request may go out; in half-open only one trial at a time */
+  tryPass(now: number = Date.now()): boolean {
+    if (this.state === 'open') {
+      if (this.isOpen(now)) {
+        return false;
+      }
+      this.state = 'half-open';
+    }
+    if (this.state === 'half-open') {
+      if (this.trialInFlight) {
+        return false;
+      }
+      this.trialInFlight = true;
+    }
+    return true;
+  }
+
+  recordSuccess(): void {
+    this.state = 'closed';
+    this.failures = 0;
+    this.trialInFlight = false;
+  }
+
+  recordFailure(now: number = Date.now()): void {
+    this.failures++;
+    this.trialInFlight = false;
+    if (this.state === 'half-open' || this.failures >= this.options.failureThreshold) {
+      if (this.state !== 'open') {
+        console.warn(`[CircuitBreaker] Opening after ${this.failures} consecutive failures`);
+      }
+      this.state = 'open';
+      this.openedAt = now;
+    }
+  }
+
+  /** A throttled answer: the provider is up, but it says nothing about recovery */
+  recordNeutral(): void {
+    this.trialInFlight = false;
+  }
+
+  getState(now: number = Date.now()): CircuitState {
+    return this.state === 'open' && !this.isOpen(now) ? 'half-open' : this.state;
+  }
+
+  retryInMs(now: number = Date.now()): number {
+    return this.state === 'open' ? Math.max(0, this.openedAt + this.options.openMs - now) : 0;
+  }
+}
@@ -0,0 +1,73 @@
+import { Config } from '../../config/schema';
+import { ProviderClientOptions, ProviderClientStats, ProviderHttpClient } from './ProviderHttpClient';
+
+export type ProvidersConfig = Config['providers'];
+
+const DEFAULT_PROVIDERS: ProvidersConfig = {
+  keepAliveMs: 30000,
+  maxSockets: 32,
+  timeoutMs: 120000,
+  slowRequestMs: 60000,
+  maxRetries: 3,
+  initialConcurrency: 4,
+  minConcurrency: 1,
+  maxConcurrency: 16,
+  backoffRatio: 0.5,
+  circuitBreaker: { failureThreshold: 5, openMs: 30000 },
+  endpoints: {}
+};
+
+/**
+ * Process-wide registry of ProviderHttpClients, one per provider base URL,
+ * so every adapter calling the same provider shares its connection pool,
+ * in-flight limit and circuit breaker.
+ */
+export class ProviderClients {
+  private static instance: ProviderClients;
+  private clients = new Map<string, ProviderHttpClient>();
+
+  constructor(private config: ProvidersConfig = DEFAULT_PROVIDERS) {}
+
+  static getInstance(): ProviderClients {
+    if (!ProviderClients.instance) {
+      ProviderClients.instance = new ProviderClients();
+    }
+    return ProviderClients.instance;
+  }
+
+  configure(config: ProvidersConfig): void {
+    this.close();
+    this.config = config;
+  }
+
+  get(baseUrl: string): ProviderHttpClient {
+    const key = baseUrl.replace(/\/+$/, '');
+    let client = this.clients.get(key);
+    if (!client) {
+      client = new ProviderHttpClient(key, this.optionsFor(key));
+      this.clients.set(key, client);
+    }
+    return client;
+  }
+
+  stats(): ProviderClientStats[] {
+    return [...this.clients.values()].map(client => client.stats());
+  }
+
+  close(): void {
+    for (const client of this.clients.values()) {
+      client.close();
+    }
+    this.clients.clear();
+  }
+
+  // Endpoint overrides match by base URL prefix, the longest one wins
+  private optionsFor(baseUrl: string): ProviderClientOptions {
+    const { endpoints, ...defaults } = this.config;
+    const prefix = Object.keys(endpoints)
+      .filter(candidate => baseUrl.startsWith(candidate.replace(/\/+$/, '')))
+      .sort((a, b) => b.length - a.length)[0];
+    const override = Object.entries(prefix ? endpoints[prefix] : {}).filter(([, value]) => value !== undefined);
+    return { ...defaults, ...Object.fromEntries(override) };
+  }
+}
@@ -0,0 +1,163 @@
+import http from 'http';
+import { AddressInfo } from 'net';
+import {
+  ProviderCircuitOpenError,
+  ProviderClientOptions,
+  ProviderHttpClient,
+  ProviderTimeoutError,
+  parseRetryAfter
+} from './ProviderHttpClient';
+
+const OPTIONS: ProviderClientOptions = {
+  keepAliveMs: 5000,
+  maxSockets: 4,
+  timeoutMs: 5000,
+  slowRequestMs: 0,
+  maxRetries: 3,
+  initialConcurrency: 4,
+  minConcurrency: 1,
+  maxConcurrency: 8,
+  backoffRatio: 0.5,
+  circuitBreaker: { failureThreshold: 2, openMs: 60000 }
+};
+
+type Handler = (request: http.IncomingMessage, body: Buffer, response: http.ServerResponse) => void;
+
+function json(response: http.ServerResponse, status: number, payload: unknown, headers: Record<string, string> = {}) {
+  const data = JSON.stringify(payload);
+  response.writeHead(status, { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(data), ...headers });
+  response.end(data);
+}
+
+describe('ProviderHttpClient', () => {
+  let server: http.Server;
+  let baseUrl: string;
+  let handler: Handler;
+  let connections: number;
+  let requests: number;
+  let client: ProviderHttpClient;
+
+  beforeAll(done => {
+    server = http.createServer((request, response) => {
+      requests++;
+      const chunks: Buffer[] = [];
+      request.on('data', chunk => chunks.push(chunk));
+      request.on('end', () => handler(request, Buffer.concat(chunks), response));
+    });
+    server.on('connection', () => connections++);
+    server.listen(0, '127.0.0.1', () => {
+      baseUrl = `http://127.0.0.1:${(server.address() as AddressInfo).port}/v1`;
+      done();
+    });
+  });
+
+  afterAll(done => {
+    server.close(() => done());
+  });
+
+  beforeEach(() => {
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+    connections = 0;
+    requests = 0;
+    handler = (_request, _body, response) => json(response, 200, { ok: true });
+    client = new ProviderHttpClient(baseUrl, OPTIONS);
+  });
+
+  afterEach(() => {
+    client.close();
+    server.closeAllConnections();
+    jest.restoreAllMocks();
+  });
+
+  it('should reuse one keep-alive connection for sequential requests', async () => {
+    for (let i = 0; i < 3; i++) {
+      const response = await client.request('/chat/completions', { method: 'POST', body: '{}' });
+      expect(await response.json()).toEqual({ ok: true });
+    }
+
+    expect(requests).toBe(3);
+    expect(connections).toBe(1);
+  });
+
+  it('should send multipart bodies with their exact length', async () => {
+    handler = (request, body, response) => json(response, 200, {
+      length: body.length,
+      contentLength: Number(request.headers['content-length']),
+      hasFile: body.includes(Buffer.from('filename="note.ogg"'))
+    });
+    const form = new FormData();
+    form.append('file', new Blob([Buffer.alloc(10000, 1)], { type: 'audio/ogg' }), 'note.ogg');
+    form.append('prompt', 'Żabka\nMicrosoft');
+
+    const response = await client.request('/audio/transcriptions', { method: 'POST', body: form });
+    const result = await response.json();
+
+    expect(result.hasFile).toBe(true);
+    expect(result.length).toBe(result.contentLength);
+  });
+
+  it('should retry a 429 after Retry-After and halve the in-flight limit', async () => {
+    let calls = 0;
+    handler = (_request, _body, response) => {
+      calls++;
+      if (calls === 1) {
+        json(response, 429, { error: 'slow down' }, { 'Retry-After': '0' });
+      } else {
+        json(response, 200, { ok: true });
+      }
+    };
+
+    const response = await client.request('/chat/completions', { method: 'POST', body: '{}' });
+
+    expect(response.status).toBe(200);
+    expect(calls).toBe(2);
+    expect(client.stats().throttled).toBe(1);
+    expect(client.stats().limit).toBe(2);
+  });
+
+  it('should hand back a 429 for a one-shot stream body instead of retrying it', async () => {
+    handler = (_request, _body, response) => json(response, 429, { error: 'slow down' }, { 'Retry-After': '0' });
+    const { Readable } = await import('stream');
+
+    const response = await client.request('/chat/completions', { method: 'POST', body: Readable.from([Buffer.from('{}')]) });
+    await response.text();
+
+    expect(response.status).toBe(429);
+    expect(requests).toBe(1);
+  });
+
+  it('should fail fast once the circuit opens', async () => {
+    handler = (_request, _body, response) => json(response, 500, { error: 'boom' });
+
+    for (let i = 0; i < 2; i++) {
+      const response = await client.request('/chat/completions', { method: 'POST', body: '{}' });
+      expect(response.status).toBe(500);
+      await response.text();
+    }
+
+    await expect(client.request('/chat/completions', { method: 'POST', body: '{}' }))
+      .rejects.toBeInstanceOf(ProviderCircuitOpenError);
+    expect(requests).toBe(2);
+    expect(client.stats()).toMatchObject({ circuit: 'open', failed: 2, rejected: 1 });
+  });
+
+  it('should abandon a request that stalls past timeoutMs', async () => {
+    handler = () => {};
+
+    await expect(client.request('/chat/completions', { method: 'POST', body: '{}', timeoutMs: 50 }))
+      .rejects.toBeInstanceOf(ProviderTimeoutError);
+    expect(client.stats().inFlight).toBe(0);
+  });
+});
+
+describe('parseRetryAfter', () => {
+  it('should read seconds and HTTP dates', () => {
+    const now = Date.UTC(2026, 9, 1, 12, 0, 0);
+
+    expect(parseRetryAfter('2', now)).toBe(2000);
+    expect(parseRetryAfter(new Date(now + 5000).toUTCString(), now)).toBe(5000);
+    expect(parseRetryAfter(null, now)).toBeNull();
+    expect(parseRetryAfter('soon', now)).toBeNull();
+  });
+});
@@ -0,0 +1,247 @@
+import http from 'http';
+import https from 'https';
+import { Readable } from 'stream';
+import { pipeline } from 'stream/promises';
+import { AdaptiveConcurrencyLimiter, AdaptiveConcurrencyOptions, LimiterStats, RequestOutcome } from './AdaptiveConcurrencyLimiter';
+import { CircuitBreaker, CircuitBreakerOptions, CircuitState } from './CircuitBreaker';
+import { encodeMultipart } from './multipart';
+import { StageMetrics } from '../observability/StageMetrics';
+
+export interface ProviderClientOptions extends AdaptiveConcurrencyOptions {
+  keepAliveMs: number;  // Idle pooled connections are closed after this
+  maxSockets: number;
+  timeoutMs: number;  // A request with no bytes moving for this long is abandoned
+  slowRequestMs: number;  // Answers slower than this count as congestion; 0 = off
+  maxRetries: number;  // 429s retried after Retry-After
+  circuitBreaker: CircuitBreakerOptions;
+}
+
+export type ProviderRequestBody = string | Uint8Array | FormData | Readable;
+
+export interface ProviderRequestInit {
+  method?: string;
+  headers?: Record<string, string>;
+  // Pass a factory for a stream body, so a throttled request can be sent again
+  body?: ProviderRequestBody | (() => ProviderRequestBody);
+  timeoutMs?: number;
+}
+
+export interface ProviderClientStats extends LimiterStats {
+  baseUrl: string;
+  circuit: CircuitState;
+  requests: number;
+  throttled: number;
+  failed: number;
+  rejected: number;
+}
+
+export class ProviderNetworkError extends Error {
+  constructor(message: string, public readonly code?: string) {
+    super(message);
+    this.name = 'ProviderNetworkError';
+  }
+}
+
+export class ProviderTimeoutError extends ProviderNetworkError {
+  constructor(target: string, timeoutMs: number) {
+    super(`${target} timed out after ${Math.round(timeoutMs / 1000)}s without data`, 'ETIMEDOUT');
+    this.name = 'ProviderTimeoutError';
+  }
+}
+
+export class ProviderCircuitOpenError extends Error {
+  constructor(public readonly baseUrl: string, public readonly retryInMs: number) {
+    super(`${baseUrl} is failing, requests are paused for ${Math.ceil(retryInMs / 1000)}s`);
+    this.name = 'ProviderCircuitOpenError';
+  }
+}
+
+const MAX_RETRY_WAIT_MS = 60 * 1000;
+
+// Retry-After is either seconds or an HTTP date
+export function parseRetryAfter(value: string | null, now: number = Date.now()): number | null {
+  if (!value) {
+    return null;
+  }
+  const seconds = Number(value);
+  if (Number.isFinite(seconds)) {
+    return Math.max(0, seconds * 1000);
+  }
+  const date = Date.parse(value);
+  return Number.isNaN(date) ? null : Math.max(0, date - now);
+}
+
+/**
+ * HTTP client for one AI provider base URL: a keep-alive connection pool,
+ * an adaptive in-flight limit (429/503, timeouts and slow answers shrink it,
+ * successes grow it back), 429 retries that pause the whole provider for
+ * Retry-After, and a circuit breaker. Answers come back as a fetch Response;
+ * the in-flight slot is held until its body has been read.
+ */
+export class ProviderHttpClient {
+  private readonly agent: http.Agent;
+  private readonly limiter: AdaptiveConcurrencyLimiter;
+  private readonly breaker: CircuitBreaker;
+  private counters = { requests: 0, throttled: 0, failed: 0, rejected: 0 };
+
+  constructor(
+    private readonly baseUrl: string,
+    private readonly options: ProviderClientOptions
+  ) {
+    const agentOptions = {
+      keepAlive: true,
+      maxSockets: options.maxSockets,
+      maxFreeSockets: options.maxSockets,
+      timeout: options.keepAliveMs,
+      scheduling: 'lifo' as const  // Reuse the warmest connection, let the rest idle out
+    };
+    this.agent = baseUrl.startsWith('https:') ? new https.Agent(agentOptions) : new http.Agent(agentOptions);
+    this.limiter = new AdaptiveConcurrencyLimiter(options);
+    this.breaker = new CircuitBreaker(options.circuitBreaker);
+  }
+
+  /** path is appended to the base URL, e.g. '/chat/completions' */
+  async request(path: string, init: ProviderRequestInit = {}): Promise<Response> {
+    const replayable = !(init.body instanceof Readable);
+    for (let attempt = 1; ; attempt++) {
+      const response = await this.send(path, init);
+      if (response.status !== 429 || !replayable || attempt > this.options.maxRetries) {
+        return response;
+      }
+
+      const waitMs = Math.min(MAX_RETRY_WAIT_MS,
+        parseRetryAfter(response.headers.get('retry-after')) ?? 1000 * Math.pow(2, attempt - 1));
+      await response.arrayBuffer().catch(() => undefined);
+      console.log(`[ProviderHttpClient] ${this.baseUrl} throttled (429), retrying in ${waitMs}ms (${attempt}/${this.options.maxRetries}), limit now ${this.limiter.getLimit().toFixed(1)}`);
+      this.limiter.pause(waitMs);
+    }
+  }
+
+  stats(): ProviderClientStats {
+    return {
+      baseUrl: this.baseUrl,
+      ...this.limiter.stats(),
+      circuit: this.breaker.getState(),
+      ...this.counters
+    };
+  }
+
+  close(): void {
+    this.agent.destroy();
+  }
+
+  private async send(path: string, init: ProviderRequestInit): Promise<Response> {
+    if (this.breaker.isOpen()) {
+      this.counters.rejected++;
+      throw new ProviderCircuitOpenError(this.baseUrl, this.breaker.retryInMs());
+    }
+
+    const queuedAt = Date.now();
+    const permit = await this.limiter.acquire();
+    StageMetrics.getInstance().observe('provider_queue', Date.now() - queuedAt);
+    if (!this.breaker.tryPass()) {
+      permit.release('ignored');
+      this.counters.rejected++;
+      throw new ProviderCircuitOpenError(this.baseUrl, this.breaker.retryInMs());
+    }
+
+    this.counters.requests++;
+    const startedAt = Date.now();
+    let message: http.IncomingMessage;
+    try {
+      message = await this.transport(path, init);
+    } catch (error) {
+      this.counters.failed++;
+      this.breaker.recordFailure();
+      permit.release(error instanceof ProviderTimeoutError ? 'congested' : 'ignored');
+      throw error;
+    }
+
+    const status = message.statusCode ?? 502;
+    if (status === 429) {
+      this.counters.throttled++;
+      this.breaker.recordNeutral();
+    } else if (status >= 500) {
+      this.counters.failed++;
+      this.breaker.recordFailure();
+    } else {
+      this.breaker.recordSuccess();
+    }
+    const outcome = this.classify(status, Date.now() - startedAt);
+    message.once('close', () => permit.release(outcome));
+
+    return toResponse(message, status);
+  }
+
+  private classify(status: number, latencyMs: number): RequestOutcome {
+    if (status === 429 || status === 503) {
+      return 'congested';
+    }
+    if (status >= 500) {
+      return 'ignored';
+    }
+    if (this.options.slowRequestMs > 0 && latencyMs > this.options.slowRequestMs) {
+      return 'congested';
+    }
+    return 'success';
+  }
+
+  private transport(path: string, init: ProviderRequestInit): Promise<http.IncomingMessage> {
+    const url = new URL(this.baseUrl + path);
+    // Never log the query string: Gemini takes its API key there
+    const target = `${init.method || 'GET'} ${url.origin}${url.pathname}`;
+    const timeoutMs = init.timeoutMs ?? this.options.timeoutMs;
+    const body = typeof init.body === 'function' ? init.body() : init.body;
+
+    const headers: Record<string, string> = {};
+    let data: Buffer | null = null;
+    let stream: Readable | null = null;
+    if (typeof body === 'string' || body instanceof Uint8Array) {
+      data = Buffer.from(body);
+      headers['Content-Length'] = String(data.length);
+    } else if (body instanceof FormData) {
+      const encoded = encodeMultipart(body);
+      headers['Content-Type'] = encoded.contentType;
+      headers['Content-Length'] = String(encoded.contentLength);
+      stream = encoded.stream;
+    } else if (body) {
+      stream = body;
+    }
+    Object.assign(headers, init.headers);
+
+    return new Promise((resolve, reject) => {
+      const transport = url.protocol === 'https:' ? https : http;
+      const request = transport.request(url, { method: init.method || 'GET', headers, agent: this.agent }, resolve);
+      request.setTimeout(timeoutMs, () => request.destroy(new ProviderTimeoutError(target, timeoutMs)));
+      request.on('error', (error: NodeJS.ErrnoException) => {
+        reject(error instanceof ProviderNetworkError
+          ? error
+          : new ProviderNetworkError(`${target} failed: ${error.message}`, error.code));
+      });
+
+      if (stream) {
+        pipeline(stream, request).catch(error => request.destroy(error));
+      } else {
+        request.end(data ?? undefined);
+      }
+    });
+  }
+}
+
+function toResponse(message: http.IncomingMessage, status: number): Response {
+  const headers = new Headers();
+  for (const [name, value] of Object.entries(message.headers)) {
+    if (Array.isArray(value)) {
+      value.forEach(item => headers.append(name, item));
+    } else if (value !== undefined) {
+      headers.set(name, value);
+    }
+  }
+
+  // These statuses can't carry a body; drain so the connection goes back to the pool
+  if ([204, 205, 304].includes(status)) {
+    message.resume();
+    return new Response(null, { status, statusText: message.statusMessage, headers });
+  }
+  return new Response(Readable.toWeb(message) as ReadableStream, { status, statusText: message.statusMessage, headers });
+}
@@ -0,0 +1,65 @@
+import crypto from 'crypto';
+import { Readable } from 'stream';
+
+export interface EncodedMultipart {
+  contentType: string;
+  contentLength: number;
+  stream: Readable;
+}
+
+const CRLF = '\r\n';
+
+// WHATWG form-data escaping for names and filenames
+function escapeName(name: string): string {
+  return name.replace(/\r/g, '%0D').replace(/\n/g, '%0A').replace(/"/g, '%22');
+}
+
+/**
+ * Encodes a FormData as multipart/form-data with its exact length up front,
+ * streaming Blob parts (e.g. fs.openAsBlob) from their source, so an audio
+ * upload is never copied into memory and needs no chunked encoding.
+ */
+export function encodeMultipart(form: FormData): EncodedMultipart {
+  const boundary = `----nano-grazynka-${crypto.randomBytes(12).toString('hex')}`;
+  const parts: Array<{ head: Buffer; value: Buffer | Blob }> = [];
+  let contentLength = 0;
+
+  form.forEach((value, name) => {
+    let head = `--${boundary}${CRLF}Content-Disposition: form-data; name="${escapeName(name)}"`;
+    if (typeof value === 'string') {
+      head += `${CRLF}${CRLF}`;
+      const data = Buffer.from(value.replace(/\r?\n|\r/g, CRLF));
+      parts.push({ head: Buffer.from(head), value: data });
+      contentLength += Buffer.byteLength(head) + data.length + CRLF.length;
+    } else {
+      head += `; filename="${escapeName(value.name)}"${CRLF}`;
+      head += `Content-Type: ${value.type || 'application/octet-stream'}${CRLF}${CRLF}`;
+      parts.push({ head: Buffer.from(head), value });
+      contentLength += Buffer.byteLength(head) + value.size + CRLF.length;
+    }
+  });
+
+  const closing = Buffer.from(`--${boundary}--${CRLF}`);
+  contentLength += closing.length;
+
+  async function* generate(): AsyncGenerator<Buffer | Uint8Array> {
+    for (const part of parts) {
+      yield part.head;
+      if (Buffer.isBuffer(part.value)) {
+        yield part.value;
+      } else {
+        for await (const chunk of part.value.stream() as unknown as AsyncIterable<Uint8Array>) {
+          yield chunk;
+        }
+      }
+      yield Buffer.from(CRLF);
+    }
+    yield closing;
+  }
+
+  return {
+    contentType: `multipart/form-data; boundary=${boundary}`,
+    contentLength,
+    stream: Readable.from(generate())
+  };
+}
@@ -0,0 +1,30 @@
+import { StageMetrics } from './StageMetrics';
+
+describe('StageMetrics', () => {
+  it('renders cumulative buckets, sum and count per stage', () => {
+    const metrics = new StageMetrics([0.1, 1]);
+    metrics.observe('db_save', 50);
+    metrics.observe('db_save', 500);
+    metrics.observe('db_save', 5000);
+
+    const lines = metrics.render();
+
+    expect(lines).toContain('# TYPE nano_grazynka_stage_duration_seconds histogram');
+    expect(lines).toContain('nano_grazynka_stage_duration_seconds_bucket{stage="db_save",le="0.1"} 1');
+    expect(lines).toContain('nano_grazynka_stage_duration_seconds_bucket{stage="db_save",le="1"} 2');
+    expect(lines).toContain('nano_grazynka_stage_duration_seconds_bucket{stage="db_save",le="+Inf"} 3');
+    expect(lines).toContain('nano_grazynka_stage_duration_seconds_sum{stage="db_save"} 5.55');
+    expect(lines).toContain('nano_grazynka_stage_duration_seconds_count{stage="db_save"} 3');
+  });
+
+  it('observes failed calls as well as successful ones', async () => {
+    const metrics = new StageMetrics();
+
+    await metrics.time('llm_title', async () => 'ok');
+    await expect(metrics.time('llm_title', async () => {
+      throw new Error('provider down');
+    })).rejects.toThrow('provider down');
+
+    expect(metrics.snapshot().llm_title.count).toBe(2);
+  });
+});
@@ -0,0 +1,96 @@
+// Upper bounds in seconds; spans DB writes (ms) up to long provider calls (minutes)
+const DEFAULT_BUCKETS_SECONDS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300];
+
+const METRIC_NAME = 'nano_grazynka_stage_duration_seconds';
+
+export interface StageSnapshot {
+  count: number;
+  sumMs: number;
+}
+
+class Histogram {
+  readonly bucketCounts: number[];
+  count = 0;
+  sumSeconds = 0;
+
+  constructor(readonly buckets: number[]) {
+    this.bucketCounts = new Array(buckets.length).fill(0);
+  }
+
+  observe(seconds: number): void {
+    this.count++;
+    this.sumSeconds += seconds;
+    for (let i = 0; i < this.buckets.length; i++) {
+      if (seconds <= this.buckets[i]) {
+        this.bucketCounts[i]++;
+      }
+    }
+  }
+}
+
+/**
+ * Process-wide latency histograms for hot-path stages (upload parse, disk
+ * write, provider calls, DB saves, event appends, pipeline stages), rendered
+ * in Prometheus text format by GET /metrics. Observing is a few additions, so
+ * it is safe to call on every request.
+ */
+export class StageMetrics {
+  private static instance: StageMetrics;
+  private histograms = new Map<string, Histogram>();
+
+  constructor(private readonly buckets: number[] = DEFAULT_BUCKETS_SECONDS) {}
+
+  static getInstance(): StageMetrics {
+    if (!StageMetrics.instance) {
+      StageMetrics.instance = new StageMetrics();
+    }
+    return StageMetrics.instance;
+  }
+
+  observe(stage: string, durationMs: number): void {
+    let histogram = this.histograms.get(stage);
+    if (!histogram) {
+      histogram = new Histogram(this.buckets);
+      this.histograms.set(stage, histogram);
+    }
+    histogram.observe(Math.max(0, durationMs) / 1000);
+  }
+
+  // Failed calls are observed too: a slow timeout is still latency on the hot path
+  async time<T>(stage: string, run: () => Promise<T>): Promise<T> {
+    const startedAt = Date.now();
+    try {
+      return await run();
+    } finally {
+      this.observe(stage, Date.now() - startedAt);
+    }
+  }
+
+  snapshot(): Record<string, StageSnapshot> {
+    const stages: Record<string, StageSnapshot> = {};
+    for (const [stage, histogram] of this.histograms) {
+      stages[stage] = { count: histogram.count, sumMs: histogram.sumSeconds * 1000 };
+    }
+    return stages;
+  }
+
+  render(): string[] {
+    const lines = [
+      `# HELP ${METRIC_NAME} Wall-clock duration of processing stages`,
+      `# TYPE ${METRIC_NAME} histogram`
+    ];
+
+    const stages = [...this.histograms.keys()].sort();
+    for (const stage of stages) {
+      const histogram = this.histograms.get(stage)!;
+      histogram.buckets.forEach((bound, i) => {
+        lines.push(`${METRIC_NAME}_bucket{stage="${stage}",le="${bound}"} ${histogram.bucketCounts[i]}`);
+      });
+      lines.push(`${METRIC_NAME}_bucket{stage="${stage}",le="+Inf"} ${histogram.count}`);
+      lines.push(`${METRIC_NAME}_sum{stage="${stage}"} ${histogram.sumSeconds}`);
+      lines.push(`${METRIC_NAME}_count{stage="${stage}"} ${histogram.count}`);
+    }
+
+    return lines;
+  }
+}
@@ -1,5 +1,9 @@
-import { PrismaClient } from '@prisma/client';
-import { IEntityUsageRepository, EntityUsageRecord } from '../../domain/repositories/IEntityUsageRepository';
+import { Prisma, PrismaClient } from '@prisma/client';
+import {
+  IEntityUsageRepository,
+  EntityUsageRecord,
+  EntityUsageStats
+} from '../../domain/repositories/IEntityUsageRepository';
 
 export class EntityUsageRepository implements IEntityUsageRepository {
   constructor(private readonly prisma: PrismaClient) {}
@@ -78,25 +82,48 @@ export class EntityUsageRepository implements IEntityUsageRepository {
     });
   }
 
-  async getUsageStats(entityId: string): Promise<{
-    totalUsage: number;
-    correctUsage: number;
-    correctionRate: number;
-  }> {
-    const usages = await this.prisma.entityUsage.findMany({
-      where: { entityId }
+  async getUsageStats(entityId: string): Promise<EntityUsageStats> {
+    const stats = await this.aggregateStats({ entityId });
+    return stats.get(entityId) ?? { totalUsage: 0, correctUsage: 0, correctionRate: 0 };
+  }
+
+  async getUsageStatsByUser(userId: string): Promise<Map<string, EntityUsageStats>> {
+    return this.aggregateStats({ entity: { userId } });
+  }
+
+  // Counts per (entity, wasUsed, wasCorrected) folded into per-entity stats
+  private async aggregateStats(where: Prisma.EntityUsageWhereInput): Promise<Map<string, EntityUsageStats>> {
+    const groups = await this.prisma.entityUsage.groupBy({
+      by: ['entityId', 'wasUsed', 'wasCorrected'],
+      where,
+      _count: { _all: true },
+      _max: { createdAt: true }
     });
 
-    const totalUsage = usages.length;
-    const correctUsage = usages.filter(u => u.wasUsed && !u.wasCorrected).length;
-    const correctionRate = totalUsage > 0 
-      ? (usages.filter(u => u.wasCorrected).length / totalUsage) * 100 
-      : 0;
+    const stats = new Map<string, EntityUsageStats & { corrected: number }>();
+    for (const group of groups) {
+      let entry = stats.get(group.entityId);
+      if (!entry) {
+        entry = { totalUsage: 0, correctUsage: 0, correctionRate: 0, corrected: 0 };
+        stats.set(group.entityId, entry);
+      }
+      const count = group._count._all;
+      entry.totalUsage += count;
+      if (group.wasCorrected) {
+        entry.corrected += count;
+      } else if (group.wasUsed) {
+        entry.correctUsage += count;
+      }
+      const usedAt = group._max.createdAt;
+      if (group.wasUsed && usedAt && (!entry.lastUsedAt || usedAt > entry.lastUsedAt)) {
+        entry.lastUsedAt = usedAt;
+      }
+    }
 
-    return {
-      totalUsage,
-      correctUsage,
-      correctionRate
-    };
+    const result = new Map<string, EntityUsageStats>();
+    for (const [entityId, { corrected, ...entry }] of stats) {
+      result.set(entityId, { ...entry, correctionRate: (corrected / entry.totalUsage) * 100 });
+    }
+    return result;
   }
 }
\ No newline at end of file
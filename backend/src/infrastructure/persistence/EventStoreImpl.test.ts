@@ -0,0 +1,108 @@
+import { EventStoreImpl } from './EventStoreImpl';
+import { DomainEvent } from '../../domain/events/DomainEvent';
+
+function event(aggregateId: string, eventType: string): DomainEvent {
+  return {
+    eventId: `${aggregateId}-${eventType}`,
+    aggregateId,
+    eventType,
+    payload: { eventType },
+    occurredAt: new Date()
+  };
+}
+
+describe('EventStoreImpl', () => {
+  let prisma: any;
+
+  beforeEach(() => {
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+    prisma = {
+      event: {
+        create: jest.fn().mockResolvedValue({}),
+        createMany: jest.fn().mockResolvedValue({ count: 0 }),
+        findMany: jest.fn()
+      }
+    };
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('group commits concurrent appends and notifies subscribers after the write', async () => {
+    const store = new EventStoreImpl(prisma, { enabled: true, maxBatchSize: 10, flushIntervalMs: 5 });
+    const seen: string[] = [];
+    store.subscribe('note-1', e => seen.push(e.eventType));
+
+    await Promise.all([
+      store.append(event('note-1', 'Started')),
+      store.append(event('note-2', 'Started')),
+      store.append(event('note-1', 'Transcribed'))
+    ]);
+
+    expect(prisma.event.createMany).toHaveBeenCalledTimes(1);
+    expect(prisma.event.createMany.mock.calls[0][0].data.map((row: any) => row.eventType))
+      .toEqual(['Started', 'Started', 'Transcribed']);
+    expect(prisma.event.create).not.toHaveBeenCalled();
+    expect(seen).toEqual(['Started', 'Transcribed']);
+  });
+
+  it('flushes as soon as a batch is full', async () => {
+    const store = new EventStoreImpl(prisma, { enabled: true, maxBatchSize: 2, flushIntervalMs: 60000 });
+
+    await Promise.all([store.append(event('a', 'One')), store.append(event('b', 'Two'))]);
+
+    expect(prisma.event.createMany).toHaveBeenCalledTimes(1);
+  });
+
+  it('rejects only the failing event when a batch write fails', async () => {
+    prisma.event.createMany.mockRejectedValue(new Error('FOREIGN KEY constraint failed'));
+    prisma.event.create.mockImplementation(async ({ data }: any) => {
+      if (data.aggregateId === 'deleted') throw new Error('FOREIGN KEY constraint failed');
+      return {};
+    });
+    const store = new EventStoreImpl(prisma, { enabled: true, maxBatchSize: 10, flushIntervalMs: 5 });
+
+    const results = await Promise.allSettled([
+      store.append(event('note-1', 'Started')),
+      store.append(event('deleted', 'Started'))
+    ]);
+
+    expect(results.map(result => result.status)).toEqual(['fulfilled', 'rejected']);
+  });
+
+  it('writes pending events on close and appends directly afterwards', async () => {
+    const store = new EventStoreImpl(prisma, { enabled: true, maxBatchSize: 10, flushIntervalMs: 60000 });
+
+    const pending = store.append(event('note-1', 'Started'));
+    await store.close();
+    await pending;
+    await store.append(event('note-1', 'Completed'));
+
+    expect(prisma.event.createMany).toHaveBeenCalledTimes(1);
+    expect(prisma.event.create).toHaveBeenCalledTimes(1);
+  });
+
+  it('streams events page by page with a cursor', async () => {
+    const row = (id: string) => ({
+      id,
+      eventId: id,
+      aggregateId: 'note-1',
+      eventType: 'Started',
+      payload: '{"n":1}',
+      occurredAt: new Date()
+    });
+    prisma.event.findMany
+      .mockResolvedValueOnce([row('e1'), row('e2')])
+      .mockResolvedValueOnce([row('e3')]);
+    const store = new EventStoreImpl(prisma);
+
+    const ids: string[] = [];
+    for await (const e of store.streamEvents(undefined, 2)) {
+      ids.push(e.eventId!);
+    }
+
+    expect(ids).toEqual(['e1', 'e2', 'e3']);
+    expect(prisma.event.findMany.mock.calls[1][0]).toMatchObject({ cursor: { id: 'e2' }, skip: 1, take: 2 });
+  });
+});
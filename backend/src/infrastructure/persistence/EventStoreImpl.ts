@@ -1,50 +1,235 @@
+import { EventEmitter } from 'events';
 import { PrismaClient } from '@prisma/client';
 import { EventStore } from '../../domain/repositories/EventStore';
 import { DomainEvent } from '../../domain/events/DomainEvent';
+import { StageMetrics } from '../observability/StageMetrics';
 
+export type EventListener = (event: DomainEvent) => void;
+
+// Forwards persisted events to other processes and delivers theirs (cluster mode)
+export interface EventRelay {
+  publish(event: DomainEvent): void;
+  onEvent(listener: EventListener): void;
+}
+
+export interface EventBufferOptions {
+  enabled: boolean;
+  maxBatchSize: number;
+  flushIntervalMs: number;
+}
+
+interface PendingAppend {
+  event: DomainEvent;
+  resolve: () => void;
+  reject: (error: Error) => void;
+}
+
+const UNBUFFERED: EventBufferOptions = { enabled: false, maxBatchSize: 1, flushIntervalMs: 0 };
+const READ_BATCH_SIZE = 500;
+
+/**
+ * Prisma-backed event store. With buffering enabled, appends are group
+ * committed: events arriving within flushIntervalMs (or until maxBatchSize)
+ * go to SQLite in one createMany, and each append() resolves only once its
+ * batch is written, so callers keep the same durability guarantee.
+ */
 export class EventStoreImpl implements EventStore {
-  constructor(private prisma: PrismaClient) {}
+  // In-process fan-out of appended events (SSE / long-poll status subscribers)
+  private readonly emitter = new EventEmitter();
+  private buffer: PendingAppend[] = [];
+  private flushTimer?: NodeJS.Timeout;
+  // Batches are written one after another so events keep their append order
+  private writes: Promise<void> = Promise.resolve();
+  private closed = false;
+  private relay?: EventRelay;
+
+  constructor(
+    private prisma: PrismaClient,
+    private readonly bufferOptions: EventBufferOptions = UNBUFFERED
+  ) {
+    this.emitter.setMaxListeners(0);
+  }
+
+  /**
+   * Subscribe to events appended for one aggregate.
+   * Listeners are notified only after the event has been persisted.
+   * @returns unsubscribe function
+   */
+  subscribe(aggregateId: string, listener: EventListener): () => void {
+    this.emitter.on(aggregateId, listener);
+    return () => {
+      this.emitter.off(aggregateId, listener);
+    };
+  }
+
+  /**
+   * Also notify subscribers about events appended by other processes, and
+   * forward this process's events to them.
+   */
+  attachRelay(relay: EventRelay): void {
+    this.relay = relay;
+    relay.onEvent(event => this.notify(event));
+  }
 
   async append(event: DomainEvent): Promise<void> {
-    await this.prisma.event.create({
-      data: {
-        eventId: event.eventId,
-        aggregateId: event.aggregateId,
-        eventType: event.eventType,
-        payload: JSON.stringify(event.payload),
-        occurredAt: event.occurredAt
+    if (!this.bufferOptions.enabled || this.closed) {
+      await this.writeOne(event);
+      this.publish(event);
+      return;
+    }
+
+    return new Promise<void>((resolve, reject) => {
+      this.buffer.push({ event, resolve, reject });
+      if (this.buffer.length >= this.bufferOptions.maxBatchSize) {
+        void this.flush();
+      } else if (!this.flushTimer) {
+        this.flushTimer = setTimeout(() => void this.flush(), this.bufferOptions.flushIntervalMs);
       }
     });
   }
 
+  /** Write everything buffered so far; resolves once it is committed. */
+  flush(): Promise<void> {
+    if (this.flushTimer) {
+      clearTimeout(this.flushTimer);
+      this.flushTimer = undefined;
+    }
+
+    const batch = this.buffer;
+    this.buffer = [];
+    if (batch.length > 0) {
+      this.writes = this.writes.then(() => this.writeBatch(batch));
+    }
+    return this.writes;
+  }
+
+  /** Stop buffering and flush what is pending; called on shutdown. */
+  async close(): Promise<void> {
+    this.closed = true;
+    await this.flush();
+  }
+
+  private async writeBatch(batch: PendingAppend[]): Promise<void> {
+    try {
+      await StageMetrics.getInstance().time('event_append', () => this.prisma.event.createMany({
+        data: batch.map(pending => this.toRow(pending.event))
+      }));
+    } catch (error) {
+      // One bad row (e.g. its voice note was deleted) fails the whole insert;
+      // retry one by one so only the offending append is rejected
+      console.warn('[EventStore] Batch append failed, retrying events individually:', error);
+      for (const pending of batch) {
+        try {
+          await this.writeOne(pending.event);
+        } catch (eventError) {
+          pending.reject(eventError instanceof Error ? eventError : new Error(String(eventError)));
+          continue;
+        }
+        this.publish(pending.event);
+        pending.resolve();
+      }
+      return;
+    }
+
+    for (const pending of batch) {
+      this.publish(pending.event);
+      pending.resolve();
+    }
+  }
+
+  private async writeOne(event: DomainEvent): Promise<void> {
+    await StageMetrics.getInstance().time('event_append', () => this.prisma.event.create({
+      data: this.toRow(event)
+    }));
+  }
+
+  private toRow(event: DomainEvent) {
+    return {
+      eventId: event.eventId,
+      aggregateId: event.aggregateId,
+      eventType: event.eventType,
+      payload: JSON.stringify(event.payload),
+      occurredAt: event.occurredAt
+    };
+  }
+
+  private publish(event: DomainEvent): void {
+    this.notify(event);
+    try {
+      this.relay?.publish(event);
+    } catch (error) {
+      console.error('[EventStore] Event relay failed:', error);
+    }
+  }
+
+  private notify(event: DomainEvent): void {
+    try {
+      this.emitter.emit(event.aggregateId, event);
+    } catch (error) {
+      // A misbehaving subscriber must never fail the write path
+      console.error('[EventStore] Event listener failed:', error);
+    }
+  }
+
   async getEvents(aggregateId: string): Promise<DomainEvent[]> {
     const events = await this.prisma.event.findMany({
       where: { aggregateId },
       orderBy: { occurredAt: 'asc' }
     });
 
-    return events.map(e => ({
-      eventId: e.eventId,
-      aggregateId: e.aggregateId,
-      eventType: e.eventType,
-      payload: JSON.parse(e.payload as string),
-      occurredAt: e.occurredAt
-    }));
+    return events.map(e => this.toDomainEvent(e));
+  }
+
+  /**
+   * Pages through the event log in (occurredAt, id) order with a cursor, so
+   * replaying the whole table never holds more than one page in memory.
+   */
+  async *streamEvents(fromDate?: Date, batchSize: number = READ_BATCH_SIZE): AsyncGenerator<DomainEvent> {
+    let cursor: string | undefined;
+    while (true) {
+      const rows = await this.prisma.event.findMany({
+        where: fromDate ? { occurredAt: { gte: fromDate } } : undefined,
+        orderBy: [{ occurredAt: 'asc' }, { id: 'asc' }],
+        take: batchSize,
+        ...(cursor ? { cursor: { id: cursor }, skip: 1 } : {})
+      });
+
+      for (const row of rows) {
+        yield this.toDomainEvent(row);
+      }
+      if (rows.length < batchSize) {
+        return;
+      }
+      cursor = rows[rows.length - 1].id;
+    }
   }
 
   async getAllEvents(fromDate?: Date): Promise<DomainEvent[]> {
-    const events = await this.prisma.event.findMany({
-      where: fromDate ? { occurredAt: { gte: fromDate } } : undefined,
-      orderBy: { occurredAt: 'asc' }
-    });
+    const events: DomainEvent[] = [];
+    for await (const event of this.streamEvents(fromDate)) {
+      events.push(event);
+    }
+    return events;
+  }
 
-    return events.map(e => ({
-      eventId: e.eventId,
-      aggregateId: e.aggregateId,
-      eventType: e.eventType,
-      payload: JSON.parse(e.payload as string),
-      occurredAt: e.occurredAt
-    }));
+  // Payloads are parsed on first access; replays that only look at types and ids skip JSON.parse
+  private toDomainEvent(row: { eventId: string; aggregateId: string; eventType: string; payload: string; occurredAt: Date }): DomainEvent {
+    let raw: string | undefined = row.payload;
+    let payload: Record<string, any> = {};
+
+    return {
+      eventId: row.eventId,
+      aggregateId: row.aggregateId,
+      eventType: row.eventType,
+      occurredAt: row.occurredAt,
+      get payload() {
+        if (raw !== undefined) {
+          payload = JSON.parse(raw);
+          raw = undefined;
+        }
+        return payload;
+      }
+    };
   }
 
   // Legacy methods for backward compatibility
@@ -63,12 +248,6 @@ export class EventStoreImpl implements EventStore {
       take: limit
     });
 
-    return events.map(e => ({
-      eventId: e.eventId,
-      aggregateId: e.aggregateId,
-      eventType: e.eventType,
-      payload: JSON.parse(e.payload as string),
-      occurredAt: e.occurredAt
-    }));
+    return events.map(e => this.toDomainEvent(e));
   }
 }
\ No newline at end of file
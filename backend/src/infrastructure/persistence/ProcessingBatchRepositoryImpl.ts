@@ -0,0 +1,56 @@
+import { PrismaClient } from '@prisma/client';
+import {
+  ProcessingBatch,
+  ProcessingBatchItemStatus,
+  ProcessingBatchRepository
+} from '../../domain/repositories/ProcessingBatchRepository';
+
+export class ProcessingBatchRepositoryImpl implements ProcessingBatchRepository {
+  constructor(private readonly prisma: PrismaClient) {}
+
+  async create(batch: Omit<ProcessingBatch, 'id' | 'createdAt'>): Promise<ProcessingBatch> {
+    const created = await this.prisma.processingBatch.create({
+      data: {
+        userId: batch.userId,
+        voiceNoteIds: JSON.stringify(batch.voiceNoteIds),
+        language: batch.language,
+        projectId: batch.projectId
+      }
+    });
+    return this.toDomain(created);
+  }
+
+  async findById(id: string): Promise<ProcessingBatch | null> {
+    const batch = await this.prisma.processingBatch.findUnique({ where: { id } });
+    return batch ? this.toDomain(batch) : null;
+  }
+
+  async findItemStatuses(voiceNoteIds: string[]): Promise<ProcessingBatchItemStatus[]> {
+    if (voiceNoteIds.length === 0) {
+      return [];
+    }
+
+    const notes = await this.prisma.voiceNote.findMany({
+      where: { id: { in: voiceNoteIds } },
+      select: { id: true, title: true, status: true, errorMessage: true }
+    });
+
+    return notes.map(note => ({
+      voiceNoteId: note.id,
+      title: note.title,
+      status: note.status,
+      errorMessage: note.errorMessage ?? undefined
+    }));
+  }
+
+  private toDomain(batch: any): ProcessingBatch {
+    return {
+      id: batch.id,
+      userId: batch.userId,
+      voiceNoteIds: JSON.parse(batch.voiceNoteIds || '[]'),
+      language: batch.language ?? undefined,
+      projectId: batch.projectId ?? undefined,
+      createdAt: batch.createdAt
+    };
+  }
+}
@@ -0,0 +1,85 @@
+import { ProcessingJobRepositoryImpl } from './ProcessingJobRepositoryImpl';
+
+// Just enough of Prisma's where/data semantics for the columns the queue touches
+function matches(row: any, where: any): boolean {
+  return Object.entries(where).every(([key, condition]: [string, any]) => {
+    if (key === 'OR') return condition.some((clause: any) => matches(row, clause));
+    if (condition && typeof condition === 'object' && !(condition instanceof Date)) {
+      if ('lt' in condition) return row[key] !== null && row[key] < condition.lt;
+      if ('lte' in condition) return row[key] !== null && row[key] <= condition.lte;
+      if ('in' in condition) return condition.in.includes(row[key]);
+    }
+    return row[key] === condition;
+  });
+}
+
+function fakePrisma(rows: any[]): any {
+  return {
+    processingJob: {
+      findFirst: jest.fn(async ({ where }: any) => rows.find(row => matches(row, where)) ?? null),
+      findMany: jest.fn(async ({ where }: any) => rows.filter(row => matches(row, where))),
+      updateMany: jest.fn(async ({ where, data }: any) => {
+        const hit = rows.filter(row => matches(row, where));
+        for (const row of hit) {
+          for (const [key, value] of Object.entries<any>(data)) {
+            row[key] = value && typeof value === 'object' && 'increment' in value
+              ? row[key] + value.increment
+              : value;
+          }
+        }
+        return { count: hit.length };
+      })
+    }
+  };
+}
+
+describe('ProcessingJobRepositoryImpl', () => {
+  let row: any;
+  let repository: ProcessingJobRepositoryImpl;
+
+  beforeEach(() => {
+    const created = new Date(Date.now() - 60000);
+    row = {
+      id: 'job-1',
+      voiceNoteId: 'note-1',
+      status: 'queued',
+      payload: '{}',
+      attempts: 0,
+      maxAttempts: 3,
+      runAfter: created,
+      lockedAt: null,
+      lockedBy: null,
+      lastError: null,
+      createdAt: created,
+      updatedAt: created,
+      completedAt: null
+    };
+    repository = new ProcessingJobRepositoryImpl(fakePrisma([row]));
+  });
+
+  it('ignores the stale owner once its lease has been taken over', async () => {
+    const stale = await repository.claimNext('worker-a');
+    expect(stale?.lockedBy).toMatch(/^worker-a:/);
+
+    // worker-a stalls past its lease; another worker requeues and claims the job
+    await repository.requeueInterrupted(new Date(Date.now() + 1000));
+    const current = await repository.claimNext('worker-b');
+
+    expect(await repository.markCompleted(stale!.id, stale!.lockedBy!)).toBe(false);
+    expect(await repository.renewLeases([{ id: stale!.id, lockedBy: stale!.lockedBy! }])).toEqual(['job-1']);
+    expect(row).toMatchObject({ status: 'running', lockedBy: current!.lockedBy, attempts: 2 });
+
+    expect(await repository.markCompleted(current!.id, current!.lockedBy!)).toBe(true);
+    expect(row).toMatchObject({ status: 'completed', lockedBy: null });
+  });
+
+  it('gives a worker reclaiming its own job a new claim token', async () => {
+    const first = await repository.claimNext('worker-a');
+    await repository.requeueInterrupted(new Date(Date.now() + 1000));
+    const second = await repository.claimNext('worker-a');
+
+    expect(second!.lockedBy).not.toBe(first!.lockedBy);
+    expect(await repository.scheduleRetry(first!.id, first!.lockedBy!, 'late', new Date())).toBe(false);
+    expect(row.status).toBe('running');
+  });
+});
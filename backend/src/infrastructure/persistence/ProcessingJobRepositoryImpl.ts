@@ -0,0 +1,218 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+import { randomUUID } from 'crypto';
+import {
+  ProcessingJob,
+  ProcessingJobCounts,
+  ProcessingJobPayload,
+  ProcessingJobRepository,
+  ProcessingJobStatus
+} from '../../domain/repositories/ProcessingJobRepository';
+
+// How many times claimNext retries when another worker wins the race for a job
+const MAX_CLAIM_ATTEMPTS = 5;
+
+export class ProcessingJobRepositoryImpl implements ProcessingJobRepository {
+  constructor(private readonly prisma: PrismaClient) {}
+
+  async enqueue(
+    voiceNoteId: string,
+    payload: ProcessingJobPayload,
+    maxAttempts: number
+  ): Promise<ProcessingJob> {
+    const job = await this.prisma.processingJob.create({
+      data: {
+        voiceNoteId,
+        payload: JSON.stringify(payload),
+        maxAttempts
+      }
+    });
+    return this.toDomain(job);
+  }
+
+  async findActiveByVoiceNoteId(voiceNoteId: string): Promise<ProcessingJob | null> {
+    const job = await this.prisma.processingJob.findFirst({
+      where: {
+        voiceNoteId,
+        status: { in: ['queued', 'running'] }
+      },
+      orderBy: { createdAt: 'desc' }
+    });
+    return job ? this.toDomain(job) : null;
+  }
+
+  async claimNext(owner: string, now: Date = new Date()): Promise<ProcessingJob | null> {
+    // A fresh token per claim: the same worker claiming the job again after a
+    // takeover must not be mistaken for the earlier attempt
+    const lockedBy = `${owner}:${randomUUID()}`;
+
+    for (let attempt = 0; attempt < MAX_CLAIM_ATTEMPTS; attempt++) {
+      const candidate = await this.prisma.processingJob.findFirst({
+        where: {
+          status: 'queued',
+          runAfter: { lte: now }
+        },
+        orderBy: [{ runAfter: 'asc' }, { createdAt: 'asc' }]
+      });
+
+      if (!candidate) {
+        return null;
+      }
+
+      // Conditional update acts as compare-and-set: only one claimer sees count === 1
+      const claimed = await this.prisma.processingJob.updateMany({
+        where: { id: candidate.id, status: 'queued' },
+        data: {
+          status: 'running',
+          lockedAt: now,
+          lockedBy,
+          attempts: { increment: 1 }
+        }
+      });
+
+      if (claimed.count === 1) {
+        return this.toDomain({
+          ...candidate,
+          status: 'running',
+          lockedAt: now,
+          lockedBy,
+          attempts: candidate.attempts + 1
+        });
+      }
+    }
+
+    return null;
+  }
+
+  markCompleted(id: string, lockedBy: string): Promise<boolean> {
+    return this.releaseLease(id, lockedBy, {
+      status: 'completed',
+      lastError: null,
+      completedAt: new Date()
+    });
+  }
+
+  scheduleRetry(id: string, lockedBy: string, error: string, runAfter: Date): Promise<boolean> {
+    return this.releaseLease(id, lockedBy, {
+      status: 'queued',
+      lastError: error,
+      runAfter
+    });
+  }
+
+  markFailed(id: string, lockedBy: string, error: string): Promise<boolean> {
+    return this.releaseLease(id, lockedBy, {
+      status: 'failed',
+      lastError: error,
+      completedAt: new Date()
+    });
+  }
+
+  async renewLeases(leases: Array<{ id: string; lockedBy: string }>, now: Date = new Date()): Promise<string[]> {
+    const lost: string[] = [];
+    for (const lease of leases) {
+      const renewed = await this.prisma.processingJob.updateMany({
+        where: { id: lease.id, status: 'running', lockedBy: lease.lockedBy },
+        data: { lockedAt: now }
+      });
+      if (renewed.count === 0) {
+        lost.push(lease.id);
+      }
+    }
+    return lost;
+  }
+
+  // Compare-and-set on the claim token: a worker whose lease was taken over writes nothing
+  private async releaseLease(
+    id: string,
+    lockedBy: string,
+    data: Prisma.ProcessingJobUpdateManyMutationInput
+  ): Promise<boolean> {
+    const result = await this.prisma.processingJob.updateMany({
+      where: { id, status: 'running', lockedBy },
+      data: { ...data, lockedAt: null, lockedBy: null }
+    });
+    return result.count === 1;
+  }
+
+  async requeueInterrupted(staleBefore?: Date): Promise<string[]> {
+    const stale: Prisma.ProcessingJobWhereInput = staleBefore
+      ? { status: 'running', OR: [{ lockedAt: null }, { lockedAt: { lt: staleBefore } }] }
+      : { status: 'running' };
+
+    const interrupted = await this.prisma.processingJob.findMany({
+      where: stale,
+      select: { id: true, voiceNoteId: true }
+    });
+
+    // Compare-and-set per job, so a job renewed in the meantime stays with its worker
+    const requeued: string[] = [];
+    for (const job of interrupted) {
+      const result = await this.prisma.processingJob.updateMany({
+        where: { ...stale, id: job.id },
+        data: {
+          status: 'queued',
+          lockedAt: null,
+          lockedBy: null,
+          lastError: staleBefore ? 'Worker lease expired' : 'Interrupted by server restart',
+          runAfter: new Date()
+        }
+      });
+      if (result.count === 1) {
+        requeued.push(job.voiceNoteId);
+      }
+    }
+
+    return requeued;
+  }
+
+  async countByStatus(): Promise<ProcessingJobCounts> {
+    const [groups, oldestQueued] = await Promise.all([
+      this.prisma.processingJob.groupBy({
+        by: ['status'],
+        _count: { _all: true }
+      }),
+      this.prisma.processingJob.findFirst({
+        where: { status: 'queued' },
+        orderBy: { createdAt: 'asc' },
+        select: { createdAt: true }
+      })
+    ]);
+
+    const counts: ProcessingJobCounts = {
+      queued: 0,
+      running: 0,
+      completed: 0,
+      failed: 0,
+      oldestQueuedAt: oldestQueued?.createdAt
+    };
+    for (const group of groups) {
+      counts[group.status as ProcessingJobStatus] = group._count._all;
+    }
+    return counts;
+  }
+
+  private toDomain(job: any): ProcessingJob {
+    let payload: ProcessingJobPayload = {};
+    try {
+      payload = JSON.parse(job.payload || '{}');
+    } catch {
+      // Corrupt payload: process with defaults rather than wedge the queue
+    }
+
+    return {
+      id: job.id,
+      voiceNoteId: job.voiceNoteId,
+      status: job.status as ProcessingJobStatus,
+      payload,
+      attempts: job.attempts,
+      maxAttempts: job.maxAttempts,
+      runAfter: job.runAfter,
+      lockedAt: job.lockedAt ?? undefined,
+      lockedBy: job.lockedBy ?? undefined,
+      lastError: job.lastError ?? undefined,
+      createdAt: job.createdAt,
+      updatedAt: job.updatedAt,
+      completedAt: job.completedAt ?? undefined
+    };
+  }
+}
@@ -0,0 +1,178 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+import {
+  StoredObject,
+  StoredObjectRepository,
+  StoredObjectTotals
+} from '../../domain/repositories/StoredObjectRepository';
+
+type SqlClient = PrismaClient | Prisma.TransactionClient;
+
+/**
+ * Reference counts move inside the VoiceNote write transactions
+ * (addReference/releaseReference), so a file is never unreferenced while a
+ * committed note points at it. Files from before content addressing are
+ * registered on their first reference.
+ */
+export class StoredObjectRepositoryImpl implements StoredObjectRepository {
+  constructor(private readonly prisma: PrismaClient) {}
+
+  async addReference(client: SqlClient, object: { path: string; hash?: string; size: number }): Promise<void> {
+    const now = new Date();
+    await client.storedObject.upsert({
+      where: { path: object.path },
+      create: { path: object.path, hash: object.hash, size: object.size, refCount: 1, createdAt: now, touchedAt: now },
+      update: { refCount: { increment: 1 }, touchedAt: now }
+    });
+  }
+
+  async releaseReference(client: SqlClient, path: string): Promise<void> {
+    // The grace period before the file is reclaimed starts now
+    await client.storedObject.updateMany({
+      where: { path },
+      data: { refCount: { decrement: 1 }, touchedAt: new Date() }
+    });
+  }
+
+  async register(object: { path: string; hash: string; size: number }): Promise<void> {
+    const now = new Date();
+    await this.prisma.storedObject.upsert({
+      where: { path: object.path },
+      create: { ...object, createdAt: now, touchedAt: now },
+      update: { hash: object.hash, size: object.size, touchedAt: now, expiredAt: null }
+    });
+  }
+
+  async isLive(path: string): Promise<boolean> {
+    const object = await this.prisma.storedObject.findUnique({
+      where: { path },
+      select: { expiredAt: true }
+    });
+    return !!object && !object.expiredAt;
+  }
+
+  async findReclaimable(touchedBefore: Date, limit: number): Promise<StoredObject[]> {
+    const objects = await this.prisma.storedObject.findMany({
+      where: { refCount: 0, touchedAt: { lt: touchedBefore } },
+      orderBy: { touchedAt: 'asc' },
+      take: limit
+    });
+    return objects.map(object => this.toDomain(object));
+  }
+
+  async claimReclaimable(path: string, touchedBefore: Date): Promise<boolean> {
+    // Conditional delete acts as compare-and-set against a concurrent upload or reference
+    const claimed = await this.prisma.storedObject.deleteMany({
+      where: { path, refCount: 0, touchedAt: { lt: touchedBefore } }
+    });
+    return claimed.count === 1;
+  }
+
+  async findAged(touchedBefore: Date, limit: number): Promise<StoredObject[]> {
+    const candidates = await this.prisma.storedObject.findMany({
+      where: { expiredAt: null, refCount: { gt: 0 }, touchedAt: { lt: touchedBefore } },
+      orderBy: { touchedAt: 'asc' },
+      take: limit
+    });
+    if (candidates.length === 0) {
+      return [];
+    }
+
+    const unfinished = await this.prisma.voiceNote.findMany({
+      where: {
+        originalFilePath: { in: candidates.map(object => object.path) },
+        status: { not: 'completed' }
+      },
+      select: { originalFilePath: true },
+      distinct: ['originalFilePath']
+    });
+    const inUse = new Set(unfinished.map(note => note.originalFilePath));
+    if (inUse.size > 0) {
+      await this.prisma.storedObject.updateMany({
+        where: { path: { in: Array.from(inUse) } },
+        data: { touchedAt: new Date() }
+      });
+    }
+
+    return candidates
+      .filter(object => !inUse.has(object.path))
+      .map(object => this.toDomain(object));
+  }
+
+  async markExpired(path: string, touchedBefore: Date): Promise<boolean> {
+    const marked = await this.prisma.storedObject.updateMany({
+      where: { path, expiredAt: null, refCount: { gt: 0 }, touchedAt: { lt: touchedBefore } },
+      data: { expiredAt: new Date() }
+    });
+    return marked.count === 1;
+  }
+
+  async reconcile(
+    afterPath: string | undefined,
+    limit: number
+  ): Promise<{ checked: number; corrected: number; lastPath?: string }> {
+    const objects = await this.prisma.storedObject.findMany({
+      where: afterPath ? { path: { gt: afterPath } } : {},
+      orderBy: { path: 'asc' },
+      take: limit,
+      select: { path: true, refCount: true }
+    });
+    if (objects.length === 0) {
+      return { checked: 0, corrected: 0 };
+    }
+
+    const counts = await this.prisma.voiceNote.groupBy({
+      by: ['originalFilePath'],
+      where: { originalFilePath: { in: objects.map(object => object.path) } },
+      _count: { _all: true }
+    });
+    const actual = new Map(counts.map(row => [row.originalFilePath, row._count._all]));
+
+    let corrected = 0;
+    for (const object of objects) {
+      const refCount = actual.get(object.path) || 0;
+      if (refCount === object.refCount) {
+        continue;
+      }
+      // Only if no note was created or deleted since the count; the next pass picks it up otherwise
+      const updated = await this.prisma.storedObject.updateMany({
+        where: { path: object.path, refCount: object.refCount },
+        data: refCount === 0 ? { refCount, touchedAt: new Date() } : { refCount }
+      });
+      corrected += updated.count;
+    }
+
+    return { checked: objects.length, corrected, lastPath: objects[objects.length - 1].path };
+  }
+
+  async totals(): Promise<StoredObjectTotals> {
+    const rows = await this.prisma.$queryRaw<Array<Record<keyof StoredObjectTotals, number | bigint | null>>>`
+      SELECT
+        SUM(CASE WHEN "expiredAt" IS NULL THEN 1 ELSE 0 END) AS "objects",
+        SUM(CASE WHEN "expiredAt" IS NULL THEN "size" ELSE 0 END) AS "bytes",
+        SUM(CASE WHEN "expiredAt" IS NULL AND "refCount" > 0 THEN "size" * "refCount" ELSE 0 END) AS "referencedBytes",
+        SUM(CASE WHEN "refCount" <= 0 THEN 1 ELSE 0 END) AS "unreferenced",
+        SUM(CASE WHEN "expiredAt" IS NOT NULL THEN 1 ELSE 0 END) AS "expired"
+      FROM "StoredObject"
+    `;
+    const [row] = rows;  // Aggregates always return one row
+    return {
+      objects: Number(row.objects ?? 0),
+      bytes: Number(row.bytes ?? 0),
+      referencedBytes: Number(row.referencedBytes ?? 0),
+      unreferenced: Number(row.unreferenced ?? 0),
+      expired: Number(row.expired ?? 0)
+    };
+  }
+
+  private toDomain(object: any): StoredObject {
+    return {
+      path: object.path,
+      hash: object.hash || undefined,
+      size: object.size,
+      refCount: object.refCount,
+      createdAt: object.createdAt,
+      touchedAt: object.touchedAt,
+      expiredAt: object.expiredAt || undefined
+    };
+  }
+}
@@ -0,0 +1,85 @@
+import { PrismaClient } from '@prisma/client';
+import {
+  TranscriptionCacheEntry,
+  TranscriptionCacheRepository,
+  TranscriptionCacheTotals
+} from '../../domain/repositories/TranscriptionCacheRepository';
+
+export class TranscriptionCacheRepositoryImpl implements TranscriptionCacheRepository {
+  constructor(private readonly prisma: PrismaClient) {}
+
+  async findByKey(cacheKey: string): Promise<TranscriptionCacheEntry | null> {
+    const entry = await this.prisma.transcriptionCacheEntry.findUnique({
+      where: { cacheKey }
+    });
+    return entry ? this.toDomain(entry) : null;
+  }
+
+  async save(entry: Omit<TranscriptionCacheEntry, 'hitCount' | 'createdAt' | 'lastHitAt'>): Promise<void> {
+    const { cacheKey, ...fields } = entry;
+    await this.prisma.transcriptionCacheEntry.upsert({
+      where: { cacheKey },
+      create: { cacheKey, ...fields },
+      update: { ...fields, lastHitAt: new Date() }
+    });
+  }
+
+  async recordHit(cacheKey: string): Promise<void> {
+    await this.prisma.transcriptionCacheEntry.updateMany({
+      where: { cacheKey },
+      data: {
+        hitCount: { increment: 1 },
+        lastHitAt: new Date()
+      }
+    });
+  }
+
+  async evict(olderThan: Date, maxEntries: number): Promise<number> {
+    const expired = await this.prisma.transcriptionCacheEntry.deleteMany({
+      where: { lastHitAt: { lt: olderThan } }
+    });
+
+    const remaining = await this.prisma.transcriptionCacheEntry.count();
+    if (remaining <= maxEntries) {
+      return expired.count;
+    }
+
+    const overflow = await this.prisma.transcriptionCacheEntry.findMany({
+      orderBy: { lastHitAt: 'asc' },
+      take: remaining - maxEntries,
+      select: { id: true }
+    });
+    const trimmed = await this.prisma.transcriptionCacheEntry.deleteMany({
+      where: { id: { in: overflow.map(entry => entry.id) } }
+    });
+
+    return expired.count + trimmed.count;
+  }
+
+  async totals(): Promise<TranscriptionCacheTotals> {
+    const result = await this.prisma.transcriptionCacheEntry.aggregate({
+      _count: { _all: true },
+      _sum: { sizeBytes: true }
+    });
+    return {
+      entries: result._count._all,
+      totalBytes: result._sum.sizeBytes ?? 0
+    };
+  }
+
+  private toDomain(entry: any): TranscriptionCacheEntry {
+    return {
+      cacheKey: entry.cacheKey,
+      audioHash: entry.audioHash,
+      model: entry.model,
+      text: entry.text,
+      language: entry.language,
+      duration: entry.duration,
+      confidence: entry.confidence,
+      sizeBytes: entry.sizeBytes,
+      hitCount: entry.hitCount,
+      createdAt: entry.createdAt,
+      lastHitAt: entry.lastHitAt
+    };
+  }
+}
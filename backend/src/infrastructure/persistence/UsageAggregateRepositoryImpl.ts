@@ -0,0 +1,80 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+import {
+  ALL_TIME_PERIOD,
+  UsageAggregateRepository,
+  UsageTotals,
+  emptyUsageTotals,
+  usagePeriod
+} from '../../domain/repositories/UsageAggregateRepository';
+
+type SqlClient = PrismaClient | Prisma.TransactionClient;
+
+/**
+ * Per-user, per-month usage counters. Writers bump them inside their own
+ * transactions (incrementWith) so the counters move atomically with the data
+ * they describe; readers get a user's stats with one primary-key lookup.
+ */
+export class UsageAggregateRepositoryImpl implements UsageAggregateRepository {
+  constructor(private readonly prisma: PrismaClient) {}
+
+  async increment(userId: string, at: Date, delta: Partial<UsageTotals>): Promise<void> {
+    await this.prisma.$transaction(tx => this.incrementWith(tx, userId, at, delta));
+  }
+
+  async incrementWith(client: SqlClient, userId: string, at: Date, delta: Partial<UsageTotals>): Promise<void> {
+    const increments = {
+      notesProcessed: { increment: delta.notesProcessed ?? 0 },
+      secondsTranscribed: { increment: delta.secondsTranscribed ?? 0 },
+      creditsUsed: { increment: delta.creditsUsed ?? 0 }
+    };
+    const initial = { ...emptyUsageTotals(), ...delta };
+
+    for (const period of [usagePeriod(at), ALL_TIME_PERIOD]) {
+      await client.usageAggregate.upsert({
+        where: { userId_period: { userId, period } },
+        create: { userId, period, ...initial },
+        update: increments
+      });
+    }
+  }
+
+  async findTotals(userId: string, periods: string[]): Promise<Map<string, UsageTotals>> {
+    const rows = await this.prisma.usageAggregate.findMany({
+      where: { userId, period: { in: periods } }
+    });
+
+    const totals = new Map<string, UsageTotals>();
+    for (const period of periods) {
+      totals.set(period, emptyUsageTotals());
+    }
+    for (const row of rows) {
+      totals.set(row.period, {
+        notesProcessed: row.notesProcessed,
+        secondsTranscribed: row.secondsTranscribed,
+        creditsUsed: row.creditsUsed
+      });
+    }
+    return totals;
+  }
+
+  async isEmpty(): Promise<boolean> {
+    return (await this.prisma.usageAggregate.findFirst({ select: { userId: true } })) === null;
+  }
+
+  async replaceAll(totals: Map<string, Map<string, UsageTotals>>, userId?: string): Promise<void> {
+    const data = [];
+    for (const [owner, periods] of totals) {
+      if (userId && owner !== userId) continue;
+      for (const [period, values] of periods) {
+        data.push({ userId: owner, period, ...values });
+      }
+    }
+
+    await this.prisma.$transaction(async (tx) => {
+      await tx.usageAggregate.deleteMany({ where: userId ? { userId } : {} });
+      if (data.length > 0) {
+        await tx.usageAggregate.createMany({ data });
+      }
+    });
+  }
+}
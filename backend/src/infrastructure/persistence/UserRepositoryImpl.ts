@@ -1,5 +1,9 @@
 import { PrismaClient, User as PrismaUser } from '@prisma/client';
 import { UserEntity } from '../../domain/entities/User';
+import { UsageAggregateRepositoryImpl } from './UsageAggregateRepositoryImpl';
+import { AuthenticatedUserCache } from '../auth/AuthenticatedUserCache';
+import { StageMetrics } from '../observability/StageMetrics';
+import { UserCacheInvalidator } from '../../domain/services/UserCacheInvalidator';
 
 export interface UserRepository {
   findById(id: string): Promise<UserEntity | null>;
@@ -7,21 +11,39 @@ export interface UserRepository {
   create(user: UserEntity, passwordHash: string): Promise<UserEntity>;
   update(user: UserEntity): Promise<UserEntity>;
   delete(id: string): Promise<void>;
-  incrementCredits(userId: string): Promise<UserEntity>;
+  incrementCredits(userId: string, amount?: number): Promise<UserEntity>;
   resetCredits(userId: string): Promise<UserEntity>;
   updateTier(userId: string, tier: string): Promise<UserEntity>;
 }
 
-export class UserRepositoryImpl implements UserRepository {
-  constructor(private readonly prisma: PrismaClient) {}
+/**
+ * Users by id are served from the process-wide AuthenticatedUserCache; every
+ * write below puts the updated user back into it. Code that changes a user
+ * row directly (e.g. in its own transaction) must call invalidateCachedUser().
+ */
+export class UserRepositoryImpl implements UserRepository, UserCacheInvalidator {
+  private readonly usageAggregates: UsageAggregateRepositoryImpl;
+
+  constructor(
+    private readonly prisma: PrismaClient,
+    private readonly cache: AuthenticatedUserCache = AuthenticatedUserCache.getInstance()
+  ) {
+    this.usageAggregates = new UsageAggregateRepositoryImpl(prisma);
+  }
 
-  async findById(id: string): Promise<UserEntity | null> {
-    const user = await this.prisma.user.findUnique({
-      where: { id },
-    });
+  findById(id: string): Promise<UserEntity | null> {
+    return this.cache.getUser(id, () => StageMetrics.getInstance().time('user_lookup', async () => {
+      const user = await this.prisma.user.findUnique({
+        where: { id },
+      });
 
-    if (!user) return null;
-    return this.toDomainEntity(user);
+      if (!user) return null;
+      return this.toDomainEntity(user);
+    }));
+  }
+
+  invalidateCachedUser(id: string): void {
+    this.cache.invalidateUser(id);
   }
 
   async findByEmail(email: string): Promise<UserEntity | null> {
@@ -64,24 +86,28 @@ export class UserRepositoryImpl implements UserRepository {
       },
     });
 
-    return this.toDomainEntity(updated);
+    return this.cached(this.toDomainEntity(updated));
   }
 
   async delete(id: string): Promise<void> {
     await this.prisma.user.delete({
       where: { id },
     });
+    this.cache.invalidateUser(id);
   }
 
-  async incrementCredits(userId: string): Promise<UserEntity> {
-    const updated = await this.prisma.user.update({
-      where: { id: userId },
-      data: {
-        creditsUsed: { increment: 1 },
-      },
+  async incrementCredits(userId: string, amount: number = 1): Promise<UserEntity> {
+    const updated = await this.prisma.$transaction(async (tx) => {
+      await this.usageAggregates.incrementWith(tx, userId, new Date(), { creditsUsed: amount });
+      return tx.user.update({
+        where: { id: userId },
+        data: {
+          creditsUsed: { increment: amount },
+        },
+      });
     });
 
-    return this.toDomainEntity(updated);
+    return this.cached(this.toDomainEntity(updated));
   }
 
   async resetCredits(userId: string): Promise<UserEntity> {
@@ -93,7 +119,7 @@ export class UserRepositoryImpl implements UserRepository {
       },
     });
 
-    return this.toDomainEntity(updated);
+    return this.cached(this.toDomainEntity(updated));
   }
 
   async updateTier(userId: string, tier: string): Promise<UserEntity> {
@@ -107,7 +133,12 @@ export class UserRepositoryImpl implements UserRepository {
       }
     });
 
-    return this.toDomainEntity(updated);
+    return this.cached(this.toDomainEntity(updated));
+  }
+
+  private cached(user: UserEntity): UserEntity {
+    this.cache.setUser(user);
+    return user;
   }
 
   private toDomainEntity(user: PrismaUser): UserEntity {
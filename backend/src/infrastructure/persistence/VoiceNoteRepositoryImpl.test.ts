@@ -0,0 +1,297 @@
+import { VoiceNoteRepositoryImpl } from './VoiceNoteRepositoryImpl';
+import { VoiceNote } from '../../domain/entities/VoiceNote';
+import { Transcription } from '../../domain/entities/Transcription';
+import { Summary } from '../../domain/entities/Summary';
+import { VoiceNoteId } from '../../domain/value-objects/VoiceNoteId';
+import { Language } from '../../domain/value-objects/Language';
+
+const NOTE_ID = '123e4567-e89b-12d3-a456-426614174000';
+
+function row(overrides: Record<string, unknown> = {}): any {
+  return {
+    id: NOTE_ID,
+    userId: 'user-1',
+    sessionId: null,
+    title: 'Standup',
+    originalFilePath: '/tmp/standup.m4a',
+    fileSize: 1024,
+    fileHash: null,
+    mimeType: 'audio/m4a',
+    language: 'EN',
+    status: 'pending',
+    tags: '[]',
+    createdAt: new Date('2026-01-01T00:00:00Z'),
+    updatedAt: new Date('2026-01-01T00:00:00Z'),
+    version: 1,
+    transcriptions: null,
+    summaries: null,
+    ...overrides
+  };
+}
+
+describe('VoiceNoteRepositoryImpl.save', () => {
+  let tx: any;
+  let prisma: any;
+  let repository: VoiceNoteRepositoryImpl;
+
+  beforeEach(() => {
+    tx = {
+      voiceNote: { create: jest.fn(), update: jest.fn() },
+      transcription: { upsert: jest.fn().mockResolvedValue({ id: 'transcription-1' }) },
+      summary: { upsert: jest.fn() },
+      voiceNoteSearchDoc: { upsert: jest.fn().mockResolvedValue({ docId: 1 }) },
+      usageAggregate: { upsert: jest.fn() },
+      storedObject: { upsert: jest.fn(), updateMany: jest.fn() },
+      event: { findFirst: jest.fn().mockResolvedValue(null) },
+      $executeRaw: jest.fn()
+    };
+    prisma = {
+      voiceNote: { findUnique: jest.fn().mockResolvedValue(row()) },
+      $transaction: jest.fn().mockImplementation((run: any) => run(tx))
+    };
+    repository = new VoiceNoteRepositoryImpl(prisma);
+  });
+
+  async function load(): Promise<VoiceNote> {
+    return (await repository.findById(VoiceNoteId.fromString(NOTE_ID)))!;
+  }
+
+  it('inserts a new note once and then treats it as clean', async () => {
+    const voiceNote = VoiceNote.create({
+      userId: 'user-1',
+      title: 'Standup',
+      originalFilePath: '/tmp/standup.m4a',
+      fileSize: 1024,
+      mimeType: 'audio/m4a',
+      language: Language.EN
+    });
+
+    await repository.save(voiceNote);
+    await repository.save(voiceNote);
+
+    expect(prisma.$transaction).toHaveBeenCalledTimes(1);
+    expect(tx.voiceNote.create).toHaveBeenCalledTimes(1);
+    expect(tx.voiceNote.update).not.toHaveBeenCalled();
+    // The note holds a reference to its audio file
+    expect(tx.storedObject.upsert).toHaveBeenCalledTimes(1);
+    expect(tx.storedObject.upsert.mock.calls[0][0]).toMatchObject({
+      where: { path: '/tmp/standup.m4a' },
+      update: { refCount: { increment: 1 } }
+    });
+  });
+
+  it('skips the write entirely when a loaded note is unchanged', async () => {
+    const voiceNote = await load();
+
+    await repository.save(voiceNote);
+
+    expect(prisma.$transaction).not.toHaveBeenCalled();
+  });
+
+  it('updates only the dirty columns of a status change', async () => {
+    const voiceNote = await load();
+    voiceNote.startProcessing();
+
+    await repository.save(voiceNote);
+
+    expect(tx.voiceNote.update).toHaveBeenCalledWith({
+      where: { id: NOTE_ID },
+      data: { status: 'processing', updatedAt: voiceNote.getUpdatedAt() }
+    });
+    expect(tx.transcription.upsert).not.toHaveBeenCalled();
+    expect(tx.summary.upsert).not.toHaveBeenCalled();
+    expect(tx.$executeRaw).not.toHaveBeenCalled();
+  });
+
+  it('writes a new transcription with the status change, re-indexes and counts usage', async () => {
+    const voiceNote = await load();
+    voiceNote.startProcessing();
+    await repository.save(voiceNote);
+    tx.voiceNote.update.mockClear();
+
+    voiceNote.addTranscription(Transcription.create('hello world', Language.EN, 3, 0.9));
+    voiceNote.setAIGeneratedTitle('Greeting');
+    voiceNote.markAsCompleted();
+    await repository.save(voiceNote);
+
+    expect(Object.keys(tx.voiceNote.update.mock.calls[0][0].data).sort())
+      .toEqual(['aiGeneratedTitle', 'errorMessage', 'status', 'updatedAt']);
+    expect(tx.transcription.upsert).toHaveBeenCalledTimes(1);
+    expect(tx.voiceNoteSearchDoc.upsert).toHaveBeenCalledTimes(1);
+    // Month row and all-time row
+    expect(tx.usageAggregate.upsert).toHaveBeenCalledTimes(2);
+    expect(tx.usageAggregate.upsert.mock.calls[0][0].update).toMatchObject({
+      notesProcessed: { increment: 1 },
+      secondsTranscribed: { increment: 3 }
+    });
+  });
+
+  it('leaves usage alone when a completed note gets a regenerated summary', async () => {
+    prisma.voiceNote.findUnique.mockResolvedValue(row({
+      status: 'completed',
+      transcriptions: { text: 'hello world', language: 'EN', duration: 3, confidence: 0.9, timestamp: new Date() }
+    }));
+    const voiceNote = await load();
+
+    voiceNote.addSummary(Summary.create('Hello', ['Greeting'], [], Language.EN));
+    voiceNote.setAIGeneratedTitle('Greeting');
+    await repository.save(voiceNote);
+    // Even a round trip through processing is not a new completion
+    voiceNote.reprocess();
+    voiceNote.startProcessing();
+    voiceNote.markAsCompleted();
+    await repository.save(voiceNote);
+
+    expect(tx.summary.upsert).toHaveBeenCalledTimes(1);
+    expect(tx.voiceNote.update).toHaveBeenCalledTimes(2);
+    expect(tx.usageAggregate.upsert).not.toHaveBeenCalled();
+  });
+
+  it('counts a note that was processed before only once', async () => {
+    tx.event.findFirst.mockResolvedValue({ id: 'event-1' });
+    const voiceNote = await load();
+    voiceNote.startProcessing();
+    voiceNote.addTranscription(Transcription.create('hello again', Language.EN, 3, 0.9));
+    voiceNote.markAsCompleted();
+
+    await repository.save(voiceNote);
+
+    expect(tx.event.findFirst).toHaveBeenCalledWith({
+      where: { aggregateId: NOTE_ID, eventType: 'VoiceNoteProcessingCompleted' },
+      select: { id: true }
+    });
+    expect(tx.transcription.upsert).toHaveBeenCalledTimes(1);
+    expect(tx.usageAggregate.upsert).not.toHaveBeenCalled();
+  });
+
+  it('releases the audio file reference in the delete transaction', async () => {
+    tx.voiceNoteSearchDoc.findUnique = jest.fn().mockResolvedValue(null);
+    tx.voiceNote.delete = jest.fn().mockResolvedValue({ originalFilePath: '/tmp/standup.m4a' });
+
+    await repository.delete(VoiceNoteId.fromString(NOTE_ID));
+
+    expect(tx.storedObject.updateMany.mock.calls[0][0]).toMatchObject({
+      where: { path: '/tmp/standup.m4a' },
+      data: { refCount: { decrement: 1 } }
+    });
+  });
+});
+
+describe('VoiceNoteRepositoryImpl.list', () => {
+  let prisma: any;
+  let repository: VoiceNoteRepositoryImpl;
+
+  function listRow(id: string, createdAt: string): any {
+    return {
+      ...row({ id, createdAt: new Date(createdAt), tags: '["work"]' }),
+      transcriptions: { id: `t-${id}` },
+      summaries: null
+    };
+  }
+
+  beforeEach(() => {
+    prisma = {
+      voiceNote: {
+        findMany: jest.fn(),
+        count: jest.fn().mockResolvedValue(1000)
+      }
+    };
+    repository = new VoiceNoteRepositoryImpl(prisma);
+  });
+
+  it('seeks past the cursor with a lean projection and reports the next cursor', async () => {
+    prisma.voiceNote.findMany.mockResolvedValue([
+      listRow('c', '2026-10-03T00:00:00Z'),
+      listRow('b', '2026-10-02T00:00:00Z'),
+      listRow('a', '2026-10-01T00:00:00Z')
+    ]);
+    const after = { createdAt: new Date('2026-10-04T00:00:00Z'), id: 'd' };
+
+    const page = await repository.list('user-1', { limit: 2, keyset: true, after }, {});
+
+    const query = prisma.voiceNote.findMany.mock.calls[0][0];
+    expect(query.take).toBe(3);
+    expect(query.skip).toBeUndefined();
+    expect(query.orderBy).toEqual([{ createdAt: 'desc' }, { id: 'desc' }]);
+    expect(query.where.AND[1]).toEqual({
+      createdAt: { lte: after.createdAt },
+      OR: [
+        { createdAt: { lt: after.createdAt } },
+        { createdAt: after.createdAt, id: { lt: 'd' } }
+      ]
+    });
+    expect(query.select.transcriptions).toEqual({ select: { id: true } });
+    expect(query.include).toBeUndefined();
+
+    expect(page.items.map(item => item.id)).toEqual(['c', 'b']);
+    expect(page.items[0]).toMatchObject({ tags: ['work'], hasTranscription: true, hasSummary: false });
+    expect(page.hasNext).toBe(true);
+    expect(page.next).toEqual({ createdAt: new Date('2026-10-02T00:00:00Z'), id: 'b' });
+    expect(prisma.voiceNote.count).not.toHaveBeenCalled();
+  });
+
+  it('caps the count when an estimate is enough', async () => {
+    prisma.voiceNote.findMany.mockResolvedValue([]);
+
+    const page = await repository.list('user-1', { limit: 20, keyset: true, count: 'estimate' });
+
+    expect(prisma.voiceNote.count.mock.calls[0][0].take).toBe(1000);
+    expect(page).toMatchObject({ total: 1000, totalIsEstimate: true, hasNext: false });
+  });
+});
+
+describe('VoiceNoteRepositoryImpl.iterate', () => {
+  it('reads batches oldest first, seeking past the last row of each', async () => {
+    const rows = ['a', 'b', 'c'].map((id, i) => row({ id, createdAt: new Date(`2026-10-0${i + 1}T00:00:00Z`) }));
+    const prisma: any = {
+      voiceNote: {
+        findMany: jest.fn()
+          .mockResolvedValueOnce(rows.slice(0, 2))
+          .mockResolvedValueOnce(rows.slice(2))
+      }
+    };
+    const repository = new VoiceNoteRepositoryImpl(prisma);
+
+    const ids: string[] = [];
+    for await (const voiceNote of repository.iterate('user-1', { batchSize: 2 }, { projectId: 'project-1' })) {
+      ids.push(voiceNote.getId().getValue());
+    }
+
+    expect(ids).toEqual(['a', 'b', 'c']);
+    expect(prisma.voiceNote.findMany).toHaveBeenCalledTimes(2);
+    const [first, second] = prisma.voiceNote.findMany.mock.calls.map((call: any[]) => call[0]);
+    expect(first.take).toBe(2);
+    expect(first.orderBy).toEqual([{ createdAt: 'asc' }, { id: 'asc' }]);
+    expect(first.include).toEqual({ transcriptions: true, summaries: true });
+    expect(first.where.AND[0].OR).toEqual([
+      { projectId: 'project-1' },
+      { projectNotes: { some: { projectId: 'project-1' } } }
+    ]);
+    expect(first.where.AND[1]).toEqual({});
+    expect(second.where.AND[1]).toEqual({
+      createdAt: { gte: rows[1].createdAt },
+      OR: [
+        { createdAt: { gt: rows[1].createdAt } },
+        { createdAt: rows[1].createdAt, id: { gt: 'b' } }
+      ]
+    });
+  });
+});
+
+describe('VoiceNoteRepositoryImpl.search', () => {
+  it('searches nothing without an owner', async () => {
+    const repository = new VoiceNoteRepositoryImpl({} as any);
+    const searchIndex = jest.spyOn((repository as any).searchIndex, 'search');
+    const pagination = { page: 1, pageSize: 20 };
+
+    const results = [
+      await repository.search('anonymous', 'standup', pagination),
+      await repository.search('', 'standup', pagination),
+      await repository.findAll({ search: 'standup' })
+    ];
+
+    expect(searchIndex).not.toHaveBeenCalled();
+    expect(results.map(result => result.total)).toEqual([0, 0, 0]);
+    expect(results[2].items).toEqual([]);
+  });
+});
@@ -1,98 +1,176 @@
-import { PrismaClient } from '@prisma/client';
-import { VoiceNoteRepository } from '../../domain/repositories/VoiceNoteRepository';
-import { VoiceNote } from '../../domain/entities/VoiceNote';
+import { Prisma, PrismaClient } from '@prisma/client';
+import {
+  LIST_COUNT_ESTIMATE_CAP,
+  VoiceNoteFilter,
+  VoiceNoteListCursor,
+  VoiceNoteListItem,
+  VoiceNoteListOptions,
+  VoiceNoteListPage,
+  VoiceNoteRepository,
+  VoiceNoteSearchHit
+} from '../../domain/repositories/VoiceNoteRepository';
+import { VoiceNote, VoiceNoteMutableField } from '../../domain/entities/VoiceNote';
 import { Transcription } from '../../domain/entities/Transcription';
 import { Summary } from '../../domain/entities/Summary';
 import { VoiceNoteId } from '../../domain/value-objects/VoiceNoteId';
 import { Language } from '../../domain/value-objects/Language';
-import { ProcessingStatus } from '../../domain/value-objects/ProcessingStatus';
+import { ProcessingStatus, ProcessingStatusValue } from '../../domain/value-objects/ProcessingStatus';
+import { StageMetrics } from '../observability/StageMetrics';
+import { VoiceNoteSearchIndex, SearchDocument } from './VoiceNoteSearchIndex';
+import { UsageAggregateRepositoryImpl } from './UsageAggregateRepositoryImpl';
+import { StoredObjectRepositoryImpl } from './StoredObjectRepositoryImpl';
+
+// Mutable columns that feed the full-text index (see toSearchDocument)
+const SEARCHABLE_FIELDS: VoiceNoteMutableField[] = ['aiGeneratedTitle', 'briefDescription'];
+
+// List views only need card fields and whether the children exist, not their text
+const LIST_SELECT = {
+  id: true,
+  userId: true,
+  sessionId: true,
+  title: true,
+  fileSize: true,
+  mimeType: true,
+  language: true,
+  status: true,
+  tags: true,
+  duration: true,
+  aiGeneratedTitle: true,
+  briefDescription: true,
+  derivedDate: true,
+  createdAt: true,
+  updatedAt: true,
+  transcriptions: { select: { id: true } },
+  summaries: { select: { id: true } }
+} satisfies Prisma.VoiceNoteSelect;
+
+type VoiceNoteListRow = Prisma.VoiceNoteGetPayload<{ select: typeof LIST_SELECT }>;
 
 export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
-  constructor(private prisma: PrismaClient) {}
+  private readonly searchIndex: VoiceNoteSearchIndex;
+  private readonly usageAggregates: UsageAggregateRepositoryImpl;
+  private readonly storedObjects: StoredObjectRepositoryImpl;
 
+  constructor(private prisma: PrismaClient) {
+    this.searchIndex = new VoiceNoteSearchIndex(prisma);
+    this.usageAggregates = new UsageAggregateRepositoryImpl(prisma);
+    this.storedObjects = new StoredObjectRepositoryImpl(prisma);
+  }
+
+  /**
+   * Writes only what changed since the note was loaded or last saved: a new
+   * note is inserted with its children, an existing one gets a single UPDATE
+   * of its dirty columns plus upserts of a changed transcription/summary.
+   * Unchanged notes are not written at all.
+   */
   async save(voiceNote: VoiceNote): Promise<void> {
+    const isNew = !voiceNote.isPersisted();
+    if (!isNew && !voiceNote.hasChanges()) {
+      return;
+    }
+
     const data = this.toDatabase(voiceNote);
+    const changes = voiceNote.getChanges();
+    const transcription = voiceNote.getTranscription();
+    const summary = voiceNote.getSummary();
+    const writeTranscription = !!transcription && (isNew || changes.transcription);
+    const writeSummary = !!summary && (isNew || changes.summary);
+    const reindex = isNew || writeTranscription || writeSummary ||
+      changes.fields.some(field => SEARCHABLE_FIELDS.includes(field));
+    const userId = voiceNote.getUserId();
+    // A pipeline run completes with its transcription; summary regenerations don't count
+    const completed = changes.fields.includes('status') &&
+      voiceNote.getStatus().getValue() === ProcessingStatusValue.COMPLETED &&
+      writeTranscription;
     
-    await this.prisma.$transaction(async (tx) => {
-      // Separate userId and projectId from other fields for Prisma relations
-      const { userId, projectId, ...voiceNoteFields } = data;
-      
-      // Build the create/update data with proper relation handling
-      const createData = {
-        ...voiceNoteFields,
-        ...(userId ? { user: { connect: { id: userId } } } : {}),
-        ...(projectId ? { project: { connect: { id: projectId } } } : {})
-      };
-      
-      const updateData = {
-        ...voiceNoteFields,
-        ...(userId ? { user: { connect: { id: userId } } } : {}),
-        ...(projectId ? { project: { connect: { id: projectId } } } : {})
-      };
-      
-      await tx.voiceNote.upsert({
-        where: { id: data.id },
-        create: createData,
-        update: updateData
-      });
-
-      if (voiceNote.getTranscription()) {
-        const transcription = voiceNote.getTranscription()!;
-        await tx.transcription.upsert({
-          where: { voiceNoteId: data.id },
-          create: {
-            voiceNoteId: data.id,
-            text: transcription.getText(),
-            language: transcription.getLanguage().toString(),
-            confidence: transcription.getConfidence() || 0,
-            duration: transcription.getDuration() || 0,
-            wordCount: transcription.getWordCount(),
-            timestamp: transcription.getTimestamp() || new Date()
-          },
-          update: {
-            text: transcription.getText(),
-            language: transcription.getLanguage().toString(),
-            confidence: transcription.getConfidence() || 0,
-            duration: transcription.getDuration() || 0,
-            wordCount: transcription.getWordCount(),
-            timestamp: transcription.getTimestamp() || new Date()
+    await StageMetrics.getInstance().time('db_save', () => this.prisma.$transaction(async (tx) => {
+      if (isNew) {
+        // Separate userId and projectId from other fields for Prisma relations
+        const { userId, projectId, ...voiceNoteFields } = data;
+        
+        await tx.voiceNote.create({
+          data: {
+            ...voiceNoteFields,
+            ...(userId ? { user: { connect: { id: userId } } } : {}),
+            ...(projectId ? { project: { connect: { id: projectId } } } : {})
           }
         });
+        // The audio file is kept while any note references it
+        await this.storedObjects.addReference(tx, {
+          path: data.originalFilePath,
+          hash: data.fileHash || undefined,
+          size: data.fileSize
+        });
+      } else {
+        const columns: Record<string, unknown> = {};
+        for (const field of changes.fields) {
+          columns[field] = data[field];
+        }
+
+        await tx.voiceNote.update({
+          where: { id: data.id },
+          data: { ...columns, updatedAt: data.updatedAt }
+        });
       }
 
-      if (voiceNote.getSummary()) {
-        const summary = voiceNote.getSummary()!;
-        
-        // Get the transcription ID from the database
-        const transcription = await tx.transcription.findUnique({
-          where: { voiceNoteId: data.id }
+      let transcriptionId: string | undefined;
+      if (writeTranscription) {
+        const fields = {
+          text: transcription!.getText(),
+          language: transcription!.getLanguage().toString(),
+          confidence: transcription!.getConfidence() || 0,
+          duration: transcription!.getDuration() || 0,
+          wordCount: transcription!.getWordCount(),
+          timestamp: transcription!.getTimestamp() || new Date()
+        };
+        const row = await tx.transcription.upsert({
+          where: { voiceNoteId: data.id },
+          create: { voiceNoteId: data.id, ...fields },
+          update: fields
         });
-        
-        if (!transcription) {
-          throw new Error('Cannot save summary without a transcription');
-        }
-        
+        transcriptionId = row.id;
+      }
+
+      if (writeSummary) {
+        const fields = {
+          summary: summary!.getSummary(),
+          keyPoints: JSON.stringify(summary!.getKeyPoints()),
+          actionItems: JSON.stringify(summary!.getActionItems()),
+          language: summary!.getLanguage().getValue(),
+          timestamp: summary!.getTimestamp() || new Date()
+        };
+        // Fails (rolling back the save) if the note has no transcription row
         await tx.summary.upsert({
           where: { voiceNoteId: data.id },
           create: {
-            voiceNoteId: data.id,
-            transcriptionId: transcription.id,
-            summary: summary.getSummary(),
-            keyPoints: JSON.stringify(summary.getKeyPoints()),
-            actionItems: JSON.stringify(summary.getActionItems()),
-            language: summary.getLanguage().getValue(),
-            timestamp: summary.getTimestamp() || new Date()
+            ...fields,
+            voiceNote: { connect: { id: data.id } },
+            transcription: { connect: transcriptionId ? { id: transcriptionId } : { voiceNoteId: data.id } }
           },
-          update: {
-            summary: summary.getSummary(),
-            keyPoints: JSON.stringify(summary.getKeyPoints()),
-            actionItems: JSON.stringify(summary.getActionItems()),
-            language: summary.getLanguage().getValue(),
-            timestamp: summary.getTimestamp() || new Date()
-          }
+          update: fields
         });
       }
-    });
+
+      if (reindex) {
+        await this.searchIndex.index(tx, data.id, this.toSearchDocument(voiceNote));
+      }
+
+      // Usage counters move in the same transaction as the completed status. A
+      // note counts once: its completed event is appended after this save, so an
+      // earlier one means it was processed before (the rebuild uses the same rule)
+      const firstCompletion = completed && !!userId && !(await tx.event.findFirst({
+        where: { aggregateId: data.id, eventType: 'VoiceNoteProcessingCompleted' },
+        select: { id: true }
+      }));
+      if (firstCompletion) {
+        await this.usageAggregates.incrementWith(tx, userId!, voiceNote.getUpdatedAt(), {
+          notesProcessed: 1,
+          secondsTranscribed: transcription?.getDuration() || voiceNote.getDuration() || 0
+        });
+      }
+    }));
+
+    voiceNote.markPersisted();
   }
 
   async findById(
@@ -112,6 +190,19 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
     return this.fromDatabase(result);
   }
 
+  /**
+   * Lightweight status lookup for status polling/streaming - reads only the
+   * status columns instead of the full aggregate with transcription and summary.
+   */
+  async findStatus(
+    id: VoiceNoteId
+  ): Promise<{ status: string; errorMessage: string | null; updatedAt: Date } | null> {
+    return this.prisma.voiceNote.findUnique({
+      where: { id: id.toString() },
+      select: { status: true, errorMessage: true, updatedAt: true }
+    });
+  }
+
   async findByUserId(
     userId: string,
     pagination: {
@@ -133,27 +224,14 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
     // Support both userId and sessionId filtering
     // For anonymous users (userId is 'anonymous'), use sessionId
     // For authenticated users, use userId
-    const where: any = {};
-    
-    if (userId === 'anonymous' && filter?.sessionId) {
-      where.sessionId = filter.sessionId;
-    } else if (userId && userId !== 'anonymous') {
-      where.userId = userId;
-    }
-    
-    if (filter) {
-      if (filter.status) where.status = filter.status.toString();
-      if (filter.language) where.language = filter.language.toString();
-      if (filter.fromDate) where.createdAt = { gte: filter.fromDate };
-      if (filter.toDate) where.createdAt = { ...where.createdAt, lte: filter.toDate };
-      if (filter.searchQuery) {
-        where.OR = [
-          { title: { contains: filter.searchQuery } },
-          { description: { contains: filter.searchQuery } }
-        ];
-      }
+    if (filter?.searchQuery) {
+      // Full-text matches come back ranked by relevance rather than sortBy
+      const result = await this.search(userId, filter.searchQuery, pagination, filter);
+      return { ...result, items: result.items.map(hit => hit.voiceNote) };
     }
 
+    const where = this.ownerWhere(userId, filter);
+
     const skip = (pagination.page - 1) * pagination.pageSize;
     const take = pagination.pageSize;
     
@@ -191,9 +269,165 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
     };
   }
 
+  /**
+   * Lean listing for list views. Keyset mode seeks past the previous page's
+   * last (createdAt, id) on the owner's index, so page 500 costs the same as
+   * page 1; offset mode is kept for sortBy other than upload time. Counting is
+   * optional and can be capped, since an exact count walks every matching row.
+   */
+  async list(userId: string, options: VoiceNoteListOptions, filter?: VoiceNoteFilter): Promise<VoiceNoteListPage> {
+    const where = this.ownerWhere(userId, filter);
+    const direction = options.sortOrder || 'desc';
+
+    let rows: VoiceNoteListRow[];
+    let hasNext: boolean;
+    const counting = this.countListed(where, options.count || 'none');
+
+    if (options.keyset) {
+      rows = await this.prisma.voiceNote.findMany({
+        where: { AND: [where, this.keysetSeek(direction, options.after)] },
+        orderBy: [{ createdAt: direction }, { id: direction }],
+        take: options.limit + 1,
+        select: LIST_SELECT
+      });
+      hasNext = rows.length > options.limit;
+      rows = rows.slice(0, options.limit);
+    } else {
+      const page = options.page || 1;
+      const orderByField = options.sortBy === 'processedAt' ? 'updatedAt' :
+                          options.sortBy === 'fileName' ? 'title' :
+                          options.sortBy === 'duration' ? 'duration' :
+                          'createdAt';
+      rows = await this.prisma.voiceNote.findMany({
+        where,
+        orderBy: [{ [orderByField]: direction }, { id: direction }],
+        skip: (page - 1) * options.limit,
+        take: options.limit + 1,
+        select: LIST_SELECT
+      });
+      hasNext = rows.length > options.limit;
+      rows = rows.slice(0, options.limit);
+    }
+
+    const { total, totalIsEstimate } = await counting;
+    const last = rows[rows.length - 1];
+
+    return {
+      items: rows.map(row => this.toListItem(row)),
+      hasNext,
+      next: options.keyset && hasNext && last ? { createdAt: last.createdAt, id: last.id } : undefined,
+      total,
+      totalIsEstimate
+    };
+  }
+
+  /**
+   * Streams full notes (with transcription and summary) for exports, keyset
+   * paged in (createdAt, id) order. The next batch is only requested once the
+   * consumer has taken the current one, so memory stays at about two batches
+   * however many notes match.
+   */
+  async *iterate(userId: string, options: { batchSize: number }, filter?: VoiceNoteFilter): AsyncGenerator<VoiceNote> {
+    const where = this.ownerWhere(userId, filter);
+    const fetch = (after?: VoiceNoteListCursor) => this.prisma.voiceNote.findMany({
+      where: { AND: [where, this.keysetSeek('asc', after)] },
+      orderBy: [{ createdAt: 'asc' }, { id: 'asc' }],
+      take: options.batchSize,
+      include: {
+        transcriptions: true,
+        summaries: true
+      }
+    });
+
+    let batch = await fetch();
+    while (batch.length > 0) {
+      const last = batch[batch.length - 1];
+      // Read ahead one batch while this one is written out
+      const next = batch.length === options.batchSize
+        ? fetch({ createdAt: last.createdAt, id: last.id })
+        : Promise.resolve([]);
+      next.catch(() => undefined);  // Surfaced by the await below, unless the consumer stopped early
+
+      for (const item of batch) {
+        yield this.fromDatabase(item);
+      }
+      batch = await next;
+    }
+  }
+
+  async search(
+    userId: string,
+    query: string,
+    pagination: { page: number; pageSize: number },
+    filter?: {
+      status?: ProcessingStatus;
+      language?: Language;
+      sessionId?: string;
+    }
+  ): Promise<{ items: VoiceNoteSearchHit[]; total: number; page: number; pageSize: number; totalPages: number }> {
+    // Same ownership rules as findByUserId, but a search never spans owners:
+    // without a user or an anonymous session there is nothing to search
+    const owner = userId === 'anonymous'
+      ? { sessionId: filter?.sessionId }
+      : { userId: userId || undefined };
+    if (!owner.sessionId && !owner.userId) {
+      return { items: [], total: 0, page: pagination.page, pageSize: pagination.pageSize, totalPages: 0 };
+    }
+
+    const { hits, total } = await this.searchIndex.search(
+      query,
+      {
+        ...owner,
+        status: filter?.status?.toString(),
+        language: filter?.language?.toString()
+      },
+      pagination.pageSize,
+      (pagination.page - 1) * pagination.pageSize
+    );
+
+    // Hydrate the page and restore rank order, which findMany does not keep
+    const notes = await this.findByIds(hits.map(hit => VoiceNoteId.fromString(hit.voiceNoteId)));
+    const byId = new Map(notes.map(note => [note.getId().toString(), note]));
+    const items = hits
+      .filter(hit => byId.has(hit.voiceNoteId))
+      .map(hit => ({ voiceNote: byId.get(hit.voiceNoteId)!, rank: hit.rank, snippet: hit.snippet }));
+
+    return {
+      items,
+      total,
+      page: pagination.page,
+      pageSize: pagination.pageSize,
+      totalPages: Math.ceil(total / pagination.pageSize)
+    };
+  }
+
+  async findByIds(ids: VoiceNoteId[]): Promise<VoiceNote[]> {
+    if (ids.length === 0) {
+      return [];
+    }
+
+    const items = await this.prisma.voiceNote.findMany({
+      where: { id: { in: ids.map(id => id.toString()) } },
+      include: {
+        transcriptions: true,
+        summaries: true
+      }
+    });
+
+    return items.map(item => this.fromDatabase(item));
+  }
+
   async findByFileHash(userId: string, fileHash: string): Promise<VoiceNote | null> {
-    // Implementation for finding by file hash
-    return null;
+    const item = await this.prisma.voiceNote.findFirst({
+      where: { userId, fileHash },
+      include: {
+        transcriptions: true,
+        summaries: true
+      },
+      orderBy: { createdAt: 'desc' }
+    });
+
+    return item ? this.fromDatabase(item) : null;
   }
 
   async findPendingForProcessing(limit: number): Promise<VoiceNote[]> {
@@ -206,6 +440,20 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
     return items.map(item => this.fromDatabase(item));
   }
 
+  async findByStatus(status: ProcessingStatus, limit: number): Promise<VoiceNote[]> {
+    const items = await this.prisma.voiceNote.findMany({
+      where: { status: status.toString() },
+      include: {
+        transcriptions: true,
+        summaries: true
+      },
+      take: limit,
+      orderBy: { updatedAt: 'asc' }
+    });
+
+    return items.map(item => this.fromDatabase(item));
+  }
+
   async findAll(
     filters?: {
       status?: ProcessingStatus;
@@ -222,6 +470,16 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
       sortOrder?: 'asc' | 'desc';
     }
   ): Promise<{ items: VoiceNote[]; total: number }> {
+    if (filters?.search) {
+      const result = await this.search(
+        filters.userId || '',
+        filters.search,
+        { page: pagination?.page || 1, pageSize: pagination?.limit || 20 },
+        { status: filters.status }
+      );
+      return { items: result.items.map(hit => hit.voiceNote), total: result.total };
+    }
+
     const where: any = {};
     
     if (filters) {
@@ -229,12 +487,6 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
       if (filters.userId) where.userId = filters.userId;
       if (filters.fromDate) where.createdAt = { gte: filters.fromDate };
       if (filters.toDate) where.createdAt = { ...where.createdAt, lte: filters.toDate };
-      if (filters.search) {
-        where.OR = [
-          { title: { contains: filters.search } },
-          { description: { contains: filters.search } }
-        ];
-      }
     }
 
     const skip = pagination ? (pagination.page - 1) * pagination.limit : 0;
@@ -264,8 +516,13 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
   }
 
   async delete(id: VoiceNoteId): Promise<void> {
-    await this.prisma.voiceNote.delete({
-      where: { id: id.toString() }
+    await this.prisma.$transaction(async (tx) => {
+      await this.searchIndex.remove(tx, id.toString());
+      const deleted = await tx.voiceNote.delete({
+        where: { id: id.toString() },
+        select: { originalFilePath: true }
+      });
+      await this.storedObjects.releaseReference(tx, deleted.originalFilePath);
     });
   }
 
@@ -285,6 +542,7 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
       title: voiceNote.getTitle(),
       originalFilePath: voiceNote.getOriginalFilePath(),
       fileSize: voiceNote.getFileSize(),
+      fileHash: voiceNote.getFileHash() || null,
       mimeType: voiceNote.getMimeType(),
       language: voiceNote.getLanguage().toString(),
       status: voiceNote.getStatus().toString(),
@@ -307,6 +565,107 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
     };
   }
 
+  private toSearchDocument(voiceNote: VoiceNote): SearchDocument {
+    const transcription = voiceNote.getTranscription();
+    const summary = voiceNote.getSummary();
+
+    return {
+      title: [voiceNote.getTitle(), voiceNote.getAIGeneratedTitle()].filter(Boolean).join(' '),
+      description: voiceNote.getBriefDescription() || '',
+      transcription: transcription ? transcription.getText() : '',
+      summary: summary
+        ? [summary.getSummary(), ...summary.getKeyPoints(), ...summary.getActionItems()].join('\n')
+        : ''
+    };
+  }
+
+  // Rows after the cursor in (createdAt, id) order. The redundant createdAt
+  // bound lets SQLite seek the index; the OR alone scans from the top
+  private keysetSeek(direction: 'asc' | 'desc', after?: VoiceNoteListCursor): Prisma.VoiceNoteWhereInput {
+    if (!after) {
+      return {};
+    }
+    const descending = direction === 'desc';
+    return {
+      createdAt: descending ? { lte: after.createdAt } : { gte: after.createdAt },
+      OR: [
+        { createdAt: descending ? { lt: after.createdAt } : { gt: after.createdAt } },
+        { createdAt: after.createdAt, id: descending ? { lt: after.id } : { gt: after.id } }
+      ]
+    };
+  }
+
+  // Anonymous listings are scoped by session, signed-in ones by user
+  private ownerWhere(userId: string, filter?: VoiceNoteFilter): Prisma.VoiceNoteWhereInput {
+    const where: any = {};
+    
+    if (userId === 'anonymous' && filter?.sessionId) {
+      where.sessionId = filter.sessionId;
+    } else if (userId && userId !== 'anonymous') {
+      where.userId = userId;
+    }
+    
+    if (filter) {
+      if (filter.status) where.status = filter.status.toString();
+      if (filter.language) where.language = filter.language.toString();
+      if (filter.fromDate) where.createdAt = { gte: filter.fromDate };
+      if (filter.toDate) where.createdAt = { ...where.createdAt, lte: filter.toDate };
+      // Notes join a project through ProjectNote; older ones only carry projectId
+      if (filter.projectId) {
+        where.OR = [
+          { projectId: filter.projectId },
+          { projectNotes: { some: { projectId: filter.projectId } } }
+        ];
+      }
+    }
+
+    return where;
+  }
+
+  private async countListed(
+    where: Prisma.VoiceNoteWhereInput,
+    mode: 'exact' | 'estimate' | 'none'
+  ): Promise<{ total?: number; totalIsEstimate?: boolean }> {
+    if (mode === 'none') {
+      return {};
+    }
+    if (mode === 'exact') {
+      return { total: await this.prisma.voiceNote.count({ where }) };
+    }
+    // Stop counting at the cap: "1000+" is all a list header needs
+    const total = await this.prisma.voiceNote.count({ where, take: LIST_COUNT_ESTIMATE_CAP });
+    return { total, totalIsEstimate: total >= LIST_COUNT_ESTIMATE_CAP };
+  }
+
+  private toListItem(row: VoiceNoteListRow): VoiceNoteListItem {
+    let tags: string[] = [];
+    try {
+      tags = JSON.parse(row.tags || '[]');
+    } catch {
+      // Leave malformed tags out of the card rather than failing the page
+    }
+
+    return {
+      id: row.id,
+      userId: row.userId ?? undefined,
+      sessionId: row.sessionId ?? undefined,
+      title: row.title,
+      fileSize: row.fileSize,
+      mimeType: row.mimeType,
+      language: row.language,
+      status: row.status,
+      tags,
+      duration: row.duration ?? undefined,
+      aiGeneratedTitle: row.aiGeneratedTitle ?? undefined,
+      briefDescription: row.briefDescription ?? undefined,
+      derivedDate: row.derivedDate ?? undefined,
+      createdAt: row.createdAt,
+      updatedAt: row.updatedAt,
+      hasTranscription: !!row.transcriptions,
+      hasSummary: !!row.summaries
+    };
+  }
+
   private fromDatabase(data: any): VoiceNote {
     const status = ProcessingStatus.fromString(data.status);
     const language = Language.fromString(data.language);
@@ -337,7 +696,8 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
       data.derivedDate ? new Date(data.derivedDate) : undefined,  // Add derivedDate
       data.createdAt,
       data.updatedAt,
-      data.version
+      data.version,
+      data.fileHash || undefined
     );
 
     // Handle one-to-one transcription relationship
@@ -364,6 +724,8 @@ export class VoiceNoteRepositoryImpl implements VoiceNoteRepository {
       voiceNote.addSummary(summary);
     }
 
+    // Freshly loaded state is clean; only later changes get written back
+    voiceNote.markPersisted();
     return voiceNote;
   }
 }
\ No newline at end of file
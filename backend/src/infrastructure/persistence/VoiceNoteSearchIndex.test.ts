@@ -0,0 +1,37 @@
+import { VoiceNoteSearchIndex } from './VoiceNoteSearchIndex';
+
+describe('VoiceNoteSearchIndex', () => {
+  it('turns free text into quoted prefix terms', () => {
+    expect(VoiceNoteSearchIndex.toMatchQuery('budżet Żabka')).toBe('"budżet"* "Żabka"*');
+  });
+
+  it('drops FTS5 syntax from user input', () => {
+    expect(VoiceNoteSearchIndex.toMatchQuery('title:"release" OR (demo*) -NEAR'))
+      .toBe('"title"* "release"* "OR"* "demo"* "NEAR"*');
+  });
+
+  it('does not query the database when nothing searchable is left', async () => {
+    const prisma = { $queryRaw: jest.fn() };
+    const index = new VoiceNoteSearchIndex(prisma as any);
+
+    expect(VoiceNoteSearchIndex.toMatchQuery(' "*" ')).toBeNull();
+    await expect(index.search('?!', { userId: 'user-1' }, 20, 0)).resolves.toEqual({ hits: [], total: 0 });
+    expect(prisma.$queryRaw).not.toHaveBeenCalled();
+  });
+
+  it('replaces the existing row when a note is re-indexed', async () => {
+    const tx = {
+      voiceNoteSearchDoc: { upsert: jest.fn().mockResolvedValue({ docId: 7, voiceNoteId: 'note-1' }) },
+      $executeRaw: jest.fn().mockResolvedValue(1)
+    };
+    const index = new VoiceNoteSearchIndex({} as any);
+
+    await index.index(tx as any, 'note-1', { title: 'Standup', description: '', transcription: 'hello', summary: '' });
+
+    expect(tx.$executeRaw).toHaveBeenCalledTimes(2);
+    const [deleteSql, insertSql] = tx.$executeRaw.mock.calls.map((call: any[]) => call[0].join('?'));
+    expect(deleteSql).toContain('DELETE FROM "VoiceNoteSearch" WHERE rowid = ?');
+    expect(insertSql).toContain('INSERT INTO "VoiceNoteSearch"');
+    expect(tx.$executeRaw.mock.calls[1].slice(1)).toEqual([7, 'Standup', '', 'hello', '']);
+  });
+});
@@ -0,0 +1,122 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+
+// Column weights for bm25(), in table order: title, description, transcription, summary
+const BM25_WEIGHTS = Prisma.sql`10.0, 5.0, 1.0, 2.0`;
+const MAX_QUERY_TERMS = 16;
+const SNIPPET_TOKENS = 12;
+
+export interface SearchDocument {
+  title: string;
+  description: string;
+  transcription: string;
+  summary: string;
+}
+
+export interface SearchScope {
+  userId?: string;
+  sessionId?: string;
+  status?: string;
+  language?: string;
+}
+
+export interface SearchHit {
+  voiceNoteId: string;
+  rank: number;
+  snippet: string;
+}
+
+type SqlClient = PrismaClient | Prisma.TransactionClient;
+
+/**
+ * SQLite FTS5 index over voice note titles, descriptions, transcriptions and
+ * summaries (the VoiceNoteSearch virtual table). Each note owns one row whose
+ * rowid comes from VoiceNoteSearchDoc, so updates and deletes are keyed
+ * lookups instead of scans of the virtual table.
+ */
+export class VoiceNoteSearchIndex {
+  constructor(private prisma: PrismaClient) {}
+
+  /**
+   * Turns free text into an FTS5 query: every word becomes a quoted prefix
+   * term and all terms must match. Returns null when nothing searchable is left.
+   */
+  static toMatchQuery(text: string): string | null {
+    const terms = (text.match(/[\p{L}\p{N}]+/gu) || []).slice(0, MAX_QUERY_TERMS);
+    if (terms.length === 0) {
+      return null;
+    }
+    return terms.map(term => `"${term}"*`).join(' ');
+  }
+
+  // Runs inside the caller's transaction so the index never lags the note
+  async index(tx: Prisma.TransactionClient, voiceNoteId: string, document: SearchDocument): Promise<void> {
+    const doc = await tx.voiceNoteSearchDoc.upsert({
+      where: { voiceNoteId },
+      create: { voiceNoteId },
+      update: {}
+    });
+
+    await tx.$executeRaw`DELETE FROM "VoiceNoteSearch" WHERE rowid = ${doc.docId}`;
+    await tx.$executeRaw`
+      INSERT INTO "VoiceNoteSearch" (rowid, title, description, transcription, summary)
+      VALUES (${doc.docId}, ${document.title}, ${document.description}, ${document.transcription}, ${document.summary})
+    `;
+  }
+
+  async remove(client: SqlClient, voiceNoteId: string): Promise<void> {
+    const doc = await client.voiceNoteSearchDoc.findUnique({ where: { voiceNoteId } });
+    if (!doc) {
+      return;
+    }
+
+    await client.$executeRaw`DELETE FROM "VoiceNoteSearch" WHERE rowid = ${doc.docId}`;
+    await client.voiceNoteSearchDoc.delete({ where: { docId: doc.docId } });
+  }
+
+  /**
+   * Best matches first (bm25, title hits weigh most). Rows are joined back to
+   * VoiceNote for ownership and filters, so rows orphaned by cascading deletes
+   * never surface.
+   */
+  async search(
+    text: string,
+    scope: SearchScope,
+    limit: number,
+    offset: number
+  ): Promise<{ hits: SearchHit[]; total: number }> {
+    const match = VoiceNoteSearchIndex.toMatchQuery(text);
+    if (!match) {
+      return { hits: [], total: 0 };
+    }
+
+    const conditions = [Prisma.sql`"VoiceNoteSearch" MATCH ${match}`];
+    if (scope.userId) conditions.push(Prisma.sql`v."userId" = ${scope.userId}`);
+    if (scope.sessionId) conditions.push(Prisma.sql`v."sessionId" = ${scope.sessionId}`);
+    if (scope.status) conditions.push(Prisma.sql`v."status" = ${scope.status}`);
+    if (scope.language) conditions.push(Prisma.sql`v."language" = ${scope.language}`);
+
+    const from = Prisma.sql`
+      FROM "VoiceNoteSearch"
+      JOIN "VoiceNoteSearchDoc" d ON d."docId" = "VoiceNoteSearch".rowid
+      JOIN "VoiceNote" v ON v."id" = d."voiceNoteId"
+      WHERE ${Prisma.join(conditions, ' AND ')}
+    `;
+
+    const [hits, counts] = await Promise.all([
+      this.prisma.$queryRaw<SearchHit[]>`
+        SELECT d."voiceNoteId" AS "voiceNoteId",
+               bm25("VoiceNoteSearch", ${BM25_WEIGHTS}) AS "rank",
+               snippet("VoiceNoteSearch", -1, '**', '**', '…', ${SNIPPET_TOKENS}) AS "snippet"
+        ${from}
+        ORDER BY "rank"
+        LIMIT ${limit} OFFSET ${offset}
+      `,
+      this.prisma.$queryRaw<Array<{ total: bigint | number }>>`SELECT COUNT(*) AS "total" ${from}`
+    ]);
+
+    return {
+      hits: hits.map(hit => ({ ...hit, rank: Number(hit.rank) })),
+      total: Number(counts[0]?.total ?? 0)
+    };
+  }
+}
@@ -0,0 +1,55 @@
+import { MemoryRateLimitStore } from './MemoryRateLimitStore';
+
+const WINDOW = 60000;
+const T0 = 1_800_000_000_000 - (1_800_000_000_000 % WINDOW);
+
+describe('MemoryRateLimitStore', () => {
+  it('allows up to the limit within one window', async () => {
+    const store = new MemoryRateLimitStore();
+    const results = [];
+    for (let i = 0; i < 4; i++) {
+      results.push(await store.hit('session:a', 3, WINDOW, T0 + i));
+    }
+
+    expect(results.map(r => r.allowed)).toEqual([true, true, true, false]);
+    expect(results[2].remaining).toBe(0);
+    expect(results[3].retryAfterMs).toBe(WINDOW - 3);
+  });
+
+  it('weights the previous window instead of resetting at the boundary', async () => {
+    const store = new MemoryRateLimitStore();
+    for (let i = 0; i < 10; i++) {
+      await store.hit('user:1', 10, WINDOW, T0 + 1000);
+    }
+
+    // A quarter into the next window, 75% of the previous 10 hits still count
+    const early = await store.hit('user:1', 10, WINDOW, T0 + WINDOW + WINDOW / 4);
+    expect(early.remaining).toBe(1);
+    await store.hit('user:1', 10, WINDOW, T0 + WINDOW + WINDOW / 4);
+    expect((await store.hit('user:1', 10, WINDOW, T0 + WINDOW + WINDOW / 4)).allowed).toBe(false);
+
+    // Two windows later the old counts are gone
+    expect((await store.hit('user:1', 10, WINDOW, T0 + 3 * WINDOW)).remaining).toBe(9);
+  });
+
+  it('evicts the least recently seen keys beyond maxKeys', async () => {
+    const store = new MemoryRateLimitStore(2);
+    await store.hit('a', 1, WINDOW, T0);
+    await store.hit('b', 1, WINDOW, T0);
+    await store.hit('a', 1, WINDOW, T0);
+    await store.hit('c', 1, WINDOW, T0);
+
+    expect(store.size()).toBe(2);
+    // 'a' was refreshed, so 'b' went and starts over
+    expect((await store.hit('a', 1, WINDOW, T0)).allowed).toBe(false);
+    expect((await store.hit('b', 1, WINDOW, T0)).allowed).toBe(true);
+  });
+
+  it('drops expired keys as new ones arrive', async () => {
+    const store = new MemoryRateLimitStore();
+    await store.hit('old', 5, WINDOW, T0);
+    await store.hit('new', 5, WINDOW, T0 + 2 * WINDOW);
+
+    expect(store.size()).toBe(1);
+  });
+});
@@ -0,0 +1,53 @@
+import { RateLimitDecision, RateLimitStore, slidingWindowDecision, windowStartFor } from './RateLimitStore';
+
+interface Bucket {
+  windowStart: number;
+  count: number;
+  previousCount: number;
+  expiresAt: number;
+}
+
+/**
+ * In-process store for single-instance deployments. The Map doubles as an
+ * LRU list (a hit re-inserts its key at the end), so eviction only ever looks
+ * at the front: expired buckets (no hit for two windows) and, past maxKeys,
+ * the least recently seen ones. Memory stays bounded however many anonymous
+ * session ids show up.
+ */
+export class MemoryRateLimitStore implements RateLimitStore {
+  private buckets = new Map<string, Bucket>();
+
+  constructor(private readonly maxKeys: number = 100000) {}
+
+  async hit(key: string, limit: number, windowMs: number, now: number = Date.now()): Promise<RateLimitDecision> {
+    const windowStart = windowStartFor(now, windowMs);
+    const existing = this.buckets.get(key);
+    if (existing) {
+      this.buckets.delete(key);
+    }
+
+    const bucket: Bucket = !existing || existing.windowStart < windowStart - windowMs
+      ? { windowStart, count: 1, previousCount: 0, expiresAt: windowStart + 2 * windowMs }
+      : existing.windowStart < windowStart
+        ? { windowStart, count: 1, previousCount: existing.count, expiresAt: windowStart + 2 * windowMs }
+        : { ...existing, count: existing.count + 1 };
+
+    this.buckets.set(key, bucket);
+    this.evict(now);
+
+    return slidingWindowDecision(bucket.count, bucket.previousCount, windowStart, limit, windowMs, now);
+  }
+
+  size(): number {
+    return this.buckets.size;
+  }
+
+  private evict(now: number): void {
+    for (const [key, bucket] of this.buckets) {
+      if (this.buckets.size <= this.maxKeys && bucket.expiresAt > now) {
+        break;
+      }
+      this.buckets.delete(key);
+    }
+  }
+}
@@ -0,0 +1,44 @@
+export interface RateLimitDecision {
+  allowed: boolean;
+  limit: number;
+  remaining: number;
+  resetAt: number;       // ms epoch when the current window ends
+  retryAfterMs: number;  // 0 when allowed
+}
+
+/**
+ * Counts hits per key and decides whether the caller is over its limit.
+ * Implementations use a sliding window counter: the current fixed window's
+ * count plus the previous window's count weighted by how much of it still
+ * overlaps the last `windowMs`. Two integers per key, no per-request log.
+ */
+export interface RateLimitStore {
+  hit(key: string, limit: number, windowMs: number, now?: number): Promise<RateLimitDecision>;
+  close?(): Promise<void>;
+}
+
+export function windowStartFor(now: number, windowMs: number): number {
+  return now - (now % windowMs);
+}
+
+export function slidingWindowDecision(
+  count: number,
+  previousCount: number,
+  windowStart: number,
+  limit: number,
+  windowMs: number,
+  now: number
+): RateLimitDecision {
+  const previousWeight = Math.max(0, windowMs - (now - windowStart)) / windowMs;
+  const estimate = previousCount * previousWeight + count;
+  const allowed = estimate <= limit;
+  const resetAt = windowStart + windowMs;
+
+  return {
+    allowed,
+    limit,
+    remaining: Math.max(0, Math.floor(limit - estimate)),
+    resetAt,
+    retryAfterMs: allowed ? 0 : Math.max(1, resetAt - now)
+  };
+}
@@ -0,0 +1,35 @@
+import { SqliteRateLimitStore } from './SqliteRateLimitStore';
+
+describe('SqliteRateLimitStore', () => {
+  let prisma: any;
+  let store: SqliteRateLimitStore;
+
+  beforeEach(() => {
+    prisma = { $queryRaw: jest.fn(), $executeRaw: jest.fn().mockResolvedValue(0) };
+    store = new SqliteRateLimitStore(prisma);
+  });
+
+  afterEach(async () => {
+    await store.close();
+  });
+
+  it('decides from the counters returned by the upsert', async () => {
+    const now = 1_800_000_030_000;
+    prisma.$queryRaw.mockResolvedValue([{ count: 3, previousCount: BigInt(10) }]);
+
+    const decision = await store.hit('user:1', 10, 60000, now);
+
+    const [, key, windowStart, expiresAt, windowMs] = prisma.$queryRaw.mock.calls[0];
+    expect([key, windowStart, expiresAt, windowMs]).toEqual(['user:1', 1_800_000_000_000, 1_800_000_120_000, 60000]);
+    // 10 * 0.5 of the previous window + 3 in this one
+    expect(decision).toMatchObject({ allowed: true, remaining: 2, resetAt: 1_800_000_060_000 });
+  });
+
+  it('rejects once the weighted count passes the limit', async () => {
+    prisma.$queryRaw.mockResolvedValue([{ count: 11, previousCount: 0 }]);
+
+    const decision = await store.hit('user:1', 10, 60000, 1_800_000_045_000);
+
+    expect(decision).toMatchObject({ allowed: false, remaining: 0, retryAfterMs: 15000 });
+  });
+});
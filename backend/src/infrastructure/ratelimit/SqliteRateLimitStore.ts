@@ -0,0 +1,52 @@
+import { PrismaClient } from '@prisma/client';
+import { RateLimitDecision, RateLimitStore, slidingWindowDecision, windowStartFor } from './RateLimitStore';
+
+const CLEANUP_INTERVAL_MS = 5 * 60 * 1000;
+
+/**
+ * Shared store for multi-process deployments: every backend process on the
+ * same database sees the same counters. Each hit is one upsert that rolls
+ * the window and returns the counts (INSERT .. ON CONFLICT .. RETURNING), so
+ * there is no read-modify-write race between processes. Expired rows are
+ * swept periodically.
+ */
+export class SqliteRateLimitStore implements RateLimitStore {
+  private cleanupTimer?: NodeJS.Timeout;
+
+  constructor(private readonly prisma: PrismaClient) {
+    this.cleanupTimer = setInterval(() => {
+      this.prisma.$executeRaw`DELETE FROM "RateLimitBucket" WHERE "expiresAt" < ${Date.now()}`
+        .catch(error => console.warn('[SqliteRateLimitStore] Cleanup failed:', error));
+    }, CLEANUP_INTERVAL_MS);
+    this.cleanupTimer.unref();
+  }
+
+  async hit(key: string, limit: number, windowMs: number, now: number = Date.now()): Promise<RateLimitDecision> {
+    const windowStart = windowStartFor(now, windowMs);
+    const expiresAt = windowStart + 2 * windowMs;
+
+    const rows = await this.prisma.$queryRaw<Array<{ count: number | bigint; previousCount: number | bigint }>>`
+      INSERT INTO "RateLimitBucket" ("key", "windowStart", "count", "previousCount", "expiresAt")
+      VALUES (${key}, ${windowStart}, 1, 0, ${expiresAt})
+      ON CONFLICT ("key") DO UPDATE SET
+        "previousCount" = CASE
+          WHEN "windowStart" = excluded."windowStart" THEN "previousCount"
+          WHEN "windowStart" = excluded."windowStart" - ${windowMs} THEN "count"
+          ELSE 0 END,
+        "count" = CASE WHEN "windowStart" = excluded."windowStart" THEN "count" + 1 ELSE 1 END,
+        "windowStart" = excluded."windowStart",
+        "expiresAt" = excluded."expiresAt"
+      RETURNING "count", "previousCount"
+    `;
+
+    const { count, previousCount } = rows[0];
+    return slidingWindowDecision(Number(count), Number(previousCount), windowStart, limit, windowMs, now);
+  }
+
+  async close(): Promise<void> {
+    if (this.cleanupTimer) {
+      clearInterval(this.cleanupTimer);
+      this.cleanupTimer = undefined;
+    }
+  }
+}
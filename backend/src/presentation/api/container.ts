@@ -1,3 +1,4 @@
+import cluster from 'cluster';
 import { PrismaClient } from '@prisma/client';
 import { ConfigLoader, Config } from '../../config/loader';
 import { CompositeObservabilityProvider } from '../../infrastructure/observability/CompositeObservabilityProvider';
@@ -5,14 +6,33 @@ import { LangSmithObservabilityProvider } from '../../infrastructure/observabili
 import { OpenLLMetryObservabilityProvider } from '../../infrastructure/observability/OpenLLMetryObservabilityProvider';
 import { VoiceNoteRepositoryImpl } from '../../infrastructure/persistence/VoiceNoteRepositoryImpl';
 import { UserRepositoryImpl } from '../../infrastructure/persistence/UserRepositoryImpl';
+import { AuthenticatedUserCache } from '../../infrastructure/auth/AuthenticatedUserCache';
+import { ProviderClients } from '../../infrastructure/http/ProviderClients';
 import { EventStoreImpl } from '../../infrastructure/persistence/EventStoreImpl';
+import { ProcessingJobRepositoryImpl } from '../../infrastructure/persistence/ProcessingJobRepositoryImpl';
+import { TranscriptionCacheRepositoryImpl } from '../../infrastructure/persistence/TranscriptionCacheRepositoryImpl';
+import { ProcessingBatchRepositoryImpl } from '../../infrastructure/persistence/ProcessingBatchRepositoryImpl';
+import { UsageAggregateRepositoryImpl } from '../../infrastructure/persistence/UsageAggregateRepositoryImpl';
+import { UsageService } from '../../domain/services/UsageService';
+import { RateLimitStore } from '../../infrastructure/ratelimit/RateLimitStore';
+import { MemoryRateLimitStore } from '../../infrastructure/ratelimit/MemoryRateLimitStore';
+import { SqliteRateLimitStore } from '../../infrastructure/ratelimit/SqliteRateLimitStore';
+import { ClusterEventRelay } from '../../infrastructure/cluster/ClusterEventRelay';
 import { WhisperAdapter } from '../../infrastructure/adapters/WhisperAdapter';
+import { ChunkedTranscriptionAdapter } from '../../infrastructure/adapters/ChunkedTranscriptionAdapter';
+import { AudioSegmenter } from '../../infrastructure/adapters/AudioSegmenter';
+import { AudioTranscoder } from '../../infrastructure/adapters/AudioTranscoder';
+import { TranscodingTranscriptionAdapter } from '../../infrastructure/adapters/TranscodingTranscriptionAdapter';
 import { LLMAdapter } from '../../infrastructure/adapters/LLMAdapter';
 import { LocalStorageAdapter } from '../../infrastructure/adapters/LocalStorageAdapter';
+import { StoredObjectRepositoryImpl } from '../../infrastructure/persistence/StoredObjectRepositoryImpl';
+import { StorageReaper } from '../../application/services/StorageReaper';
 import { TitleGenerationAdapter } from '../../infrastructure/adapters/TitleGenerationAdapter';
 import { AudioMetadataExtractor } from '../../infrastructure/adapters/AudioMetadataExtractor';
 import { DatabaseClient } from '../../infrastructure/database/DatabaseClient';
 import { ProcessingOrchestrator } from '../../application/services/ProcessingOrchestrator';
+import { ProcessingQueue } from '../../application/services/ProcessingQueue';
+import { TranscriptionCache } from '../../application/services/TranscriptionCache';
 import {
   UploadVoiceNoteUseCase,
   ProcessVoiceNoteUseCase,
@@ -21,7 +41,10 @@ import {
   DeleteVoiceNoteUseCase,
   ReprocessVoiceNoteUseCase,
   ExportVoiceNoteUseCase,
-  MigrateAnonymousToUserUseCase
+  ExportVoiceNotesUseCase,
+  MigrateAnonymousToUserUseCase,
+  CreateProcessingBatchUseCase,
+  GetProcessingBatchUseCase
 } from '../../application/use-cases';
 
 // Entity use cases
@@ -42,9 +65,11 @@ import { EntityRepository } from '../../infrastructure/persistence/EntityReposit
 import { ProjectRepository } from '../../infrastructure/persistence/ProjectRepository';
 import { EntityUsageRepository } from '../../infrastructure/persistence/EntityUsageRepository';
 import { EntityContextBuilder } from '../../application/services/EntityContextBuilder';
+import { EntityRelevanceRanker } from '../../application/services/EntityRelevanceRanker';
 import { IEntityRepository } from '../../domain/repositories/IEntityRepository';
 import { IProjectRepository } from '../../domain/repositories/IProjectRepository';
 import { IEntityUsageRepository } from '../../domain/repositories/IEntityUsageRepository';
+import { TranscriptionService } from '../../domain/services/TranscriptionService';
 
 export class Container {
   private static instance: Container;
@@ -60,17 +85,23 @@ export class Container {
   private projectRepository: IProjectRepository;
   private entityUsageRepository: IEntityUsageRepository;
   private entityContextBuilder: EntityContextBuilder;
-  private transcriptionService: WhisperAdapter;
+  private transcriptionService: TranscriptionService;
   private summarizationService: LLMAdapter;
   private titleGenerationService: TitleGenerationAdapter;
   private storageService: LocalStorageAdapter;
+  private storageReaper: StorageReaper;
   private audioMetadataExtractor: AudioMetadataExtractor;
   private processingOrchestrator: ProcessingOrchestrator;
+  private processingQueue: ProcessingQueue | null = null;
+  private transcriptionCache: TranscriptionCache;
+  private processingBatchRepository: ProcessingBatchRepositoryImpl;
+  private usageService: UsageService;
+  private rateLimitStore: RateLimitStore;
   
   private constructor() {
     this.config = ConfigLoader.load();
     
-    this.prisma = DatabaseClient.getInstance();
+    this.prisma = DatabaseClient.getInstance(this.config.database);
     
     // Initialize PromptLoader as singleton
     this.promptLoader = PromptLoader.getInstance();
@@ -81,26 +112,64 @@ export class Container {
     ]);
     
     this.voiceNoteRepository = new VoiceNoteRepositoryImpl(this.prisma);
+    // Connection pools, in-flight limits and circuit breakers shared by all provider adapters
+    ProviderClients.getInstance().configure(this.config.providers);
+    
+    // Shared with the UserRepositoryImpl instances the auth and payment routes create
+    AuthenticatedUserCache.getInstance().configure(this.config.auth.userCache);
     this.userRepository = new UserRepositoryImpl(this.prisma);
-    this.eventStore = new EventStoreImpl(this.prisma);
+    this.eventStore = new EventStoreImpl(this.prisma, this.config.database.eventBuffer);
+    if (ClusterEventRelay.isAvailable()) {
+      this.eventStore.attachRelay(new ClusterEventRelay());
+    }
+    this.processingBatchRepository = new ProcessingBatchRepositoryImpl(this.prisma);
+    this.usageService = new UsageService(
+      this.userRepository,
+      this.prisma,
+      new UsageAggregateRepositoryImpl(this.prisma),
+      this.eventStore
+    );
+    // Shared counters when several processes serve the same database (always in cluster mode)
+    this.rateLimitStore = this.config.rateLimit.store === 'sqlite' || cluster.isWorker
+      ? new SqliteRateLimitStore(this.prisma)
+      : new MemoryRateLimitStore(this.config.rateLimit.maxKeys);
     
     // Initialize Entity and Project repositories
     this.entityRepository = new EntityRepository(this.prisma);
     this.projectRepository = new ProjectRepository(this.prisma);
     this.entityUsageRepository = new EntityUsageRepository(this.prisma);
     
-    // Initialize EntityContextBuilder
+    // Initialize EntityContextBuilder, ranking entities by their usage
     this.entityContextBuilder = new EntityContextBuilder(
       this.entityRepository,
-      this.projectRepository
+      this.projectRepository,
+      new EntityRelevanceRanker(this.entityUsageRepository, {
+        recencyHalfLifeDays: this.config.entityContext.recencyHalfLifeDays
+      })
     );
     
     // Pass PromptLoader to adapters
-    this.transcriptionService = new WhisperAdapter(this.promptLoader);
+    this.audioMetadataExtractor = new AudioMetadataExtractor();
+    this.transcriptionService = new ChunkedTranscriptionAdapter(
+      new TranscodingTranscriptionAdapter(
+        new WhisperAdapter(this.promptLoader),
+        new AudioTranscoder(),
+        this.config
+      ),
+      new AudioSegmenter(),
+      this.audioMetadataExtractor,
+      this.config
+    );
     this.summarizationService = new LLMAdapter(this.promptLoader);
     this.titleGenerationService = new TitleGenerationAdapter(this.config, this.promptLoader);
-    this.storageService = new LocalStorageAdapter();
-    this.audioMetadataExtractor = new AudioMetadataExtractor();
+    // Content-addressed uploads; unreferenced and aged files are deleted by the reaper
+    const storedObjectRepository = new StoredObjectRepositoryImpl(this.prisma);
+    this.storageService = new LocalStorageAdapter(storedObjectRepository);
+    this.storageReaper = new StorageReaper(storedObjectRepository, this.storageService, this.config);
+    this.transcriptionCache = new TranscriptionCache(
+      new TranscriptionCacheRepositoryImpl(this.prisma),
+      this.config
+    );
     
     this.processingOrchestrator = new ProcessingOrchestrator(
       this.transcriptionService,
@@ -112,8 +181,19 @@ export class Container {
       this.entityContextBuilder,
       this.projectRepository,
       this.entityUsageRepository,
-      this.entityRepository
+      this.transcriptionCache
     );
+    
+    // Persistent job queue (processing.queueType: sqlite); inline mode processes within the request
+    if (this.config.processing.queueType === 'sqlite') {
+      this.processingQueue = new ProcessingQueue(
+        new ProcessingJobRepositoryImpl(this.prisma),
+        this.voiceNoteRepository,
+        this.processingOrchestrator,
+        this.config,
+        cluster.isWorker
+      );
+    }
   }
   
   static getInstance(): Container {
@@ -143,6 +223,38 @@ export class Container {
     return this.observability;
   }
   
+  getVoiceNoteRepository(): VoiceNoteRepositoryImpl {
+    return this.voiceNoteRepository;
+  }
+  
+  getEventStore(): EventStoreImpl {
+    return this.eventStore;
+  }
+  
+  getStorageService(): LocalStorageAdapter {
+    return this.storageService;
+  }
+  
+  getStorageReaper(): StorageReaper {
+    return this.storageReaper;
+  }
+  
+  getProcessingQueue(): ProcessingQueue | null {
+    return this.processingQueue;
+  }
+  
+  getTranscriptionCache(): TranscriptionCache {
+    return this.transcriptionCache;
+  }
+  
+  getUsageService(): UsageService {
+    return this.usageService;
+  }
+  
+  getRateLimitStore(): RateLimitStore {
+    return this.rateLimitStore;
+  }
+  
   getUserRepository(): UserRepositoryImpl {
     return this.userRepository;
   }
@@ -177,7 +289,7 @@ export class Container {
     return new ProcessVoiceNoteUseCase(
       this.voiceNoteRepository,
       this.processingOrchestrator,
-      this.eventStore
+      this.processingQueue
     );
   }
   
@@ -190,11 +302,7 @@ export class Container {
   }
   
   getDeleteVoiceNoteUseCase(): DeleteVoiceNoteUseCase {
-    return new DeleteVoiceNoteUseCase(
-      this.voiceNoteRepository,
-      this.storageService,
-      this.eventStore
-    );
+    return new DeleteVoiceNoteUseCase(this.voiceNoteRepository);
   }
   
   getReprocessVoiceNoteUseCase(): ReprocessVoiceNoteUseCase {
@@ -209,23 +317,42 @@ export class Container {
     return new ExportVoiceNoteUseCase(this.voiceNoteRepository);
   }
   
+  getExportVoiceNotesUseCase(): ExportVoiceNotesUseCase {
+    return new ExportVoiceNotesUseCase(this.voiceNoteRepository, this.projectRepository);
+  }
+  
   getMigrateAnonymousToUserUseCase(): MigrateAnonymousToUserUseCase {
     return new MigrateAnonymousToUserUseCase(
-      this.prisma
+      this.prisma,
+      this.userRepository
     );
   }
+  
+  getCreateProcessingBatchUseCase(): CreateProcessingBatchUseCase {
+    return new CreateProcessingBatchUseCase(
+      this.voiceNoteRepository,
+      this.processingBatchRepository,
+      this.processingOrchestrator,
+      this.processingQueue,
+      this.config
+    );
+  }
+  
+  getGetProcessingBatchUseCase(): GetProcessingBatchUseCase {
+    return new GetProcessingBatchUseCase(this.processingBatchRepository);
+  }
 
   // Entity use case getters
   getCreateEntityUseCase(): CreateEntityUseCase {
-    return new CreateEntityUseCase(this.entityRepository);
+    return new CreateEntityUseCase(this.entityRepository, this.entityContextBuilder);
   }
 
   getUpdateEntityUseCase(): UpdateEntityUseCase {
-    return new UpdateEntityUseCase(this.entityRepository);
+    return new UpdateEntityUseCase(this.entityRepository, this.entityContextBuilder);
   }
 
   getDeleteEntityUseCase(): DeleteEntityUseCase {
-    return new DeleteEntityUseCase(this.entityRepository);
+    return new DeleteEntityUseCase(this.entityRepository, this.entityContextBuilder);
   }
 
   getListEntitiesUseCase(): ListEntitiesUseCase {
@@ -242,7 +369,7 @@ export class Container {
   }
 
   getDeleteProjectUseCase(): DeleteProjectUseCase {
-    return new DeleteProjectUseCase(this.projectRepository);
+    return new DeleteProjectUseCase(this.projectRepository, this.entityContextBuilder);
   }
 
   getListProjectsUseCase(): ListProjectsUseCase {
@@ -250,10 +377,21 @@ export class Container {
   }
 
   getManageProjectEntitiesUseCase(): ManageProjectEntitiesUseCase {
-    return new ManageProjectEntitiesUseCase(this.projectRepository, this.entityRepository);
+    return new ManageProjectEntitiesUseCase(
+      this.projectRepository,
+      this.entityRepository,
+      this.entityContextBuilder
+    );
   }
   
   async shutdown(): Promise<void> {
+    if (this.processingQueue) {
+      await this.processingQueue.stop();
+    }
+    await this.storageReaper.stop();
+    // Buffered events must reach the database before the connection closes
+    await this.eventStore.close();
+    await this.rateLimitStore.close?.();
     await this.prisma.$disconnect();
   }
 }
\ No newline at end of file
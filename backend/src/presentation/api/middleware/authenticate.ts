@@ -1,6 +1,7 @@
 import { FastifyRequest, FastifyReply, HookHandlerDoneFunction } from 'fastify';
 import { JwtService } from '../../../infrastructure/auth/JwtService';
 import { UserRepositoryImpl } from '../../../infrastructure/persistence/UserRepositoryImpl';
+import { AuthenticatedUserCache } from '../../../infrastructure/auth/AuthenticatedUserCache';
 import { UserEntity } from '../../../domain/entities/User';
 
 declare module 'fastify' {
@@ -11,12 +12,18 @@ declare module 'fastify' {
 
 export function createAuthenticateMiddleware(
   jwtService: JwtService,
-  userRepository: UserRepositoryImpl
+  userRepository: UserRepositoryImpl,
+  cache: AuthenticatedUserCache = AuthenticatedUserCache.getInstance()
 ) {
   return async function authenticate(
     request: FastifyRequest,
     reply: FastifyReply
   ) {
+    // Already resolved by an earlier preHandler for this request
+    if (request.user) {
+      return;
+    }
+
     try {
       // Get token from cookie or Authorization header
       const token = extractToken(request);
@@ -25,10 +32,10 @@ export function createAuthenticateMiddleware(
         return reply.code(401).send({ error: 'Authentication required' });
       }
 
-      // Verify JWT
-      const payload = jwtService.verify(token);
+      // Verify JWT (once per token while it is cached)
+      const payload = cache.verifySession(token, t => jwtService.verify(t));
       
-      // Get user from database
+      // Get user, from the user cache when recently seen
       const user = await userRepository.findById(payload.userId);
       
       if (!user) {
@@ -1,6 +1,7 @@
 import { FastifyRequest, FastifyReply } from 'fastify';
 import { JwtService } from '../../../infrastructure/auth/JwtService';
 import { UserRepository } from '../../../domain/repositories/UserRepository';
+import { AuthenticatedUserCache } from '../../../infrastructure/auth/AuthenticatedUserCache';
 import { extractToken } from './authenticate';
 
 /**
@@ -10,12 +11,18 @@ import { extractToken } from './authenticate';
  */
 export function createOptionalAuthMiddleware(
   jwtService: JwtService,
-  userRepository: UserRepository
+  userRepository: UserRepository,
+  cache: AuthenticatedUserCache = AuthenticatedUserCache.getInstance()
 ) {
   return async function optionalAuth(
     request: FastifyRequest,
     reply: FastifyReply
   ) {
+    // Already resolved by an earlier preHandler for this request
+    if (request.user) {
+      return;
+    }
+
     try {
       // Get token from cookie or Authorization header
       const token = extractToken(request);
@@ -23,7 +30,7 @@ export function createOptionalAuthMiddleware(
       if (token) {
         // If token exists, try to authenticate
         try {
-          const payload = jwtService.verify(token);
+          const payload = cache.verifySession(token, t => jwtService.verify(t));
           const user = await userRepository.findById(payload.userId);
           
           if (user) {
@@ -1,8 +1,7 @@
 import { FastifyRequest, FastifyReply } from 'fastify';
 import { UserEntity } from '../../../domain/entities/User';
-
-// Store rate limit data in memory (for MVP - in production use Redis)
-const rateLimitStore = new Map<string, { count: number; resetTime: number }>();
+import { RateLimitStore } from '../../../infrastructure/ratelimit/RateLimitStore';
+import { StageMetrics } from '../../../infrastructure/observability/StageMetrics';
 
 // Rate limits by tier (requests per minute)
 const RATE_LIMITS = {
@@ -11,26 +10,29 @@ const RATE_LIMITS = {
   business: 120  // 120 requests per minute
 };
 
-export function createRateLimitMiddleware() {
+const ANONYMOUS_LIMIT = 20;
+const WINDOW_MS = 60 * 1000; // 1 minute window
+
+export function createRateLimitMiddleware(store: RateLimitStore) {
   return async function rateLimit(
     request: FastifyRequest & { user?: UserEntity },
     reply: FastifyReply
   ) {
     try {
       const user = request.user;
-      
+
       if (!user) {
         // For anonymous users, use their session ID as the rate limit identifier
         // This gives each anonymous session its own rate limit bucket
         const sessionId = request.headers['x-session-id'] as string;
         const identifier = sessionId || 'anonymous-no-session';
-        return applyRateLimit(request, reply, identifier, 20);
+        return await applyRateLimit(store, reply, `session:${identifier}`, ANONYMOUS_LIMIT);
       }
 
       const tier = user.tier as keyof typeof RATE_LIMITS;
       const limit = RATE_LIMITS[tier] || RATE_LIMITS.free;
-      
-      return applyRateLimit(request, reply, user.id!, limit);
+
+      return await applyRateLimit(store, reply, `user:${user.id!}`, limit);
     } catch (error) {
       // Don't block requests on rate limit errors
       console.error('Rate limit error:', error);
@@ -38,56 +40,33 @@ export function createRateLimitMiddleware() {
   };
 }
 
-function applyRateLimit(
-  request: FastifyRequest,
+async function applyRateLimit(
+  store: RateLimitStore,
   reply: FastifyReply,
   identifier: string,
   limit: number
-): void | Promise<void> {
-  const now = Date.now();
-  const windowMs = 60 * 1000; // 1 minute window
-  
-  // Get or create rate limit data
-  let data = rateLimitStore.get(identifier);
-  
-  if (!data || now > data.resetTime) {
-    // Create new window
-    data = {
-      count: 1,
-      resetTime: now + windowMs
-    };
-    rateLimitStore.set(identifier, data);
-  } else {
-    // Increment counter
-    data.count++;
-  }
-  
+): Promise<FastifyReply | void> {
+  const decision = await StageMetrics.getInstance().time(
+    'rate_limit_check',
+    () => store.hit(identifier, limit, WINDOW_MS)
+  );
+
   // Set rate limit headers
   reply.header('X-RateLimit-Limit', limit.toString());
-  reply.header('X-RateLimit-Remaining', Math.max(0, limit - data.count).toString());
-  reply.header('X-RateLimit-Reset', new Date(data.resetTime).toISOString());
-  
+  reply.header('X-RateLimit-Remaining', decision.remaining.toString());
+  reply.header('X-RateLimit-Reset', new Date(decision.resetAt).toISOString());
+
   // Check if limit exceeded
-  if (data.count > limit) {
-    const retryAfter = Math.ceil((data.resetTime - now) / 1000);
+  if (!decision.allowed) {
+    const retryAfter = Math.ceil(decision.retryAfterMs / 1000);
     reply.header('Retry-After', retryAfter.toString());
-    
+
     return reply.code(429).send({
       error: 'Too Many Requests',
       message: `Rate limit exceeded. Please try again in ${retryAfter} seconds.`,
       retryAfter,
       limit,
-      resetTime: new Date(data.resetTime).toISOString()
+      resetTime: new Date(decision.resetAt).toISOString()
     });
   }
 }
-
-// Cleanup old entries periodically (every 5 minutes)
-setInterval(() => {
-  const now = Date.now();
-  for (const [key, value] of rateLimitStore.entries()) {
-    if (now > value.resetTime + 60000) { // Remove entries older than 1 minute past reset
-      rateLimitStore.delete(key);
-    }
-  }
-}, 5 * 60 * 1000);
\ No newline at end of file
@@ -7,7 +7,9 @@ import { PasswordService } from '../../../infrastructure/auth/PasswordService';
 import { JwtService } from '../../../infrastructure/auth/JwtService';
 import { LoginAttemptService } from '../../../infrastructure/auth/LoginAttemptService';
 import { PrismaClient } from '@prisma/client';
-import { createAuthenticateMiddleware } from '../middleware/authenticate';
+import { AuthenticatedUserCache } from '../../../infrastructure/auth/AuthenticatedUserCache';
+import { createAuthenticateMiddleware, extractToken } from '../middleware/authenticate';
+import { Container } from '../container';
 
 const authRoutes: FastifyPluginAsync = async (fastify) => {
   const prisma = new PrismaClient();
@@ -175,7 +177,16 @@ const authRoutes: FastifyPluginAsync = async (fastify) => {
   });
 
   // Logout endpoint
-  fastify.post('/logout', async (_request, reply) => {
+  fastify.post('/logout', async (request, reply) => {
+    const token = extractToken(request);
+    if (token) {
+      // Drop the cached session and user; the next login starts from the database
+      const payload = jwtService.decode(token);
+      AuthenticatedUserCache.getInstance().invalidateSession(token);
+      if (payload?.userId) {
+        userRepository.invalidateCachedUser(payload.userId);
+      }
+    }
     reply.clearCookie('token', { path: '/' });
     return { success: true };
   });
@@ -210,6 +221,13 @@ const authRoutes: FastifyPluginAsync = async (fastify) => {
     };
   });
 
+  // Usage for the settings page, served from the maintained aggregates
+  fastify.get('/usage', {
+    preHandler: [authenticate]
+  }, async (request, _reply) => {
+    return Container.getInstance().getUsageService().getUserUsageStats(request.user!.id!);
+  });
+
   // Password reset request (simplified for MVP)
   fastify.post('/reset-password-request', {
     schema: {
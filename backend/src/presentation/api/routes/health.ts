@@ -1,5 +1,7 @@
 import { FastifyInstance } from 'fastify';
 import { Container } from '../container';
+import { StageMetrics } from '../../../infrastructure/observability/StageMetrics';
+import { ProviderClients } from '../../../infrastructure/http/ProviderClients';
 
 export async function healthRoutes(fastify: FastifyInstance): Promise<void> {
   const container = Container.getInstance();
@@ -69,6 +71,44 @@ export async function healthRoutes(fastify: FastifyInstance): Promise<void> {
     });
   });
 
+  // Processing queue depth and drain rate (used by the load harness)
+  fastify.get('/health/queue', {
+    schema: {
+      description: 'Processing job queue statistics',
+      tags: ['System']
+    }
+  }, async (request, reply) => {
+    const processingQueue = container.getProcessingQueue();
+    if (!processingQueue) {
+      return reply.send({ enabled: false });
+    }
+
+    const stats = await processingQueue.getStats();
+    return reply.send({ enabled: true, ...stats });
+  });
+
+  // Transcription cache hit rate and size
+  fastify.get('/health/cache', {
+    schema: {
+      description: 'Transcription cache statistics',
+      tags: ['System']
+    }
+  }, async (request, reply) => {
+    const stats = await container.getTranscriptionCache().getStats();
+    return reply.send(stats);
+  });
+
+  // Upload storage: deduplication and the reaper's progress
+  fastify.get('/health/storage', {
+    schema: {
+      description: 'Upload storage and reaper statistics',
+      tags: ['System']
+    }
+  }, async (request, reply) => {
+    const stats = await container.getStorageReaper().getStats();
+    return reply.send(stats);
+  });
+
   // Metrics endpoint for Prometheus
   fastify.get('/metrics', {
     schema: {
@@ -106,6 +146,14 @@ export async function healthRoutes(fastify: FastifyInstance): Promise<void> {
     metrics.push(`# TYPE nano_grazynka_memory_heap_total_bytes gauge`);
     metrics.push(`nano_grazynka_memory_heap_total_bytes ${memUsage.heapTotal}`);
     
+    metrics.push(`# HELP nano_grazynka_memory_rss_bytes Resident set size in bytes`);
+    metrics.push(`# TYPE nano_grazynka_memory_rss_bytes gauge`);
+    metrics.push(`nano_grazynka_memory_rss_bytes ${memUsage.rss}`);
+    
+    metrics.push(`# HELP nano_grazynka_memory_external_bytes Memory used by Buffers and other C++ objects`);
+    metrics.push(`# TYPE nano_grazynka_memory_external_bytes gauge`);
+    metrics.push(`nano_grazynka_memory_external_bytes ${memUsage.external}`);
+    
     // Business metrics
     try {
       const voiceNoteCount = await prisma.voiceNote.count();
@@ -137,6 +185,121 @@ export async function healthRoutes(fastify: FastifyInstance): Promise<void> {
       request.log.error('Failed to collect business metrics:', error);
     }
     
+    // Processing queue metrics
+    const processingQueue = container.getProcessingQueue();
+    if (processingQueue) {
+      try {
+        const stats = await processingQueue.getStats();
+        metrics.push(`# HELP nano_grazynka_queue_jobs Processing jobs by state`);
+        metrics.push(`# TYPE nano_grazynka_queue_jobs gauge`);
+        metrics.push(`nano_grazynka_queue_jobs{state="queued"} ${stats.queued}`);
+        metrics.push(`nano_grazynka_queue_jobs{state="running"} ${stats.running}`);
+        metrics.push(`nano_grazynka_queue_jobs{state="completed"} ${stats.completed}`);
+        metrics.push(`nano_grazynka_queue_jobs{state="failed"} ${stats.failed}`);
+        
+        metrics.push(`# HELP nano_grazynka_queue_oldest_job_age_seconds Age of the oldest queued job`);
+        metrics.push(`# TYPE nano_grazynka_queue_oldest_job_age_seconds gauge`);
+        metrics.push(`nano_grazynka_queue_oldest_job_age_seconds ${stats.oldestQueuedAgeMs / 1000}`);
+        
+        metrics.push(`# HELP nano_grazynka_queue_workers_busy Workers currently running a job`);
+        metrics.push(`# TYPE nano_grazynka_queue_workers_busy gauge`);
+        metrics.push(`nano_grazynka_queue_workers_busy ${stats.inFlight}`);
+        
+        metrics.push(`# HELP nano_grazynka_queue_retries_total Job attempts retried since start`);
+        metrics.push(`# TYPE nano_grazynka_queue_retries_total counter`);
+        metrics.push(`nano_grazynka_queue_retries_total ${stats.retriesSinceStart}`);
+        
+        metrics.push(`# HELP nano_grazynka_queue_timeouts_total Job attempts that hit jobTimeoutMinutes since start`);
+        metrics.push(`# TYPE nano_grazynka_queue_timeouts_total counter`);
+        metrics.push(`nano_grazynka_queue_timeouts_total ${stats.timeoutsSinceStart}`);
+        
+        metrics.push(`# HELP nano_grazynka_queue_drain_rate_per_minute Jobs completed in the last minute`);
+        metrics.push(`# TYPE nano_grazynka_queue_drain_rate_per_minute gauge`);
+        metrics.push(`nano_grazynka_queue_drain_rate_per_minute ${stats.drainRatePerMinute}`);
+      } catch (error) {
+        request.log.error('Failed to collect queue metrics:', error);
+      }
+    }
+    
+    // Transcription cache metrics
+    try {
+      const cacheStats = await container.getTranscriptionCache().getStats();
+      metrics.push(`# HELP nano_grazynka_transcription_cache_lookups_total Transcription cache lookups by result since start`);
+      metrics.push(`# TYPE nano_grazynka_transcription_cache_lookups_total counter`);
+      metrics.push(`nano_grazynka_transcription_cache_lookups_total{result="hit"} ${cacheStats.hits}`);
+      metrics.push(`nano_grazynka_transcription_cache_lookups_total{result="coalesced"} ${cacheStats.coalesced}`);
+      metrics.push(`nano_grazynka_transcription_cache_lookups_total{result="miss"} ${cacheStats.misses}`);
+      
+      metrics.push(`# HELP nano_grazynka_transcription_cache_entries Cached transcriptions`);
+      metrics.push(`# TYPE nano_grazynka_transcription_cache_entries gauge`);
+      metrics.push(`nano_grazynka_transcription_cache_entries ${cacheStats.entries}`);
+      
+      metrics.push(`# HELP nano_grazynka_transcription_cache_evictions_total Entries evicted since start`);
+      metrics.push(`# TYPE nano_grazynka_transcription_cache_evictions_total counter`);
+      metrics.push(`nano_grazynka_transcription_cache_evictions_total ${cacheStats.evictions}`);
+    } catch (error) {
+      request.log.error('Failed to collect transcription cache metrics:', error);
+    }
+    
+    // Upload storage metrics (reaper counters are kept by the process that runs it)
+    try {
+      const storageStats = await container.getStorageReaper().getStats();
+      metrics.push(`# HELP nano_grazynka_storage_objects Upload files on disk`);
+      metrics.push(`# TYPE nano_grazynka_storage_objects gauge`);
+      metrics.push(`nano_grazynka_storage_objects ${storageStats.objects}`);
+      
+      metrics.push(`# HELP nano_grazynka_storage_bytes Upload bytes on disk`);
+      metrics.push(`# TYPE nano_grazynka_storage_bytes gauge`);
+      metrics.push(`nano_grazynka_storage_bytes ${storageStats.bytes}`);
+      
+      metrics.push(`# HELP nano_grazynka_storage_dedup_ratio Bytes referenced by notes per byte stored`);
+      metrics.push(`# TYPE nano_grazynka_storage_dedup_ratio gauge`);
+      metrics.push(`nano_grazynka_storage_dedup_ratio ${storageStats.dedupRatio}`);
+      
+      metrics.push(`# HELP nano_grazynka_storage_unreferenced_objects Files waiting to be reclaimed`);
+      metrics.push(`# TYPE nano_grazynka_storage_unreferenced_objects gauge`);
+      metrics.push(`nano_grazynka_storage_unreferenced_objects ${storageStats.unreferenced}`);
+      
+      metrics.push(`# HELP nano_grazynka_storage_reaped_bytes_total Bytes deleted by the reaper since start`);
+      metrics.push(`# TYPE nano_grazynka_storage_reaped_bytes_total counter`);
+      metrics.push(`nano_grazynka_storage_reaped_bytes_total{reason="unreferenced"} ${storageStats.reclaimedBytes}`);
+      metrics.push(`nano_grazynka_storage_reaped_bytes_total{reason="aged"} ${storageStats.expiredBytes}`);
+    } catch (error) {
+      request.log.error('Failed to collect storage metrics:', error);
+    }
+    
+    // AI provider clients: adaptive in-flight limit, queueing and circuit state per base URL
+    const providers = ProviderClients.getInstance().stats();
+    if (providers.length > 0) {
+      metrics.push(`# HELP nano_grazynka_provider_concurrency_limit Current adaptive in-flight limit`);
+      metrics.push(`# TYPE nano_grazynka_provider_concurrency_limit gauge`);
+      providers.forEach(p => metrics.push(`nano_grazynka_provider_concurrency_limit{provider="${p.baseUrl}"} ${p.limit}`));
+      
+      metrics.push(`# HELP nano_grazynka_provider_in_flight Requests in flight`);
+      metrics.push(`# TYPE nano_grazynka_provider_in_flight gauge`);
+      providers.forEach(p => metrics.push(`nano_grazynka_provider_in_flight{provider="${p.baseUrl}"} ${p.inFlight}`));
+      
+      metrics.push(`# HELP nano_grazynka_provider_queued Requests waiting for an in-flight slot`);
+      metrics.push(`# TYPE nano_grazynka_provider_queued gauge`);
+      providers.forEach(p => metrics.push(`nano_grazynka_provider_queued{provider="${p.baseUrl}"} ${p.queued}`));
+      
+      metrics.push(`# HELP nano_grazynka_provider_circuit_open Whether requests currently fail fast (1) or not (0)`);
+      metrics.push(`# TYPE nano_grazynka_provider_circuit_open gauge`);
+      providers.forEach(p => metrics.push(`nano_grazynka_provider_circuit_open{provider="${p.baseUrl}"} ${p.circuit === 'open' ? 1 : 0}`));
+      
+      metrics.push(`# HELP nano_grazynka_provider_requests_total Provider requests by result since start`);
+      metrics.push(`# TYPE nano_grazynka_provider_requests_total counter`);
+      providers.forEach(p => {
+        metrics.push(`nano_grazynka_provider_requests_total{provider="${p.baseUrl}",result="sent"} ${p.requests}`);
+        metrics.push(`nano_grazynka_provider_requests_total{provider="${p.baseUrl}",result="throttled"} ${p.throttled}`);
+        metrics.push(`nano_grazynka_provider_requests_total{provider="${p.baseUrl}",result="failed"} ${p.failed}`);
+        metrics.push(`nano_grazynka_provider_requests_total{provider="${p.baseUrl}",result="rejected"} ${p.rejected}`);
+      });
+    }
+    
+    // Per-stage latency histograms (upload, disk, providers, DB, events, pipeline)
+    metrics.push(...StageMetrics.getInstance().render());
+    
     return reply
       .type('text/plain')
       .send(metrics.join('\n'));
@@ -7,7 +7,11 @@ import { createOptionalAuthMiddleware } from '../middleware/optionalAuth';
 import { createAnonymousUsageLimitMiddleware } from '../middleware/anonymousUsageLimit';
 import { createRateLimitMiddleware } from '../middleware/rateLimit';
 import { UserEntity } from '../../../domain/entities/User';
+import { VoiceNoteId } from '../../../domain/value-objects/VoiceNoteId';
+import { DomainEvent } from '../../../domain/events/DomainEvent';
 import { JwtService } from '../../../infrastructure/auth/JwtService';
+import { FileTooLargeError } from '../../../infrastructure/adapters/LocalStorageAdapter';
+import { StageMetrics } from '../../../infrastructure/observability/StageMetrics';
 
 declare module 'fastify' {
   interface FastifyInstance {
@@ -15,6 +19,92 @@ declare module 'fastify' {
   }
 }
 
+// Status push (SSE / long-poll) configuration
+const TERMINAL_STATUSES = ['completed', 'failed'];
+const TERMINAL_EVENT_TYPES = [
+  'VoiceNoteProcessingCompleted',
+  'VoiceNoteProcessingFailed',
+  'VoiceNoteReprocessed'
+];
+const STATUS_BY_EVENT_TYPE: Record<string, string> = {
+  VoiceNoteProcessingStarted: 'processing',
+  VoiceNoteTranscribed: 'processing',
+  VoiceNoteProcessingCompleted: 'completed',
+  VoiceNoteProcessingFailed: 'failed'
+};
+const MAX_LONG_POLL_MS = 60000;
+const SSE_HEARTBEAT_MS = 15000;
+
+// Clients that send Accept: text/event-stream get summary text while it is generated
+function wantsEventStream(request: FastifyRequest): boolean {
+  return (request.headers.accept || '').includes('text/event-stream');
+}
+
+/**
+ * Server-sent events response that only opens on the first event, so a
+ * request failing before any summary text was produced still gets a plain
+ * HTTP error status from the error handler.
+ */
+function createLazyEventStream(reply: FastifyReply) {
+  let opened = false;
+  return {
+    get opened() {
+      return opened;
+    },
+    send(eventName: string, data: Record<string, any>) {
+      if (!opened) {
+        opened = true;
+        reply.hijack();
+        reply.raw.writeHead(200, {
+          ...reply.getHeaders(),
+          'Content-Type': 'text/event-stream',
+          'Cache-Control': 'no-cache',
+          'Connection': 'keep-alive',
+          'X-Accel-Buffering': 'no'
+        });
+      }
+      if (!reply.raw.writableEnded) {
+        reply.raw.write(`event: ${eventName}\ndata: ${JSON.stringify(data)}\n\n`);
+      }
+    },
+    end() {
+      if (opened && !reply.raw.writableEnded) {
+        reply.raw.end();
+      }
+    }
+  };
+}
+
+const ALLOWED_MIME_TYPES = [
+  'audio/mp4',
+  'audio/m4a',
+  'audio/x-m4a',  // Some systems report m4a files with this MIME type
+  'audio/mpeg',
+  'audio/mp3',
+  'audio/wav',
+  'audio/x-wav',
+  'audio/webm',
+  'audio/ogg'
+];
+
+// Fix mimetype detection for files uploaded as application/octet-stream
+function detectMimeType(mimetype: string, filename: string): string {
+  if (mimetype !== 'application/octet-stream') {
+    return mimetype;
+  }
+  // Fallback to extension-based detection
+  const ext = filename.toLowerCase().split('.').pop();
+  const mimeTypeMap: Record<string, string> = {
+    'm4a': 'audio/x-m4a',
+    'mp3': 'audio/mpeg',
+    'wav': 'audio/wav',
+    'webm': 'audio/webm',
+    'ogg': 'audio/ogg',
+    'mp4': 'audio/mp4'
+  };
+  return mimeTypeMap[ext || ''] || mimetype;
+}
+
 export async function voiceNoteRoutes(fastify: FastifyInstance) {
   const container = fastify.container || Container.getInstance();
   
@@ -23,7 +113,7 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
   const authMiddleware = createAuthenticateMiddleware(jwtService, container.getUserRepository());
   const optionalAuthMiddleware = createOptionalAuthMiddleware(jwtService, container.getUserRepository());
   const anonymousUsageLimitMiddleware = createAnonymousUsageLimitMiddleware();
-  const rateLimitMiddleware = createRateLimitMiddleware();
+  const rateLimitMiddleware = createRateLimitMiddleware(container.getRateLimitStore());
 
   // Upload voice note (supports both authenticated and anonymous users)
   fastify.post('/api/voice-notes', 
@@ -31,21 +121,28 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
       preHandler: [optionalAuthMiddleware, rateLimitMiddleware] 
     }, 
     async (request: FastifyRequest & { user?: UserEntity }, reply: FastifyReply) => {
+    const storageService = container.getStorageService();
+    // A rejected upload (limits, bad type, validation) leaves its file unreferenced; the storage reaper reclaims it
+    let fileData: { path: string; size: number; sha256: string; filename: string; mimetype: string } | null = null;
+    
     try {
       const parts = request.parts();
-      let fileData: { buffer: Buffer; filename: string; mimetype: string } | null = null;
       const fields: any = {};
+      const maxBytes = (container.getConfig().transcription?.maxFileSizeMB || 25) * 1024 * 1024;
+      const parseStartedAt = Date.now();
       
       for await (const part of parts) {
         if (part.file) {
-          // MUST consume the file stream for the iterator to proceed
-          const chunks = [];
-          for await (const chunk of part.file) {
-            chunks.push(chunk);
-          }
-          const buffer = Buffer.concat(chunks);
+          // MUST consume the file stream for the iterator to proceed.
+          // Stream it straight to disk (hashing on the way) instead of buffering in memory.
+          const stored = await storageService.saveStream(
+            part.file,
+            part.filename,
+            request.user?.id,
+            { maxBytes }
+          );
           fileData = {
-            buffer,
+            ...stored,
             filename: part.filename,
             mimetype: part.mimetype
           };
@@ -54,6 +151,8 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
           fields[part.fieldname] = part.value;
         }
       }
+      // Receiving the whole multipart body, including the nested disk_write
+      StageMetrics.getInstance().observe('upload_parse', Date.now() - parseStartedAt);
       
       if (!fileData) {
         return reply.status(400).send({
@@ -126,41 +225,15 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
       }
 
       // Validate file type
-      const allowedMimeTypes = [
-        'audio/mp4',
-        'audio/m4a',
-        'audio/x-m4a',  // Some systems report m4a files with this MIME type
-        'audio/mpeg',
-        'audio/mp3',
-        'audio/wav',
-        'audio/x-wav',
-        'audio/webm',
-        'audio/ogg'
-      ];
-      
-      // Fix mimetype detection for files uploaded as application/octet-stream
-      let detectedMimeType = fileData.mimetype;
-      if (detectedMimeType === 'application/octet-stream') {
-        // Fallback to extension-based detection
-        const ext = fileData.filename.toLowerCase().split('.').pop();
-        const mimeTypeMap: Record<string, string> = {
-          'm4a': 'audio/x-m4a',
-          'mp3': 'audio/mpeg',
-          'wav': 'audio/wav',
-          'webm': 'audio/webm',
-          'ogg': 'audio/ogg',
-          'mp4': 'audio/mp4'
-        };
-        detectedMimeType = mimeTypeMap[ext || ''] || detectedMimeType;
-      }
+      const detectedMimeType = detectMimeType(fileData.mimetype, fileData.filename);
       
       console.log('[Upload] Original mimetype:', fileData.mimetype);
       console.log('[Upload] Detected mimetype:', detectedMimeType);
       
-      if (!allowedMimeTypes.includes(detectedMimeType)) {
+      if (!ALLOWED_MIME_TYPES.includes(detectedMimeType)) {
         return reply.status(400).send({
           error: 'Bad Request',
-          message: `Invalid file type. Allowed types: ${allowedMimeTypes.join(', ')}`
+          message: `Invalid file type. Allowed types: ${ALLOWED_MIME_TYPES.join(', ')}`
         });
       }
 
@@ -169,10 +242,11 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
       const useCase = container.getUploadVoiceNoteUseCase();
       const result = await useCase.execute({
         file: {
-          buffer: fileData.buffer,
+          path: fileData.path,
+          sha256: fileData.sha256,
           mimeType: detectedMimeType,  // Use the detected mimetype
           originalName: fileData.filename,
-          size: fileData.buffer.length
+          size: fileData.size
         },
         userPrompt: fields.customPrompt || fields.userPrompt,  // Support both field names for compatibility
         whisperPrompt: fields.whisperPrompt,  // For GPT-4o hints
@@ -226,6 +300,13 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
     } catch (error: any) {
       console.error('Upload error:', error);
       
+      if (error instanceof FileTooLargeError) {
+        return reply.status(413).send({
+          error: 'Payload Too Large',
+          message: error.message
+        });
+      }
+      
       // Return 400 for validation errors
       if (error.message?.includes('validation') || 
           error.message?.includes('invalid') || 
@@ -243,6 +324,132 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
     }
   });
 
+  // Batch upload + process: many files (multipart) or existing IDs (JSON) in one
+  // request, scheduled through the processing pipeline under one batch handle
+  fastify.post('/api/voice-notes/batches',
+    { preHandler: [authMiddleware, rateLimitMiddleware] },
+    async (request: FastifyRequest & { user?: UserEntity }, reply: FastifyReply) => {
+    const user = request.user!;
+    const config = container.getConfig();
+    const storageService = container.getStorageService();
+    const uploaded: Array<{ voiceNoteId: string; filename: string }> = [];
+    const rejected: Array<{ filename: string; reason: string }> = [];
+    let voiceNoteIds: string[] = [];
+    let fields: any = {};
+
+    if (request.isMultipart()) {
+      const maxBytes = (config.transcription?.maxFileSizeMB || 25) * 1024 * 1024;
+      const stored: Array<{ path: string; size: number; sha256: string; filename: string; mimetype: string }> = [];
+
+      // Files stored before a failure stay unreferenced and are reclaimed by the storage reaper
+      const parseStartedAt = Date.now();
+      for await (const part of request.parts({ limits: { files: config.processing.batchMaxItems } })) {
+        if (part.type === 'file') {
+          try {
+            const file = await storageService.saveStream(part.file, part.filename, user.id, { maxBytes });
+            stored.push({ ...file, filename: part.filename, mimetype: part.mimetype });
+          } catch (error: any) {
+            if (!(error instanceof FileTooLargeError)) {
+              throw error;
+            }
+            rejected.push({ filename: part.filename, reason: error.message });
+          }
+        } else {
+          fields[part.fieldname] = part.value;
+        }
+      }
+      StageMetrics.getInstance().observe('upload_parse', Date.now() - parseStartedAt);
+
+      // Fields can arrive after the files, so notes are created once the whole body is in
+      const uploadUseCase = container.getUploadVoiceNoteUseCase();
+      for (const file of stored) {
+        const mimeType = detectMimeType(file.mimetype, file.filename);
+        const result = ALLOWED_MIME_TYPES.includes(mimeType)
+          ? await uploadUseCase.execute({
+              file: {
+                path: file.path,
+                sha256: file.sha256,
+                mimeType,
+                originalName: file.filename,
+                size: file.size
+              },
+              userPrompt: fields.customPrompt || fields.userPrompt,
+              whisperPrompt: fields.whisperPrompt,
+              transcriptionModel: fields.transcriptionModel,
+              geminiSystemPrompt: fields.geminiSystemPrompt,
+              geminiUserPrompt: fields.geminiUserPrompt,
+              projectId: fields.projectId,
+              tags: fields.tags ? fields.tags.split(',') : undefined,
+              userId: user.id,
+              language: fields.language === 'AUTO' ? undefined : fields.language as 'EN' | 'PL' | undefined
+            })
+          : { success: false as const, error: new Error(`Invalid file type: ${mimeType}`) };
+
+        if (result.success) {
+          uploaded.push({ voiceNoteId: result.data.voiceNoteId, filename: file.filename });
+        } else {
+          rejected.push({ filename: file.filename, reason: result.error.message });
+        }
+      }
+
+      if (uploaded.length > 0) {
+        await container.getUserRepository().incrementCredits(user.id!, uploaded.length);
+      }
+      voiceNoteIds = uploaded.map(item => item.voiceNoteId);
+    } else {
+      fields = request.body || {};
+      voiceNoteIds = Array.isArray(fields.voiceNoteIds) ? fields.voiceNoteIds.map(String) : [];
+    }
+
+    if (voiceNoteIds.length === 0) {
+      return reply.status(400).send({
+        error: 'Bad Request',
+        message: request.isMultipart() ? 'No valid files uploaded' : 'voiceNoteIds must be a non-empty array',
+        rejected
+      });
+    }
+
+    const result = await container.getCreateProcessingBatchUseCase().execute({
+      userId: user.id!,
+      voiceNoteIds,
+      language: fields.language === 'AUTO' ? undefined : fields.language,
+      projectId: fields.projectId
+    });
+
+    if (!result.success) {
+      throw result.error;
+    }
+
+    return reply.status(202).send({
+      batch: {
+        id: result.data.batchId,
+        total: result.data.total,
+        scheduled: result.data.scheduled
+      },
+      uploaded,
+      rejected,
+      skipped: result.data.skipped,
+      statusUrl: `/api/voice-notes/batches/${result.data.batchId}`
+    });
+  });
+
+  // Aggregate batch progress; ?includeItems=true adds per-note status in submission order
+  fastify.get('/api/voice-notes/batches/:id',
+    { preHandler: [authMiddleware] },
+    async (request: any, reply: any) => {
+    const result = await container.getGetProcessingBatchUseCase().execute({
+      batchId: request.params.id,
+      userId: request.user.id,
+      includeItems: request.query?.includeItems === 'true'
+    });
+
+    if (!result.success) {
+      throw result.error;
+    }
+
+    return reply.send(result.data);
+  });
+
   // Process voice note (supports both authenticated and anonymous users)
   fastify.post('/api/voice-notes/:id/process', 
     { preHandler: [optionalAuthMiddleware, rateLimitMiddleware] },
@@ -270,6 +477,15 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
       throw voiceNoteResult.error;
     }
 
+    // Queued: processing continues in the worker pool, follow it via /status or /events
+    if (result.data?.jobId) {
+      return reply.status(202).send({
+        voiceNote: voiceNoteResult.data,
+        jobId: result.data.jobId,
+        message: 'Voice note queued for processing'
+      });
+    }
+
     return reply.send({
       voiceNote: voiceNoteResult.data,
       transcription: voiceNoteResult.data?.transcription,
@@ -282,6 +498,7 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
   fastify.post('/api/voice-notes/:id/regenerate-summary',
     { preHandler: [optionalAuthMiddleware, rateLimitMiddleware] },
     async (request: FastifyRequest & { user?: UserEntity }, reply: FastifyReply) => {
+      const stream = wantsEventStream(request) ? createLazyEventStream(reply) : null;
       try {
         const params = request.params as { id: string };
         const body = request.body as { whisperPrompt?: string; userPrompt?: string };
@@ -337,7 +554,8 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
         const reprocessUseCase = container.getReprocessVoiceNoteUseCase();
         const reprocessResult = await reprocessUseCase.execute({
           voiceNoteId: params.id,
-          userPrompt: body.userPrompt  // Pass the custom prompt if provided
+          userPrompt: body.userPrompt,  // Pass the custom prompt if provided
+          onSummaryDelta: stream ? text => stream.send('summary.delta', { text }) : undefined
         });
 
         if (!reprocessResult.success) {
@@ -357,12 +575,23 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
           throw updatedResult.error;
         }
 
-        return reply.status(200).send({
+        const payload = {
           voiceNote: updatedResult.data,
           message: 'Summary regenerated successfully'
-        });
+        };
+        if (stream) {
+          stream.send('completed', payload);
+          stream.end();
+          return;
+        }
+        return reply.status(200).send(payload);
       } catch (error: any) {
         console.error('Regenerate summary error:', error);
+        if (stream?.opened) {
+          stream.send('failed', { message: error.message || 'Failed to regenerate summary' });
+          stream.end();
+          return;
+        }
         return reply.status(500).send({
           error: 'Internal Server Error',
           message: error.message || 'Failed to regenerate summary'
@@ -389,6 +618,139 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
     return reply.send(result.data);
   });
 
+  // Stream status changes as server-sent events (replaces client-side polling)
+  // Closes after a terminal event; pass ?follow=true to wait even if already completed
+  fastify.get('/api/voice-notes/:id/events',
+    { preHandler: [optionalAuthMiddleware] },
+    async (request: any, reply: any) => {
+    const voiceNoteId: string = request.params.id;
+    const eventStore = container.getEventStore();
+    const voiceNoteRepository = container.getVoiceNoteRepository();
+
+    // Subscribe before reading the current status so no event slips in between
+    const buffered: DomainEvent[] = [];
+    let forward: ((event: DomainEvent) => void) | null = null;
+    const unsubscribe = eventStore.subscribe(voiceNoteId, (event) => {
+      if (forward) {
+        forward(event);
+      } else {
+        buffered.push(event);
+      }
+    });
+
+    const current = await voiceNoteRepository.findStatus(VoiceNoteId.fromString(voiceNoteId));
+    if (!current) {
+      unsubscribe();
+      return reply.status(404).send({
+        error: 'Not Found',
+        message: 'Voice note not found'
+      });
+    }
+
+    reply.hijack();
+    reply.raw.writeHead(200, {
+      ...reply.getHeaders(),
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      'Connection': 'keep-alive',
+      'X-Accel-Buffering': 'no'
+    });
+
+    const write = (eventName: string, data: Record<string, any>) => {
+      if (!reply.raw.writableEnded) {
+        reply.raw.write(`event: ${eventName}\ndata: ${JSON.stringify(data)}\n\n`);
+      }
+    };
+    const heartbeat = setInterval(() => {
+      if (!reply.raw.writableEnded) {
+        reply.raw.write(': keep-alive\n\n');
+      }
+    }, SSE_HEARTBEAT_MS);
+    const close = () => {
+      clearInterval(heartbeat);
+      unsubscribe();
+      if (!reply.raw.writableEnded) {
+        reply.raw.end();
+      }
+    };
+    request.raw.on('close', close);
+
+    write('status', {
+      id: voiceNoteId,
+      status: current.status,
+      errorMessage: current.errorMessage || undefined,
+      updatedAt: current.updatedAt
+    });
+
+    if (TERMINAL_STATUSES.includes(current.status) && request.query?.follow !== 'true') {
+      close();
+      return;
+    }
+
+    forward = (event: DomainEvent) => {
+      write(event.eventType, {
+        id: voiceNoteId,
+        status: STATUS_BY_EVENT_TYPE[event.eventType],
+        occurredAt: event.occurredAt,
+        payload: event.payload
+      });
+      if (TERMINAL_EVENT_TYPES.includes(event.eventType)) {
+        close();
+      }
+    };
+    buffered.splice(0).forEach(forward);
+  });
+
+  // Long-poll status: returns immediately when terminal, otherwise waits up to
+  // ?waitMs= (max 60s) for a completion/failure event before answering
+  fastify.get('/api/voice-notes/:id/status',
+    { preHandler: [optionalAuthMiddleware] },
+    async (request: any, reply: any) => {
+    const voiceNoteId: string = request.params.id;
+    const waitMs = Math.min(Math.max(parseInt(request.query?.waitMs) || 0, 0), MAX_LONG_POLL_MS);
+    const eventStore = container.getEventStore();
+    const voiceNoteRepository = container.getVoiceNoteRepository();
+    const id = VoiceNoteId.fromString(voiceNoteId);
+
+    let unsubscribe: () => void = () => {};
+    const settled = new Promise<void>((resolve) => {
+      unsubscribe = eventStore.subscribe(voiceNoteId, (event) => {
+        if (TERMINAL_EVENT_TYPES.includes(event.eventType)) {
+          resolve();
+        }
+      });
+    });
+
+    try {
+      let current = await voiceNoteRepository.findStatus(id);
+      if (!current) {
+        return reply.status(404).send({
+          error: 'Not Found',
+          message: 'Voice note not found'
+        });
+      }
+
+      if (waitMs > 0 && !TERMINAL_STATUSES.includes(current.status)) {
+        let timer: NodeJS.Timeout | undefined;
+        const timedOut = new Promise<void>((resolve) => {
+          timer = setTimeout(resolve, waitMs);
+        });
+        await Promise.race([settled, timedOut]);
+        clearTimeout(timer);
+        current = (await voiceNoteRepository.findStatus(id)) || current;
+      }
+
+      return reply.send({
+        id: voiceNoteId,
+        status: current.status,
+        errorMessage: current.errorMessage || undefined,
+        updatedAt: current.updatedAt
+      });
+    } finally {
+      unsubscribe();
+    }
+  });
+
   // List voice notes (supports both authenticated and anonymous users)
   fastify.get('/api/voice-notes', 
     { preHandler: [optionalAuthMiddleware, rateLimitMiddleware] },
@@ -437,7 +799,10 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
       },
       userId: user?.id || 'anonymous',
       sortBy: query.sortBy || 'createdAt',
-      sortOrder: query.sortOrder || 'desc'
+      sortOrder: query.sortOrder || 'desc',
+      // ?cursor= (empty for the first page) switches to keyset pagination
+      cursor: typeof query.cursor === 'string' ? query.cursor : undefined,
+      count: ['exact', 'estimate', 'none'].includes(query.count) ? query.count : undefined
     });
 
     if (!result.success) {
@@ -499,8 +864,7 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
       // Proceed with deletion
       const deleteUseCase = container.getDeleteVoiceNoteUseCase();
       const result = await deleteUseCase.execute({
-        voiceNoteId: params.id,
-        deleteAudioFile: (request.query as any)?.keepAudioFile !== 'true'
+        voiceNoteId: params.id
       });
 
       if (!result.success) {
@@ -519,24 +883,73 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
 
   // Reprocess voice note
   fastify.post('/api/voice-notes/:id/reprocess', async (request: any, reply: any) => {
+    const stream = wantsEventStream(request) ? createLazyEventStream(reply) : null;
     const useCase = container.getReprocessVoiceNoteUseCase();
     const result = await useCase.execute({
       voiceNoteId: request.params.id,
       systemPrompt: request.body?.systemPrompt,
       userPrompt: request.body?.userPrompt,
       model: request.body?.model,
-      language: request.body?.language ? Language[request.body.language] : undefined
+      language: request.body?.language ? Language[request.body.language] : undefined,
+      onSummaryDelta: stream ? (text: string) => stream.send('summary.delta', { text }) : undefined
     });
 
     if (!result.success) {
+      if (stream?.opened) {
+        stream.send('failed', { message: result.error.message });
+        stream.end();
+        return;
+      }
       throw result.error;
     }
 
-    return reply.send({
+    const payload = {
       id: result.data?.voiceNoteId,
       status: result.data?.status,
       message: 'Voice note reprocessing started'
+    };
+    if (stream) {
+      stream.send('completed', payload);
+      stream.end();
+      return;
+    }
+    return reply.send(payload);
+  });
+
+  // Bulk export of the user's notes, or one project's with ?projectId=, streamed
+  // as NDJSON (default) or ?format=zip of Markdown files
+  fastify.get('/api/voice-notes/export',
+    { preHandler: [authMiddleware] },
+    async (request: any, reply: any) => {
+    const format = request.query?.format || 'ndjson';
+    if (format !== 'ndjson' && format !== 'zip') {
+      return reply.status(400).send({
+        error: 'Bad Request',
+        message: 'format must be ndjson or zip'
+      });
+    }
+
+    const result = await container.getExportVoiceNotesUseCase().execute({
+      userId: request.user.id,
+      projectId: request.query?.projectId,
+      format,
+      includeTranscription: request.query?.includeTranscription !== 'false',
+      includeMetadata: request.query?.includeMetadata !== 'false'
     });
+
+    if (!result.success) {
+      throw result.error;
+    }
+
+    const { stream, filename, mimeType, count } = result.data;
+    stream.on('error', (error) => {
+      console.error('Bulk export error:', error);
+    });
+    return reply
+      .header('Content-Type', mimeType)
+      .header('Content-Disposition', `attachment; filename="${filename}"`)
+      .header('X-Export-Count', String(count))
+      .send(stream);
   });
 
   // Export voice note
@@ -561,22 +974,40 @@ export async function voiceNoteRoutes(fastify: FastifyInstance) {
       .send(result.data?.content);
   });
 
-  // Search voice notes
-  fastify.get('/api/voice-notes/search', async (request: any, reply: any) => {
+  // Search voice notes (full-text, ranked by relevance; same scoping as the list)
+  fastify.get('/api/voice-notes/search', 
+    { preHandler: [optionalAuthMiddleware] },
+    async (request: any, reply: any) => {
     const useCase = container.getListVoiceNotesUseCase();
     const query = request.query || {};
+    const user = request.user;
+    const sessionId = (request.headers['x-session-id'] as string) || query.sessionId;
+    const search = query.q || query.query;
+
+    if (!search || (!user && !sessionId)) {
+      return reply.send({
+        items: [],
+        pagination: {
+          page: 1,
+          limit: parseInt(query.limit) || 20,
+          total: 0,
+          totalPages: 0
+        }
+      });
+    }
     
     const result = await useCase.execute({
       page: parseInt(query.page) || 1,
       limit: parseInt(query.limit) || 20,
       filter: {
-        search: query.q || query.query,
+        search,
         status: query.status,
         language: query.language,
         tags: query.tags ? query.tags.split(',') : undefined,
-        projects: query.projects ? query.projects.split(',') : undefined
-      },
-      userId: query.userId || 'default-user',
+        projects: query.projects ? query.projects.split(',') : undefined,
+        sessionId: !user && sessionId ? sessionId : undefined
+      } as any,
+      userId: user?.id || 'anonymous',
       sortBy: query.sortBy || 'relevance',
       sortOrder: query.sortOrder || 'desc'
     });
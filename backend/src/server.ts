@@ -1,29 +1,47 @@
+import cluster from 'cluster';
 import { createApp } from './presentation/api/app';
 import { Container } from './presentation/api/container';
 import { DatabaseClient } from './infrastructure/database/DatabaseClient';
+import { ClusterSupervisor } from './infrastructure/cluster/ClusterSupervisor';
+import { ConfigLoader } from './config/loader';
 
 async function start() {
   try {
     const container = Container.getInstance();
     const config = container.getConfig();
-    const prisma = DatabaseClient.getInstance();
     
-    await prisma.$connect();
+    await DatabaseClient.initialize();
     console.log('✅ Database connected');
     
-    await prisma.$queryRawUnsafe('PRAGMA journal_mode = WAL');
-    await prisma.$queryRawUnsafe('PRAGMA synchronous = NORMAL');
+    // In cluster mode the primary ran the backfill before forking the workers
+    if (!cluster.isWorker) {
+      await backfillUsageAggregates(container);
+    }
     
     const app = await createApp();
     
     const port = config.server.port;
     const host = config.server.host;
     
+    // Cluster workers all listen on the same port; the primary hands out connections
     await app.listen({ port, host });
     
-    console.log(`🚀 Server running on http://${host}:${port}`);
+    const worker = cluster.isWorker ? ` (worker ${cluster.worker!.id}, pid ${process.pid})` : '';
+    console.log(`🚀 Server running on http://${host}:${port}${worker}`);
     console.log('📝 Configuration loaded successfully');
     
+    const processingQueue = container.getProcessingQueue();
+    if (processingQueue) {
+      await processingQueue.start();
+      console.log(`⚙️  Processing queue started (${config.processing.maxConcurrentJobs} workers)`);
+    }
+    
+    // Once-per-database work runs in the leader worker only. Upload lifecycle:
+    // reclaim unreferenced files, expire aged audio
+    if (ClusterSupervisor.isLeader()) {
+      container.getStorageReaper().start();
+    }
+    
     const observability = container.getObservability();
     const providers = observability.getProviders();
     if (providers.some(p => p.constructor.name === 'LangSmithObservabilityProvider')) {
@@ -38,18 +56,49 @@ async function start() {
   }
 }
 
-process.on('SIGTERM', async () => {
-  console.log('SIGTERM received, shutting down gracefully...');
-  const container = Container.getInstance();
-  await container.shutdown();
-  process.exit(0);
-});
+/**
+ * Backfills usage aggregates from the event log once. The rebuild replaces the
+ * rows, so it must finish before anything can upload or complete a note:
+ * increments landing while it runs would be wiped or counted twice. A failed
+ * rebuild leaves the table empty and is retried on the next start.
+ */
+async function backfillUsageAggregates(container: Container): Promise<void> {
+  try {
+    await container.getUsageService().rebuildUsageAggregatesIfEmpty();
+  } catch (error) {
+    console.error('Failed to rebuild usage aggregates:', error);
+  }
+}
 
-process.on('SIGINT', async () => {
-  console.log('SIGINT received, shutting down gracefully...');
+// The primary only touches the database for the backfill, before any worker exists
+async function startCluster(workers: number) {
   const container = Container.getInstance();
+  await DatabaseClient.initialize();
+  await backfillUsageAggregates(container);
   await container.shutdown();
-  process.exit(0);
-});
+  new ClusterSupervisor(workers).start();
+}
+
+const workers = ClusterSupervisor.resolveWorkerCount(ConfigLoader.load().server.workers);
+if (cluster.isPrimary && workers > 1) {
+  startCluster(workers).catch((err) => {
+    console.error('Failed to start cluster:', err);
+    process.exit(1);
+  });
+} else {
+  process.on('SIGTERM', async () => {
+    console.log('SIGTERM received, shutting down gracefully...');
+    const container = Container.getInstance();
+    await container.shutdown();
+    process.exit(0);
+  });
+
+  process.on('SIGINT', async () => {
+    console.log('SIGINT received, shutting down gracefully...');
+    const container = Container.getInstance();
+    await container.shutdown();
+    process.exit(0);
+  });
 
-start();
\ No newline at end of file
+  start();
+}
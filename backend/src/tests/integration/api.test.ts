@@ -2,6 +2,7 @@ import { describe, it, expect, beforeAll, afterAll, beforeEach } from '@jest/glo
 import Fastify, { FastifyInstance } from 'fastify';
 import { PrismaClient } from '@prisma/client';
 import { Container } from '../../presentation/api/container';
+import { AuthenticatedUserCache } from '../../infrastructure/auth/AuthenticatedUserCache';
 import authRoutes from '../../presentation/api/routes/auth';
 import paymentsRoutes from '../../presentation/api/routes/payments';
 import { voiceNoteRoutes } from '../../presentation/api/routes/voiceNotes';
@@ -374,6 +375,8 @@ describe('API Integration Tests', () => {
         where: { id: user!.id },
         data: { creditsUsed: 4 }
       });
+      // Changed behind the repository's back, so drop the cached copy
+      AuthenticatedUserCache.getInstance().invalidateUser(user!.id);
 
       // This upload should succeed (5th credit)
       const form1 = new FormData();
@@ -498,6 +501,7 @@ describe('API Integration Tests', () => {
           creditsResetDate: new Date(Date.now() - 31 * 24 * 60 * 60 * 1000) // 31 days ago
         }
       });
+      AuthenticatedUserCache.getInstance().invalidateUser(user!.id);
 
       // Make a request that should trigger credit reset
       const meResponse = await fastify.inject({
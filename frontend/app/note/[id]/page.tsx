@@ -33,6 +33,7 @@ export default function VoiceNoteDetailPage() {
   const [showCustomizePrompt, setShowCustomizePrompt] = useState(false);
   const [customPrompt, setCustomPrompt] = useState(SUMMARY_TEMPLATE);
   const [isGeneratingSummary, setIsGeneratingSummary] = useState(false);
+  const [streamingSummary, setStreamingSummary] = useState('');
   const [processingStatus, setProcessingStatus] = useState<string | null>(null);
   const [pollingInterval, setPollingInterval] = useState<NodeJS.Timeout | null>(null);
 
@@ -112,12 +113,14 @@ export default function VoiceNoteDetailPage() {
     if (!voiceNote) return;
     
     setIsGeneratingSummary(true);
+    setStreamingSummary('');
     setError(null);
     
     try {
       const updatedNote = await voiceNotesApi.regenerateSummary(
         voiceNote.id,
-        customPrompt !== SUMMARY_TEMPLATE ? customPrompt : undefined
+        customPrompt !== SUMMARY_TEMPLATE ? customPrompt : undefined,
+        (text) => setStreamingSummary(prev => prev + text)
       );
       
       // Directly update with the returned data
@@ -129,6 +132,7 @@ export default function VoiceNoteDetailPage() {
       setError(err instanceof Error ? err.message : 'Failed to generate summary');
     } finally {
       setIsGeneratingSummary(false);
+      setStreamingSummary('');
     }
   };
 
@@ -300,8 +304,15 @@ export default function VoiceNoteDetailPage() {
             <div className={styles.tabContent}>
         {activeTab === 'summary' ? (
           <div className={styles.summaryContent}>
-            {/* Show loading skeleton when generating */}
-            {isGeneratingSummary || (voiceNote.status === 'processing' && !latestSummary && processingStatus?.includes('summary')) ? (
+            {/* Show the summary as it streams in, or a loading skeleton until the first words arrive */}
+            {isGeneratingSummary && streamingSummary ? (
+              <ContentSection
+                title="Summary"
+                content={streamingSummary}
+                type="summary"
+                isRegenerating
+              />
+            ) : isGeneratingSummary || (voiceNote.status === 'processing' && !latestSummary && processingStatus?.includes('summary')) ? (
               <div className={styles.summaryLoading}>
                 <div className={styles.skeletonCard}>
                   <div className={styles.skeletonHeader}>
@@ -250,6 +250,89 @@ export class ApiClient {
     }
   }
 
+  // POST asking for server-sent events: onEvent gets each event as it arrives and
+  // the promise resolves with the 'completed' event's data ('failed' rejects).
+  // Errors before the stream opens come back as a normal JSON error response.
+  async postEventStream<T>(
+    path: string,
+    body: any,
+    onEvent: (event: string, data: any) => void
+  ): Promise<T> {
+    const { controller, timeoutId } = this.createAbortController();
+
+    try {
+      // Get session ID for anonymous users
+      let sessionId: string | undefined;
+      if (typeof window !== 'undefined') {
+        sessionId = localStorage.getItem('anonymousSessionId') || undefined;
+      }
+
+      const headers: Record<string, string> = {
+        'Content-Type': 'application/json',
+        'Accept': 'text/event-stream',
+      };
+
+      // Add session ID header if available
+      if (sessionId) {
+        headers['x-session-id'] = sessionId;
+      }
+
+      const response = await fetch(`${this.baseUrl}${path}`, {
+        method: 'POST',
+        headers,
+        body: body ? JSON.stringify(body) : undefined,
+        credentials: 'include', // Send cookies for authentication
+        signal: controller.signal,
+      });
+
+      if (!response.ok || !response.body || !response.headers.get('content-type')?.includes('text/event-stream')) {
+        return await this.handleResponse<T>(response);
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let eventName = 'message';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+          break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() || '';
+        for (const line of lines) {
+          if (line.startsWith('event:')) {
+            eventName = line.slice(6).trim();
+          } else if (line.startsWith('data:')) {
+            const data = JSON.parse(line.slice(5));
+            if (eventName === 'completed') {
+              return data as T;
+            }
+            if (eventName === 'failed') {
+              throw { statusCode: 500, error: 'Internal Server Error', message: data.message } as ApiError;
+            }
+            onEvent(eventName, data);
+          } else if (!line.trim()) {
+            eventName = 'message';
+          }
+        }
+      }
+      throw { statusCode: 502, error: 'Bad Gateway', message: 'The stream ended before the result arrived' } as ApiError;
+    } catch (error: any) {
+      if (error.name === 'AbortError') {
+        throw {
+          statusCode: 408,
+          error: 'Request Timeout',
+          message: 'The request took too long to complete',
+        } as ApiError;
+      }
+      throw error;
+    } finally {
+      clearTimeout(timeoutId);
+    }
+  }
+
   async postFormData<T>(path: string, formData: FormData): Promise<T> {
     const { controller, timeoutId } = this.createAbortController();
 
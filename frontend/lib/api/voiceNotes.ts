@@ -58,14 +58,21 @@ export const voiceNotesApi = {
     return apiClient.post<ProcessingResponse>(`/api/voice-notes/${id}/reprocess`, request);
   },
 
-  // Regenerate summary for a voice note
-  async regenerateSummary(id: string, summaryPrompt?: string): Promise<VoiceNote> {
-    const response = await apiClient.post<{ voiceNote: VoiceNote; message: string }>(
-      `/api/voice-notes/${id}/regenerate-summary`, 
-      {
-        userPrompt: summaryPrompt
-      }
-    );
+  // Regenerate summary for a voice note; onSummaryDelta streams the summary text as it is written
+  async regenerateSummary(
+    id: string,
+    summaryPrompt?: string,
+    onSummaryDelta?: (text: string) => void
+  ): Promise<VoiceNote> {
+    const path = `/api/voice-notes/${id}/regenerate-summary`;
+    const body = { userPrompt: summaryPrompt };
+    const response = onSummaryDelta
+      ? await apiClient.postEventStream<{ voiceNote: VoiceNote; message: string }>(path, body, (event, data) => {
+          if (event === 'summary.delta') {
+            onSummaryDelta(data.text);
+          }
+        })
+      : await apiClient.post<{ voiceNote: VoiceNote; message: string }>(path, body);
     return response.voiceNote;
   },
 
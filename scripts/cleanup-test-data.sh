@@ -6,12 +6,9 @@ echo "🧹 Cleaning up test data..."
 PROJECT_ROOT="$(cd "$(dirname "$0")/.." && pwd)"
 cd "$PROJECT_ROOT"
 
-# Clean uploads older than 7 days
-echo "  Removing uploads older than 7 days..."
-find data/uploads/ -type f -mtime +7 -delete 2>/dev/null
-
-# Alternative: Keep only last 10 files
-# cd data/uploads/ && ls -1t | tail -n +11 | xargs rm -f
+# Uploads are shared between notes with the same recording, so they are not
+# deleted here: the backend's storage reaper removes unreferenced and aged ones
+# (storage.gc and storage.maxFileAgeDays in config.yaml)
 
 # Clean old database WAL files
 echo "  Cleaning old database WAL files..."
@@ -29,7 +26,7 @@ if [ "$DEBUG_ARCHIVE_SIZE" -gt "50" ]; then
 fi
 
 # Report results
-UPLOAD_COUNT=$(ls -1 data/uploads/ 2>/dev/null | wc -l | xargs)
+UPLOAD_COUNT=$(find data/uploads/ -type f 2>/dev/null | wc -l | xargs)
 UPLOAD_SIZE=$(du -sh data/uploads/ 2>/dev/null | cut -f1)
 
 echo "✅ Cleanup complete"
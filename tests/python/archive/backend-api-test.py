@@ -137,7 +137,7 @@ def test_process_voice_note(voice_note_id):
     
     try:
         response = requests.post(f"{BASE_URL}/api/voice-notes/{voice_note_id}/process")
-        passed = response.status_code == 200
+        passed = response.status_code in (200, 202)  # 202 = queued for the worker pool
         data = response.json()
         
         print_test("POST /api/voice-notes/:id/process", passed, 
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Bulk import for nano-Grazynka: upload a folder of recordings through the batch
+API and measure notes/minute throughput.
+
+Same flow as integration-test.py (upload -> process -> wait), but files go up
+in a few multipart requests to POST /api/voice-notes/batches, which also
+schedules processing, and progress is followed through one batch handle
+instead of per-note status calls. Batches need an account (anonymous sessions
+are capped at 5 uploads), so the script registers a throwaway user unless
+--email/--password are given.
+
+Usage:
+  ./bulk-import.py ~/recordings                 # import every audio file in a folder
+  ./bulk-import.py --repeat 50                  # 50 copies of ./zabka.m4a
+  ./bulk-import.py --repeat 20 --compare        # also time the one-note-at-a-time flow
+
+Copies of one recording share a content hash, so with the transcription cache
+on every copy after the first is served from cache; use distinct files to
+measure provider-bound throughput.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+import requests
+
+from loadgen import authenticate, wait_for_completion
+
+BASE_URL = "http://localhost:3101"
+AUDIO_FILE = './zabka.m4a'
+
+AUDIO_EXTENSIONS = {
+    '.m4a': 'audio/x-m4a',
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.webm': 'audio/webm',
+    '.ogg': 'audio/ogg',
+    '.mp4': 'audio/mp4'
+}
+
+
+def collect_files(folder, repeat, audio_file):
+    """[(upload name, path, mime type)] for a folder, or `repeat` copies of one file"""
+    if folder:
+        files = []
+        for name in sorted(os.listdir(folder)):
+            mime = AUDIO_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+            if mime:
+                files.append((name, os.path.join(folder, name), mime))
+        return files
+
+    stem, ext = os.path.splitext(os.path.basename(audio_file))
+    mime = AUDIO_EXTENSIONS.get(ext.lower(), 'audio/m4a')
+    return [(f'{stem}-{i + 1:04d}{ext}', audio_file, mime) for i in range(repeat)]
+
+
+def submit_batch(session, files, language, project_id=None):
+    """Upload one chunk of files as a batch; returns the response JSON or None"""
+    handles = [open(path, 'rb') for _, path, _ in files]
+    try:
+        multipart = [('files', (name, handle, mime)) for (name, _, mime), handle in zip(files, handles)]
+        data = {'language': language}
+        if project_id:
+            data['projectId'] = project_id
+        response = session.post(f'{BASE_URL}/api/voice-notes/batches', files=multipart, data=data, timeout=600)
+    finally:
+        for handle in handles:
+            handle.close()
+
+    if response.status_code != 202:
+        print(f"❌ Batch upload failed: {response.status_code} {response.text}")
+        return None
+    return response.json()
+
+
+def wait_for_batches(session, batch_ids, timeout, poll_interval):
+    """Poll every batch until all are done; returns {batch_id: progress} or None on timeout"""
+    deadline = time.time() + timeout
+    progress = {}
+    last_line = None
+    while time.time() < deadline:
+        for batch_id in batch_ids:
+            if progress.get(batch_id, {}).get('done'):
+                continue
+            response = session.get(f'{BASE_URL}/api/voice-notes/batches/{batch_id}', timeout=30)
+            if response.status_code == 200:
+                progress[batch_id] = response.json()
+
+        totals = {key: sum(p.get(key, 0) for p in progress.values())
+                  for key in ('total', 'completed', 'failed', 'processing', 'pending')}
+        line = (f"   {totals['completed']}/{totals['total']} completed, {totals['failed']} failed, "
+                f"{totals['processing']} processing, {totals['pending']} pending")
+        if line != last_line:
+            print(line)
+            last_line = line
+
+        if len(progress) == len(batch_ids) and all(p.get('done') for p in progress.values()):
+            return progress
+        time.sleep(poll_interval)
+    return None
+
+
+def run_batch_import(files, files_per_request, language, project_id, timeout, poll_interval, email, password):
+    print(f"📦 Batch import: {len(files)} files, {files_per_request} per request\n")
+    session = requests.Session()
+    if not authenticate(BASE_URL, session, email, password, 'bulk-import'):
+        return None
+
+    start = time.time()
+    batch_ids = []
+    uploaded = 0
+    rejected = 0
+    for offset in range(0, len(files), files_per_request):
+        chunk = files[offset:offset + files_per_request]
+        result = submit_batch(session, chunk, language, project_id)
+        if not result:
+            continue
+        batch_ids.append(result['batch']['id'])
+        uploaded += len(result['uploaded'])
+        rejected += len(result['rejected'])
+        for item in result['rejected']:
+            print(f"   ⚠️ {item['filename']}: {item['reason']}")
+    upload_time = time.time() - start
+    print(f"⬆️ Uploaded {uploaded} notes in {len(batch_ids)} requests ({upload_time:.1f}s)")
+
+    if not batch_ids:
+        return None
+
+    progress = wait_for_batches(session, batch_ids, timeout, poll_interval)
+    elapsed = time.time() - start
+    if progress is None:
+        print(f"⏱️ Timeout after {timeout}s")
+        return None
+
+    completed = sum(p['completed'] for p in progress.values())
+    failed = sum(p['failed'] for p in progress.values())
+    return {
+        'notes': uploaded,
+        'rejected': rejected,
+        'completed': completed,
+        'failed': failed,
+        'requests': len(batch_ids),
+        'upload_time': upload_time,
+        'elapsed': elapsed,
+        'notes_per_minute': completed / (elapsed / 60) if elapsed > 0 else 0.0
+    }
+
+
+def run_single_import(files, language, timeout):
+    """Baseline: the integration-test.py flow, one note at a time"""
+    print(f"\n🐢 One-at-a-time import: {len(files)} files\n")
+    start = time.time()
+    completed = 0
+    failed = 0
+    requests_made = 0
+    for name, path, mime in files:
+        session_id = f'bulk-import-{uuid.uuid4().hex[:12]}'
+        headers = {'x-session-id': session_id}
+        with open(path, 'rb') as handle:
+            response = requests.post(f'{BASE_URL}/api/voice-notes', files={'file': (name, handle, mime)},
+                                     data={'language': language, 'sessionId': session_id}, headers=headers)
+        requests_made += 1
+        if response.status_code != 201:
+            failed += 1
+            continue
+        voice_note_id = response.json()['voiceNote']['id']
+        requests.post(f'{BASE_URL}/api/voice-notes/{voice_note_id}/process',
+                      json={'language': language}, headers=headers)
+        requests_made += 1
+        final = wait_for_completion(BASE_URL, voice_note_id, headers=headers, timeout=timeout)
+        requests_made += 1
+        if final and final.get('status') == 'completed':
+            completed += 1
+        else:
+            failed += 1
+        print(f"   {completed + failed}/{len(files)} done")
+
+    elapsed = time.time() - start
+    return {
+        'completed': completed,
+        'failed': failed,
+        'requests': requests_made,
+        'elapsed': elapsed,
+        'notes_per_minute': completed / (elapsed / 60) if elapsed > 0 else 0.0
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='nano-Grazynka bulk import via the batch API')
+    parser.add_argument('folder', nargs='?', help='Folder of recordings to import')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--audio', default=AUDIO_FILE, help='Recording to repeat when no folder is given')
+    parser.add_argument('--repeat', type=int, default=10, help='Copies of --audio to import when no folder is given')
+    parser.add_argument('--files-per-request', type=int, default=20)
+    parser.add_argument('--language', default='PL')
+    parser.add_argument('--project-id', default=None)
+    parser.add_argument('--email', default=None)
+    parser.add_argument('--password', default=None)
+    parser.add_argument('--timeout', type=int, default=1800, help='Seconds to wait for all notes to finish')
+    parser.add_argument('--poll-interval', type=float, default=2.0)
+    parser.add_argument('--compare', action='store_true',
+                        help='Also import the same files one note at a time and compare throughput')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    BASE_URL = args.base_url
+
+    files = collect_files(args.folder, args.repeat, args.audio)
+    if not files:
+        print("❌ No audio files found")
+        sys.exit(1)
+
+    batch_result = run_batch_import(files, args.files_per_request, args.language, args.project_id,
+                                    args.timeout, args.poll_interval, args.email, args.password)
+    single_result = run_single_import(files, args.language, args.timeout) if args.compare else None
+
+    print("\n" + "=" * 60)
+    print("BULK IMPORT SUMMARY")
+    print("=" * 60)
+    if batch_result:
+        print(f"✅ Batch API: {batch_result['completed']}/{batch_result['notes']} completed, "
+              f"{batch_result['failed']} failed, {batch_result['rejected']} rejected")
+        print(f"   {batch_result['requests']} upload requests, uploads took {batch_result['upload_time']:.1f}s")
+        print(f"   Total {batch_result['elapsed']:.1f}s -> {batch_result['notes_per_minute']:.1f} notes/minute")
+    else:
+        print("❌ Batch import failed")
+
+    if single_result:
+        print(f"\n🐢 One at a time: {single_result['completed']}/{len(files)} completed "
+              f"in {single_result['elapsed']:.1f}s ({single_result['requests']} requests)")
+        print(f"   {single_result['notes_per_minute']:.1f} notes/minute")
+        if batch_result and single_result['notes_per_minute'] > 0:
+            print(f"   Batch speedup: {batch_result['notes_per_minute'] / single_result['notes_per_minute']:.1f}x")
+
+    sys.exit(0 if batch_result and batch_result['failed'] == 0 else 1)
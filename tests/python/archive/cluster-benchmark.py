@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Cluster scaling benchmark for nano-Grazynka: start the backend with 1, 2, ...
+N worker processes (WORKERS env, see server.workers in config.yaml), drive the
+same closed-loop HTTP workload against each and report throughput and latency
+per worker count.
+
+The workload is the part a single event loop serialises: multipart uploads of
+random payloads, note reads (JSON serialisation) and full-text search. Each
+upload uses a fresh anonymous session and each iteration its own
+X-Forwarded-For address, so per-session and per-IP rate limits don't cap the
+measurement. Uploads are not processed; run against fake-provider-server.py if
+the queue should do work too.
+
+Usage:
+  npm run build                       # in backend/, the benchmark runs dist/server.js
+  ./cluster-benchmark.py --workers 1,2,4 --concurrency 32 --duration 30
+"""
+import argparse
+import io
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from loadgen import LatencyRecorder, new_session_id
+
+BACKEND_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'backend'))
+
+
+def start_backend(workers, port, server_cmd, backend_dir, startup_timeout=90):
+    env = dict(os.environ, WORKERS=str(workers), PORT=str(port), NODE_ENV='production')
+    process = subprocess.Popen(server_cmd.split(), cwd=backend_dir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://localhost:{port}'
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'backend exited with code {process.returncode}')
+        try:
+            if requests.get(f'{base_url}/health', timeout=2).status_code == 200:
+                # Workers come up one by one; give the rest a moment to listen
+                time.sleep(1 + workers * 0.5)
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    stop_backend(process)
+    raise RuntimeError('backend did not become healthy in time')
+
+
+def stop_backend(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def virtual_user(base_url, index, recorder, stop, payload_bytes, reads_per_upload):
+    http = requests.Session()
+    iteration = 0
+    while not stop.is_set():
+        # The global per-IP limit would otherwise cap every worker count at the same rate
+        iteration += 1
+        http.headers['X-Forwarded-For'] = f'10.{index % 256}.{iteration // 256 % 256}.{iteration % 256}'
+        session_id = new_session_id('cluster-bench')
+        headers = {'x-session-id': session_id}
+        response = recorder.timed(
+            'POST /api/voice-notes', http.post, f'{base_url}/api/voice-notes',
+            files={'file': ('bench.m4a', io.BytesIO(os.urandom(payload_bytes)), 'audio/m4a')},
+            data={'language': 'PL'}, headers=headers, timeout=60, ok_statuses=(201,)
+        )
+        if response is None or response.status_code != 201:
+            continue
+        voice_note_id = response.json()['voiceNote']['id']
+        for _ in range(reads_per_upload):
+            recorder.timed('GET /api/voice-notes/:id', http.get, f'{base_url}/api/voice-notes/{voice_note_id}',
+                           headers=headers, timeout=60)
+        recorder.timed('GET /api/voice-notes/search', http.get, f'{base_url}/api/voice-notes/search',
+                       params={'q': 'bench'}, headers=headers, timeout=60)
+
+
+def run_workload(base_url, concurrency, duration, payload_bytes, reads_per_upload):
+    recorder = LatencyRecorder()
+    stop = threading.Event()
+    threads = [threading.Thread(target=virtual_user,
+                                args=(base_url, i, recorder, stop, payload_bytes, reads_per_upload), daemon=True)
+               for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=60)
+    recorder.finish()
+    return recorder
+
+
+def totals(recorder):
+    summary = recorder.summary()
+    count = sum(stats['count'] for stats in summary.values())
+    errors = sum(stats['errors'] for stats in summary.values())
+    throughput = sum(stats['throughput'] for stats in summary.values())
+    uploads = summary.get('POST /api/voice-notes', {})
+    return {
+        'requests': count,
+        'errors': errors,
+        'throughput': throughput,
+        'upload_p50': uploads.get('p50', 0.0),
+        'upload_p95': uploads.get('p95', 0.0)
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='nano-Grazynka cluster scaling benchmark')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts to compare')
+    parser.add_argument('--concurrency', type=int, default=32, help='Closed-loop virtual users')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds of load per worker count')
+    parser.add_argument('--payload-bytes', type=int, default=256 * 1024, help='Size of each uploaded file')
+    parser.add_argument('--reads-per-upload', type=int, default=4)
+    parser.add_argument('--port', type=int, default=3199, help='Port the benchmarked backend listens on')
+    parser.add_argument('--server-cmd', default='node dist/server.js')
+    parser.add_argument('--backend-dir', default=BACKEND_DIR)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    worker_counts = [int(n) for n in args.workers.split(',')]
+
+    results = {}
+    for workers in worker_counts:
+        print(f"\n🧵 {workers} worker(s): {args.concurrency} users for {args.duration:.0f}s")
+        try:
+            process, base_url = start_backend(workers, args.port, args.server_cmd, args.backend_dir)
+        except RuntimeError as e:
+            print(f"❌ Could not start backend: {e}")
+            sys.exit(1)
+        try:
+            recorder = run_workload(base_url, args.concurrency, args.duration,
+                                    args.payload_bytes, args.reads_per_upload)
+        finally:
+            stop_backend(process)
+        recorder.print_report(f"{workers} worker(s)")
+        results[workers] = totals(recorder)
+
+    baseline = results[worker_counts[0]]['throughput'] or 1.0
+    print("\n" + "=" * 60)
+    print("CLUSTER SCALING SUMMARY")
+    print("=" * 60)
+    print(f"{'workers':>8}{'req/s':>10}{'speedup':>9}{'errors':>8}{'upload p50':>12}{'upload p95':>12}")
+    for workers, result in results.items():
+        print(f"{workers:>8}{result['throughput']:>10.1f}{result['throughput'] / baseline:>8.2f}x"
+              f"{result['errors']:>8}{result['upload_p50']:>10.0f}ms{result['upload_p95']:>10.0f}ms")
+
+    sys.exit(0 if all(result['errors'] == 0 for result in results.values()) else 1)
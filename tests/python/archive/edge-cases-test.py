@@ -4,11 +4,16 @@ Edge Cases Test Suite
 Tests boundary conditions and error handling
 """
 
+import argparse
+import os
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from loadgen import MemorySampler, new_session_id
+
 BASE_URL = "http://localhost:3101"
 
 def test_empty_file():
@@ -44,9 +49,9 @@ def test_large_file():
     """Test uploading a file that's too large"""
     print("Testing large file upload...")
     
-    # Create 15MB file (over 10MB limit)
+    # Create 30MB file (over the 25MB transcription.maxFileSizeMB limit)
     test_file = Path("large.m4a")
-    test_file.write_bytes(b"x" * (15 * 1024 * 1024))
+    test_file.write_bytes(b"x" * (30 * 1024 * 1024))
     
     try:
         with open(test_file, 'rb') as f:
@@ -69,6 +74,67 @@ def test_large_file():
         test_file.unlink(missing_ok=True)
         return False
 
+def test_large_file_memory(concurrency=8, size_mb=20, max_rss_growth_mb=None):
+    """
+    Memory benchmark: many concurrent near-limit uploads. Uploads are streamed
+    to disk, so backend RSS growth should stay roughly constant rather than
+    scale with concurrency x file size.
+    """
+    print(f"Testing memory during {concurrency} concurrent {size_mb}MB uploads...")
+    
+    test_file = Path("large_memory.m4a")
+    with open(test_file, 'wb') as f:
+        f.write(os.urandom(size_mb * 1024 * 1024))
+    
+    if max_rss_growth_mb is None:
+        # Buffered uploads held each file at least twice; allow well under one copy per upload
+        max_rss_growth_mb = max(64, concurrency * size_mb * 0.5)
+    
+    statuses = []
+    uploaded_ids = []
+    
+    def upload(index):
+        headers = {'x-session-id': new_session_id('edge-memory')}
+        with open(test_file, 'rb') as f:
+            files = {'file': (f'large_memory_{index}.m4a', f, 'audio/m4a')}
+            response = requests.post(f"{BASE_URL}/api/voice-notes", files=files,
+                                     data={'language': 'EN'}, headers=headers, timeout=300)
+        statuses.append(response.status_code)
+        if response.status_code == 201:
+            uploaded_ids.append((response.json()['voiceNote']['id'], headers))
+    
+    try:
+        sampler = MemorySampler(BASE_URL).start()
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(upload, range(concurrency)))
+        elapsed = time.time() - start
+        sampler.stop()
+        
+        rss_growth_mb = sampler.peak_delta('rss') / 1024 / 1024
+        heap_growth_mb = sampler.peak_delta('heap') / 1024 / 1024
+        external_growth_mb = sampler.peak_delta('external') / 1024 / 1024
+        succeeded = statuses.count(201)
+        
+        print(f"  Uploads: {succeeded}/{concurrency} succeeded in {elapsed:.1f}s "
+              f"({concurrency * size_mb / max(elapsed, 1e-9):.1f} MB/s)")
+        print(f"  Peak RSS growth:      {rss_growth_mb:.1f}MB (budget {max_rss_growth_mb:.0f}MB, "
+              f"{rss_growth_mb / concurrency:.1f}MB per upload)")
+        print(f"  Peak heap growth:     {heap_growth_mb:.1f}MB")
+        print(f"  Peak external growth: {external_growth_mb:.1f}MB")
+        
+        passed = succeeded == concurrency and rss_growth_mb <= max_rss_growth_mb
+        result = "✅ PASSED" if passed else "❌ FAILED"
+        print(f"  Streaming upload memory: {result}")
+        return passed
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        return False
+    finally:
+        for voice_note_id, headers in uploaded_ids:
+            requests.delete(f"{BASE_URL}/api/voice-notes/{voice_note_id}", headers=headers)
+        test_file.unlink(missing_ok=True)
+
 def test_special_characters():
     """Test filename with special characters"""
     print("Testing special characters in filename...")
@@ -210,6 +276,17 @@ def test_nonexistent_voice_note():
         return False
 
 def main():
+    parser = argparse.ArgumentParser(description='nano-Grazynka edge case tests')
+    parser.add_argument('--memory', action='store_true',
+                        help='Run only the concurrent large-upload memory benchmark')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--size-mb', type=int, default=20)
+    parser.add_argument('--max-rss-growth-mb', type=float, default=None)
+    args = parser.parse_args()
+    
+    if args.memory:
+        return 0 if test_large_file_memory(args.concurrency, args.size_mb, args.max_rss_growth_mb) else 1
+    
     print("=" * 50)
     print("EDGE CASES TEST SUITE")
     print("=" * 50)
@@ -226,6 +303,7 @@ def main():
     # Run tests
     results.append(test_empty_file())
     results.append(test_large_file())
+    results.append(test_large_file_memory())
     results.append(test_special_characters())
     results.append(test_invalid_language())
     results.append(test_concurrent_uploads())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Bulk export benchmark for nano-Grazynka: seed an account with N processed
+notes, then stream GET /api/voice-notes/export as NDJSON and as a zip of
+Markdown files.
+
+For each format the report shows the bytes received, notes/s and MB/s, the
+time to the first byte, and the backend's peak RSS and heap growth while the
+export ran. The export is read straight from a database cursor, so the
+memory growth should stay flat whether the account holds 1k or 10k notes;
+compare runs with different --notes to check.
+
+Each download is spooled to a temporary file and checked afterwards: the
+NDJSON line count and the zip's entry count must match X-Export-Count, and
+every zip entry must pass its CRC check.
+
+Seeding goes through the batch API, so run the backend against
+fake-provider-server.py.
+
+Usage:
+  ./fake-provider-server.py --quiet &
+  ./export-benchmark.py --notes 10000
+  ./export-benchmark.py --email me@example.com --password secret --notes 0 --project-id <id>
+"""
+import argparse
+import sys
+import tempfile
+import time
+import zipfile
+
+import requests
+
+from loadgen import MemorySampler, authenticate, seed_notes
+
+BASE_URL = "http://localhost:3101"
+CHUNK_BYTES = 64 * 1024
+
+
+def run_export(session, fmt, project_id=None):
+    params = {'format': fmt}
+    if project_id:
+        params['projectId'] = project_id
+
+    sampler = MemorySampler(BASE_URL, interval=0.1).start()
+    start = time.time()
+    first_byte = None
+    received = 0
+    spool = tempfile.TemporaryFile()
+    try:
+        with session.get(f'{BASE_URL}/api/voice-notes/export', params=params, stream=True, timeout=600) as response:
+            if response.status_code != 200:
+                print(f"❌ {fmt} export failed: {response.status_code} {response.text}")
+                spool.close()
+                return None
+            count = int(response.headers.get('X-Export-Count', 0))
+            for chunk in response.iter_content(chunk_size=CHUNK_BYTES):
+                if first_byte is None:
+                    first_byte = time.time() - start
+                received += len(chunk)
+                spool.write(chunk)
+    finally:
+        elapsed = time.time() - start
+        sampler.stop()
+
+    spool.seek(0)
+    return {
+        'format': fmt,
+        'count': count,
+        'bytes': received,
+        'elapsed': elapsed,
+        'first_byte': first_byte or elapsed,
+        'rss': sampler.peak_delta('rss'),
+        'heap': sampler.peak_delta('heap'),
+        'valid': verify(fmt, spool, count)
+    }
+
+
+def verify(fmt, spool, count):
+    try:
+        if fmt == 'ndjson':
+            lines = sum(1 for line in spool if line.strip())
+            ok = lines == count
+            if not ok:
+                print(f"  ⚠️ NDJSON has {lines} lines, expected {count}")
+            return ok
+
+        with zipfile.ZipFile(spool) as archive:
+            entries = len(archive.infolist())
+            bad = archive.testzip()
+            if bad:
+                print(f"  ⚠️ Zip entry {bad} failed its CRC check")
+            if entries != count:
+                print(f"  ⚠️ Zip has {entries} entries, expected {count}")
+            return bad is None and entries == count
+    except (zipfile.BadZipFile, ValueError) as error:
+        print(f"  ⚠️ Could not read {fmt} export: {error}")
+        return False
+    finally:
+        spool.close()
+
+
+def print_report(results):
+    print("\n📦 Export results")
+    print(f"  {'format':<8} {'notes':>7} {'size MB':>9} {'time s':>8} {'TTFB ms':>8} "
+          f"{'notes/s':>9} {'MB/s':>7} {'RSS +MB':>8} {'heap +MB':>9}  valid")
+    for result in results:
+        megabytes = result['bytes'] / 1024 / 1024
+        elapsed = max(result['elapsed'], 1e-9)
+        print(f"  {result['format']:<8} {result['count']:>7} {megabytes:>9.1f} {result['elapsed']:>8.1f} "
+              f"{result['first_byte'] * 1000:>8.0f} {result['count'] / elapsed:>9.0f} {megabytes / elapsed:>7.1f} "
+              f"{result['rss'] / 1024 / 1024:>8.1f} {result['heap'] / 1024 / 1024:>9.1f}  "
+              f"{'✅' if result['valid'] else '❌'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream bulk exports of many notes and measure throughput and memory')
+    parser.add_argument('--notes', type=int, default=10000, help='Notes to seed first (0 to export what the account has)')
+    parser.add_argument('--per-request', type=int, default=50, help='Recordings per seeding batch')
+    parser.add_argument('--email', help='Existing account to use instead of a throwaway one')
+    parser.add_argument('--password', help='Password for --email')
+    parser.add_argument('--project-id', help='Export only this project')
+    parser.add_argument('--formats', default='ndjson,zip', help='Comma-separated formats to export')
+    args = parser.parse_args()
+
+    print("🚀 Bulk export benchmark")
+    print("=" * 50)
+
+    session = requests.Session()
+    if not authenticate(BASE_URL, session, args.email, args.password, prefix='export-bench'):
+        return 1
+    if args.notes and not seed_notes(BASE_URL, session, args.notes, per_request=args.per_request):
+        return 1
+
+    results = []
+    for fmt in args.formats.split(','):
+        print(f"\n⬇️  Exporting as {fmt}")
+        result = run_export(session, fmt.strip(), args.project_id)
+        if not result:
+            return 1
+        results.append(result)
+
+    print_report(results)
+    return 0 if all(result['valid'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the AI providers used by the nano-Grazynka backend.
+
+Speaks the three wire formats the adapters call:
+  POST .../audio/transcriptions              (OpenAI / OpenRouter, WhisperAdapter)
+  POST .../models/<model>:generateContent     (Gemini direct, WhisperAdapter.transcribeWithGemini)
+  POST .../chat/completions                   (LLMAdapter, TitleGenerationAdapter)
+
+Outputs are deterministic (derived from the request body and --seed); latency,
+token throughput, failures and 429s are configurable so the processing
+pipeline can be benchmarked repeatably without network access. Chat requests
+with "stream": true are answered as server-sent chunks paced at
+--tokens-per-sec after the time-to-first-token latency.
+
+Point the backend at it with:
+  TRANSCRIPTION_API_URL=http://localhost:8089/v1
+  SUMMARIZATION_API_URL=http://localhost:8089/v1
+  OPENROUTER_API_URL=http://localhost:8089/v1
+  GEMINI_API_URL=http://localhost:8089/v1beta
+  OPENAI_API_KEY=fake OPENROUTER_API_KEY=fake GEMINI_API_KEY=fake
+
+Control endpoints:
+  GET  /__stats   request counts, request body bytes, status codes and peak in-flight per route,
+                  plus TCP connections accepted (to check keep-alive reuse)
+  POST /__reset   clear stats
+
+Latency specs: fixed:MS | uniform:LO:HI | normal:MEAN:STDDEV | lognormal:MEDIAN:SIGMA
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = [
+    'spotkanie', 'projekt', 'termin', 'klient', 'budżet', 'zadanie', 'raport',
+    'meeting', 'deadline', 'release', 'backend', 'frontend', 'review', 'plan',
+    'Microsoft', 'Żabka', 'sprint', 'demo', 'wdrożenie', 'testy', 'umowa'
+]
+
+# Roughly 4 characters per token; streamed chunks carry a few tokens each
+CHARS_PER_TOKEN = 4
+TOKENS_PER_CHUNK = 5
+
+
+def parse_latency(spec):
+    """Turn a latency spec string into a zero-arg sampler returning milliseconds"""
+    parts = spec.split(':')
+    kind = parts[0]
+    args = [float(p) for p in parts[1:]]
+    if kind == 'fixed':
+        return lambda rng: args[0]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == 'normal':
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == 'lognormal':
+        return lambda rng: rng.lognormvariate(math.log(args[0]), args[1])
+    raise ValueError(f'Unknown latency spec: {spec}')
+
+
+class ProviderStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = {}
+            self.bytes = {}
+            self.statuses = {}
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.connections = 0
+            self.started_at = time.time()
+
+    def enter(self, route, body_bytes=0):
+        with self.lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+            self.bytes[route] = self.bytes.get(route, 0) + body_bytes
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return self.in_flight
+
+    def connect(self):
+        with self.lock:
+            self.connections += 1
+
+    def leave(self, route, status):
+        with self.lock:
+            self.in_flight -= 1
+            key = f'{route} {status}'
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'uptimeSeconds': round(time.time() - self.started_at, 3),
+                'requests': dict(self.requests),
+                'bytes': dict(self.bytes),
+                'statuses': dict(self.statuses),
+                'inFlight': self.in_flight,
+                'peakInFlight': self.peak_in_flight,
+                'connections': self.connections
+            }
+
+
+class FakeProvider:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.stats = ProviderStats()
+        self.latency = {
+            'transcription': parse_latency(args.transcription_latency),
+            'gemini': parse_latency(args.gemini_latency),
+            'chat': parse_latency(args.chat_latency)
+        }
+
+    def roll(self):
+        with self.rng_lock:
+            return self.rng.random()
+
+    def sample_latency(self, route):
+        with self.rng_lock:
+            return self.latency[route](self.rng)
+
+    def content_rng(self, body):
+        digest = hashlib.sha256(body).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big') ^ self.args.seed)
+
+    def words(self, body, count):
+        rng = self.content_rng(body)
+        return ' '.join(rng.choice(WORDS) for _ in range(max(1, count)))
+
+    def audio_seconds(self, body):
+        # Compressed speech is roughly 16 KB/s at 128 kbps
+        return max(1.0, len(body) / 16000.0)
+
+    def transcription(self, body):
+        duration = self.audio_seconds(body)
+        text = self.words(body, min(int(duration * 2.5), self.args.max_words))
+        payload = {'text': text, 'duration': round(duration, 2)}
+        if b'verbose_json' in body:
+            payload['segments'] = [{'avg_logprob': -0.1, 'text': text}]
+        return payload, duration * self.args.realtime_factor * 1000
+
+    def gemini(self, body):
+        # Audio arrives base64-encoded inside the JSON body (4/3 inflation)
+        duration = max(1.0, len(body) * 3 / 4 / 16000.0)
+        text = self.words(body, min(int(duration * 2.5), self.args.max_words))
+        payload = {
+            'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'finishReason': 'STOP'}],
+            'usageMetadata': {'candidatesTokenCount': len(text) // 4}
+        }
+        return payload, duration * self.args.realtime_factor * 1000
+
+    def chat(self, body):
+        request = json.loads(body or b'{}')
+        prompt_text = json.dumps(request.get('messages', []))
+        if 'metadata extractor' in prompt_text:
+            content = {
+                'title': self.words(body, 4).title(),
+                'description': self.words(body + b'desc', 12),
+                'date': None
+            }
+        else:
+            content = {
+                'summary': self.words(body, 60),
+                'key_points': [self.words(body + bytes([i]), 8) for i in range(3)],
+                'action_items': [f'- [ ] {self.words(body + bytes([10 + i]), 6)}' for i in range(2)]
+            }
+        message = json.dumps(content, ensure_ascii=False)
+        completion_tokens = max(1, len(message) // 4)
+        generation_ms = completion_tokens / self.args.tokens_per_sec * 1000
+        payload = {
+            'id': f'chatcmpl-{hashlib.sha1(body).hexdigest()[:12]}',
+            'object': 'chat.completion',
+            'model': request.get('model', 'fake-model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': message}, 'finish_reason': 'stop'}],
+            'usage': {
+                'prompt_tokens': len(prompt_text) // 4,
+                'completion_tokens': completion_tokens,
+                'total_tokens': len(prompt_text) // 4 + completion_tokens
+            }
+        }
+        return payload, generation_ms
+
+
+def make_handler(provider):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            provider.stats.connect()
+
+        def log_message(self, fmt, *args):
+            if not provider.args.quiet:
+                super().log_message(fmt, *args)
+
+        def send_json(self, status, payload, headers=None):
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def write_chunk(self, data):
+            self.wfile.write(f'{len(data):X}\r\n'.encode() + data + b'\r\n')
+            self.wfile.flush()
+
+        def send_chat_stream(self, payload, generation_ms):
+            """OpenAI-style streamed completion: content deltas as SSE, then [DONE]"""
+            content = payload['choices'][0]['message']['content']
+            step = CHARS_PER_TOKEN * TOKENS_PER_CHUNK
+            pieces = [content[i:i + step] for i in range(0, len(content), step)] or ['']
+            delay = generation_ms / 1000.0 / len(pieces)
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for index, piece in enumerate(pieces):
+                chunk = {
+                    'id': payload['id'],
+                    'object': 'chat.completion.chunk',
+                    'model': payload['model'],
+                    'choices': [{'index': 0, 'delta': {'content': piece},
+                                 'finish_reason': 'stop' if index == len(pieces) - 1 else None}]
+                }
+                self.write_chunk(f'data: {json.dumps(chunk, ensure_ascii=False)}\n\n'.encode('utf-8'))
+                time.sleep(delay)
+            self.write_chunk(b'data: [DONE]\n\n')
+            self.write_chunk(b'')
+
+        def do_GET(self):
+            if self.path.startswith('/__stats'):
+                return self.send_json(200, provider.stats.snapshot())
+            self.send_json(404, {'error': {'message': 'not found'}})
+
+        def read_body(self):
+            # Streamed uploads may arrive with Transfer-Encoding: chunked and no length
+            if 'chunked' in (self.headers.get('Transfer-Encoding') or '').lower():
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b';')[0].strip() or b'0', 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        break
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+                return b''.join(chunks)
+            length = int(self.headers.get('Content-Length') or 0)
+            return self.rfile.read(length) if length else b''
+
+        def do_POST(self):
+            body = self.read_body()
+
+            if self.path.startswith('/__reset'):
+                provider.stats.reset()
+                return self.send_json(200, {'reset': True})
+
+            path = self.path.split('?')[0]
+            if path.endswith('/audio/transcriptions'):
+                route, build = 'transcription', provider.transcription
+            elif re.search(r'/models/[^/]+:generateContent$', path):
+                route, build = 'gemini', provider.gemini
+            elif path.endswith('/chat/completions'):
+                route, build = 'chat', provider.chat
+            else:
+                return self.send_json(404, {'error': {'message': f'unknown route {path}'}})
+
+            in_flight = provider.stats.enter(route, len(body))
+            status = 200
+            try:
+                if provider.args.max_concurrency and in_flight > provider.args.max_concurrency:
+                    status = 429
+                elif provider.roll() < provider.args.rate_limit_rate:
+                    status = 429
+                elif provider.roll() < provider.args.failure_rate:
+                    status = 503
+
+                if status == 429:
+                    return self.send_json(429, {'error': {'message': 'Rate limit exceeded (fake)', 'type': 'rate_limit'}},
+                                          {'Retry-After': str(provider.args.retry_after)})
+
+                payload, work_ms = build(body)
+                if route == 'chat' and status == 200 and json.loads(body or b'{}').get('stream'):
+                    time.sleep(provider.sample_latency(route) / 1000.0)
+                    return self.send_chat_stream(payload, work_ms)
+                time.sleep((provider.sample_latency(route) + work_ms) / 1000.0)
+
+                if status == 503:
+                    return self.send_json(503, {'error': {'message': 'The model is overloaded (fake)'}})
+                self.send_json(200, payload)
+            finally:
+                provider.stats.leave(route, status)
+
+    return Handler
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Offline fake AI provider for nano-Grazynka benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--transcription-latency', default='lognormal:800:0.3',
+                        help='Base latency for /audio/transcriptions')
+    parser.add_argument('--gemini-latency', default='lognormal:1200:0.3',
+                        help='Base latency for :generateContent')
+    parser.add_argument('--chat-latency', default='lognormal:300:0.3',
+                        help='Time to first token for /chat/completions')
+    parser.add_argument('--realtime-factor', type=float, default=0.05,
+                        help='Extra processing seconds per second of audio')
+    parser.add_argument('--tokens-per-sec', type=float, default=150.0,
+                        help='Completion token throughput for chat responses')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--max-concurrency', type=int, default=0,
+                        help='Answer 429 above this many in-flight requests (0 = unlimited)')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds on 429')
+    parser.add_argument('--max-words', type=int, default=2000)
+    parser.add_argument('--quiet', action='store_true')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(FakeProvider(args)))
+    server.daemon_threads = True
+    print(f'🧪 Fake AI provider listening on http://{args.host}:{args.port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
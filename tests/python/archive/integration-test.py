@@ -43,7 +43,7 @@ def test_full_pipeline():
         json={'language': 'PL'}
     )
     
-    if process_response.status_code != 200:
+    if process_response.status_code not in (200, 202):
         print(f"❌ Processing failed: {process_response.status_code}")
         print(process_response.text)
         return False
@@ -56,7 +56,8 @@ def test_full_pipeline():
     print("\nStep 3: Waiting for processing to complete...")
     max_attempts = 30
     for i in range(max_attempts):
-        time.sleep(2)
+        # Long-poll: returns as soon as processing finishes, otherwise after 2s
+        requests.get(f'{BASE_URL}/api/voice-notes/{voice_note_id}/status', params={'waitMs': 2000})
         
         status_response = requests.get(
             f'{BASE_URL}/api/voice-notes/{voice_note_id}?includeTranscription=true&includeSummary=true'
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Load generation helpers for the nano-Grazynka Python test scripts.
+
+Drives virtual users through a scenario at a fixed arrival rate using a
+thread pool and collects per-endpoint latency samples, so the scripts can
+report p50/p95/p99/max, throughput and error rate instead of a single mean.
+"""
+import io
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers (0 <= pct <= 100)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def new_session_id(prefix="loadgen"):
+    """Fresh anonymous session so each flow gets its own usage/rate-limit bucket"""
+    return f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+def authenticate(base_url, session, email=None, password=None, prefix="loadgen"):
+    """Log in (or register a throwaway account) and send the JWT as a bearer token"""
+    if email and password:
+        response = session.post(f'{base_url}/api/auth/login', json={'email': email, 'password': password})
+    else:
+        email = f'{prefix}-{uuid.uuid4().hex[:12]}@example.com'
+        password = f'{prefix}-password'
+        response = session.post(f'{base_url}/api/auth/register', json={'email': email, 'password': password})
+
+    if response.status_code != 200:
+        print(f"❌ Authentication failed: {response.status_code} {response.text}")
+        return False
+
+    # The token is set as an httpOnly cookie; a header also works over plain http
+    token = session.cookies.get('token')
+    if token:
+        session.headers['Authorization'] = f'Bearer {token}'
+    print(f"🔑 Authenticated as {email}")
+    return True
+
+
+def seed_notes(base_url, session, count, per_request=50, payload_bytes=4096, timeout=3600):
+    """
+    Give an authenticated session `count` processed notes via the batch API.
+    Payloads are random bytes posing as recordings, so run the backend against
+    fake-provider-server.py: every payload hashes differently and gets its own
+    deterministic transcription and title.
+    """
+    print(f"🌱 Seeding {count} notes ({per_request} per request)")
+    start = time.time()
+    batch_ids = []
+    for offset in range(0, count, per_request):
+        size = min(per_request, count - offset)
+        files = [('files', (f'seed-{offset + i + 1:06d}.m4a', io.BytesIO(os.urandom(payload_bytes)), 'audio/x-m4a'))
+                 for i in range(size)]
+        response = session.post(f'{base_url}/api/voice-notes/batches', files=files,
+                                data={'language': 'PL'}, timeout=600)
+        if response.status_code != 202:
+            print(f"❌ Seed batch failed: {response.status_code} {response.text}")
+            return False
+        batch_ids.append(response.json()['batch']['id'])
+
+    deadline = time.time() + timeout
+    pending = set(batch_ids)
+    while pending and time.time() < deadline:
+        for batch_id in list(pending):
+            response = session.get(f'{base_url}/api/voice-notes/batches/{batch_id}', timeout=30)
+            if response.status_code == 200 and response.json().get('done'):
+                pending.discard(batch_id)
+        if pending:
+            time.sleep(2)
+
+    if pending:
+        print(f"⏱️ Seeding timed out with {len(pending)} batches unfinished")
+        return False
+    print(f"   Seeded in {time.time() - start:.1f}s")
+    return True
+
+
+def wait_for_completion(base_url, voice_note_id, headers=None, timeout=120, wait_ms=25000, recorder=None):
+    """
+    Block until a voice note reaches a terminal status using the long-poll
+    status endpoint (one request per wait window instead of a 2s polling loop).
+    Returns the final status payload, or None on timeout.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        remaining_ms = int((deadline - time.time()) * 1000)
+        url = f'{base_url}/api/voice-notes/{voice_note_id}/status'
+        params = {'waitMs': max(1, min(wait_ms, remaining_ms))}
+        if recorder:
+            response = recorder.timed('GET /api/voice-notes/:id/status (long-poll)', requests.get,
+                                      url, params=params, headers=headers, timeout=timeout)
+        else:
+            response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        if response is None or response.status_code != 200:
+            return None
+        payload = response.json()
+        if payload.get('status') in TERMINAL_STATUSES:
+            return payload
+    return None
+
+
+def stream_events(base_url, voice_note_id, headers=None, timeout=120, follow=False):
+    """Yield (event, data) tuples from the SSE status stream until the server closes it"""
+    params = {'follow': 'true'} if follow else None
+    with requests.get(f'{base_url}/api/voice-notes/{voice_note_id}/events', params=params,
+                      headers=headers, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        event_name = 'message'
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith('event:'):
+                event_name = line[len('event:'):].strip()
+            elif line.startswith('data:'):
+                yield event_name, json.loads(line[len('data:'):].strip())
+                event_name = 'message'
+
+
+def parse_metrics(text):
+    """Parse Prometheus text exposition into {'name{labels}': float}"""
+    values = {}
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        name, _, value = line.rpartition(' ')
+        try:
+            values[name] = float(value)
+        except ValueError:
+            continue
+    return values
+
+
+STAGE_METRIC = 'nano_grazynka_stage_duration_seconds'
+
+
+def fetch_metrics(base_url):
+    """Scrape GET /metrics into {'name{labels}': float}"""
+    response = requests.get(f'{base_url}/metrics', timeout=10)
+    response.raise_for_status()
+    return parse_metrics(response.text)
+
+
+def _labels(key):
+    """'name{a="1",b="2"}' -> {'a': '1', 'b': '2'}"""
+    if '{' not in key:
+        return {}
+    body = key[key.index('{') + 1:key.rindex('}')]
+    labels = {}
+    for pair in body.split(','):
+        name, _, value = pair.partition('=')
+        labels[name] = value.strip('"')
+    return labels
+
+
+def stage_histograms(metrics):
+    """Group the per-stage latency histogram into {stage: {'count', 'sum', 'buckets': {le: count}}}"""
+    stages = {}
+    for key, value in metrics.items():
+        if not key.startswith(STAGE_METRIC):
+            continue
+        labels = _labels(key)
+        stage = stages.setdefault(labels.get('stage'), {'count': 0.0, 'sum': 0.0, 'buckets': {}})
+        if key.startswith(f'{STAGE_METRIC}_bucket'):
+            stage['buckets'][float(labels['le'])] = value
+        elif key.startswith(f'{STAGE_METRIC}_sum'):
+            stage['sum'] = value
+        elif key.startswith(f'{STAGE_METRIC}_count'):
+            stage['count'] = value
+    return stages
+
+
+def _bucket_quantile(buckets, count, q):
+    """Prometheus-style histogram_quantile over cumulative {le: count} buckets, in seconds"""
+    if count <= 0:
+        return 0.0
+    rank = q * count
+    lower_bound, lower_count = 0.0, 0.0
+    for bound in sorted(buckets):
+        cumulative = buckets[bound]
+        if cumulative >= rank:
+            if bound == float('inf'):
+                return lower_bound
+            if cumulative == lower_count:
+                return bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / (cumulative - lower_count)
+        lower_bound, lower_count = bound, cumulative
+    return lower_bound
+
+
+def stage_breakdown(before, after):
+    """
+    Per-stage latency for the observations made between two /metrics scrapes:
+    {stage: {'count', 'mean_ms', 'p50_ms', 'p95_ms'}} (percentiles are bucket estimates)
+    """
+    start = stage_histograms(before)
+    end = stage_histograms(after)
+    breakdown = {}
+    for stage, hist in end.items():
+        prev = start.get(stage, {'count': 0.0, 'sum': 0.0, 'buckets': {}})
+        count = hist['count'] - prev['count']
+        if count <= 0:
+            continue
+        buckets = {le: n - prev['buckets'].get(le, 0.0) for le, n in hist['buckets'].items()}
+        breakdown[stage] = {
+            'count': int(count),
+            'mean_ms': (hist['sum'] - prev['sum']) / count * 1000,
+            'p50_ms': _bucket_quantile(buckets, count, 0.50) * 1000,
+            'p95_ms': _bucket_quantile(buckets, count, 0.95) * 1000
+        }
+    return breakdown
+
+
+def print_stage_breakdown(breakdown):
+    if not breakdown:
+        print("  (no stage timings recorded)")
+        return
+    print(f"  {'stage':<28} {'n':>5} {'mean':>10} {'p50':>10} {'p95':>10}")
+    for stage, row in sorted(breakdown.items(), key=lambda item: -item[1]['mean_ms']):
+        print(f"  {stage:<28} {row['count']:>5} {row['mean_ms']:>8.1f}ms "
+              f"{row['p50_ms']:>8.1f}ms {row['p95_ms']:>8.1f}ms")
+
+
+class MemorySampler:
+    """Background sampler for backend RSS/heap/external memory via GET /metrics"""
+
+    def __init__(self, base_url, interval=0.2):
+        self.base_url = base_url
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def fetch(self):
+        metrics = fetch_metrics(self.base_url)
+        return {
+            'rss': metrics.get('nano_grazynka_memory_rss_bytes', 0.0),
+            'heap': metrics.get('nano_grazynka_memory_heap_used_bytes', 0.0),
+            'external': metrics.get('nano_grazynka_memory_external_bytes', 0.0)
+        }
+
+    def start(self):
+        self.baseline = self.fetch()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.samples.append(self.fetch())
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+    def peak_delta(self, key):
+        """Peak growth over the baseline for 'rss', 'heap' or 'external', in bytes"""
+        if not self.samples:
+            return 0.0
+        return max(sample[key] for sample in self.samples) - self.baseline[key]
+
+
+class QueueSampler:
+    """
+    Background sampler for GET /health/queue. Records queue depth and busy
+    workers over time so a run can assert peak depth, worker cap and drain rate.
+    """
+
+    def __init__(self, base_url, interval=1.0):
+        self.base_url = base_url
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def fetch(self):
+        response = requests.get(f'{self.base_url}/health/queue', timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def start(self):
+        self.baseline = self.fetch()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.final = self.fetch()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                stats = self.fetch()
+                stats['sampledAt'] = time.time()
+                self.samples.append(stats)
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+    def summary(self):
+        if not self.samples:
+            return {}
+        elapsed = max(self.samples[-1]['sampledAt'] - self.samples[0]['sampledAt'], 1e-9)
+        completed = self.final.get('completedSinceStart', 0) - self.baseline.get('completedSinceStart', 0)
+        return {
+            'enabled': self.baseline.get('enabled', False),
+            'concurrency': self.baseline.get('concurrency'),
+            'peak_queued': max(s.get('queued', 0) for s in self.samples),
+            'peak_in_flight': max(s.get('inFlight', 0) for s in self.samples),
+            'peak_oldest_age_s': max(s.get('oldestQueuedAgeMs', 0) for s in self.samples) / 1000.0,
+            'completed': completed,
+            'drain_rate_per_min': completed / elapsed * 60,
+            'retries': self.final.get('retriesSinceStart', 0) - self.baseline.get('retriesSinceStart', 0),
+            'timeouts': self.final.get('timeoutsSinceStart', 0) - self.baseline.get('timeoutsSinceStart', 0),
+            'final_queued': self.final.get('queued', 0)
+        }
+
+    def print_report(self):
+        summary = self.summary()
+        if not summary:
+            print("\nQueue: no samples collected")
+            return summary
+        if not summary['enabled']:
+            print("\nQueue: disabled (processing.queueType is inline)")
+            return summary
+        print(f"\nQueue ({summary['concurrency']} workers)")
+        print(f"  Peak queued:          {summary['peak_queued']}")
+        print(f"  Peak busy workers:    {summary['peak_in_flight']}")
+        print(f"  Oldest job waited:    {summary['peak_oldest_age_s']:.1f}s")
+        print(f"  Drain rate:           {summary['drain_rate_per_min']:.1f} jobs/min ({summary['completed']} completed)")
+        print(f"  Retries / timeouts:   {summary['retries']} / {summary['timeouts']}")
+        print(f"  Left in queue:        {summary['final_queued']}")
+        return summary
+
+
+class LatencyRecorder:
+    """Thread-safe collection of latency samples and errors keyed by endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._errors = {}
+        self._statuses = {}
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def record(self, endpoint, elapsed_ms, ok=True, status=None):
+        with self._lock:
+            self._samples.setdefault(endpoint, []).append(elapsed_ms)
+            if not ok:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+            if status is not None:
+                counts = self._statuses.setdefault(endpoint, {})
+                counts[status] = counts.get(status, 0) + 1
+
+    def timed(self, endpoint, func, *args, ok_statuses=(200, 201), **kwargs):
+        """Call an HTTP function, record its latency and return the response (or None)"""
+        start = time.time()
+        try:
+            response = func(*args, **kwargs)
+        except Exception:
+            self.record(endpoint, (time.time() - start) * 1000, ok=False, status='error')
+            return None
+        self.record(
+            endpoint,
+            (time.time() - start) * 1000,
+            ok=response.status_code in ok_statuses,
+            status=response.status_code
+        )
+        return response
+
+    def finish(self):
+        self.finished_at = time.time()
+
+    def summary(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        with self._lock:
+            result = {}
+            for endpoint, samples in self._samples.items():
+                errors = self._errors.get(endpoint, 0)
+                result[endpoint] = {
+                    'count': len(samples),
+                    'errors': errors,
+                    'error_rate': errors / len(samples) if samples else 0.0,
+                    'throughput': len(samples) / elapsed if elapsed > 0 else 0.0,
+                    'p50': percentile(samples, 50),
+                    'p95': percentile(samples, 95),
+                    'p99': percentile(samples, 99),
+                    'max': max(samples) if samples else 0.0,
+                    'statuses': dict(self._statuses.get(endpoint, {}))
+                }
+            return result
+
+    def print_report(self, title="Load Test Results"):
+        summary = self.summary()
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        print(f"\n{title} ({elapsed:.1f}s wall clock)")
+        header = f"{'endpoint':<34}{'count':>7}{'err%':>7}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+        print(header)
+        print("-" * len(header))
+        for endpoint, stats in summary.items():
+            print(
+                f"{endpoint:<34}{stats['count']:>7}{stats['error_rate'] * 100:>6.1f}%"
+                f"{stats['throughput']:>8.2f}{stats['p50']:>8.0f}ms{stats['p95']:>7.0f}ms"
+                f"{stats['p99']:>7.0f}ms{stats['max']:>7.0f}ms"
+            )
+            non_ok = {k: v for k, v in stats['statuses'].items() if k not in (200, 201, 204)}
+            if non_ok:
+                print(f"{'':<34}statuses: {non_ok}")
+        return summary
+
+
+def run_load(scenario, users=5, rate=1.0, duration=30.0, recorder=None):
+    """
+    Open-loop load: start `rate` scenario runs per second for `duration`
+    seconds, with at most `users` running concurrently. Each run receives the
+    shared recorder and its sequence number. Arrivals that find every virtual
+    user busy are counted as 'dropped' so saturation is visible.
+    """
+    recorder = recorder or LatencyRecorder()
+    interval = 1.0 / rate if rate > 0 else 0.0
+    slots = threading.Semaphore(users)
+    dropped = 0
+    launched = 0
+
+    def run(index):
+        try:
+            scenario(recorder, index)
+        except Exception:
+            recorder.record('scenario', 0.0, ok=False, status='exception')
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        deadline = time.time() + duration
+        next_arrival = time.time()
+        while time.time() < deadline:
+            if slots.acquire(blocking=False):
+                pool.submit(run, launched)
+                launched += 1
+            else:
+                dropped += 1
+            next_arrival += interval
+            time.sleep(max(0.0, next_arrival - time.time()))
+
+    recorder.finish()
+    recorder.launched = launched
+    recorder.dropped = dropped
+    return recorder
@@ -2,13 +2,40 @@
 """
 Performance test for nano-Grazynka pipeline
 Tests: Processing time, throughput, and resource usage
+
+Usage:
+  ./performance-test.py                       # MVP suite (single note, 5 samples/endpoint)
+  ./performance-test.py --load --users 10 --rate 2 --duration 60
+                                              # concurrent upload -> process -> wait load
+  ./performance-test.py --burst 20 --min-drain-rate 6
+                                              # queue absorbs a burst, assert depth/drain rate
+  ./performance-test.py --cache 10            # duplicate uploads: transcription cache hit vs miss
+  ./performance-test.py --long-audio 60       # 60-minute recording: chunked parallel transcription
+  ./performance-test.py --list-pages 2000     # list latency on deep pages: offset vs keyset cursor
+  ./performance-test.py --rate-limit 60 --instances http://localhost:3101,http://localhost:3102
+                                              # one session's limit holds across backend processes
 """
+import argparse
+import os
+import shutil
+import subprocess
 import requests
 import time
 import statistics
 import json
+import threading
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+
+from loadgen import (
+    TERMINAL_STATUSES, LatencyRecorder, QueueSampler, authenticate, fetch_metrics, new_session_id, percentile,
+    print_stage_breakdown, run_load, seed_notes, stage_breakdown, stage_histograms, stream_events,
+    wait_for_completion
+)
 
 BASE_URL = "http://localhost:3101"
+AUDIO_FILE = './zabka.m4a'
 
 def measure_processing_time():
     """Measure time taken for complete processing pipeline"""
@@ -36,6 +63,20 @@ def measure_processing_time():
     voice_note_id = voice_note['id']
     print(f"Upload time: {upload_time:.2f}s")
     
+    # Listen for the completion event, which carries the per-stage timings
+    completed_event = {}
+
+    def capture_completion():
+        try:
+            for event_name, event in stream_events(BASE_URL, voice_note_id, timeout=130, follow=True):
+                if event_name == 'VoiceNoteProcessingCompleted':
+                    completed_event.update(event.get('payload') or {})
+        except requests.RequestException:
+            pass
+
+    listener = threading.Thread(target=capture_completion, daemon=True)
+    listener.start()
+
     # Trigger processing
     process_start = time.time()
     process_response = requests.post(
@@ -43,50 +84,54 @@ def measure_processing_time():
         json={'language': 'PL'}
     )
     
-    if process_response.status_code != 200:
+    if process_response.status_code not in (200, 202):
         print(f"❌ Processing failed: {process_response.status_code}")
         return None
     
-    # Poll for completion
-    max_attempts = 60  # 2 minutes max
-    for i in range(max_attempts):
-        time.sleep(2)
-        
-        status_response = requests.get(
-            f'{BASE_URL}/api/voice-notes/{voice_note_id}?includeTranscription=true&includeSummary=true'
-        )
-        
-        if status_response.status_code == 200:
-            note_data = status_response.json()
-            if note_data.get('status') == 'completed':
-                process_time = time.time() - process_start
-                print(f"Processing time: {process_time:.2f}s")
-                
-                # Breakdown
-                if 'transcription' in note_data:
-                    print(f"  - Transcription word count: {note_data['transcription'].get('wordCount', 0)}")
-                if 'summary' in note_data:
-                    summary = note_data['summary']
-                    print(f"  - Summary generated: Yes")
-                    if summary.get('keyPoints'):
-                        print(f"  - Key points: {len(summary['keyPoints'])}")
-                    if summary.get('actionItems'):
-                        print(f"  - Action items: {len(summary['actionItems'])}")
-                
-                return {
-                    'upload_time': upload_time,
-                    'process_time': process_time,
-                    'total_time': upload_time + process_time
-                }
-            elif note_data.get('status') == 'failed':
-                print(f"❌ Processing failed: {note_data.get('errorMessage')}")
-                return None
-    
-    print("⏱️ Timeout waiting for processing")
-    return None
+    # Wait for completion (long-poll, returns as soon as the note is terminal)
+    final_status = wait_for_completion(BASE_URL, voice_note_id, timeout=120)
+    if final_status is None:
+        print("⏱️ Timeout waiting for processing")
+        return None
+    if final_status.get('status') == 'failed':
+        print(f"❌ Processing failed: {final_status.get('errorMessage')}")
+        return None
+
+    process_time = time.time() - process_start
+    print(f"Processing time: {process_time:.2f}s")
+
+    listener.join(timeout=5)
+    stage_timings = completed_event.get('stageTimingsMs') or {}
+    if stage_timings:
+        print(f"Pipeline time: {completed_event.get('pipelineTimeMs', 0)}ms")
+        for stage, ms in stage_timings.items():
+            print(f"  - {stage}: {ms}ms")
+
+    status_response = requests.get(
+        f'{BASE_URL}/api/voice-notes/{voice_note_id}?includeTranscription=true&includeSummary=true'
+    )
+    note_data = status_response.json() if status_response.status_code == 200 else {}
+
+    # Breakdown
+    if 'transcription' in note_data:
+        print(f"  - Transcription word count: {note_data['transcription'].get('wordCount', 0)}")
+    if 'summary' in note_data:
+        summary = note_data['summary']
+        print(f"  - Summary generated: Yes")
+        if summary.get('keyPoints'):
+            print(f"  - Key points: {len(summary['keyPoints'])}")
+        if summary.get('actionItems'):
+            print(f"  - Action items: {len(summary['actionItems'])}")
+
+    return {
+        'upload_time': upload_time,
+        'process_time': process_time,
+        'total_time': upload_time + process_time,
+        'stage_timings_ms': stage_timings
+    }
 
 def test_api_response_times():
-    """Test response times for various API endpoints"""
+    """Test response times for various API endpoints, anonymous and authenticated"""
     print("\n📊 Performance Test: API Response Times\n")
     
     endpoints = [
@@ -126,8 +171,637 @@ def test_api_response_times():
         print(f"  Min: {min_time:.2f}ms")
         print(f"  Max: {max_time:.2f}ms")
     
+    results.update(measure_authenticated_reads())
     return results
 
+
+def user_lookups(metrics):
+    """Users queried from the database so far (cache misses of the authenticated-user cache)"""
+    return stage_histograms(metrics).get('user_lookup', {}).get('count', 0.0)
+
+
+def measure_authenticated_reads(samples=5):
+    """
+    Time the hot authenticated reads (the list and a single note) and count
+    the user queries the server made while serving them (the user_lookup
+    stage on /metrics). Users and sessions are cached in-process
+    (auth.userCache), so the count should be 0; run once with the cache
+    disabled to see the per-request lookup it saves.
+    """
+    session = requests.Session()
+    if not authenticate(BASE_URL, session, prefix='perf-api'):
+        return {}
+    with open(AUDIO_FILE, 'rb') as f:
+        response = session.post(f'{BASE_URL}/api/voice-notes',
+                                files={'file': ('perf-api.m4a', f, 'audio/m4a')},
+                                data={'language': 'PL'}, timeout=60)
+    if response.status_code != 201:
+        print(f"❌ Upload failed: {response.status_code} {response.text[:200]}")
+        return {}
+    voice_note_id = response.json()['voiceNote']['id']
+
+    try:
+        metrics_before = fetch_metrics(BASE_URL)
+    except requests.RequestException:
+        metrics_before = None
+
+    results = {}
+    for name, path in (('GET /api/voice-notes (auth)', '/api/voice-notes'),
+                       ('GET /api/voice-notes/{id} (auth)', f'/api/voice-notes/{voice_note_id}')):
+        times = []
+        for _ in range(samples):
+            start = time.time()
+            response = session.get(f'{BASE_URL}{path}', timeout=30)
+            times.append((time.time() - start) * 1000)
+            if response.status_code != 200:
+                print(f"❌ {name} failed: {response.status_code} {response.text[:200]}")
+                break
+            time.sleep(0.1)
+
+        results[name] = {'avg': statistics.mean(times), 'min': min(times), 'max': max(times)}
+        print(f"{name}:")
+        print(f"  Avg: {results[name]['avg']:.2f}ms")
+        print(f"  Min: {results[name]['min']:.2f}ms")
+        print(f"  Max: {results[name]['max']:.2f}ms")
+
+    if metrics_before is not None:
+        try:
+            lookups = user_lookups(fetch_metrics(BASE_URL)) - user_lookups(metrics_before)
+            print(f"User lookups for {2 * samples} authenticated reads: {int(lookups)}")
+        except requests.RequestException as e:
+            print(f"⚠️ Could not scrape /metrics: {e}")
+
+    return results
+
+def timed_list(session, params):
+    """GET /api/voice-notes, waiting out 429s (the list is rate limited); returns (json, ms)"""
+    while True:
+        start = time.perf_counter()
+        response = session.get(f'{BASE_URL}/api/voice-notes', params=params, timeout=60)
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code != 429:
+            break
+        time.sleep(int(response.headers.get('Retry-After', '5')))
+    response.raise_for_status()
+    return response.json(), elapsed
+
+
+def measure_list_pagination(notes=2000, page_size=100, samples=3, email=None, password=None):
+    """
+    List latency for the first and the deepest pages of an account with `notes`
+    notes, with offset pages (?page=N, exact count) and keyset pages (?cursor=,
+    no count). Keyset latency should stay flat however deep the page; offset
+    latency grows with the rows skipped. Seeding uses the batch API with fake
+    recordings; run the backend against fake-provider-server.py.
+    """
+    print(f"\n📊 Performance Test: List Pagination ({notes} notes, {page_size} per page)\n")
+
+    session = requests.Session()
+    if not authenticate(BASE_URL, session, email, password, 'perf-list'):
+        return None
+    if notes > 0 and not seed_notes(BASE_URL, session, notes):
+        return None
+
+    first, _ = timed_list(session, {'limit': page_size, 'page': 1})
+    total = first['pagination']['total']
+    last_page = max(1, first['pagination']['totalPages'])
+
+    offset = {}
+    for label, page in (('first', 1), ('last', last_page)):
+        offset[label] = statistics.median(
+            timed_list(session, {'limit': page_size, 'page': page})[1] for _ in range(samples)
+        )
+
+    # Walk every page once with the cursor, timing each hop
+    cursor_latencies = []
+    cursor = ''
+    pages = 0
+    while cursor is not None:
+        body, elapsed = timed_list(session, {'limit': page_size, 'cursor': cursor})
+        cursor_latencies.append(elapsed)
+        cursor = body['pagination'].get('nextCursor')
+        pages += 1
+
+    keyset = {'first': cursor_latencies[0], 'last': cursor_latencies[-1]}
+    print(f"  Notes listed:        {total} ({pages} cursor pages)")
+    print(f"  Offset page 1/{last_page}:   {offset['first']:.1f}ms / {offset['last']:.1f}ms")
+    print(f"  Cursor first/last:   {keyset['first']:.1f}ms / {keyset['last']:.1f}ms "
+          f"(p95 {percentile(cursor_latencies, 95):.1f}ms)")
+
+    return {'total': total, 'pages': pages, 'offset_ms': offset, 'keyset_ms': keyset}
+
+
+def upload_process_poll_flow(recorder, index, audio_file=AUDIO_FILE, timeout=120):
+    """One virtual-user iteration: upload, trigger processing, wait until done"""
+    session_id = new_session_id('perf-load')
+    headers = {'x-session-id': session_id}
+    flow_start = time.time()
+
+    with open(audio_file, 'rb') as f:
+        response = recorder.timed(
+            'POST /api/voice-notes',
+            requests.post,
+            f'{BASE_URL}/api/voice-notes',
+            files={'file': ('zabka.m4a', f, 'audio/m4a')},
+            data={'language': 'PL', 'tags': 'performance,load'},
+            headers=headers,
+            ok_statuses=(201,)
+        )
+    if response is None or response.status_code != 201:
+        recorder.record('flow (end-to-end)', (time.time() - flow_start) * 1000, ok=False)
+        return
+
+    voice_note_id = response.json()['voiceNote']['id']
+    response = recorder.timed(
+        'POST /api/voice-notes/:id/process',
+        requests.post,
+        f'{BASE_URL}/api/voice-notes/{voice_note_id}/process',
+        json={'language': 'PL'},
+        headers=headers,
+        ok_statuses=(200, 202)
+    )
+    if response is None or response.status_code not in (200, 202):
+        recorder.record('flow (end-to-end)', (time.time() - flow_start) * 1000, ok=False)
+        return
+
+    status = response.json().get('voiceNote', {}).get('status')
+    if status not in TERMINAL_STATUSES:
+        final_status = wait_for_completion(BASE_URL, voice_note_id, headers=headers,
+                                           timeout=timeout, recorder=recorder)
+        status = final_status.get('status') if final_status else None
+
+    recorder.record(
+        'flow (end-to-end)',
+        (time.time() - flow_start) * 1000,
+        ok=status == 'completed',
+        status=status or 'timeout'
+    )
+
+
+def check_queue(queue_summary, max_queue_depth=None, min_drain_rate=None):
+    """Assert queue invariants/thresholds; returns a list of failure messages"""
+    failures = []
+    if not queue_summary.get('enabled'):
+        return failures
+    if queue_summary['peak_in_flight'] > queue_summary['concurrency']:
+        failures.append(f"busy workers {queue_summary['peak_in_flight']} exceeded "
+                        f"maxConcurrentJobs {queue_summary['concurrency']}")
+    if max_queue_depth is not None and queue_summary['peak_queued'] > max_queue_depth:
+        failures.append(f"peak queue depth {queue_summary['peak_queued']} > {max_queue_depth}")
+    if min_drain_rate is not None and queue_summary['drain_rate_per_min'] < min_drain_rate:
+        failures.append(f"drain rate {queue_summary['drain_rate_per_min']:.1f}/min < {min_drain_rate}/min")
+    for failure in failures:
+        print(f"❌ Queue check failed: {failure}")
+    return failures
+
+
+def test_load(users=5, rate=1.0, duration=30.0, audio_file=AUDIO_FILE, max_queue_depth=None, min_drain_rate=None):
+    """Drive concurrent virtual users through upload -> process -> wait"""
+    print(f"\n📊 Performance Test: Load ({users} users, {rate}/s arrivals, {duration:.0f}s)\n")
+
+    sampler = QueueSampler(BASE_URL).start()
+    start = time.time()
+    recorder = run_load(
+        lambda rec, index: upload_process_poll_flow(rec, index, audio_file),
+        users=users,
+        rate=rate,
+        duration=duration,
+        recorder=LatencyRecorder()
+    )
+    # run_load returns once the last flow finished, which can be well after `duration`
+    elapsed = time.time() - start
+    sampler.stop()
+    summary = recorder.print_report("Load Test Results")
+    queue_summary = sampler.print_report()
+    summary['queue_failures'] = check_queue(queue_summary, max_queue_depth, min_drain_rate)
+
+    flows = summary.get('flow (end-to-end)', {})
+    print(f"\nFlows launched: {recorder.launched}, arrivals dropped (all users busy): {recorder.dropped}")
+    if flows:
+        completed_per_min = (flows['count'] - flows['errors']) / max(elapsed, 1e-9) * 60
+        print(f"Completed notes/minute: {completed_per_min:.1f}")
+    if recorder.dropped:
+        print("⚠️  Arrival rate exceeds what the backend drains with this many users - saturation reached")
+
+    return summary
+
+
+def test_queue_burst(burst=10, audio_file=AUDIO_FILE, timeout=600, max_queue_depth=None, min_drain_rate=None):
+    """
+    Upload `burst` notes, trigger processing for all of them at once and watch
+    the job queue absorb the burst: depth should rise, busy workers stay at
+    maxConcurrentJobs and the queue drain at a steady rate.
+    """
+    print(f"\n📊 Performance Test: Queue Burst ({burst} notes)\n")
+
+    notes = []
+    for index in range(burst):
+        headers = {'x-session-id': new_session_id('perf-burst')}
+        with open(audio_file, 'rb') as f:
+            response = requests.post(
+                f'{BASE_URL}/api/voice-notes',
+                files={'file': ('zabka.m4a', f, 'audio/m4a')},
+                data={'language': 'PL', 'tags': 'performance,burst'},
+                headers=headers
+            )
+        if response.status_code != 201:
+            print(f"❌ Upload {index + 1} failed: {response.status_code}")
+            return None
+        notes.append((response.json()['voiceNote']['id'], headers))
+    print(f"Uploaded {len(notes)} notes")
+
+    sampler = QueueSampler(BASE_URL, interval=0.5).start()
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=burst) as pool:
+        statuses = list(pool.map(
+            lambda note: requests.post(f'{BASE_URL}/api/voice-notes/{note[0]}/process',
+                                       json={'language': 'PL'}, headers=note[1]).status_code,
+            notes
+        ))
+    accept_time = time.time() - start
+    print(f"All {burst} process requests answered in {accept_time:.2f}s (statuses: {sorted(set(statuses))})")
+
+    with ThreadPoolExecutor(max_workers=burst) as pool:
+        finals = list(pool.map(
+            lambda note: wait_for_completion(BASE_URL, note[0], headers=note[1], timeout=timeout),
+            notes
+        ))
+    drain_time = time.time() - start
+    sampler.stop()
+
+    completed = sum(1 for final in finals if final and final.get('status') == 'completed')
+    print(f"Completed {completed}/{burst} in {drain_time:.1f}s ({completed / max(drain_time, 1e-9) * 60:.1f} notes/min)")
+    queue_summary = sampler.print_report()
+    failures = check_queue(queue_summary, max_queue_depth, min_drain_rate)
+    if queue_summary.get('enabled') and queue_summary['final_queued'] != 0:
+        failures.append(f"{queue_summary['final_queued']} jobs left in queue")
+        print(f"❌ Queue check failed: {failures[-1]}")
+
+    return {
+        'accept_time': accept_time,
+        'drain_time': drain_time,
+        'completed': completed,
+        'queue': queue_summary,
+        'queue_failures': failures
+    }
+
+
+def measure_push_vs_polling(audio_file=AUDIO_FILE, poll_interval=2, timeout=120):
+    """
+    Compare how quickly a client learns a note is done: SSE push vs the old
+    2s polling loop. The /process call runs in a background thread because in
+    inline mode (processing.queueType: inline) it blocks until the pipeline finishes.
+    """
+    print("\n📊 Performance Test: Completion Notification (push vs polling)\n")
+
+    headers = {'x-session-id': new_session_id('perf-push')}
+    with open(audio_file, 'rb') as f:
+        response = requests.post(
+            f'{BASE_URL}/api/voice-notes',
+            files={'file': ('zabka.m4a', f, 'audio/m4a')},
+            data={'language': 'PL', 'tags': 'performance,push'},
+            headers=headers
+        )
+    if response.status_code != 201:
+        print(f"❌ Upload failed: {response.status_code}")
+        return None
+    voice_note_id = response.json()['voiceNote']['id']
+
+    results = {}
+
+    def process():
+        requests.post(f'{BASE_URL}/api/voice-notes/{voice_note_id}/process',
+                      json={'language': 'PL'}, headers=headers, timeout=timeout)
+        results['processed_at'] = time.time()
+
+    def push():
+        for event, data in stream_events(BASE_URL, voice_note_id, headers=headers, timeout=timeout, follow=True):
+            results['push_events'] = results.get('push_events', 0) + 1
+            if data.get('status') in TERMINAL_STATUSES:
+                results['push_at'] = time.time()
+                return
+
+    def poll():
+        requests_made = 0
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            time.sleep(poll_interval)
+            requests_made += 1
+            status_response = requests.get(f'{BASE_URL}/api/voice-notes/{voice_note_id}', headers=headers)
+            if status_response.status_code == 200 and status_response.json().get('status') in TERMINAL_STATUSES:
+                results['poll_at'] = time.time()
+                break
+        results['poll_requests'] = requests_made
+
+    start = time.time()
+    threads = [threading.Thread(target=target) for target in (push, poll)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)  # let the SSE subscription attach before work starts
+    process_thread = threading.Thread(target=process)
+    process_thread.start()
+    for thread in threads + [process_thread]:
+        thread.join(timeout)
+
+    if 'push_at' not in results or 'poll_at' not in results:
+        print("⏱️ Timeout waiting for completion notification")
+        return None
+
+    push_delay = results['push_at'] - start
+    poll_delay = results['poll_at'] - start
+    print(f"SSE push notified after:     {push_delay:.2f}s ({results.get('push_events', 0)} events, 1 request)")
+    print(f"Polling ({poll_interval}s) notified after: {poll_delay:.2f}s ({results['poll_requests']} requests)")
+    print(f"Notification delay saved:    {poll_delay - push_delay:.2f}s")
+
+    return {
+        'push_delay': push_delay,
+        'poll_delay': poll_delay,
+        'poll_requests': results['poll_requests']
+    }
+
+
+def fetch_cache_stats():
+    response = requests.get(f'{BASE_URL}/health/cache', timeout=10)
+    return response.json() if response.status_code == 200 else {}
+
+
+def measure_transcription_cache(repeats=5, audio_file=AUDIO_FILE, timeout=120):
+    """
+    Upload the same recording repeatedly. The first run uses a fresh prompt so
+    it is a guaranteed cache miss; the repeats reuse it and should be served
+    from the transcription cache. Reports process -> completed latency for
+    hit vs miss and the hit rate seen by the backend.
+    """
+    print(f"\n📊 Performance Test: Transcription Cache (1 miss + {repeats} duplicates)\n")
+
+    before = fetch_cache_stats()
+    if not before.get('enabled'):
+        print("⚠️ Transcription cache disabled (transcription.cache.enabled: false)")
+
+    # Unique prompt per run so earlier benchmark runs can't pre-warm the miss
+    whisper_prompt = f'cache benchmark {uuid.uuid4().hex[:8]}'
+
+    def timed_flow(index):
+        headers = {'x-session-id': new_session_id('perf-cache')}
+        with open(audio_file, 'rb') as f:
+            response = requests.post(
+                f'{BASE_URL}/api/voice-notes',
+                files={'file': ('zabka.m4a', f, 'audio/m4a')},
+                data={'language': 'PL', 'tags': 'performance,cache', 'whisperPrompt': whisper_prompt},
+                headers=headers
+            )
+        if response.status_code != 201:
+            print(f"❌ Upload {index + 1} failed: {response.status_code}")
+            return None
+        voice_note_id = response.json()['voiceNote']['id']
+
+        start = time.time()
+        requests.post(f'{BASE_URL}/api/voice-notes/{voice_note_id}/process',
+                      json={'language': 'PL'}, headers=headers, timeout=timeout)
+        final = wait_for_completion(BASE_URL, voice_note_id, headers=headers, timeout=timeout)
+        elapsed = time.time() - start
+        if not final or final.get('status') != 'completed':
+            print(f"❌ Run {index + 1} did not complete")
+            return None
+        return elapsed
+
+    miss_time = timed_flow(0)
+    if miss_time is None:
+        return None
+    print(f"  Miss (provider call): {miss_time:.2f}s")
+
+    hit_times = []
+    for index in range(1, repeats + 1):
+        elapsed = timed_flow(index)
+        if elapsed is not None:
+            hit_times.append(elapsed)
+            print(f"  Duplicate {index}:          {elapsed:.2f}s")
+
+    after = fetch_cache_stats()
+    hits = (after.get('hits', 0) + after.get('coalesced', 0)) - (before.get('hits', 0) + before.get('coalesced', 0))
+    misses = after.get('misses', 0) - before.get('misses', 0)
+    lookups = hits + misses
+    hit_rate = hits / lookups if lookups else 0.0
+
+    if not hit_times:
+        return None
+
+    hit_p50 = percentile(hit_times, 50)
+    print(f"\nCache hit rate:       {hit_rate * 100:.1f}% ({hits} hits / {lookups} lookups)")
+    print(f"Miss latency:         {miss_time * 1000:.0f}ms")
+    print(f"Hit latency p50/max:  {hit_p50 * 1000:.0f}ms / {max(hit_times) * 1000:.0f}ms")
+    print(f"Speedup:              {miss_time / max(hit_p50, 1e-9):.1f}x")
+    print(f"Cached entries:       {after.get('entries', 0)} ({after.get('totalBytes', 0) / 1024:.1f}KB)")
+
+    return {
+        'miss_time': miss_time,
+        'hit_p50': hit_p50,
+        'hit_max': max(hit_times),
+        'hit_rate': hit_rate
+    }
+
+
+def build_long_audio(minutes, source=AUDIO_FILE, bitrate='32k'):
+    """
+    Loop the sample recording into a `minutes`-long file with ffmpeg. Mono at a
+    low bitrate keeps a 60-minute file under the 25MB upload limit.
+    """
+    if not shutil.which('ffmpeg'):
+        return None
+    target = f'./long_{minutes}m.m4a'
+    if not os.path.exists(target):
+        subprocess.run(
+            ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y', '-stream_loop', '-1', '-i', source,
+             '-t', str(minutes * 60), '-ac', '1', '-b:a', bitrate, target],
+            check=True
+        )
+    return target
+
+
+def process_and_wait(audio_file, filename, timeout):
+    """Upload, trigger processing and return (seconds from /process to completed, final status)"""
+    headers = {'x-session-id': new_session_id('perf-long')}
+    with open(audio_file, 'rb') as f:
+        response = requests.post(
+            f'{BASE_URL}/api/voice-notes',
+            files={'file': (filename, f, 'audio/m4a')},
+            data={'language': 'PL', 'tags': 'performance,long-audio'},
+            headers=headers,
+            timeout=timeout
+        )
+    if response.status_code != 201:
+        print(f"❌ Upload of {filename} failed: {response.status_code} {response.text[:200]}")
+        return None, None
+    voice_note_id = response.json()['voiceNote']['id']
+
+    start = time.time()
+    requests.post(f'{BASE_URL}/api/voice-notes/{voice_note_id}/process',
+                  json={'language': 'PL'}, headers=headers, timeout=timeout)
+    final = wait_for_completion(BASE_URL, voice_note_id, headers=headers, timeout=timeout)
+    return time.time() - start, final
+
+
+def measure_long_audio(minutes=60, audio_file=AUDIO_FILE, timeout=1800):
+    """
+    Long-recording scenario: transcribe a `minutes`-long file and compare it
+    with the short sample. With chunked parallel transcription the long file
+    should take roughly as long as its slowest chunk, not `minutes` x longer.
+    """
+    print(f"\n📊 Performance Test: Long Recording ({minutes} min)\n")
+
+    long_file = build_long_audio(minutes, audio_file)
+    if not long_file:
+        print("⚠️ ffmpeg not found - skipping long recording scenario")
+        return None
+    size_mb = os.path.getsize(long_file) / 1024 / 1024
+    print(f"Built {long_file} ({size_mb:.1f}MB)")
+
+    short_time, short_final = process_and_wait(audio_file, 'zabka.m4a', timeout)
+    if not short_final or short_final.get('status') != 'completed':
+        print("❌ Short baseline did not complete")
+        return None
+    print(f"  Short sample:        {short_time:.2f}s")
+
+    long_time, long_final = process_and_wait(long_file, os.path.basename(long_file), timeout)
+    if not long_final or long_final.get('status') != 'completed':
+        print(f"❌ Long recording did not complete (status: {long_final.get('status') if long_final else 'timeout'})")
+        return None
+    print(f"  {minutes}-minute recording: {long_time:.2f}s")
+
+    print(f"\nLong / short ratio:   {long_time / max(short_time, 1e-9):.1f}x")
+    print(f"Audio per wall second: {minutes * 60 / max(long_time, 1e-9):.0f}s")
+
+    return {
+        'minutes': minutes,
+        'short_time': short_time,
+        'long_time': long_time
+    }
+
+
+def measure_db_writes(notes=10, audio_file=AUDIO_FILE, timeout=300):
+    """
+    SQL statements and save latency per processed note, from the
+    db_statement_<verb> and db_save histograms on /metrics. Notes run one at a
+    time so the counts are per note; reads include the status polling done by
+    this script.
+    """
+    print(f"\n📊 Performance Test: Database Writes per Note ({notes} notes)\n")
+
+    before = fetch_metrics(BASE_URL)
+    completed = 0
+    for index in range(notes):
+        _, final = process_and_wait(audio_file, f'db-writes-{index + 1}.m4a', timeout)
+        if final and final.get('status') == 'completed':
+            completed += 1
+    breakdown = stage_breakdown(before, fetch_metrics(BASE_URL))
+
+    if not completed:
+        print("❌ No notes completed")
+        return None
+
+    statements = {stage[len('db_statement_'):]: row for stage, row in breakdown.items()
+                  if stage.startswith('db_statement_')}
+    if not statements:
+        print("⚠️ No db_statement_* metrics - is the backend recording query events?")
+        return None
+
+    print(f"  {'statement':<12} {'per note':>9} {'mean':>10}")
+    for verb, row in sorted(statements.items(), key=lambda item: -item[1]['count']):
+        print(f"  {verb:<12} {row['count'] / completed:>9.1f} {row['mean_ms']:>8.2f}ms")
+
+    writes = sum(row['count'] for verb, row in statements.items() if verb in ('insert', 'update', 'delete'))
+    save = breakdown.get('db_save', {'count': 0, 'mean_ms': 0.0, 'p95_ms': 0.0})
+    print(f"\nWrite statements per note: {writes / completed:.1f}")
+    print(f"Saves per note:            {save['count'] / completed:.1f} "
+          f"(mean {save['mean_ms']:.2f}ms, p95 {save['p95_ms']:.2f}ms)")
+
+    return {
+        'notes': completed,
+        'writes_per_note': writes / completed,
+        'saves_per_note': save['count'] / completed,
+        'save_mean_ms': save['mean_ms']
+    }
+
+
+def measure_usage_stats(notes=10000, requests_count=50, email=None, password=None):
+    """
+    Time GET /api/auth/usage (settings page) for an account with `notes`
+    processed notes. Stats come from per-user aggregates, so latency should
+    not depend on how much history the account has. Seeding uses the batch
+    API with fake recordings; run the backend against fake-provider-server.py.
+    """
+    print(f"\n📊 Performance Test: Usage Stats ({notes} notes)\n")
+
+    session = requests.Session()
+    if not authenticate(BASE_URL, session, email, password, 'perf-usage'):
+        return None
+    if notes > 0 and not seed_notes(BASE_URL, session, notes):
+        return None
+
+    latencies = []
+    stats = None
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        response = session.get(f'{BASE_URL}/api/auth/usage', timeout=30)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            print(f"❌ Usage request failed: {response.status_code} {response.text[:200]}")
+            return None
+        stats = response.json()
+
+    print(f"  All-time notes:      {stats['allTime']['totalNotes']}")
+    print(f"  Minutes transcribed: {stats['allTime']['totalMinutesTranscribed']}")
+    print(f"  Latency p50/p95/max: {percentile(latencies, 50):.1f}ms / "
+          f"{percentile(latencies, 95):.1f}ms / {max(latencies):.1f}ms")
+
+    return {
+        'notes': stats['allTime']['totalNotes'],
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95)
+    }
+
+
+def measure_rate_limit(requests_count=60, instances=None):
+    """
+    Send `requests_count` list requests for one anonymous session, round-robin
+    across `instances` (backend base URLs sharing one database), and check that
+    no more than X-RateLimit-Limit of them got through. With rateLimit.store:
+    memory each process counts on its own, so this only holds across several
+    instances with the sqlite store.
+    """
+    instances = instances or [BASE_URL]
+    print(f"\n🚦 Performance Test: Rate Limit ({requests_count} requests over {len(instances)} instance(s))\n")
+
+    session_id = new_session_id()
+    allowed = 0
+    limited = 0
+    limit = None
+    for i in range(requests_count):
+        base_url = instances[i % len(instances)]
+        response = requests.get(f'{base_url}/api/voice-notes', headers={'x-session-id': session_id},
+                                params={'sessionId': session_id}, timeout=30)
+        if 'X-RateLimit-Limit' in response.headers:
+            limit = int(response.headers['X-RateLimit-Limit'])
+        if response.status_code == 429:
+            limited += 1
+        elif response.status_code == 200:
+            allowed += 1
+        else:
+            print(f"❌ Unexpected response: {response.status_code} {response.text[:200]}")
+            return None
+
+    if limit is None:
+        print("❌ No X-RateLimit-Limit header; is the endpoint rate limited?")
+        return None
+
+    passed = allowed <= limit
+    print(f"  Limit per window: {limit}")
+    print(f"  Allowed/limited:  {allowed} / {limited}")
+    print(f"  {'✅' if passed else '❌'} {'Limit held' if passed else 'Limit exceeded'} across instances")
+
+    return {'limit': limit, 'allowed': allowed, 'limited': limited, 'passed': passed}
+
+
 def test_concurrent_uploads():
     """Test system behavior with concurrent uploads"""
     print("\n📊 Performance Test: Concurrent Operations\n")
@@ -161,20 +835,117 @@ def test_concurrent_uploads():
     
     return times
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='nano-Grazynka performance tests')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--audio', default=AUDIO_FILE, help='Audio file used for uploads')
+    parser.add_argument('--load', action='store_true', help='Run the concurrent load generator only')
+    parser.add_argument('--users', type=int, default=5, help='Max concurrent virtual users')
+    parser.add_argument('--rate', type=float, default=1.0, help='New flows started per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to keep generating arrivals')
+    parser.add_argument('--burst', type=int, default=0,
+                        help='Run the queue burst test with this many notes only')
+    parser.add_argument('--cache', type=int, default=0,
+                        help='Run the transcription cache benchmark with this many duplicate uploads only')
+    parser.add_argument('--long-audio', type=int, default=0, metavar='MINUTES',
+                        help='Run the long recording (chunked transcription) scenario only')
+    parser.add_argument('--db-writes', type=int, default=0, metavar='NOTES',
+                        help='Count SQL statements and save latency per processed note only')
+    parser.add_argument('--usage', type=int, default=0, metavar='NOTES',
+                        help='Time the usage stats endpoint for an account seeded with this many notes only '
+                             '(10000 for the history-size check; 0 notes with --email to reuse an account)')
+    parser.add_argument('--email', default=None, help='Existing account for --usage')
+    parser.add_argument('--password', default=None)
+    parser.add_argument('--list-pages', type=int, default=0, metavar='NOTES',
+                        help='Time first vs deepest list pages (offset and cursor) for an account seeded with '
+                             'this many notes only (with --email, the account is reused and seeded on top)')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--rate-limit', type=int, default=0, metavar='REQUESTS',
+                        help='Check one session stays within its rate limit across --instances only')
+    parser.add_argument('--instances', default=None,
+                        help='Comma-separated backend base URLs for --rate-limit (default: --base-url)')
+    parser.add_argument('--max-queue-depth', type=int, default=None,
+                        help='Fail if the processing queue grows beyond this many jobs')
+    parser.add_argument('--min-drain-rate', type=float, default=None,
+                        help='Fail if the queue drains fewer jobs/minute than this')
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    BASE_URL = args.base_url
+    AUDIO_FILE = args.audio
+
+    if args.load:
+        load_summary = test_load(args.users, args.rate, args.duration, args.audio,
+                                 args.max_queue_depth, args.min_drain_rate)
+        raise SystemExit(1 if load_summary['queue_failures'] else 0)
+
+    if args.burst:
+        burst_result = test_queue_burst(args.burst, args.audio,
+                                        max_queue_depth=args.max_queue_depth, min_drain_rate=args.min_drain_rate)
+        raise SystemExit(1 if not burst_result or burst_result['queue_failures'] else 0)
+
+    if args.cache:
+        cache_result = measure_transcription_cache(args.cache, args.audio)
+        raise SystemExit(0 if cache_result and cache_result['hit_rate'] > 0 else 1)
+
+    if args.long_audio:
+        long_result = measure_long_audio(args.long_audio, args.audio)
+        raise SystemExit(0 if long_result else 1)
+
+    if args.list_pages:
+        list_result = measure_list_pagination(args.list_pages, args.page_size,
+                                              email=args.email, password=args.password)
+        raise SystemExit(0 if list_result else 1)
+
+    if args.usage or args.email:
+        usage_result = measure_usage_stats(args.usage, email=args.email, password=args.password)
+        raise SystemExit(0 if usage_result else 1)
+
+    if args.rate_limit:
+        instances = args.instances.split(',') if args.instances else None
+        rate_result = measure_rate_limit(args.rate_limit, instances)
+        raise SystemExit(0 if rate_result and rate_result['passed'] else 1)
+
+    if args.db_writes:
+        db_result = measure_db_writes(args.db_writes, args.audio)
+        raise SystemExit(0 if db_result else 1)
+
     print("="*60)
     print("nano-Grazynka Performance Test Suite")
     print("="*60)
     
+    # Stage histograms are cumulative since server start; diff two scrapes for this run
+    try:
+        metrics_before = fetch_metrics(BASE_URL)
+    except requests.RequestException as e:
+        print(f"⚠️ Could not scrape /metrics: {e}")
+        metrics_before = None
+    
     # Test 1: Processing time
     processing_result = measure_processing_time()
     
-    # Test 2: API response times
+    # Test 2: Completion notification latency (push vs polling)
+    push_result = measure_push_vs_polling()
+    
+    # Test 3: Transcription cache (duplicate uploads)
+    cache_result = measure_transcription_cache(repeats=3)
+    
+    # Test 4: API response times
     api_results = test_api_response_times()
     
-    # Test 3: Concurrent operations
+    # Test 5: Concurrent operations
     concurrent_results = test_concurrent_uploads()
     
+    # Server-side per-stage latency for everything above
+    if metrics_before is not None:
+        print("\n📊 Per-stage latency (server-side, this run)\n")
+        try:
+            print_stage_breakdown(stage_breakdown(metrics_before, fetch_metrics(BASE_URL)))
+        except requests.RequestException as e:
+            print(f"⚠️ Could not scrape /metrics: {e}")
+    
     # Summary
     print("\n" + "="*60)
     print("PERFORMANCE SUMMARY")
@@ -187,6 +958,14 @@ if __name__ == "__main__":
     else:
         print("❌ Processing test failed")
     
+    if push_result:
+        print(f"\n✅ Completion push: {push_result['push_delay']:.2f}s "
+              f"(polling: {push_result['poll_delay']:.2f}s, {push_result['poll_requests']} requests)")
+    
+    if cache_result:
+        print(f"\n✅ Transcription cache: {cache_result['hit_rate'] * 100:.0f}% hit rate, "
+              f"hit {cache_result['hit_p50']:.2f}s vs miss {cache_result['miss_time']:.2f}s")
+    
     print(f"\n✅ API Response Times:")
     for endpoint, times in api_results.items():
         print(f"   {endpoint}: {times['avg']:.2f}ms avg")
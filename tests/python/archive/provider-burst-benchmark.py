@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Provider burst benchmark for nano-Grazynka: submit one batch of N recordings
+and watch how the backend's shared provider clients pace it against a
+provider that only admits a few requests at a time.
+
+Run the backend against fake-provider-server.py started with
+--max-concurrency, which answers 429 above that many in-flight requests. The
+report shows what the provider saw (200s vs 429s, peak in-flight, TCP
+connections opened), how long the burst took to complete, and the backend's
+provider gauges: the adaptive in-flight limit each client settled on and how
+long requests queued for a slot (provider_queue stage).
+
+With pooled keep-alive clients the connection count stays near the peak
+in-flight count instead of growing with every request, and the 429 share
+falls once the limit has adapted.
+
+Usage:
+  ./fake-provider-server.py --quiet --max-concurrency 4 --retry-after 1 &
+  ./provider-burst-benchmark.py --notes 40
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import requests
+
+from loadgen import authenticate, fetch_metrics, print_stage_breakdown, stage_breakdown
+
+BASE_URL = "http://localhost:3101"
+PROVIDER_URL = "http://localhost:8089"
+PROVIDER_METRIC = 'nano_grazynka_provider_'
+
+
+def provider_stats():
+    return requests.get(f'{PROVIDER_URL}/__stats', timeout=10).json()
+
+
+def submit_burst(session, count, payload_bytes):
+    files = [('files', (f'burst-{i + 1:04d}.m4a', io.BytesIO(os.urandom(payload_bytes)), 'audio/x-m4a'))
+             for i in range(count)]
+    response = session.post(f'{BASE_URL}/api/voice-notes/batches', files=files,
+                            data={'language': 'PL'}, timeout=600)
+    if response.status_code != 202:
+        print(f"❌ Batch rejected: {response.status_code} {response.text}")
+        return None
+    return response.json()['batch']['id']
+
+
+def wait_for_batch(session, batch_id, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = session.get(f'{BASE_URL}/api/voice-notes/batches/{batch_id}', timeout=30)
+        if response.status_code == 200 and response.json().get('done'):
+            return response.json()
+        time.sleep(0.5)
+    return None
+
+
+def print_provider_report(stats):
+    statuses = stats.get('statuses', {})
+    print("\n📡 Provider view")
+    for route in sorted(stats.get('requests', {})):
+        ok = statuses.get(f'{route} 200', 0)
+        throttled = statuses.get(f'{route} 429', 0)
+        failed = sum(n for key, n in statuses.items() if key.startswith(f'{route} ') and key not in
+                     (f'{route} 200', f'{route} 429'))
+        total = stats['requests'][route]
+        print(f"  {route:<14} {total:>5} requests  {ok:>5} ok  {throttled:>5} x 429 "
+              f"({throttled / total * 100 if total else 0:.0f}%)  {failed:>3} other")
+    print(f"  peak in-flight: {stats.get('peakInFlight', 0)}")
+    print(f"  TCP connections opened: {stats.get('connections', 'n/a')}")
+
+
+def print_client_gauges(metrics):
+    rows = {}
+    for key, value in metrics.items():
+        if not key.startswith(PROVIDER_METRIC):
+            continue
+        name, _, labels = key[len(PROVIDER_METRIC):].partition('{')
+        provider = labels.split('provider="', 1)[-1].split('"', 1)[0]
+        if name == 'requests_total':
+            result = labels.split('result="', 1)[-1].split('"', 1)[0]
+            name = f'requests_{result}'
+        rows.setdefault(provider, {})[name] = value
+
+    print("\n🔧 Backend provider clients")
+    if not rows:
+        print("  (no provider clients yet)")
+        return
+    for provider, row in sorted(rows.items()):
+        print(f"  {provider}")
+        print(f"    limit {row.get('concurrency_limit', 0):.1f}  in-flight {row.get('in_flight', 0):.0f}  "
+              f"queued {row.get('queued', 0):.0f}  circuit {'open' if row.get('circuit_open') else 'closed'}")
+        print(f"    sent {row.get('requests_sent', 0):.0f}  throttled {row.get('requests_throttled', 0):.0f}  "
+              f"failed {row.get('requests_failed', 0):.0f}  rejected {row.get('requests_rejected', 0):.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Burst a batch through the backend against a throttling fake provider')
+    parser.add_argument('--notes', type=int, default=40, help='Recordings in the burst')
+    parser.add_argument('--payload-bytes', type=int, default=32000, help='Size of each fake recording')
+    parser.add_argument('--timeout', type=int, default=600, help='Seconds to wait for the batch')
+    args = parser.parse_args()
+
+    print("🚀 Provider burst benchmark")
+    print("=" * 50)
+
+    session = requests.Session()
+    if not authenticate(BASE_URL, session, prefix='provider-burst'):
+        return 1
+
+    requests.post(f'{PROVIDER_URL}/__reset', timeout=10)
+    before = fetch_metrics(BASE_URL)
+    start = time.time()
+
+    batch_id = submit_burst(session, args.notes, args.payload_bytes)
+    if not batch_id:
+        return 1
+    print(f"📦 Submitted {args.notes} notes as batch {batch_id}")
+
+    batch = wait_for_batch(session, batch_id, args.timeout)
+    elapsed = time.time() - start
+    if not batch:
+        print(f"⏱️ Batch not done after {args.timeout}s")
+        return 1
+
+    after = fetch_metrics(BASE_URL)
+    print(f"\n✅ Burst done in {elapsed:.1f}s ({args.notes / elapsed:.2f} notes/s)"
+          f"  completed {batch['completed']}  failed {batch['failed']}")
+
+    print_provider_report(provider_stats())
+    print_client_gauges(after)
+
+    print("\n⏱️ Stage timings during the burst")
+    breakdown = stage_breakdown(before, after)
+    print_stage_breakdown({stage: row for stage, row in breakdown.items()
+                           if stage == 'provider_queue' or stage.startswith('pipeline_')} or breakdown)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
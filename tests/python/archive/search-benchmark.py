@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Search latency benchmark for nano-Grazynka: seed an account with N processed
+notes, then time GET /api/voice-notes/search and report p50/p95/p99.
+
+Seeding goes through the batch API with random payloads (loadgen.seed_notes),
+so run the backend against fake-provider-server.py. Queries are drawn from the
+fake provider's vocabulary, single words and pairs, plus a miss.
+
+Usage:
+  ./fake-provider-server.py &                      # then start the backend against it
+  ./search-benchmark.py --notes 2000               # seed 2000 notes, run 200 queries
+  ./search-benchmark.py --notes 0 --email a@b.c --password secret   # reuse a seeded account
+"""
+import argparse
+import random
+import sys
+import time
+
+import requests
+
+from loadgen import authenticate, percentile, seed_notes
+
+BASE_URL = "http://localhost:3101"
+
+# Keep in sync with WORDS in fake-provider-server.py
+WORDS = [
+    'spotkanie', 'projekt', 'termin', 'klient', 'budżet', 'zadanie', 'raport',
+    'meeting', 'deadline', 'release', 'backend', 'frontend', 'review', 'plan',
+    'Microsoft', 'Żabka', 'sprint', 'demo', 'wdrożenie', 'testy', 'umowa'
+]
+
+
+def build_queries(count, rng):
+    queries = []
+    for i in range(count):
+        if i % 10 == 9:
+            queries.append('nieistniejącefraza')
+        elif i % 3 == 2:
+            queries.append(' '.join(rng.sample(WORDS, 2)))
+        else:
+            queries.append(rng.choice(WORDS)[:rng.randint(3, 8)])
+    return queries
+
+
+def run_queries(session, queries, page_size):
+    latencies = []
+    hits = []
+    errors = 0
+    for query in queries:
+        started = time.perf_counter()
+        response = session.get(f'{BASE_URL}/api/voice-notes/search',
+                               params={'q': query, 'limit': page_size}, timeout=30)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            errors += 1
+            continue
+        hits.append(response.json()['pagination']['total'])
+    return latencies, hits, errors
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='nano-Grazynka full-text search benchmark')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--notes', type=int, default=1000, help='Notes to seed before querying (0 to skip)')
+    parser.add_argument('--files-per-request', type=int, default=50)
+    parser.add_argument('--payload-bytes', type=int, default=4096, help='Size of each fake recording')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--email', default=None)
+    parser.add_argument('--password', default=None)
+    parser.add_argument('--timeout', type=int, default=3600, help='Seconds to wait for seeding to finish')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    BASE_URL = args.base_url
+
+    session = requests.Session()
+    if not authenticate(BASE_URL, session, args.email, args.password, 'search-bench'):
+        sys.exit(1)
+
+    if args.notes > 0 and not seed_notes(BASE_URL, session, args.notes, args.files_per_request,
+                                         args.payload_bytes, args.timeout):
+        sys.exit(1)
+
+    queries = build_queries(args.queries, random.Random(args.seed))
+    # Warm the connection and SQLite page cache before timing
+    run_queries(session, queries[:5], args.page_size)
+    latencies, hits, errors = run_queries(session, queries, args.page_size)
+
+    print("\n" + "=" * 60)
+    print("SEARCH BENCHMARK SUMMARY")
+    print("=" * 60)
+    print(f"🔎 {len(queries)} queries, page size {args.page_size}, {errors} errors")
+    if hits:
+        print(f"   Matches per query: avg {sum(hits) / len(hits):.0f}, max {max(hits)}")
+    print(f"   p50 {percentile(latencies, 50):.1f}ms  p95 {percentile(latencies, 95):.1f}ms  "
+          f"p99 {percentile(latencies, 99):.1f}ms  max {max(latencies):.1f}ms")
+
+    sys.exit(0 if errors == 0 else 1)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Upload storage benchmark for nano-Grazynka: measure how well identical
+recordings deduplicate and how fast the storage reaper reclaims files once
+their notes are gone.
+
+The run uploads --distinct random recordings --copies times each through the
+batch API (every copy has the same bytes, as when a phone re-shares the same
+file), then reads GET /health/storage:
+
+  - stored MB is what actually landed on disk, referenced MB is what the
+    notes point at; their ratio should come out at --copies
+  - the objects count should grow by --distinct, not by distinct x copies
+
+It then deletes every note and polls /health/storage until the reaper has
+reclaimed all --distinct files, reporting objects/s and MB/s.
+
+Reclaiming only starts once a file has been unreferenced for
+storage.gc.orphanGraceMinutes and the reaper wakes every storage.gc.intervalMs,
+so set both low in config.yaml for the run:
+
+  storage:
+    gc:
+      intervalMs: 1000
+      orphanGraceMinutes: 0
+
+The reaper runs in the leader cluster worker only, and its counters live in
+that process; with several workers, /health/storage may be answered by another
+one, so benchmark with server.workers: 1. Processing goes through the
+providers, so run the backend against fake-provider-server.py.
+
+Usage:
+  ./fake-provider-server.py --quiet &
+  ./storage-gc-benchmark.py --distinct 200 --copies 5
+  ./storage-gc-benchmark.py --distinct 1000 --copies 3 --payload-kb 256
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import requests
+
+from loadgen import authenticate
+
+BASE_URL = "http://localhost:3101"
+
+
+def storage_stats(session):
+    response = session.get(f'{BASE_URL}/health/storage', timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def upload_copies(session, distinct, copies, payload_bytes, per_request):
+    """Upload every payload `copies` times; returns the created note ids"""
+    payloads = [os.urandom(payload_bytes) for _ in range(distinct)]
+    uploads = [(f'copy-{copy + 1}-of-{index + 1:06d}.m4a', payload)
+               for copy in range(copies) for index, payload in enumerate(payloads)]
+
+    note_ids = []
+    batch_ids = []
+    for offset in range(0, len(uploads), per_request):
+        files = [('files', (name, io.BytesIO(payload), 'audio/x-m4a'))
+                 for name, payload in uploads[offset:offset + per_request]]
+        response = session.post(f'{BASE_URL}/api/voice-notes/batches', files=files,
+                                data={'language': 'PL'}, timeout=600)
+        if response.status_code != 202:
+            print(f"❌ Upload batch failed: {response.status_code} {response.text}")
+            return None
+        body = response.json()
+        note_ids.extend(item['voiceNoteId'] for item in body['uploaded'])
+        batch_ids.append(body['batch']['id'])
+    return note_ids, batch_ids
+
+
+def wait_for_batches(session, batch_ids, timeout):
+    deadline = time.time() + timeout
+    pending = set(batch_ids)
+    while pending and time.time() < deadline:
+        for batch_id in list(pending):
+            response = session.get(f'{BASE_URL}/api/voice-notes/batches/{batch_id}', timeout=30)
+            if response.status_code == 200 and response.json().get('done'):
+                pending.discard(batch_id)
+        if pending:
+            time.sleep(2)
+    return not pending
+
+
+def delete_notes(session, note_ids):
+    failed = 0
+    for note_id in note_ids:
+        response = session.delete(f'{BASE_URL}/api/voice-notes/{note_id}', timeout=30)
+        if response.status_code not in (200, 204):
+            failed += 1
+    return failed
+
+
+def wait_for_reclaim(session, baseline, expected, timeout, poll_interval):
+    """Poll until the reaper has reclaimed `expected` more objects than at baseline"""
+    start = time.time()
+    first_progress = None
+    stats = baseline
+    while time.time() - start < timeout:
+        stats = storage_stats(session)
+        reclaimed = stats['reclaimedObjects'] - baseline['reclaimedObjects']
+        if reclaimed > 0 and first_progress is None:
+            first_progress = time.time()
+        if reclaimed >= expected:
+            break
+        time.sleep(poll_interval)
+    return stats, time.time() - start, first_progress and time.time() - first_progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure upload dedup ratio and storage reaper throughput')
+    parser.add_argument('--distinct', type=int, default=200, help='Distinct recordings to upload')
+    parser.add_argument('--copies', type=int, default=5, help='Uploads of each recording')
+    parser.add_argument('--payload-kb', type=int, default=64, help='Size of each recording')
+    parser.add_argument('--per-request', type=int, default=50, help='Recordings per upload batch')
+    parser.add_argument('--timeout', type=float, default=1800, help='Seconds to wait for processing and reclaiming')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='Seconds between /health/storage polls')
+    parser.add_argument('--min-dedup', type=float, default=None,
+                        help='Fail when the measured dedup ratio is below this (default: --copies)')
+    args = parser.parse_args()
+
+    print("🚀 Upload storage benchmark")
+    print("=" * 50)
+
+    session = requests.Session()
+    if not authenticate(BASE_URL, session, prefix='storage-bench'):
+        return 1
+
+    before = storage_stats(session)
+    if not before['enabled']:
+        print("⚠️  storage.gc.enabled is false: files will not be reclaimed")
+    if before['orphanGraceMinutes'] > 0:
+        print(f"⚠️  orphanGraceMinutes is {before['orphanGraceMinutes']}: reclaiming waits that long after the deletes")
+
+    payload_bytes = args.payload_kb * 1024
+    print(f"\n⬆️  Uploading {args.distinct} recordings x {args.copies} copies ({args.payload_kb} KB each)")
+    start = time.time()
+    uploaded = upload_copies(session, args.distinct, args.copies, payload_bytes, args.per_request)
+    if not uploaded:
+        return 1
+    note_ids, batch_ids = uploaded
+    print(f"   {len(note_ids)} notes in {time.time() - start:.1f}s, waiting for processing")
+    if not wait_for_batches(session, batch_ids, args.timeout):
+        print("⏱️ Processing timed out")
+        return 1
+
+    stored = storage_stats(session)
+    objects_added = stored['objects'] - before['objects']
+    bytes_added = stored['bytes'] - before['bytes']
+    referenced_added = stored['referencedBytes'] - before['referencedBytes']
+    dedup_ratio = referenced_added / bytes_added if bytes_added > 0 else 0.0
+
+    print(f"\n🗑️  Deleting {len(note_ids)} notes")
+    start = time.time()
+    failed = delete_notes(session, note_ids)
+    print(f"   Deleted in {time.time() - start:.1f}s ({failed} failed)")
+
+    reclaimed_stats, wall, active = wait_for_reclaim(session, stored, args.distinct, args.timeout, args.poll_interval)
+    reclaimed_objects = reclaimed_stats['reclaimedObjects'] - stored['reclaimedObjects']
+    reclaimed_bytes = reclaimed_stats['reclaimedBytes'] - stored['reclaimedBytes']
+    active = max(active or wall, 1e-9)
+
+    print("\n📦 Deduplication")
+    print(f"  uploads           {len(note_ids):>10}")
+    print(f"  objects added     {objects_added:>10}   (expected {args.distinct})")
+    print(f"  referenced MB     {referenced_added / 1024 / 1024:>10.1f}")
+    print(f"  stored MB         {bytes_added / 1024 / 1024:>10.1f}")
+    print(f"  dedup ratio       {dedup_ratio:>10.2f}   (expected {args.copies:.2f})")
+
+    print("\n♻️  Reclaiming")
+    print(f"  objects reclaimed {reclaimed_objects:>10}   of {args.distinct}")
+    print(f"  MB reclaimed      {reclaimed_bytes / 1024 / 1024:>10.1f}")
+    print(f"  wall time s       {wall:>10.1f}   (includes grace period and waiting for the next pass)")
+    print(f"  objects/s         {reclaimed_objects / active:>10.0f}   (from first reclaim to last)")
+    print(f"  MB/s              {reclaimed_bytes / 1024 / 1024 / active:>10.1f}")
+    print(f"  reaper deletes/s  {reclaimed_stats['deletesPerSecond']:>10.0f}   (last pass, paced by maxDeletesPerSecond)")
+
+    min_dedup = args.min_dedup if args.min_dedup is not None else args.copies
+    ok = failed == 0 and objects_added == args.distinct and dedup_ratio >= min_dedup - 0.01 \
+        and reclaimed_objects >= args.distinct
+    print(f"\n{'✅ Passed' if ok else '❌ Failed'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Audio pre-processing benchmark for nano-Grazynka: encode the same recording
+as WAV, M4A, MP3 and WebM (padded with silence at both ends, the way phone
+recordings usually start and stop), process each through the backend and
+report the bytes the transcription provider received per request next to the
+end-to-end latency (from POST /process to completed).
+
+Provider bytes come from the fake provider's /__stats, so run the backend
+against fake-provider-server.py. Run it once with
+transcription.preprocessing.enabled: false and once with true to compare the
+stored-format upload with the transcoded one. Every run encodes a slightly
+different padding so the transcription cache never answers.
+
+Usage:
+  ./fake-provider-server.py --quiet &       # then start the backend against it
+  ./transcode-benchmark.py --runs 5
+  ./transcode-benchmark.py --formats wav,webm --model google/gemini-2.0-flash-001
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from loadgen import new_session_id, percentile, wait_for_completion
+
+BASE_URL = "http://localhost:3101"
+PROVIDER_URL = "http://localhost:8089"
+AUDIO_FILE = './zabka.m4a'
+
+# Roughly what phones and browsers produce for each container
+FORMATS = {
+    'wav': (['-c:a', 'pcm_s16le', '-ar', '44100', '-ac', '2'], 'audio/wav'),
+    'm4a': (['-c:a', 'aac', '-b:a', '128k'], 'audio/m4a'),
+    'mp3': (['-c:a', 'libmp3lame', '-b:a', '128k'], 'audio/mpeg'),
+    'webm': (['-c:a', 'libopus', '-b:a', '64k'], 'audio/webm')
+}
+PROVIDER_ROUTES = ('transcription', 'gemini')
+
+
+def encode(source, fmt, pad_ms, out_dir):
+    codec_args, _ = FORMATS[fmt]
+    target = os.path.join(out_dir, f'bench-{pad_ms}.{fmt}')
+    subprocess.run(
+        ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y', '-i', source,
+         '-af', f'adelay=delays={pad_ms}:all=1,apad=pad_dur={pad_ms / 1000:.3f}', '-vn', *codec_args, target],
+        check=True
+    )
+    return target
+
+
+def provider_snapshot():
+    return requests.get(f'{PROVIDER_URL}/__stats', timeout=10).json()
+
+
+def provider_totals(before, after):
+    count = sum(after['requests'].get(route, 0) - before['requests'].get(route, 0) for route in PROVIDER_ROUTES)
+    size = sum(after.get('bytes', {}).get(route, 0) - before.get('bytes', {}).get(route, 0) for route in PROVIDER_ROUTES)
+    return count, size
+
+
+def process_file(path, mime_type, model, timeout):
+    """Upload, process and wait; returns seconds from /process to completed, or None"""
+    headers = {'x-session-id': new_session_id('transcode-bench')}
+    data = {'language': 'PL'}
+    if model:
+        data['transcriptionModel'] = model
+    with open(path, 'rb') as f:
+        response = requests.post(f'{BASE_URL}/api/voice-notes', files={'file': (os.path.basename(path), f, mime_type)},
+                                 data=data, headers=headers, timeout=timeout)
+    if response.status_code != 201:
+        print(f"  ❌ Upload failed: {response.status_code} {response.text[:200]}")
+        return None
+    voice_note_id = response.json()['voiceNote']['id']
+
+    started = time.time()
+    requests.post(f'{BASE_URL}/api/voice-notes/{voice_note_id}/process',
+                  json={'language': 'PL'}, headers=headers, timeout=timeout)
+    final = wait_for_completion(BASE_URL, voice_note_id, headers=headers, timeout=timeout)
+    if not final or final.get('status') != 'completed':
+        print(f"  ❌ Processing did not complete (status: {final.get('status') if final else 'timeout'})")
+        return None
+    return time.time() - started
+
+
+def benchmark_format(source, fmt, args, work_dir):
+    _, mime_type = FORMATS[fmt]
+    latencies = []
+    file_bytes = []
+    provider_requests = 0
+    provider_bytes = 0
+    errors = 0
+
+    for run in range(args.runs):
+        path = encode(source, fmt, int(args.pad_sec * 1000) + run, work_dir)
+        file_bytes.append(os.path.getsize(path))
+        before = provider_snapshot()
+        elapsed = process_file(path, mime_type, args.model, args.timeout)
+        count, size = provider_totals(before, provider_snapshot())
+        os.remove(path)
+        if elapsed is None:
+            errors += 1
+            continue
+        latencies.append(elapsed)
+        provider_requests += count
+        provider_bytes += size
+
+    return {
+        'file_bytes': sum(file_bytes) / len(file_bytes),
+        'provider_bytes': provider_bytes / provider_requests if provider_requests else 0.0,
+        'provider_requests': provider_requests,
+        'p50': percentile(latencies, 50) if latencies else 0.0,
+        'p95': percentile(latencies, 95) if latencies else 0.0,
+        'errors': errors
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='nano-Grazynka audio pre-processing benchmark')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--provider-url', default=PROVIDER_URL, help='fake-provider-server.py, for payload bytes')
+    parser.add_argument('--audio', default=AUDIO_FILE, help='Source recording')
+    parser.add_argument('--formats', default=','.join(FORMATS), help='Comma-separated formats to compare')
+    parser.add_argument('--pad-sec', type=float, default=3.0, help='Silence added before and after the speech')
+    parser.add_argument('--runs', type=int, default=5, help='Notes processed per format')
+    parser.add_argument('--model', default=None, help='transcriptionModel for the uploads (e.g. the Gemini model)')
+    parser.add_argument('--timeout', type=int, default=300)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    BASE_URL = args.base_url
+    PROVIDER_URL = args.provider_url
+
+    if not shutil.which('ffmpeg'):
+        print("❌ ffmpeg is needed to encode the test files")
+        sys.exit(1)
+    formats = [fmt for fmt in args.formats.split(',') if fmt]
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown:
+        print(f"❌ Unknown formats: {', '.join(unknown)} (choose from {', '.join(FORMATS)})")
+        sys.exit(1)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='transcode-bench-') as work_dir:
+        for fmt in formats:
+            print(f"\n🎧 {fmt}: {args.runs} notes")
+            results[fmt] = benchmark_format(args.audio, fmt, args, work_dir)
+
+    print("\n" + "=" * 72)
+    print("AUDIO PRE-PROCESSING SUMMARY")
+    print("=" * 72)
+    print(f"{'format':>8}{'file KB':>10}{'provider KB':>13}{'ratio':>8}{'requests':>10}"
+          f"{'p50':>9}{'p95':>9}{'errors':>8}")
+    for fmt, result in results.items():
+        ratio = result['provider_bytes'] / result['file_bytes'] if result['file_bytes'] else 0.0
+        print(f"{fmt:>8}{result['file_bytes'] / 1024:>10.0f}{result['provider_bytes'] / 1024:>13.0f}{ratio:>8.2f}"
+              f"{result['provider_requests']:>10}{result['p50']:>8.2f}s{result['p95']:>8.2f}s{result['errors']:>8}")
+
+    sys.exit(0 if all(result['errors'] == 0 for result in results.values()) else 1)
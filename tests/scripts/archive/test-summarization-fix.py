@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
 Test script for summarization fix
-Tests that summarization now works correctly after fixing the prompt issue
+Tests that summarization now works correctly after fixing the prompt issue,
+then regenerates the summary once buffered and once streamed over SSE
+(Accept: text/event-stream) and reports time to first token for each
 """
 import requests
 import json
@@ -11,6 +13,70 @@ import uuid
 
 BASE_URL = "http://localhost:3101"
 
+
+def regenerate_summary(voice_note_id, session_id, stream):
+    """
+    POST regenerate-summary and time it. Returns (time to first summary text,
+    total time, final payload); buffered responses have no first token before
+    the whole body arrives.
+    """
+    headers = {'Content-Type': 'application/json', 'x-session-id': session_id}
+    if stream:
+        headers['Accept'] = 'text/event-stream'
+
+    start = time.time()
+    response = requests.post(
+        f'{BASE_URL}/api/voice-notes/{voice_note_id}/regenerate-summary',
+        headers=headers,
+        json={},
+        stream=stream
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"regenerate-summary failed: {response.status_code} {response.text}")
+
+    if not stream:
+        elapsed = time.time() - start
+        return elapsed, elapsed, response.json()
+
+    first_token = None
+    deltas = 0
+    event_name = 'message'
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith('event:'):
+            event_name = line[len('event:'):].strip()
+        elif line.startswith('data:'):
+            data = json.loads(line[len('data:'):].strip())
+            if event_name == 'summary.delta':
+                deltas += 1
+                if first_token is None:
+                    first_token = time.time() - start
+            elif event_name == 'completed':
+                print(f"   {deltas} summary deltas streamed")
+                return first_token or time.time() - start, time.time() - start, data
+            elif event_name == 'failed':
+                raise RuntimeError(f"Streamed regeneration failed: {data.get('message')}")
+        elif not line:
+            event_name = 'message'
+    raise RuntimeError('Stream ended without a completed event')
+
+
+def measure_time_to_first_token(voice_note_id, session_id):
+    print("\n⏱️  Step 4: Time to first token (regenerate-summary)")
+    results = {}
+    for label, stream in (('buffered', False), ('streamed', True)):
+        ttft, total, payload = regenerate_summary(voice_note_id, session_id, stream)
+        summary = payload.get('voiceNote', {}).get('summary') or {}
+        if not summary.get('summary'):
+            print(f"   ❌ {label} regeneration returned no summary")
+            return False
+        results[label] = (ttft, total)
+        print(f"   {label:<9} first text {ttft * 1000:7.0f}ms   complete {total * 1000:7.0f}ms   "
+              f"summary {len(summary.get('summary', ''))} chars")
+
+    saved = results['buffered'][0] - results['streamed'][0]
+    print(f"   Streaming shows text {saved * 1000:.0f}ms sooner")
+    return results['streamed'][0] < results['buffered'][0]
+
 def test_summarization():
     print("🚀 Testing Summarization Fix\n")
     
@@ -52,7 +118,7 @@ def test_summarization():
         json={'language': 'PL'}
     )
     
-    if response.status_code != 200:
+    if response.status_code not in (200, 202):
         print(f"❌ Processing failed: {response.status_code}")
         print(f"Response: {response.text}")
         return False
@@ -63,7 +129,12 @@ def test_summarization():
     print("\n⏳ Step 3: Waiting for processing to complete...")
     max_attempts = 30
     for i in range(max_attempts):
-        time.sleep(2)
+        # Long-poll: returns as soon as processing finishes, otherwise after 2s
+        requests.get(
+            f'{BASE_URL}/api/voice-notes/{voice_note_id}/status',
+            headers={'x-session-id': session_id},
+            params={'waitMs': 2000}
+        )
         
         response = requests.get(
             f'{BASE_URL}/api/voice-notes/{voice_note_id}',
@@ -100,10 +171,11 @@ def test_summarization():
                     print(f"   Key points: {len(key_points)} items")
                     
                     print("\n🎉 SUMMARIZATION IS WORKING!")
-                    return True
+                    return measure_time_to_first_token(voice_note_id, session_id)
                 else:
-                    print("\n❌ No summary found - summarization still failing")
-                    return False
+                    # Uploads are summarized on request (two-step flow), so generate it here
+                    print("\n⚠️  No summary after processing - generating one via regenerate-summary")
+                    return measure_time_to_first_token(voice_note_id, session_id)
                     
             elif status == 'failed':
                 print(f"\n❌ Processing failed: {voice_note.get('errorMessage')}")